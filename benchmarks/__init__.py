@@ -0,0 +1,15 @@
+"""
+Performance benchmarks for the backtest, feature, optimizer and DB hot paths.
+
+Every case runs on synthetic 1m candles (`benchmarks.synthetic`), so results are
+reproducible across machines and commits. Results are written as JSON and can be
+compared with a previous run:
+
+    python -m benchmarks --list
+    python -m benchmarks backtest --output before.json
+    python -m benchmarks backtest --compare before.json --threshold 0.15
+
+Cases that need Postgres run against the database from the usual POSTGRES_*
+settings, inside a dedicated 'benchmarks' schema. Cases whose dependencies are
+missing are reported as skipped.
+"""
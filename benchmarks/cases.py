@@ -0,0 +1,252 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from benchmarks.synthetic import DEFAULT_SEED, candles_ending_now, generate_candles
+
+BENCHMARK_SYMBOL = "BENCHUSDT"
+BACKTEST_DAYS = (30, 180, 365)
+DB_DAYS = 30
+
+
+class SkipBenchmark(Exception):
+    """Raised by a setup when the case cannot run here (missing service or module)."""
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    One timed operation. `setup(context)` runs once, untimed, and returns the
+    state passed to `run`; `teardown(context, state)` cleans up afterwards.
+    Each sample times `number` calls of `run`, and `repeat` samples are taken.
+    """
+    name: str
+    run: Callable[[Any], Any]
+    setup: Optional[Callable[["BenchmarkContext"], Any]] = None
+    teardown: Optional[Callable[["BenchmarkContext", Any], None]] = None
+    repeat: int = 5
+    number: int = 1
+
+
+CASES: Dict[str, BenchmarkCase] = {}
+
+
+def register(case: BenchmarkCase) -> BenchmarkCase:
+    CASES[case.name] = case
+    return case
+
+
+class BenchmarkContext:
+    """
+    Shared, lazily built inputs. Candles and feature frames are computed once per
+    length and reused by every case; the database is only opened by cases that need it.
+    """
+    def __init__(self, seed: int = DEFAULT_SEED):
+        self.seed = seed
+        self._frames: Dict[tuple, Any] = {}
+        self._db_manager = None
+        self._db_error: Optional[str] = None
+
+    def _cached(self, key: tuple, build: Callable[[], Any]):
+        if key not in self._frames:
+            self._frames[key] = build()
+        return self._frames[key]
+
+    def candles(self, days: int):
+        return self._cached(("candles", days), lambda: generate_candles(days, seed=self.seed))
+
+    def features(self, days: int):
+        """Features exactly as the Backtester computes them from price data."""
+        from jules_bot.research.feature_engineering import add_all_features
+        return self._cached(("features", days), lambda: add_all_features(self.candles(days), live_mode=False).dropna())
+
+    def backtest_frame(self, days: int):
+        """Regimes and the configured dtype policy on top of `features`, as the Backtester keeps them."""
+        from jules_bot.bot.situational_awareness import SituationalAwareness
+        from jules_bot.research.feature_dtypes import apply_dtype_policy
+        return self._cached(("regimes", days), lambda: apply_dtype_policy(SituationalAwareness().transform(self.features(days))))
+
+    def db_manager(self):
+        """The benchmark schema's PostgresManager, or SkipBenchmark when Postgres is unreachable."""
+        if self._db_manager is None and self._db_error is None:
+            from jules_bot.database.postgres_manager import PostgresManager
+            try:
+                self._db_manager = PostgresManager()
+            except Exception as e:
+                self._db_error = str(e).splitlines()[0]
+        if self._db_manager is None:
+            raise SkipBenchmark(f"Postgres not available: {self._db_error}")
+        return self._db_manager
+
+
+# --- Features and regimes ---
+
+FEATURE_DAYS = 30
+
+
+def _features_setup(context: BenchmarkContext):
+    from jules_bot.research.feature_engineering import add_all_features
+    return add_all_features, context.candles(FEATURE_DAYS)
+
+
+def _regime_setup(context: BenchmarkContext):
+    from jules_bot.bot.situational_awareness import SituationalAwareness
+    return SituationalAwareness(), context.features(FEATURE_DAYS)
+
+
+register(BenchmarkCase(
+    name=f"features.add_all_features[{FEATURE_DAYS}d]",
+    setup=_features_setup,
+    run=lambda state: state[0](state[1], live_mode=False),
+    repeat=3,
+))
+register(BenchmarkCase(
+    name=f"regime.transform[{FEATURE_DAYS}d]",
+    setup=_regime_setup,
+    run=lambda state: state[0].transform(state[1]),
+    repeat=3,
+))
+
+
+# --- Backtests ---
+
+def _backtest_setup(context: BenchmarkContext, days: int):
+    from jules_bot.backtesting.engine import Backtester
+    return Backtester, context.db_manager(), context.backtest_frame(days)
+
+
+def _backtest_run(state, **options):
+    backtester_class, db_manager, frame = state
+    return backtester_class(db_manager=db_manager, data=frame, **options).run(return_full_results=True)
+
+
+def _clear_backtest_trades(context: BenchmarkContext, state):
+    # The runner switches to the benchmark bot schema, so only its backtest trades are removed.
+    context.db_manager().clear_backtest_trades()
+
+
+for _days in BACKTEST_DAYS:
+    register(BenchmarkCase(
+        name=f"backtest.run[{_days}d]",
+        setup=lambda context, days=_days: _backtest_setup(context, days),
+        run=_backtest_run,
+        teardown=_clear_backtest_trades,
+        repeat=3 if _days <= 30 else 1,
+    ))
+
+# The candle-by-candle loop, for comparison with the event-skipping default.
+register(BenchmarkCase(
+    name="backtest.run_every_candle[30d]",
+    setup=lambda context: _backtest_setup(context, 30),
+    run=lambda state: _backtest_run(state, event_skipping=False),
+    teardown=_clear_backtest_trades,
+    repeat=3,
+))
+
+
+BATCH_SIZE = 32
+
+
+def _batch_setup(context: BenchmarkContext):
+    from jules_bot.backtesting.batch_engine import BatchBacktester
+    from jules_bot.utils.config_manager import ConfigManager
+
+    rng = np.random.default_rng(context.seed)
+    config_managers = []
+    for buy_dip, sell_rise in zip(rng.uniform(0.001, 0.02, BATCH_SIZE), rng.uniform(0.002, 0.03, BATCH_SIZE)):
+        config = ConfigManager()
+        config.apply_overrides({"BUY_DIP_PERCENTAGE": str(buy_dip), "SELL_RISE_PERCENTAGE": str(sell_rise)})
+        config_managers.append(config)
+    return BatchBacktester, config_managers, context.backtest_frame(30)
+
+
+register(BenchmarkCase(
+    name=f"backtest.batch[30d x{BATCH_SIZE}]",
+    setup=_batch_setup,
+    run=lambda state: state[0](data=state[2], config_managers=state[1]).run(),
+    repeat=3,
+))
+
+
+# --- Optimizer ---
+
+GENIUS_RESULTS = {
+    "final_balance": "1250.0", "max_drawdown": "0.18", "sortino_ratio": "2.4",
+    "net_pnl_pct": "25.0", "profit_factor": "1.8", "sell_trades_count": 42,
+}
+
+
+def _genius_score_setup(context: BenchmarkContext):
+    from decimal import Decimal
+    from jules_bot.genius_optimizer.objective import calculate_genius_score
+    results = {key: Decimal(value) if isinstance(value, str) else value for key, value in GENIUS_RESULTS.items()}
+    return calculate_genius_score, results
+
+
+register(BenchmarkCase(
+    name="optimizer.calculate_genius_score",
+    setup=_genius_score_setup,
+    run=lambda state: state[0](state[1]),
+    number=10000,
+))
+
+
+def _optimizer_trial_setup(context: BenchmarkContext):
+    import json
+    import optuna
+    from jules_bot.genius_optimizer.objective import create_objective_function
+    from jules_bot.utils.config_manager import config_manager
+
+    optuna.logging.set_verbosity(optuna.logging.WARNING)
+    active_params = json.loads(config_manager.get('OPTIMIZER', 'active_params_json', fallback='{}'))
+    objective = create_objective_function(config_manager.bot_name, context.db_manager(), active_params, context.backtest_frame(30))
+    return optuna, objective, context.seed
+
+
+def _optimizer_trial_run(state):
+    optuna, objective, seed = state
+    # A fresh in-memory study with a seeded sampler draws the same parameters every time.
+    study = optuna.create_study(direction="maximize", sampler=optuna.samplers.TPESampler(seed=seed))
+    study.optimize(objective, n_trials=1)
+    return study.best_value
+
+
+register(BenchmarkCase(
+    name="optimizer.trial[30d]",
+    setup=_optimizer_trial_setup,
+    run=_optimizer_trial_run,
+    teardown=_clear_backtest_trades,
+    repeat=3,
+))
+
+
+# --- Database ---
+
+def _price_data_setup(context: BenchmarkContext):
+    from sqlalchemy import text
+    db_manager = context.db_manager()
+    candles = candles_ending_now(DB_DAYS, seed=context.seed)
+    db_manager.ensure_price_history_partitions(candles.index[0], candles.index[-1])
+    with db_manager.engine.begin() as connection:
+        connection.execute(text("DELETE FROM price_history WHERE symbol = :symbol"), {"symbol": BENCHMARK_SYMBOL})
+    candles[["open", "high", "low", "close", "volume"]].assign(symbol=BENCHMARK_SYMBOL).to_sql(
+        "price_history", db_manager.engine, if_exists="append", index=True, index_label="timestamp",
+        method="multi", chunksize=5000,
+    )
+    return db_manager
+
+
+def _price_data_teardown(context: BenchmarkContext, db_manager):
+    from sqlalchemy import text
+    with db_manager.engine.begin() as connection:
+        connection.execute(text("DELETE FROM price_history WHERE symbol = :symbol"), {"symbol": BENCHMARK_SYMBOL})
+
+
+register(BenchmarkCase(
+    name=f"db.get_price_data[{DB_DAYS}d]",
+    setup=_price_data_setup,
+    run=lambda db_manager: db_manager.get_price_data(measurement=BENCHMARK_SYMBOL, start_date=f"-{DB_DAYS}d"),
+    teardown=_price_data_teardown,
+    repeat=5,
+))
@@ -0,0 +1,216 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.cases import CASES, BenchmarkCase, BenchmarkContext, SkipBenchmark
+from benchmarks.synthetic import DEFAULT_SEED
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+THRESHOLDS_FILE = os.path.join(PROJECT_ROOT, "benchmarks", "thresholds.json")
+DEFAULT_THRESHOLD = 0.10
+# Benchmarks write backtest trades and price rows, so they get a schema of their own.
+BENCHMARK_BOT_NAME = "benchmarks"
+
+
+def run_case(case: BenchmarkCase, context: BenchmarkContext, repeat: Optional[int] = None) -> dict:
+    """
+    Runs one case and returns {"status": "ok", "samples_s": [...], ...},
+    {"status": "skipped", "reason": ...} or {"status": "error", "reason": ...}.
+    Samples are seconds per call of `case.run`.
+    """
+    try:
+        state = case.setup(context) if case.setup else None
+    except SkipBenchmark as e:
+        return {"status": "skipped", "reason": str(e)}
+    except ModuleNotFoundError as e:
+        return {"status": "skipped", "reason": f"missing module '{e.name}'"}
+    except Exception as e:
+        return {"status": "error", "reason": f"setup failed: {e}"}
+
+    samples = []
+    try:
+        for _ in range(repeat or case.repeat):
+            gc.collect()
+            started = time.perf_counter()
+            for _ in range(case.number):
+                case.run(state)
+            samples.append((time.perf_counter() - started) / case.number)
+    except Exception as e:
+        return {"status": "error", "reason": f"run failed: {e}"}
+    finally:
+        if case.teardown:
+            try:
+                case.teardown(context, state)
+            except Exception as e:
+                print(f"⚠️  teardown of {case.name} failed: {e}", file=sys.stderr)
+
+    return {
+        "status": "ok",
+        "number": case.number,
+        "samples_s": samples,
+        "median_s": statistics.median(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+    }
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_suite(names: Iterable[str], seed: int = DEFAULT_SEED, repeat: Optional[int] = None) -> dict:
+    """Runs the named cases and returns the JSON-ready result document."""
+    context = BenchmarkContext(seed=seed)
+    results = {}
+    for name in names:
+        print(f"▶️  {name} ...", file=sys.stderr, flush=True)
+        results[name] = run_case(CASES[name], context, repeat=repeat)
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "seed": seed,
+        "results": results,
+    }
+
+
+def load_thresholds(path: str = THRESHOLDS_FILE) -> tuple[float, Dict[str, float]]:
+    """Returns (default threshold, per-case thresholds) as fractional slowdowns, e.g. 0.1 = +10%."""
+    if not os.path.exists(path):
+        return DEFAULT_THRESHOLD, {}
+    with open(path) as f:
+        config = json.load(f)
+    return float(config.get("default", DEFAULT_THRESHOLD)), {name: float(value) for name, value in config.get("cases", {}).items()}
+
+
+def compare(current: dict, baseline: dict, default_threshold: float, case_thresholds: Dict[str, float]) -> list:
+    """
+    Compares the median time of every case present in both documents. A case
+    regresses when it is slower than the baseline by more than its threshold.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        threshold = case_thresholds.get(name, default_threshold)
+        if result.get("status") != "ok" or not base or base.get("status") != "ok":
+            rows.append({"name": name, "status": "not compared", "threshold": threshold})
+            continue
+        change = result["median_s"] / base["median_s"] - 1 if base["median_s"] else 0.0
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "status": status, "threshold": threshold, "change": change,
+                     "baseline_s": base["median_s"], "current_s": result["median_s"]})
+    return rows
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+def print_results(document: dict):
+    print(f"\nBenchmarks @ {document['commit']}{' (dirty)' if document['dirty'] else ''} — seed {document['seed']}")
+    print(f"{'case':<38}{'median':>12}{'min':>12}{'samples':>9}")
+    for name, result in document["results"].items():
+        if result["status"] == "ok":
+            print(f"{name:<38}{_format_seconds(result['median_s']):>12}{_format_seconds(result['min_s']):>12}{len(result['samples_s']):>9}")
+        else:
+            print(f"{name:<38}  {result['status']}: {result['reason']}")
+
+
+def print_comparison(rows: list, baseline: dict):
+    print(f"\nCompared with {baseline.get('commit', '?')} (median, slower is positive)")
+    print(f"{'case':<38}{'baseline':>12}{'current':>12}{'change':>10}{'limit':>8}  status")
+    for row in rows:
+        if "change" not in row:
+            print(f"{row['name']:<38}{'':>42}  {row['status']}")
+            continue
+        print(f"{row['name']:<38}{_format_seconds(row['baseline_s']):>12}{_format_seconds(row['current_s']):>12}"
+              f"{row['change']:>+10.1%}{row['threshold']:>8.0%}  {row['status']}")
+
+
+def _parse_case_thresholds(values: list) -> Dict[str, float]:
+    thresholds = {}
+    for value in values:
+        name, _, limit = value.rpartition("=")
+        if not name:
+            raise argparse.ArgumentTypeError(f"Expected NAME=FRACTION, got '{value}'.")
+        thresholds[name] = float(limit)
+    return thresholds
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Runs the performance benchmarks on synthetic 1m candles and compares them with a baseline.")
+    parser.add_argument("filters", nargs="*", help="Only run cases whose name contains one of these substrings.")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed of the synthetic candles.")
+    parser.add_argument("--repeat", type=int, help="Samples per case (overrides each case's default).")
+    parser.add_argument("--output", help="Where to write the JSON results (default: benchmarks/results/<commit>.json).")
+    parser.add_argument("--compare", metavar="BASELINE", help="A previous results JSON to compare against. Regressions exit with status 1.")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE, help="JSON file with the default and per-case allowed slowdowns.")
+    parser.add_argument("--threshold", type=float, help="Override the default allowed slowdown (0.1 = 10%%).")
+    parser.add_argument("--case-threshold", action="append", default=[], metavar="NAME=FRACTION", help="Allowed slowdown for one case.")
+    parser.add_argument("--bot-name", default=BENCHMARK_BOT_NAME, help="Bot (and DB schema) the benchmarks run as.")
+    args = parser.parse_args(argv)
+
+    names = [name for name in CASES if not args.filters or any(f in name for f in args.filters)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print(f"No benchmark matches {args.filters}. Use --list to see the cases.")
+        return 2
+
+    from jules_bot.utils.config_manager import config_manager
+    config_manager.bot_name = args.bot_name
+
+    document = run_suite(names, seed=args.seed, repeat=args.repeat)
+    print_results(document)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{document['commit']}{'-dirty' if document['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    exit_code = 1 if any(r["status"] == "error" for r in document["results"].values()) else 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        default_threshold, case_thresholds = load_thresholds(args.thresholds)
+        if args.threshold is not None:
+            default_threshold = args.threshold
+        case_thresholds.update(_parse_case_thresholds(args.case_threshold))
+        rows = compare(document, baseline, default_threshold, case_thresholds)
+        print_comparison(rows, baseline)
+        if any(row["status"] == "regression" for row in rows):
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+MINUTES_PER_DAY = 1440
+DEFAULT_SEED = 42
+DEFAULT_START = datetime(2024, 1, 1)
+DEFAULT_START_PRICE = 30000.0
+
+# Per-minute log-return volatility of the calm, normal and stressed segments.
+SEGMENT_VOLATILITIES = (0.0004, 0.0008, 0.0016)
+# Average length of a segment with constant drift and volatility (minutes).
+MEAN_SEGMENT_MINUTES = 6 * 60
+
+
+def generate_candles(days: int, seed: int = DEFAULT_SEED, start: Optional[datetime] = None,
+                     start_price: float = DEFAULT_START_PRICE) -> pd.DataFrame:
+    """
+    Returns `days` of synthetic 1m BTC-like candles shaped like `get_price_data`
+    output (timestamp index, OHLCV plus taker buy/sell volume).
+
+    Prices follow a geometric random walk split into segments with their own drift
+    and volatility, so the regime model sees trends, ranges and volatile stretches.
+    The same seed always produces the same candles.
+    """
+    rng = np.random.default_rng(seed)
+    minutes = days * MINUTES_PER_DAY
+
+    segment_lengths = rng.geometric(1 / MEAN_SEGMENT_MINUTES, size=minutes // 10 + 1)
+    segment_ids = np.repeat(np.arange(len(segment_lengths)), segment_lengths)[:minutes]
+    drift = rng.normal(0.0, 2e-5, size=len(segment_lengths))[segment_ids]
+    volatility = rng.choice(SEGMENT_VOLATILITIES, size=len(segment_lengths), p=(0.4, 0.45, 0.15))[segment_ids]
+
+    log_returns = drift + volatility * rng.standard_normal(minutes)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_ = np.r_[start_price, close[:-1]]
+    wick = np.abs(rng.normal(0.0, volatility / 2, size=(2, minutes)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+
+    volume = rng.lognormal(mean=1.0, sigma=0.5, size=minutes) * (volatility / SEGMENT_VOLATILITIES[0])
+    buy_share = rng.uniform(0.3, 0.7, size=minutes)
+
+    index = pd.date_range(start or DEFAULT_START, periods=minutes, freq="1min", name="timestamp")
+    return pd.DataFrame({
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+        "taker_buy_volume": volume * buy_share,
+        "taker_sell_volume": volume * (1 - buy_share),
+    }, index=index)
+
+
+def candles_ending_now(days: int, seed: int = DEFAULT_SEED) -> pd.DataFrame:
+    """The same candles, timestamped so the last one is the current minute (for '-Nd' DB queries)."""
+    end = datetime.utcnow().replace(second=0, microsecond=0)
+    return generate_candles(days, seed=seed, start=end - timedelta(minutes=days * MINUTES_PER_DAY - 1))
@@ -0,0 +1,87 @@
+import argparse
+import io
+import os
+import sys
+import zipfile
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+
+# Adiciona a raiz do projeto ao path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from jules_bot.backtesting.tick_replay import AggTradeStore
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+
+ARCHIVE_URL = "https://data.binance.vision/data/spot/daily/aggTrades/{symbol}/{symbol}-aggTrades-{day}.zip"
+# aggTrades CSV: agg_trade_id, price, quantity, first_trade_id, last_trade_id, transact_time, is_buyer_maker, is_best_match
+PRICE_COLUMN, TIME_COLUMN = 1, 5
+# Binance switched the spot archives from ms to µs timestamps; anything above this is µs.
+MICROSECOND_THRESHOLD = 10 ** 14
+
+
+def parse_agg_trades_csv(data) -> Tuple[np.ndarray, np.ndarray]:
+    """Reads an aggTrades CSV (with or without header) into (times in ns, prices)."""
+    frame = pd.read_csv(data, header=None, usecols=[PRICE_COLUMN, TIME_COLUMN])
+    if len(frame) and not str(frame.iloc[0, 0]).replace('.', '', 1).isdigit():
+        frame = frame.iloc[1:].apply(pd.to_numeric)
+    times = frame[TIME_COLUMN].to_numpy(dtype=np.int64)
+    prices = frame[PRICE_COLUMN].to_numpy(dtype=np.float64)
+    if len(times) and times.max() > MICROSECOND_THRESHOLD:
+        return times * 1_000, prices
+    return times * 1_000_000, prices
+
+
+class AggTradesCollector:
+    """Downloads Binance's public daily aggTrades archives into the tick replay store."""
+    def __init__(self, symbol: Optional[str] = None, root: Optional[str] = None):
+        self.symbol = symbol or config_manager.get('APP', 'symbol')
+        root = root or config_manager.get('DATA_PATHS', 'agg_trades_dir', fallback=None) or 'data/input/agg_trades'
+        self.store = AggTradeStore(root, self.symbol)
+
+    def collect_day(self, day: pd.Timestamp, overwrite: bool = False) -> bool:
+        path = self.store.path_for(day)
+        if path.exists() and not overwrite:
+            logger.info(f"aggTrades for {day.date()} already stored at {path}.")
+            return True
+        url = ARCHIVE_URL.format(symbol=self.symbol, day=f"{day:%Y-%m-%d}")
+        try:
+            response = requests.get(url, timeout=120)
+            response.raise_for_status()
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                with archive.open(archive.namelist()[0]) as csv_file:
+                    times_ns, prices = parse_agg_trades_csv(csv_file)
+            self.store.save_day(day, times_ns, prices)
+            logger.info(f"Stored {len(prices)} aggTrades for {day.date()} at {path}.")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to collect aggTrades for {day.date()} from {url}: {e}", exc_info=True)
+            return False
+
+    def collect(self, start: pd.Timestamp, end: pd.Timestamp, overwrite: bool = False) -> int:
+        """Collects every day in [start, end]; returns the number of days stored."""
+        stored = 0
+        for day in pd.date_range(start.normalize(), end.normalize(), freq='D'):
+            stored += self.collect_day(day, overwrite=overwrite)
+        return stored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Downloads daily aggTrades archives from data.binance.vision for tick replay backtests.")
+    parser.add_argument("--start-date", type=str, help="First day (YYYY-MM-DD). Default: yesterday.")
+    parser.add_argument("--end-date", type=str, help="Last day (YYYY-MM-DD). Default: the start date.")
+    parser.add_argument("--symbol", type=str, help="Symbol (default: [APP] symbol).")
+    parser.add_argument("--overwrite", action="store_true", help="Download days that are already stored again.")
+    args = parser.parse_args()
+
+    start = pd.Timestamp(args.start_date or (datetime.utcnow() - timedelta(days=1)).strftime('%Y-%m-%d'))
+    end = pd.Timestamp(args.end_date) if args.end_date else start
+    collector = AggTradesCollector(symbol=args.symbol)
+    days = collector.collect(start, end, overwrite=args.overwrite)
+    logger.info(f"aggTrades collection finished: {days} day(s) stored.")
@@ -19,6 +19,7 @@ from jules_bot.utils.config_manager import config_manager
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.utils.logger import logger
 from jules_bot.database.models import PriceHistory
+from jules_bot.core.request_governor import get_request_governor
 from sqlalchemy import desc
 
 class CorePriceCollector:
@@ -56,6 +57,7 @@ class CorePriceCollector:
                 return False
 
             client = Client(api_key, api_secret, tld='com', testnet=use_testnet)
+            get_request_governor().attach(client)
             client.ping()
             logger.info(f"Binance client initialized successfully in {mode} mode.")
             self.binance_client = client
@@ -77,6 +79,7 @@ class CorePriceCollector:
 
         logger.info(f"Preparing to write {len(df)} rows to PostgreSQL table '{self.measurement}'...")
         df['symbol'] = self.symbol
+        self.db_manager.ensure_price_history_partitions(df.index.min(), df.index.max())
 
         chunk_size = 50_000
         with self.db_manager.get_db() as db:
@@ -208,6 +211,7 @@ def prepare_backtest_data(days: int):
         # Aumentar o timeout para 30 segundos
         requests_params = {"timeout": 30}
         historical_client = Client(api_key="", api_secret="", requests_params=requests_params)
+        get_request_governor().attach(historical_client)
         historical_client.ping()
         online_mode = True
         logger.info("Live Binance client connected successfully.")
@@ -0,0 +1,542 @@
+"""
+Batched backtesting: K parameter sets simulated in lockstep over one pass of the candles.
+
+`Backtester.run` reads every candle, builds its price path and switches the
+regime parameters once per parameter set. `BatchBacktester` does that work once
+and advances K independent portfolios together, keeping their cash, positions,
+trailing-stop state and trade statistics in numpy arrays with one row per
+portfolio. It follows the same rules as the Backtester (the 4-point OHLC path,
+target and smart trailing sells, buy signals, sizing and difficulty) in float64
+instead of Decimal, so results match up to rounding.
+
+Each parameter set is a ConfigManager, as in `Backtester(config_manager=...)`.
+Nothing is written to the database: the summary is computed from the
+in-memory trade statistics and has the same keys as the Backtester's, without
+the trade list.
+"""
+import math
+from decimal import Decimal
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from jules_bot.core_logic.capital_manager import CapitalManager
+from jules_bot.core_logic.dynamic_parameters import DynamicParameters
+from jules_bot.core_logic.strategy_rules import StrategyRules
+from jules_bot.utils.logger import logger, log_profile
+from jules_bot.utils.profiling import timer
+
+# Open-position slots per portfolio; the arrays are compacted or doubled when a portfolio fills them.
+INITIAL_POSITION_SLOTS = 8
+# Same threshold as StrategyRules.evaluate_smart_trailing_stop for recording a new profit peak.
+PEAK_UPDATE_THRESHOLD = 0.005
+# Tolerance for the balance check of a sell, which is exact with Decimal but not with floats.
+QUANTITY_TOLERANCE = 1e-12
+
+
+def _decimal(value) -> Decimal:
+    return Decimal(repr(float(value)))
+
+
+class _ParameterSets:
+    """
+    The parameters of K configs as arrays: one entry per portfolio, or one row
+    per portfolio and one column per market regime for the regime parameters.
+    """
+    def __init__(self, config_managers: Sequence, regimes: np.ndarray):
+        from jules_bot.utils.config_manager import config_manager as global_config_manager
+
+        rows = []
+        regime_rows = []
+        for config in config_managers:
+            rules = StrategyRules(config)
+            capital = CapitalManager(config, rules)
+            dynamic = DynamicParameters(config)
+            rows.append({
+                'initial_balance': Decimal(config.get('BACKTEST', 'initial_balance') or '1000.0'),
+                'commission_rate': rules.commission_rate,
+                'sell_factor': rules.sell_factor,
+                'difficulty_adjustment_factor': rules.difficulty_adjustment_factor,
+                'fixed_trail_percentage': rules.fixed_trail_percentage,
+                'use_dynamic_trailing_stop': rules.use_dynamic_trailing_stop,
+                'dynamic_trail_min_pct': rules.dynamic_trail_min_pct,
+                'dynamic_trail_max_pct': rules.dynamic_trail_max_pct,
+                'dynamic_trail_profit_scaling': rules.dynamic_trail_profit_scaling,
+                'use_reversal_buy_strategy': rules.use_reversal_buy_strategy,
+                'min_trade_size': capital.min_trade_size,
+                'max_trade_size': capital.max_trade_size,
+                'aggressive_buy_multiplier': capital.aggressive_buy_multiplier,
+                'correction_entry_multiplier': capital.correction_entry_multiplier,
+                'order_size_percentage': capital.order_size_percentage,
+                'min_order_percentage': capital.min_order_percentage,
+                'max_order_percentage': capital.max_order_percentage,
+                'log_scaling_factor': capital.log_scaling_factor,
+                'max_open_positions': capital.max_open_positions,
+                'use_dynamic_capital': capital.use_dynamic_capital,
+                'use_percentage_sizing': capital.use_percentage_sizing,
+                'use_formula_sizing': capital.use_formula_sizing,
+                'working_capital_percentage': capital.working_capital_percentage,
+                'consecutive_buys_threshold': capital.consecutive_buys_threshold,
+                'difficulty_reset_seconds': capital.difficulty_reset_timeout_hours * 3600,
+                'base_difficulty_percentage': capital.base_difficulty_percentage,
+                'per_buy_difficulty_increment': capital.per_buy_difficulty_increment,
+            })
+            regime_parameters = []
+            for regime in regimes:
+                dynamic.update_parameters(int(regime))
+                regime_parameters.append(dynamic.parameters)
+            regime_rows.append(regime_parameters)
+
+        for name in rows[0]:
+            dtype = bool if isinstance(rows[0][name], bool) else float
+            setattr(self, name, np.array([float(row[name]) if dtype is float else row[name] for row in rows], dtype=dtype))
+        for name in ('buy_dip_percentage', 'sell_rise_percentage', 'order_size_usd', 'target_profit'):
+            setattr(self, name, np.array([[float(p[name]) for p in per_regime] for per_regime in regime_rows], dtype=float))
+
+        # MockTrader reads the slippage from the global config, whatever the parameter set.
+        self.slippage_rate = float(global_config_manager.get('BACKTEST', 'slippage_rate', fallback='0.0'))
+        self.break_even_factor = (1 + self.commission_rate) / (1 - self.commission_rate)
+
+
+class _PositionBook:
+    """
+    Open positions of every portfolio in (K, slots) arrays. A portfolio's
+    positions sit in buy order, like the Backtester's `open_positions` dict:
+    new positions take the slot after its last one, and sold slots are only
+    reclaimed by `_compact`, which keeps that order.
+    """
+    FIELDS = ('price', 'quantity', 'usd_value', 'commission_usd', 'sell_target_price', 'break_even_price',
+              'pnl_slope', 'pnl_offset', 'invested', 'highest_profit', 'trail_percentage', 'opened_at')
+
+    def __init__(self, size: int, slots: int = INITIAL_POSITION_SLOTS):
+        self.active = np.zeros((size, slots), dtype=bool)
+        # Smart trailing stop state; a trail percentage of 0 means "not set" (the fixed trail applies).
+        self.trailing = np.zeros((size, slots), dtype=bool)
+        for name in self.FIELDS:
+            setattr(self, name, np.zeros((size, slots)))
+        self.next_slot = np.zeros(size, dtype=np.int64)
+        self.count = np.zeros(size, dtype=np.int64)
+
+    @property
+    def used(self) -> int:
+        """Slots in use by at least one portfolio; later slots are empty everywhere."""
+        return int(self.next_slot.max())
+
+    def _compact(self):
+        order = np.argsort(~self.active, axis=1, kind='stable')
+        for name in ('active', 'trailing') + self.FIELDS:
+            setattr(self, name, np.take_along_axis(getattr(self, name), order, axis=1))
+        self.next_slot = self.count.copy()
+
+    def _grow(self):
+        extra = self.active.shape[1]
+        for name in ('active', 'trailing') + self.FIELDS:
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.zeros_like(array[:, :extra])], axis=1))
+
+    def open(self, rows: np.ndarray, **values):
+        if self.next_slot[rows].max() >= self.active.shape[1]:
+            self._compact()
+            if self.next_slot[rows].max() >= self.active.shape[1]:
+                self._grow()
+        slots = self.next_slot[rows]
+        self.active[rows, slots] = True
+        self.trailing[rows, slots] = False
+        self.highest_profit[rows, slots] = 0.0
+        self.trail_percentage[rows, slots] = 0.0
+        for name, value in values.items():
+            getattr(self, name)[rows, slots] = value
+        self.next_slot[rows] += 1
+        self.count[rows] += 1
+
+    def close(self, rows: np.ndarray, slot: int):
+        self.active[rows, slot] = False
+        self.count[rows] -= 1
+
+
+class _DifficultyStreaks:
+    """
+    The DifficultyTracker of every portfolio: the times of the buys since the
+    last sell, of which only those inside the reset window count.
+    """
+    def __init__(self, size: int, slots: int = INITIAL_POSITION_SLOTS):
+        self.buy_times = np.full((size, slots), np.nan)
+        self.length = np.zeros(size, dtype=np.int64)
+        self.last_trade_time = np.full(size, np.nan)
+
+    def consecutive_buys(self, cutoff: np.ndarray) -> np.ndarray:
+        return (self.buy_times >= cutoff[:, None]).sum(axis=1)
+
+    def record_buys(self, rows: np.ndarray, now: float, cutoff: np.ndarray):
+        if self.length[rows].max() >= self.buy_times.shape[1]:
+            # Buys older than the window never count again, so they are dropped before growing.
+            stale = self.buy_times < cutoff[:, None]
+            self.buy_times[stale] = np.nan
+            order = np.argsort(np.isnan(self.buy_times), axis=1, kind='stable')
+            self.buy_times = np.take_along_axis(self.buy_times, order, axis=1)
+            self.length = (~np.isnan(self.buy_times)).sum(axis=1)
+            if self.length[rows].max() >= self.buy_times.shape[1]:
+                self.buy_times = np.concatenate([self.buy_times, np.full_like(self.buy_times, np.nan)], axis=1)
+        self.buy_times[rows, self.length[rows]] = now
+        self.length[rows] += 1
+        self.last_trade_time[rows] = now
+
+    def record_sells(self, rows: np.ndarray, now: float):
+        self.buy_times[rows] = np.nan
+        self.length[rows] = 0
+        self.last_trade_time[rows] = now
+
+
+class _TradeStats:
+    """Running per-portfolio totals for the trade analysis of the summary."""
+    FIELDS = ('buy_count', 'sell_count', 'total_fees', 'total_realized_pnl', 'win_count', 'loss_count',
+              'gross_profit', 'gross_loss', 'gain_pct_sum', 'gain_pct_count', 'loss_pct_sum', 'loss_pct_count',
+              'duration_sum')
+
+    def __init__(self, size: int):
+        for name in self.FIELDS:
+            setattr(self, name, np.zeros(size))
+
+
+class BatchBacktester:
+    """
+    Runs K parameter sets over the same feature data (as prepared for the
+    Backtester, with 'market_regime') and returns one summary per set.
+    """
+    def __init__(self, data: pd.DataFrame, config_managers: Sequence, log_profile: str = "simulation"):
+        if not config_managers:
+            raise ValueError("BatchBacktester needs at least one parameter set.")
+        self.feature_data = data
+        self.config_managers = list(config_managers)
+        self.size = len(self.config_managers)
+        self.log_profile = log_profile
+
+    def run(self) -> List[dict]:
+        with log_profile(self.log_profile), timer("backtest.batch"):
+            return self._run()
+
+    def _column(self, name: str) -> np.ndarray:
+        if name in self.feature_data.columns:
+            return self.feature_data[name].to_numpy(dtype=float)
+        # Missing indicators behave like the Backtester's "Not enough indicator data": no buys.
+        return np.full(len(self.feature_data), np.nan)
+
+    def _run(self) -> List[dict]:
+        data = self.feature_data
+        logger.info(f"--- Starting batched backtest of {self.size} parameter sets over {len(data)} candles ---")
+
+        if 'market_regime' in data.columns:
+            regimes = data['market_regime'].fillna(-1).to_numpy(dtype=np.int64)
+        else:
+            regimes = np.full(len(data), -1, dtype=np.int64)
+        regime_values, regime_columns = np.unique(regimes, return_inverse=True)
+        if len(regime_values) == 0:
+            regime_values = np.array([-1])
+        params = _ParameterSets(self.config_managers, regime_values)
+
+        opens, highs, lows, closes = (self._column(name) for name in ('open', 'high', 'low', 'close'))
+        ema_100, ema_20 = self._column('ema_100'), self._column('ema_20')
+        if len(data):
+            seconds = ((data.index - data.index[0]) / pd.Timedelta(seconds=1)).to_numpy(dtype=float)
+        else:
+            seconds = np.zeros(0)
+
+        self.params = params
+        self.usd_balance = params.initial_balance.copy()
+        self.btc_balance = np.zeros(self.size)
+        self.positions = _PositionBook(self.size)
+        self.streaks = _DifficultyStreaks(self.size)
+        self.stats = _TradeStats(self.size)
+        track_difficulty = bool(params.use_dynamic_capital.any())
+
+        # Only the running peak, the worst drawdown and the last value of each day are
+        # needed for the risk metrics, so no per-candle history is kept.
+        peak_value = np.full(self.size, -np.inf)
+        max_drawdown = np.zeros(self.size)
+        days = data.index.floor('D') if len(data) else pd.DatetimeIndex([])
+        day_range = pd.date_range(days[0], days[-1], freq='D') if len(days) else pd.DatetimeIndex([])
+        day_positions = day_range.get_indexer(days)
+        last_of_day = np.r_[day_positions[1:] != day_positions[:-1], True] if len(days) else np.zeros(0, dtype=bool)
+        daily_values = np.full((len(day_range), self.size), np.nan)
+
+        portfolio_value = self.usd_balance.copy()
+        for i in range(len(data)):
+            open_price, high_price, low_price, close_price = opens[i], highs[i], lows[i], closes[i]
+            if close_price >= open_price:
+                price_path = (open_price, low_price, high_price, close_price)
+            else:
+                price_path = (open_price, high_price, low_price, close_price)
+            column = regime_columns[i]
+            now = seconds[i]
+
+            for price in price_path:
+                if self.positions.count.any():
+                    self._process_sells(price, column, now, track_difficulty)
+                # Like the Backtester, buys are evaluated at every point equal to the close.
+                if price == close_price:
+                    self._process_buys(price, high_price, ema_100[i], ema_20[i], column, now, track_difficulty)
+
+            portfolio_value = self.usd_balance + self.btc_balance * close_price
+            np.maximum(peak_value, portfolio_value, out=peak_value)
+            np.minimum(max_drawdown, (portfolio_value - peak_value) / peak_value, out=max_drawdown)
+            if last_of_day[i]:
+                daily_values[day_positions[i]] = portfolio_value
+
+        results = self._summaries(portfolio_value, np.abs(max_drawdown), daily_values, day_range, len(data))
+        logger.info(f"--- Batched backtest of {self.size} parameter sets finished ---")
+        return results
+
+    def _process_sells(self, price: float, column: int, now: float, track_difficulty: bool):
+        """Evaluates every open position at `price` and executes the sells in buy order."""
+        params, book = self.params, self.positions
+        used = book.used
+        active = book.active[:, :used]
+        trailing = book.trailing[:, :used]
+
+        # Net unrealized PnL as in StrategyRules: (price - entry) * qty - buy fee - estimated sell fee.
+        net_pnl = price * book.pnl_slope[:, :used] - book.pnl_offset[:, :used]
+        target_hit = active & (price >= book.sell_target_price[:, :used])
+        pending = active & ~target_hit
+        activate = pending & ~trailing & (net_pnl >= params.target_profit[:, column][:, None])
+        watched = pending & trailing
+        if not (watched.any() or activate.any() or target_hit.any()):
+            return
+
+        stored_peak = book.highest_profit[:, :used]
+        trail_percentage = book.trail_percentage[:, :used]
+        deactivate = watched & (net_pnl < 0)
+        watched &= ~deactivate
+
+        highest = np.maximum(stored_peak, net_pnl)
+        current_trail = np.where(trail_percentage > 0, trail_percentage, params.fixed_trail_percentage[:, None])
+        update_peak = watched & (highest > stored_peak) & (
+            (stored_peak <= 0) | (highest - stored_peak > stored_peak * PEAK_UPDATE_THRESHOLD))
+        widen_trail = update_peak & params.use_dynamic_trailing_stop[:, None]
+        if widen_trail.any():
+            # StrategyRules._calculate_dynamic_trail_percentage: the trail widens with the peak profit.
+            invested = book.invested[:, :used]
+            profit_share = np.divide(highest, invested, out=np.zeros_like(highest), where=invested > 0)
+            dynamic_trail = np.clip(params.dynamic_trail_min_pct[:, None] + profit_share * params.dynamic_trail_profit_scaling[:, None],
+                                    None, params.dynamic_trail_max_pct[:, None])
+            dynamic_trail = np.maximum(params.dynamic_trail_min_pct[:, None], dynamic_trail)
+            widen_trail &= dynamic_trail > current_trail
+            trail_to_use = np.where(widen_trail, dynamic_trail, current_trail)
+        else:
+            dynamic_trail = current_trail
+            trail_to_use = current_trail
+        stop_triggered = watched & (net_pnl <= highest * (1 - trail_to_use))
+        update_peak &= ~stop_triggered
+        widen_trail &= ~stop_triggered
+
+        above_break_even = price > book.break_even_price[:, :used]
+        stop_sell = stop_triggered & above_break_even
+        # A trailing stop below break-even is dropped instead of selling at a loss.
+        reset = deactivate | (stop_triggered & ~above_break_even)
+
+        trailing |= activate
+        np.copyto(stored_peak, net_pnl, where=activate | update_peak)
+        np.copyto(trail_percentage, dynamic_trail, where=widen_trail)
+        trailing &= ~reset
+        np.copyto(stored_peak, 0.0, where=reset)
+        np.copyto(trail_percentage, 0.0, where=deactivate)
+
+        to_sell = target_hit | stop_sell
+        if not to_sell.any():
+            return
+        # Sells run one slot at a time, in buy order, since each one changes the BTC balance.
+        for slot in np.flatnonzero(to_sell.any(axis=0)):
+            rows = np.flatnonzero(to_sell[:, slot])
+            self._execute_sells(rows, slot, price, now, track_difficulty)
+
+    def _execute_sells(self, rows: np.ndarray, slot: int, price: float, now: float, track_difficulty: bool):
+        params, book, stats = self.params, self.positions, self.stats
+        sell_quantity = book.quantity[rows, slot] * params.sell_factor[rows]
+        funded = self.btc_balance[rows] + QUANTITY_TOLERANCE >= sell_quantity
+        rows, sell_quantity = rows[funded], sell_quantity[funded]
+        if len(rows) == 0:
+            return
+
+        execution_price = price * (1 - params.slippage_rate)
+        usd_value = sell_quantity * execution_price
+        commission = usd_value * params.commission_rate[rows]
+        self.btc_balance[rows] = np.maximum(self.btc_balance[rows] - sell_quantity, 0.0)
+        self.usd_balance[rows] += usd_value - commission
+
+        buy_quantity = book.quantity[rows, slot]
+        realized_pnl = ((execution_price - book.price[rows, slot]) * sell_quantity
+                        - book.commission_usd[rows, slot] * sell_quantity / buy_quantity - commission)
+        cost = book.usd_value[rows, slot]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pnl_pct = np.where(cost > 0, realized_pnl / cost * 100, 0.0)
+
+        stats.sell_count[rows] += 1
+        stats.total_fees[rows] += commission
+        stats.total_realized_pnl[rows] += realized_pnl
+        stats.win_count[rows] += realized_pnl > 0
+        stats.loss_count[rows] += realized_pnl < 0
+        stats.gross_profit[rows] += np.where(realized_pnl > 0, realized_pnl, 0.0)
+        stats.gross_loss[rows] += np.where(realized_pnl < 0, -realized_pnl, 0.0)
+        stats.gain_pct_sum[rows] += np.where(pnl_pct > 0, pnl_pct, 0.0)
+        stats.gain_pct_count[rows] += pnl_pct > 0
+        stats.loss_pct_sum[rows] += np.where(pnl_pct < 0, pnl_pct, 0.0)
+        stats.loss_pct_count[rows] += pnl_pct < 0
+        stats.duration_sum[rows] += now - book.opened_at[rows, slot]
+
+        book.close(rows, slot)
+        if track_difficulty:
+            self.streaks.record_sells(rows, now)
+
+    def _difficulty_factors(self, now: float, track_difficulty: bool) -> np.ndarray:
+        if not track_difficulty:
+            return np.zeros(self.size)
+        params, streaks = self.params, self.streaks
+        cutoff = now - params.difficulty_reset_seconds
+        consecutive = streaks.consecutive_buys(cutoff)
+        applies = (params.use_dynamic_capital & (streaks.last_trade_time >= cutoff)
+                   & (consecutive >= params.consecutive_buys_threshold))
+        factors = params.base_difficulty_percentage + (consecutive - params.consecutive_buys_threshold) * params.per_buy_difficulty_increment
+        return np.where(applies, factors, 0.0)
+
+    def _process_buys(self, price: float, high_price: float, ema_100: float, ema_20: float, column: int,
+                      now: float, track_difficulty: bool):
+        """CapitalManager.get_buy_order_details and the Backtester's buy, for every portfolio at once."""
+        params, book = self.params, self.positions
+        open_count = book.count
+        difficulty = self._difficulty_factors(now, track_difficulty)
+
+        # --- StrategyRules.evaluate_buy_signal (NaN indicators never signal) ---
+        dip = params.buy_dip_percentage[:, column] + difficulty * params.difficulty_adjustment_factor
+        dip_hit = price <= ema_20 * (1 - dip)
+        first_entry = open_count == 0
+        if price > ema_100:
+            primary = np.where(first_entry, price > ema_20, (high_price > ema_20) and (price < ema_20))
+            # With the reversal strategy a dip only starts monitoring, which never buys in a backtest.
+            uptrend = primary | (~primary & dip_hit & ~params.use_reversal_buy_strategy)
+            downtrend = np.zeros(self.size, dtype=bool)
+        else:
+            uptrend = np.zeros(self.size, dtype=bool)
+            downtrend = dip_hit
+
+        allowed = params.use_dynamic_capital | (open_count < params.max_open_positions)
+        signal = allowed & (uptrend | downtrend)
+        if not signal.any():
+            return
+
+        # --- Operating mode and sizing ---
+        multiplier = np.where(uptrend & (open_count < params.max_open_positions / 4), params.aggressive_buy_multiplier,
+                              np.where(downtrend & first_entry, params.correction_entry_multiplier, 1.0))
+        cash = self.usd_balance
+        working_capital = cash * params.working_capital_percentage
+        portfolio_value = cash + self.btc_balance * price
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_value = np.where(portfolio_value > 100, np.log10(np.maximum(portfolio_value, 1e-12) / 100), 0.0)
+        formula_percentage = np.maximum(params.min_order_percentage,
+                                        np.minimum(params.min_order_percentage + log_value * params.log_scaling_factor,
+                                                   params.max_order_percentage))
+        formula_percentage = np.where(portfolio_value > 1, formula_percentage, params.min_order_percentage)
+        base_amount = np.where(
+            params.use_formula_sizing, np.maximum(working_capital * formula_percentage, params.min_trade_size),
+            np.where(params.use_percentage_sizing, np.maximum(working_capital * params.order_size_percentage, params.min_trade_size),
+                     params.order_size_usd[:, column]))
+
+        amount = np.minimum(base_amount * multiplier, params.max_trade_size)
+        amount = np.where(difficulty > 0, amount * (1 - difficulty), amount)
+        affordable = (amount <= working_capital) & (amount >= params.min_trade_size)
+        amount = np.round(amount, 2)
+
+        # --- MockTrader.execute_buy ---
+        execution_price = price * (1 + params.slippage_rate)
+        commission = amount * params.commission_rate
+        buy = signal & affordable & (amount > 0) & (cash >= params.min_trade_size) & (cash >= amount + commission)
+        if not buy.any():
+            return
+        rows = np.flatnonzero(buy)
+        quantity = amount[rows] / execution_price
+        self.usd_balance[rows] -= amount[rows] + commission[rows]
+        self.btc_balance[rows] += quantity
+
+        break_even = execution_price * params.break_even_factor[rows]
+        invested = execution_price * quantity
+        book.open(rows, price=execution_price, quantity=quantity, usd_value=amount[rows], commission_usd=commission[rows],
+                  sell_target_price=break_even * (1 + params.sell_rise_percentage[rows, column]), break_even_price=break_even,
+                  pnl_slope=quantity * (1 - params.commission_rate[rows]), pnl_offset=invested + commission[rows],
+                  invested=invested, opened_at=now)
+        self.stats.buy_count[rows] += 1
+        self.stats.total_fees[rows] += commission[rows]
+        if track_difficulty:
+            self.streaks.record_buys(rows, now, now - params.difficulty_reset_seconds)
+
+    def _summaries(self, final_values: np.ndarray, max_drawdowns: np.ndarray, daily_values: np.ndarray,
+                   day_range: pd.DatetimeIndex, candles: int) -> List[dict]:
+        """The Backtester's summary metrics for every portfolio."""
+        params, stats, book = self.params, self.stats, self.positions
+        daily_returns = pd.DataFrame(daily_values, index=day_range).pct_change().dropna()
+        index = self.feature_data.index
+        total_days = (index[-1] - index[0]).days if candles else 0
+        open_cost = np.where(book.active, book.usd_value, 0.0).sum(axis=1)
+
+        results = []
+        for k in range(self.size):
+            initial_balance = Decimal(repr(float(params.initial_balance[k])))
+            final_balance = _decimal(final_values[k])
+            final_cash = _decimal(self.usd_balance[k])
+            net_pnl = final_balance - initial_balance
+            sell_count = int(stats.sell_count[k])
+
+            profit_factor = Decimal(0)
+            win_rate = avg_gain_pct = avg_loss_pct = Decimal(0)
+            average_duration = 0.0
+            if sell_count:
+                win_rate = Decimal(int(stats.win_count[k])) / Decimal(sell_count) * 100
+                gross_loss = stats.gross_loss[k]
+                profit_factor = _decimal(stats.gross_profit[k] / gross_loss) if gross_loss > 0 else Decimal('inf')
+                if stats.gain_pct_count[k]:
+                    avg_gain_pct = _decimal(stats.gain_pct_sum[k] / stats.gain_pct_count[k])
+                if stats.loss_pct_count[k]:
+                    avg_loss_pct = abs(_decimal(stats.loss_pct_sum[k] / stats.loss_pct_count[k]))
+                average_duration = stats.duration_sum[k] / sell_count
+
+            max_drawdown = sharpe_ratio = sortino_ratio = calmar_ratio = Decimal(0)
+            if candles > 1:
+                max_drawdown = _decimal(max_drawdowns[k])
+                returns = daily_returns[k]
+                if not returns.empty:
+                    std_dev = returns.std()
+                    if std_dev != 0:
+                        sharpe_ratio = _decimal(np.sqrt(365) * returns.mean() / std_dev)
+                    downside_returns = returns[returns < 0]
+                    if not downside_returns.empty:
+                        downside_std = downside_returns.std()
+                        if downside_std != 0 and not np.isnan(downside_std):
+                            sortino_ratio = _decimal(np.sqrt(365) * returns.mean() / downside_std)
+                if max_drawdown > 0 and total_days > 0 and final_values[k] > 0:
+                    annualized_return = math.pow(final_values[k] / float(initial_balance), 365.0 / total_days) - 1
+                    calmar_ratio = _decimal(annualized_return) / max_drawdown
+
+            open_positions_value = final_balance - final_cash
+            results.append({
+                "initial_balance": initial_balance,
+                "final_balance": final_balance,
+                "final_cash_balance": final_cash,
+                "final_open_positions_value": open_positions_value,
+                "unrealized_pnl": open_positions_value - _decimal(open_cost[k]),
+                "net_pnl_usd": net_pnl,
+                "net_pnl_pct": (net_pnl / initial_balance) * 100 if initial_balance > 0 else Decimal(0),
+                "total_realized_pnl": _decimal(stats.total_realized_pnl[k]),
+                "buy_trades_count": int(stats.buy_count[k]),
+                "sell_trades_count": sell_count,
+                "open_positions_count": int(book.count[k]),
+                "win_rate": win_rate,
+                "profit_factor": profit_factor,
+                "avg_gain_pct": avg_gain_pct,
+                "avg_loss_pct": avg_loss_pct,
+                "avg_trade_duration_seconds": average_duration,
+                "total_fees_usd": _decimal(stats.total_fees[k]),
+                "max_drawdown": max_drawdown,
+                "sharpe_ratio": sharpe_ratio,
+                "sortino_ratio": sortino_ratio,
+                "calmar_ratio": calmar_ratio,
+            })
+        return results
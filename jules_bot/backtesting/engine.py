@@ -7,6 +7,7 @@ try:
 except ImportError:
     optuna = None
 import os
+import time
 from datetime import timedelta
 from decimal import Decimal, getcontext
 from jules_bot.core.mock_exchange import MockTrader
@@ -20,10 +21,19 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
-from jules_bot.utils.logger import logger
+from jules_bot.utils.logger import logger, log_profile
+from jules_bot.utils.profiling import get_profiler, timer
 from jules_bot.core.schemas import TradePoint
+from jules_bot.database.models import serialize_trade_value
 from jules_bot.research.feature_engineering import add_all_features
+from jules_bot.research.feature_dtypes import apply_dtype_policy
 from jules_bot.services.trade_logger import TradeLogger
+from jules_bot.backtesting.equity import EquityCurve
+from jules_bot.backtesting.event_skipping import EventSkipper, combined_band
+from jules_bot.backtesting.streaming import iter_feature_chunks, DEFAULT_CHUNK_DAYS, DEFAULT_WARMUP_DAYS
+from jules_bot.backtesting.tick_replay import (
+    CANDLE_INTERVAL, AggTradeStore, buy_target, level_in_range, position_levels, replay_path,
+)
 
 getcontext().prec = 28
 
@@ -37,8 +47,38 @@ class BacktestTrade:
     def to_dict(self):
         return self.__dict__
 
+def _serialize_trade_records(trades_df: pd.DataFrame) -> list:
+    """The trade rows as Trade.to_dict() returns them: ISO timestamps, str Decimals and None for NULLs."""
+    records = []
+    for record in trades_df.to_dict('records'):
+        records.append({
+            key: None if value is None or (not isinstance(value, (dict, list)) and pd.isna(value)) else serialize_trade_value(value)
+            for key, value in record.items()
+        })
+    return records
+
+class _RunState:
+    """Simulation state that carries over from one chunk of candles to the next."""
+    def __init__(self, equity: EquityCurve):
+        self.open_positions = {}
+        self.pending_trades = []
+        self.equity = equity
+        self.candles = 0
+        self.replayed_candles = 0
+        self.skipped_candles = 0
+        self.current_regime = None
+        self.current_params = None
+
 class Backtester:
-    def __init__(self, db_manager: PostgresManager, days: int = None, start_date: str = None, end_date: str = None, config_manager=None, data: pd.DataFrame = None):
+    def __init__(self, db_manager: PostgresManager, days: int = None, start_date: str = None, end_date: str = None, config_manager=None, data: pd.DataFrame = None,
+                 log_profile: str = "simulation", stream: bool = False, chunk_days: int = None, warmup_days: int = None,
+                 equity_downsample: int = None, tick_replay: bool = None, event_skipping: bool = None):
+        # Logging profile applied while `run` executes; 'simulation' silences per-candle and per-trade logs.
+        self.log_profile = log_profile
+        # With `stream`, candles and features are read chunk by chunk during `run` instead of up front.
+        self.stream = stream and data is None
+        self.feature_data = None
+        self.equity_curve = None
         if config_manager is None:
             from jules_bot.utils.config_manager import config_manager as global_config_manager
             config_manager = global_config_manager
@@ -66,20 +106,52 @@ class Backtester:
                 raise ValueError("Backtester must be initialized with 'days' or 'start_date'/'end_date' if no data is provided.")
 
             logger.info(log_msg)
-            price_data = self.db_manager.get_price_data(measurement=symbol, start_date=self.start_date_str, end_date=self.end_date_str)
-            if price_data.empty:
-                raise ValueError("No price data found for the specified period. Cannot run backtest.")
-
-            logger.info("Calculating features for the entire backtest period...")
-            features = add_all_features(price_data, live_mode=False).dropna()
-            logger.info("Feature calculation complete.")
-
-            logger.info("Initializing the Situational Awareness model...")
-            sa_model = SituationalAwareness()
-            self.feature_data = sa_model.transform(features)
-            logger.info("Market regimes calculated for the entire backtest period.")
+            if self.stream:
+                # Naive UTC bounds, like the candle store's timestamps.
+                if days:
+                    self.stream_end = pd.Timestamp.now(tz='UTC').tz_localize(None)
+                    self.stream_start = self.stream_end - pd.Timedelta(days=days)
+                else:
+                    self.stream_start = pd.Timestamp(start_date)
+                    self.stream_end = pd.Timestamp(end_date) + pd.Timedelta(hours=23, minutes=59, seconds=59)
+                self.chunk_days = chunk_days or int(config_manager.get('BACKTEST', 'stream_chunk_days', fallback=DEFAULT_CHUNK_DAYS))
+                self.warmup_days = warmup_days if warmup_days is not None else \
+                    int(config_manager.get('BACKTEST', 'stream_warmup_days', fallback=DEFAULT_WARMUP_DAYS))
+                logger.info(f"Streaming mode: {self.chunk_days}-day chunks with {self.warmup_days} days of indicator warm-up.")
+            else:
+                with timer("backtest.load_data"):
+                    price_data = self.db_manager.get_price_data(measurement=symbol, start_date=self.start_date_str, end_date=self.end_date_str)
+                if price_data.empty:
+                    raise ValueError("No price data found for the specified period. Cannot run backtest.")
+
+                # The price data is ours, so each stage writes into it instead of copying.
+                logger.info("Calculating features for the entire backtest period...")
+                with timer("backtest.features"):
+                    features = add_all_features(price_data, live_mode=False, inplace=True).dropna()
+                logger.info("Feature calculation complete.")
+
+                logger.info("Initializing the Situational Awareness model...")
+                sa_model = SituationalAwareness()
+                with timer("backtest.regime"):
+                    self.feature_data = apply_dtype_policy(sa_model.transform(features, inplace=True))
+                logger.info("Market regimes calculated for the entire backtest period.")
 
         # Common initialization logic
+        self.symbol = symbol
+        # Portfolio value is stored for every Nth candle; drawdown and daily returns still see every candle.
+        self.equity_downsample = equity_downsample or int(config_manager.get('BACKTEST', 'equity_downsample', fallback='1'))
+        # Optional aggTrades replay for candles with a decision level inside their range.
+        if tick_replay is None:
+            tick_replay = str(config_manager.get('BACKTEST', 'tick_replay', fallback='false')).lower() == 'true'
+        self.tick_store = None
+        if tick_replay:
+            agg_trades_dir = config_manager.get('DATA_PATHS', 'agg_trades_dir', fallback=None) or 'data/input/agg_trades'
+            self.tick_store = AggTradeStore(agg_trades_dir, symbol)
+            logger.info(f"Tick replay enabled with aggTrades from '{agg_trades_dir}'.")
+        # Candles that cannot change any decision are skipped in runs (see event_skipping.py).
+        if event_skipping is None:
+            event_skipping = str(config_manager.get('BACKTEST', 'event_skipping', fallback='false')).lower() == 'true'
+        self.event_skipping = event_skipping
         initial_balance_str = config_manager.get('BACKTEST', 'initial_balance') or '1000.0'
         commission_fee_str = config_manager.get('STRATEGY_RULES', 'commission_rate') or '0.001'
         self.mock_trader = MockTrader(
@@ -91,22 +163,100 @@ class Backtester:
         self.capital_manager = CapitalManager(config_manager, self.strategy_rules, db_manager=self.db_manager)
         self.dynamic_params = DynamicParameters(config_manager)
 
+    def _regime_boundaries(self, frame: pd.DataFrame = None) -> tuple:
+        """
+        Returns the per-candle regime of `frame` (the feature data by default) as an
+        int array and the set of candle positions where it differs from the previous
+        candle (always including 0).
+        """
+        if frame is None:
+            frame = self.feature_data
+        if 'market_regime' in frame.columns:
+            regimes = frame['market_regime'].fillna(-1).to_numpy(dtype=np.int64)
+        else:
+            regimes = np.full(len(frame), -1, dtype=np.int64)
+        if len(regimes) == 0:
+            return regimes, set()
+        changes = np.flatnonzero(np.r_[True, regimes[1:] != regimes[:-1]])
+        return regimes, set(changes.tolist())
+
     def run(self, trial: 'optuna.Trial' = None, return_full_results: bool = False):
+        with log_profile(self.log_profile), timer("backtest.run"):
+            return self._run(trial=trial, return_full_results=return_full_results)
+
+    def _run(self, trial: 'optuna.Trial' = None, return_full_results: bool = False):
         logger.info(f"--- Starting backtest run {self.run_id} ---")
 
+        state = _RunState(EquityCurve(downsample=self.equity_downsample))
+        self.equity_curve = state.equity
+        self.capital_manager.difficulty_tracker.reset()
+        profiler = get_profiler()
+
+        if self.stream:
+            chunks = iter_feature_chunks(
+                self.db_manager, self.symbol, self.stream_start, self.stream_end,
+                chunk=timedelta(days=self.chunk_days), warmup=timedelta(days=self.warmup_days),
+            )
+            for frame in chunks:
+                self._simulate(frame, state, trial)
+                # Trades are written per chunk so they don't pile up in memory; a sell
+                # updates its buy row, which an earlier chunk has already written.
+                with profiler.timer("backtest.log_trades"):
+                    self._log_trades_to_db(state.pending_trades)
+                state.pending_trades = []
+            if len(state.equity) == 0:
+                raise ValueError("No price data found for the specified period. Cannot run backtest.")
+        else:
+            self._simulate(self.feature_data, state, trial)
+            with profiler.timer("backtest.log_trades"):
+                self._log_trades_to_db(state.pending_trades)
+
+        if self.tick_store is not None:
+            logger.info(f"Tick replay: {state.replayed_candles} of {state.candles} candles replayed from aggTrades.")
+        if self.event_skipping:
+            logger.info(f"Event skipping: {state.skipped_candles} of {state.candles} candles skipped.")
+
+        with profiler.timer("backtest.summary"):
+            results = self._generate_and_save_summary(state.open_positions, state.equity)
+        logger.info(f"--- Backtest {self.run_id} finished ---")
+
+        if return_full_results:
+            return results
+        else:
+            # For backward compatibility with the old optimizer, return only the final balance as a float.
+            final_balance = results.get("final_balance", Decimal("0.0"))
+            return float(final_balance)
+
+    def _simulate(self, frame: pd.DataFrame, state: _RunState, trial: 'optuna.Trial' = None):
+        """Runs the candle loop over `frame`, continuing from (and updating) `state`."""
         strategy_rules = self.strategy_rules
         symbol = config_manager.get('APP', 'symbol')
         strategy_name = config_manager.get('APP', 'strategy_name', fallback='default_strategy')
         min_trade_size = Decimal(config_manager.get('TRADING_STRATEGY', 'min_trade_size_usdt', fallback='10.0'))
 
-        open_positions = {}
-        portfolio_history = []
-        all_trades_for_run = []
+        open_positions = state.open_positions
+        all_trades_for_run = state.pending_trades
 
         # Define a pruning frequency to avoid checking on every single candle
         pruning_frequency = 1000  # Check every 1000 candles (approx. 16 hours of 1m data)
 
-        for i, (current_time, candle) in enumerate(self.feature_data.iterrows()):
+        # Regimes come in long runs, so parameters are only switched where the regime changes.
+        regimes, regime_changes = self._regime_boundaries(frame)
+        current_regime = state.current_regime
+        current_params = state.current_params
+
+        # Between candles that can change state, only the portfolio value is recorded.
+        skipper = EventSkipper(frame, intrabar_buys=self.tick_store is not None) if self.event_skipping else None
+        change_positions = np.array(sorted(regime_changes), dtype=np.int64)
+        index = frame.index
+        candle_count = len(frame)
+
+        # The candle loop is timed as one phase; per-candle timers would cost more than they show.
+        profiler = get_profiler()
+        simulate_started = time.perf_counter()
+        i = 0
+        while i < candle_count:
+            current_time, candle = index[i], frame.iloc[i]
             # --- High-Fidelity OHLC Simulation ---
             # Instead of just using the 'close' price, we simulate the price movement
             # within the candle to catch trailing stops and other price-sensitive triggers.
@@ -122,12 +272,31 @@ class Backtester:
                 price_path = [open_price, high_price, low_price, close_price]
 
             # The regime and parameters are constant for the duration of the candle
-            current_regime = candle.get('market_regime', -1)
-            self.dynamic_params.update_parameters(int(current_regime))
-            current_params = self.dynamic_params.parameters
+            if i in regime_changes:
+                current_regime = int(regimes[i])
+                self.dynamic_params.update_parameters(current_regime)
+                current_params = self.dynamic_params.parameters
+
+            # --- Tick replay ---
+            # When a sell/trailing level or the buy target lies inside the candle's range, the
+            # OHLC path can misorder triggers and fill at the extremes, so the candle's aggTrades
+            # are replayed instead. Buys are then checked at the first trade at the buy target
+            # and at the close, at most one per candle.
+            buy_points = intrabar = None
+            if self.tick_store is not None:
+                target = buy_target(candle, current_params)
+                levels = [target]
+                for position in open_positions.values():
+                    levels.extend(position_levels(position, strategy_rules, current_params))
+                if level_in_range(levels, low_price, high_price):
+                    trade_prices = self.tick_store.prices(current_time, current_time + CANDLE_INTERVAL)
+                    if trade_prices is not None and len(trade_prices):
+                        price_path, buy_points, intrabar = replay_path(trade_prices, close_price, target)
+                        state.replayed_candles += 1
+            bought_in_candle = False
 
             # --- Loop through the simulated price path for the current candle ---
-            for current_price in price_path:
+            for point, current_price in enumerate(price_path):
                 self.mock_trader.set_current_time_and_price(current_time, current_price)
 
                 # --- SELL LOGIC ---
@@ -198,32 +367,35 @@ class Backtester:
                                 'commission_usd': sell_result.get('commission_usd', Decimal('0')), 'realized_pnl_usd': realized_pnl_usd
                             }
                             all_trades_for_run.append(BacktestTrade(**trade_data))
+                            self.capital_manager.difficulty_tracker.record_trade("sell", current_time)
                             del open_positions[trade_id]
 
                 # --- BUY LOGIC ---
                 # The buy logic should only be evaluated ONCE per candle, typically based on the final state (close price).
                 # Running it on every price tick would be unrealistic and could lead to multiple buys in one minute.
-                if current_price != close_price:
+                if buy_points is None:
+                    if current_price != close_price:
+                        continue
+                elif bought_in_candle or point not in buy_points:
                     continue
 
                 cash_balance = self.mock_trader.get_account_balance()
                 total_portfolio_value = self.mock_trader.get_total_portfolio_value()
 
                 market_data = candle.to_dict()
-                timeout_hours = self.capital_manager.difficulty_reset_timeout_hours
-                start_date_for_difficulty = current_time - timedelta(hours=timeout_hours)
-
-                recent_trades_for_difficulty = [t for t in all_trades_for_run if t.timestamp and t.timestamp >= start_date_for_difficulty]
+                if intrabar and point in intrabar:
+                    market_data.update(intrabar[point])
 
+                # The difficulty factor comes from the capital manager's streak tracker,
+                # which is fed every buy and sell below instead of rescanning the run's trades.
                 buy_amount_usdt, op_mode, reason, _, diff_factor = self.capital_manager.get_buy_order_details(
                     market_data=market_data, open_positions=list(open_positions.values()),
                     portfolio_value=total_portfolio_value, free_cash=cash_balance,
-                    params=current_params, trade_history=recent_trades_for_difficulty,
-                    current_time=current_time
+                    params=current_params, current_time=current_time
                 )
 
                 if buy_amount_usdt > 0 and cash_balance >= min_trade_size:
-                    decision_context_buy = {**candle.to_dict(), 'operating_mode': op_mode, 'buy_trigger_reason': reason, 'market_regime': current_regime}
+                    decision_context_buy = {**market_data, 'operating_mode': op_mode, 'buy_trigger_reason': reason, 'market_regime': current_regime}
                     success, buy_result = self.mock_trader.execute_buy(buy_amount_usdt, self.run_id, decision_context_buy)
                     if success:
                         new_trade_id = str(uuid.uuid4())
@@ -237,6 +409,7 @@ class Backtester:
                             'activation_price': None, 'current_trail_percentage': None,
                         }
                         open_positions[new_trade_id] = position_data
+                        bought_in_candle = True
 
                         trade_data = {
                             'run_id': self.run_id, 'strategy_name': strategy_name, 'symbol': symbol,
@@ -247,28 +420,57 @@ class Backtester:
                             'sell_target_price': sell_target_price, 'commission_usd': buy_result.get('commission_usd', Decimal('0'))
                         }
                         all_trades_for_run.append(BacktestTrade(**trade_data))
+                        self.capital_manager.difficulty_tracker.record_trade("buy", current_time)
 
             # --- End of Candle Operations ---
             # Portfolio history and pruning should be updated once per candle (at the close).
             final_portfolio_value = self.mock_trader.get_total_portfolio_value()
-            portfolio_history.append(final_portfolio_value)
-            
-            if trial and i > 0 and i % pruning_frequency == 0:
-                trial.report(float(final_portfolio_value), i)
+            state.equity.append(current_time, float(final_portfolio_value))
+
+            candle_number = state.candles + i
+            if trial and candle_number > 0 and candle_number % pruning_frequency == 0:
+                trial.report(float(final_portfolio_value), candle_number)
+                if trial.should_prune():
+                    if optuna:
+                        raise optuna.TrialPruned()
+            i += 1
+
+            # --- Event skipping ---
+            if skipper is not None and i < candle_count:
+                next_change = change_positions[np.searchsorted(change_positions, i)] \
+                    if change_positions[-1] >= i else candle_count
+                buys_possible = self.mock_trader.get_account_balance() >= min_trade_size and (
+                    self.capital_manager.use_dynamic_capital or len(open_positions) < self.capital_manager.max_open_positions)
+                buy_dip = float(current_params.get('buy_dip_percentage', Decimal('0.02')) if current_params else Decimal('0.02'))
+                band = combined_band(open_positions.values(), strategy_rules, current_params)
+                next_event = skipper.next_event(i, next_change, band, buy_dip, len(open_positions), buys_possible)
+                if next_event > i:
+                    self._skip_candles(index, skipper.close, i, next_event, state, trial, pruning_frequency)
+                    i = next_event
+
+        state.candles += len(frame)
+        state.current_regime = current_regime
+        state.current_params = current_params
+        if profiler.enabled:
+            profiler.record("backtest.simulate", time.perf_counter() - simulate_started)
+
+    def _skip_candles(self, index: pd.DatetimeIndex, closes: np.ndarray, start: int, end: int, state: _RunState,
+                      trial, pruning_frequency: int):
+        """Records the portfolio value of candles [start, end), in which no decision can change."""
+        values = float(self.mock_trader.get_account_balance()) + float(self.mock_trader.btc_balance) * closes[start:end]
+        state.equity.extend(index[start:end], values)
+        state.skipped_candles += end - start
+        self.mock_trader.set_current_time_and_price(index[end - 1], Decimal(str(closes[end - 1])))
+
+        if trial:
+            first = state.candles + start
+            for candle_number in range(-(-first // pruning_frequency) * pruning_frequency, state.candles + end, pruning_frequency):
+                if candle_number == 0:
+                    continue
+                trial.report(float(values[candle_number - first]), candle_number)
                 if trial.should_prune():
                     if optuna:
                         raise optuna.TrialPruned()
-
-        self._log_trades_to_db(all_trades_for_run)
-        results = self._generate_and_save_summary(open_positions, portfolio_history)
-        logger.info(f"--- Backtest {self.run_id} finished ---")
-
-        if return_full_results:
-            return results
-        else:
-            # For backward compatibility with the old optimizer, return only the final balance as a float.
-            final_balance = results.get("final_balance", Decimal("0.0"))
-            return float(final_balance)
 
     def _log_trades_to_db(self, trades: list):
         """
@@ -278,6 +480,10 @@ class Backtester:
         if not trades:
             return
         logger.info(f"Logging {len(trades)} trades from backtest run to database...")
+        timestamps = [trade.timestamp for trade in trades if trade.timestamp is not None]
+        if timestamps:
+            # Monthly partitions keep old backtests cheap to prune; a no-op on unpartitioned tables.
+            self.db_manager.ensure_trade_partitions('backtest', min(timestamps), max(timestamps))
         for trade in trades:
             trade_data = trade.to_dict()  # Convert BacktestTrade object to dictionary
 
@@ -324,9 +530,9 @@ class Backtester:
             return str(value)
 
         # --- Header Panel ---
-        if not self.feature_data.empty:
-            start_date = self.feature_data.index[0].date()
-            end_date = self.feature_data.index[-1].date()
+        if self.equity_curve is not None and len(self.equity_curve) > 0:
+            start_date = self.equity_curve.first_timestamp.date()
+            end_date = self.equity_curve.last_timestamp.date()
             header_text = f"Period: [bold]{start_date}[/] to [bold]{end_date}[/]\nRun ID: [dim]{self.run_id}[/dim]"
         else:
             header_text = f"Run ID: [dim]{self.run_id}[/dim]"
@@ -402,16 +608,16 @@ class Backtester:
         footer = Text("\n* Win Rate & Profit Factor are calculated based on closed (sell) trades only.", style="dim italic")
         console.print(footer)
 
-    def _generate_and_save_summary(self, open_positions: dict, portfolio_history: list[Decimal]):
+    def _generate_and_save_summary(self, open_positions: dict, equity: EquityCurve):
         logger.info("--- Generating backtest summary ---")
 
-        all_trades_for_run = self.db_manager.get_trades_by_run_id(self.run_id)
-        
-        if not all_trades_for_run:
+        # A column-projected frame: no ORM objects and no decision_context for the whole run.
+        all_trades_df = self.db_manager.get_trades_frame(run_id=self.run_id, end_date=None, newest_first=False)
+        trade_records = _serialize_trade_records(all_trades_df)
+
+        if all_trades_df.empty:
             logger.warning("No trades were executed in this backtest run.")
-            all_trades_df = pd.DataFrame()
         else:
-            all_trades_df = pd.DataFrame([t.to_dict() for t in all_trades_for_run])
             numeric_cols = ['price', 'quantity', 'usd_value', 'commission', 'commission_usd', 'realized_pnl_usd', 'hodl_asset_amount', 'hodl_asset_value_at_sell']
             for col in numeric_cols:
                 if col in all_trades_df.columns:
@@ -484,23 +690,12 @@ class Backtester:
         sortino_ratio = Decimal(0)
         calmar_ratio = Decimal(0)
 
-        if portfolio_history and len(portfolio_history) > 1:
-            # Create the DataFrame with the correct DatetimeIndex from the start
-            portfolio_df = pd.DataFrame(
-                portfolio_history,
-                columns=['value'],
-                index=self.feature_data.index[:len(portfolio_history)]
-            )
-            portfolio_float = portfolio_df['value'].astype(float)
-
-            # Max Drawdown
-            peak = portfolio_float.expanding(min_periods=1).max()
-            drawdown = (portfolio_float - peak) / peak
-            max_drawdown = Decimal(str(abs(drawdown.min()))) if not drawdown.empty else Decimal(0)
+        if equity is not None and len(equity) > 1:
+            # Max Drawdown (tracked on every candle, whatever the curve's downsampling)
+            max_drawdown = Decimal(str(equity.max_drawdown))
 
             # Ratios
-            # Now that the DataFrame has a DatetimeIndex, we can resample directly
-            daily_returns = portfolio_float.resample('D').last().pct_change().dropna()
+            daily_returns = equity.daily_values().pct_change().dropna()
 
             if not daily_returns.empty:
                 try:
@@ -521,7 +716,7 @@ class Backtester:
 
             try:
                 if max_drawdown > 0:
-                    total_days = (self.feature_data.index[-1] - self.feature_data.index[0]).days
+                    total_days = (equity.last_timestamp - equity.first_timestamp).days
                     if total_days > 0:
                         annualized_return = (final_balance / initial_balance) ** (Decimal('365.0') / Decimal(total_days)) - 1
                         calmar_ratio = annualized_return / max_drawdown
@@ -565,7 +760,7 @@ class Backtester:
         self._display_results_table(results)
 
         # Add the raw trade list to the results for detailed TUI comparison
-        results["trades"] = [trade.to_dict() for trade in all_trades_for_run]
+        results["trades"] = trade_records
 
         return results
 
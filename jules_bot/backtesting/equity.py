@@ -0,0 +1,143 @@
+"""
+Compact portfolio-value recording for the Backtester.
+
+Values go to a float64 array, optionally downsampled. The running drawdown
+and the daily closing values are kept exactly, so the summary metrics don't
+depend on the sampling.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class EquityCurve:
+    """
+    Portfolio value per candle in a growable float64 array. With `downsample`
+    N only every Nth candle is stored (the last candle is always returned by
+    `to_series`). The max drawdown and the last value of each calendar day are
+    tracked on every candle.
+    """
+    def __init__(self, downsample: int = 1, capacity: int = 4096):
+        if downsample < 1:
+            raise ValueError("downsample must be >= 1")
+        self.downsample = downsample
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty(capacity, dtype=np.float64)
+        self._stored = 0
+        self._count = 0
+        self._tz = None
+        self._unit = 'ns'
+        self.first_timestamp: Optional[pd.Timestamp] = None
+        self.last_timestamp: Optional[pd.Timestamp] = None
+        self.last_value: Optional[float] = None
+        self._peak = -np.inf
+        self._max_drawdown = 0.0
+        self._days = []
+        self._day_values = []
+        self._day_end: Optional[pd.Timestamp] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest fall from a running peak, as a positive fraction of the peak."""
+        return abs(self._max_drawdown)
+
+    @property
+    def nbytes(self) -> int:
+        return self._timestamps.nbytes + self._values.nbytes
+
+    def append(self, timestamp: pd.Timestamp, value: float):
+        if self._count == 0:
+            self.first_timestamp = timestamp
+            self._tz = timestamp.tz
+            self._unit = timestamp.unit
+        if self._count % self.downsample == 0:
+            if self._stored == len(self._values):
+                self._timestamps = np.resize(self._timestamps, 2 * self._stored)
+                self._values = np.resize(self._values, 2 * self._stored)
+            self._timestamps[self._stored] = timestamp.value
+            self._values[self._stored] = value
+            self._stored += 1
+        self._count += 1
+        self.last_timestamp = timestamp
+        self.last_value = value
+
+        if value > self._peak:
+            self._peak = value
+        if self._peak > 0:
+            drawdown = (value - self._peak) / self._peak
+            if drawdown < self._max_drawdown:
+                self._max_drawdown = drawdown
+
+        if self._day_end is None or timestamp >= self._day_end:
+            day = timestamp.normalize()
+            self._days.append(day)
+            self._day_values.append(value)
+            self._day_end = day + pd.Timedelta(days=1)
+        else:
+            self._day_values[-1] = value
+
+    def extend(self, index: pd.DatetimeIndex, values: np.ndarray):
+        """Appends a run of candles at once; equivalent to calling `append` for each."""
+        n = len(index)
+        if n == 0:
+            return
+        values = np.asarray(values, dtype=np.float64)
+        if self._count == 0:
+            self.first_timestamp = index[0]
+            self._tz = index.tz
+            self._unit = index.unit
+        timestamps = index.as_unit('ns').asi8
+        keep = np.arange((-self._count) % self.downsample, n, self.downsample)
+        if len(keep):
+            needed = self._stored + len(keep)
+            if needed > len(self._values):
+                capacity = max(needed, 2 * len(self._values))
+                self._timestamps = np.resize(self._timestamps, capacity)
+                self._values = np.resize(self._values, capacity)
+            self._timestamps[self._stored:needed] = timestamps[keep]
+            self._values[self._stored:needed] = values[keep]
+            self._stored = needed
+        self._count += n
+        self.last_timestamp = index[-1]
+        self.last_value = float(values[-1])
+
+        peaks = np.maximum.accumulate(np.r_[self._peak, values])[1:]
+        self._peak = float(peaks[-1])
+        positive = peaks > 0
+        if positive.any():
+            drawdown = float(((values[positive] - peaks[positive]) / peaks[positive]).min())
+            if drawdown < self._max_drawdown:
+                self._max_drawdown = drawdown
+
+        days = index.normalize()
+        day_ends = np.flatnonzero(np.r_[days[1:] != days[:-1], True])
+        for position in day_ends:
+            day, value = days[position], float(values[position])
+            if self._day_end is not None and day < self._day_end:
+                self._day_values[-1] = value
+            else:
+                self._days.append(day)
+                self._day_values.append(value)
+                self._day_end = day + pd.Timedelta(days=1)
+
+    def to_series(self) -> pd.Series:
+        """The stored samples, plus the last candle when downsampling skipped it."""
+        timestamps = self._timestamps[:self._stored]
+        values = self._values[:self._stored]
+        if self._count and timestamps[-1] != self.last_timestamp.value:
+            timestamps = np.append(timestamps, self.last_timestamp.value)
+            values = np.append(values, self.last_value)
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=self._tz is not None)).as_unit(self._unit)
+        if self._tz is not None:
+            index = index.tz_convert(self._tz)
+        return pd.Series(values, index=index, name='value')
+
+    def daily_values(self) -> pd.Series:
+        """Last value of each calendar day; days without candles are NaN (as `resample('D').last()`)."""
+        if not self._days:
+            return pd.Series(dtype=np.float64)
+        return pd.Series(self._day_values, index=pd.DatetimeIndex(self._days), dtype=np.float64).asfreq('D')
@@ -0,0 +1,113 @@
+"""
+Event skipping for the Backtester.
+
+Most 1m candles change nothing. Take a candle where every price in [low, high]
+is inside every open position's quiet band, and no buy signal is possible at
+its close. Then the sell/trailing loop and the buy evaluation are no-ops for
+that candle. The candle only adds its portfolio value to the equity curve.
+
+The quiet band of a position is the price range where StrategyRules leaves it
+untouched:
+- below the sell target;
+- if trailing is inactive, below the activation price;
+- if trailing is active, above the pnl=0 and stop prices and below the price
+  of the next recorded peak.
+Bands only change when the simulation changes a position or the regime
+parameters. So after each processed candle `EventSkipper.next_event` searches
+the high/low arrays for the next candle that leaves the bands or can trigger a
+buy, stopping at the next regime change. The Backtester then fills the equity
+for the candles in between at once.
+
+The buy test is a necessary condition of StrategyRules.evaluate_buy_signal
+without the difficulty factor, which only makes buying harder. Comparisons use a
+small relative tolerance toward "event", so float rounding can only cost a skip,
+never a decision.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from jules_bot.backtesting.tick_replay import PEAK_UPDATE_THRESHOLD, price_for_pnl
+
+# Relative margin applied to every float comparison, always in the direction of an event.
+TOLERANCE = 1e-9
+# First window scanned for an event; doubled while no event is found.
+INITIAL_WINDOW = 64
+BUY_COLUMNS = ('ema_20', 'ema_100', 'bbl_20_2_0')
+
+
+def quiet_band(position: dict, strategy_rules, params: Dict[str, Decimal] = None) -> Tuple[Decimal, Decimal]:
+    """The (low, high) prices between which the sell and trailing decisions for `position` are HOLD."""
+    params = params or {}
+    commission_rate = strategy_rules.commission_rate
+    high = Decimal(position.get('sell_target_price', Decimal('inf')))
+    if not position.get('is_smart_trailing_active'):
+        activation = params.get('target_profit', strategy_rules.trailing_stop_profit)
+        return Decimal('-inf'), min(high, price_for_pnl(position, activation, commission_rate))
+
+    highest = Decimal(str(position.get('smart_trailing_highest_profit') or '0'))
+    trail = Decimal(str(position.get('current_trail_percentage') or strategy_rules.fixed_trail_percentage))
+    low = max(price_for_pnl(position, Decimal('0'), commission_rate),
+              price_for_pnl(position, highest * (Decimal('1') - trail), commission_rate))
+    peak_step = highest * (Decimal('1') + PEAK_UPDATE_THRESHOLD) if highest > 0 else highest
+    return low, min(high, price_for_pnl(position, peak_step, commission_rate))
+
+
+def combined_band(positions: Iterable[dict], strategy_rules, params: Dict[str, Decimal] = None) -> Tuple[float, float]:
+    """The intersection of the positions' quiet bands as floats, narrowed by the tolerance."""
+    low, high = -np.inf, np.inf
+    for position in positions:
+        position_low, position_high = quiet_band(position, strategy_rules, params)
+        low, high = max(low, float(position_low)), min(high, float(position_high))
+    return low * (1 + TOLERANCE), high * (1 - TOLERANCE)
+
+
+class EventSkipper:
+    """
+    The frame's price and indicator columns as float arrays, searched for the
+    next candle where the simulation can change state.
+    """
+    def __init__(self, frame: pd.DataFrame, intrabar_buys: bool = False):
+        self.low = frame['low'].to_numpy(dtype=np.float64)
+        self.high = frame['high'].to_numpy(dtype=np.float64)
+        self.close = frame['close'].to_numpy(dtype=np.float64)
+        self.can_buy = all(column in frame.columns for column in BUY_COLUMNS)
+        # With tick replay a buy can fire at the first trade under the dip target, so the low is tested.
+        self.dip_price = self.low if intrabar_buys else self.close
+        invalid = np.isnan(self.low) | np.isnan(self.high) | np.isnan(self.close)
+        if self.can_buy:
+            self.ema_20 = frame['ema_20'].to_numpy(dtype=np.float64)
+            self.ema_100 = frame['ema_100'].to_numpy(dtype=np.float64)
+            invalid |= np.isnan(self.ema_20) | np.isnan(self.ema_100) | frame['bbl_20_2_0'].isna().to_numpy()
+        self.invalid = invalid
+
+    def _events(self, start: int, end: int, band: Tuple[float, float], buy_dip: float, open_positions: int,
+                buys_possible: bool) -> np.ndarray:
+        low, high = self.low[start:end], self.high[start:end]
+        events = (low <= band[0]) | (high >= band[1]) | self.invalid[start:end]
+        if buys_possible and self.can_buy:
+            close = self.close[start:end]
+            ema_20, ema_100 = self.ema_20[start:end], self.ema_100[start:end]
+            events |= self.dip_price[start:end] <= ema_20 * (1 - buy_dip) * (1 + TOLERANCE)
+            uptrend = close > ema_100 * (1 - TOLERANCE)
+            if open_positions == 0:
+                # Aggressive first entry above both EMAs.
+                events |= uptrend & (close > ema_20 * (1 - TOLERANCE))
+            else:
+                # Uptrend pullback: the candle touched the EMA20 and closed under it.
+                events |= uptrend & (high > ema_20 * (1 - TOLERANCE)) & (close < ema_20 * (1 + TOLERANCE))
+        return events
+
+    def next_event(self, start: int, stop: int, band: Tuple[float, float], buy_dip: float, open_positions: int,
+                   buys_possible: bool) -> int:
+        """First candle in [start, stop) that can change state, or `stop`."""
+        position, window = start, INITIAL_WINDOW
+        while position < stop:
+            end = min(stop, position + window)
+            hits = np.flatnonzero(self._events(position, end, band, buy_dip, open_positions, buys_possible))
+            if len(hits):
+                return position + int(hits[0])
+            position, window = end, window * 2
+        return stop
@@ -0,0 +1,100 @@
+"""
+Out-of-core support for the Backtester.
+
+A streaming backtest never holds the whole date range in memory. The candle
+store is read in time-ordered chunks and each chunk gets its features and
+regimes computed on a window that starts `warmup` before it. That warm-up
+reproduces the rolling and exponential indicators at the chunk boundary, and
+cumulative columns (`cvd`) are re-based on the previous chunk's last value.
+Each window also reaches `lookahead` past its chunk, so the triple-barrier
+target does not drop the last candles of every chunk.
+
+Portfolio state lives in the Backtester and simply carries on from one chunk
+to the next; equity goes to an `EquityCurve` (see equity.py).
+"""
+from datetime import timedelta
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from jules_bot.bot.situational_awareness import SituationalAwareness
+from jules_bot.research.feature_engineering import add_all_features
+from jules_bot.research.feature_dtypes import FeatureDtypePolicy
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+from jules_bot.utils.profiling import timer
+
+DEFAULT_CHUNK_DAYS = 30
+# Enough for every indicator in add_all_features except the 30-day macro
+# correlations, whose inputs are not in the candle store.
+DEFAULT_WARMUP_DAYS = 3
+
+
+def _sql_timestamp(timestamp: pd.Timestamp) -> str:
+    return timestamp.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _align(timestamp: pd.Timestamp, index: pd.DatetimeIndex) -> pd.Timestamp:
+    """`timestamp` (naive UTC) made comparable with `index`."""
+    if index.tz is not None:
+        return timestamp.tz_localize('UTC').tz_convert(index.tz)
+    return timestamp
+
+
+def iter_feature_chunks(db_manager, symbol: str, start: pd.Timestamp, end: pd.Timestamp,
+                        chunk: timedelta = timedelta(days=DEFAULT_CHUNK_DAYS),
+                        warmup: timedelta = timedelta(days=DEFAULT_WARMUP_DAYS),
+                        lookahead: Optional[timedelta] = None,
+                        dtype_policy: Optional[FeatureDtypePolicy] = None) -> Iterator[pd.DataFrame]:
+    """
+    Yields feature frames (with `market_regime`) covering [start, end] in time
+    order, one per `chunk`. `start` and `end` are naive UTC timestamps. Each
+    frame holds only its own candles; only one window is in memory at a time.
+    The default `lookahead` is the target's horizon (`future_periods` 1m candles);
+    frames get the configured dtype policy unless `dtype_policy` is given.
+    """
+    if chunk <= timedelta(0):
+        raise ValueError("chunk must be positive")
+    if lookahead is None:
+        future_periods = int(config_manager.get('DATA_PIPELINE', 'future_periods', fallback='10'))
+        lookahead = timedelta(minutes=future_periods + 1)
+    regime_model = SituationalAwareness()
+    dtype_policy = dtype_policy or FeatureDtypePolicy.from_config()
+    chunk_start = start
+    last_cvd = None
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + chunk, end)
+        is_last = chunk_end >= end
+        window_start = max(start, chunk_start - warmup)
+        window_end = min(end, chunk_end + lookahead)
+
+        with timer("backtest.load_data"):
+            prices = db_manager.get_price_data(measurement=symbol, start_date=_sql_timestamp(window_start),
+                                               end_date=_sql_timestamp(window_end))
+        if not prices.empty:
+            with timer("backtest.features"):
+                features = add_all_features(prices, live_mode=False, inplace=True).dropna()
+            if not features.empty:
+                with timer("backtest.regime"):
+                    features = regime_model.transform(features, inplace=True)
+                index = features.index
+                lower, upper = _align(chunk_start, index), _align(chunk_end, index)
+                in_chunk = (index >= lower) & ((index <= upper) if is_last else (index < upper))
+
+                # The cumulative volume delta restarts at the window; re-base it on the previous chunk.
+                if last_cvd is not None and 'cvd' in features.columns:
+                    previous_time, previous_cvd = last_cvd
+                    if previous_time in index:
+                        features['cvd'] += previous_cvd - features.at[previous_time, 'cvd']
+                    else:
+                        logger.warning(f"Streaming backtest: no warm-up candle at {previous_time}; 'cvd' restarts at {chunk_start}.")
+
+                frame = features[in_chunk]
+                del prices, features
+                if not frame.empty:
+                    if 'cvd' in frame.columns:
+                        last_cvd = (frame.index[-1], frame['cvd'].iloc[-1])
+                    yield dtype_policy.apply(frame)
+        if is_last:
+            break
+        chunk_start = chunk_end
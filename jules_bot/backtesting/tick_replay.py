@@ -0,0 +1,146 @@
+"""
+Intra-candle replay from Binance aggTrades.
+
+The Backtester walks each candle along a fixed 4-point path (open, low, high,
+close, or open, high, low, close). That path is exact only while no decision
+level lies inside the candle's [low, high] range: then every point of the path
+sits on the same side of every level as every real trade does. When a level is
+inside the range, the order of the trades matters (which of the stop and the
+target came first) and so does the fill price (the first trade past the level,
+not the candle's extreme).
+
+`position_levels` and `buy_target` list those levels for the open positions and
+the dip buy. Only candles with a level in range are replayed from the local
+aggTrades store; all others stay on the fast path.
+
+The store keeps one compressed `.npz` per day (trade times in ns and prices),
+written by collectors/agg_trades_collector.py from Binance's public daily
+archives. Only one day is held in memory at a time.
+"""
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from jules_bot.utils.logger import logger
+
+# The candle store holds 1m klines.
+CANDLE_INTERVAL = pd.Timedelta(minutes=1)
+# Same threshold as StrategyRules.evaluate_smart_trailing_stop for recording a new profit peak.
+PEAK_UPDATE_THRESHOLD = Decimal('0.005')
+
+
+class AggTradeStore:
+    """Daily aggTrades files under `root/<symbol>/<symbol>-aggTrades-YYYY-MM-DD.npz`."""
+    def __init__(self, root, symbol: str):
+        self.root = Path(root)
+        self.symbol = symbol
+        self._day: Optional[pd.Timestamp] = None
+        self._times: Optional[np.ndarray] = None
+        self._prices: Optional[np.ndarray] = None
+        self._missing_days = set()
+
+    def path_for(self, day: pd.Timestamp) -> Path:
+        return self.root / self.symbol / f"{self.symbol}-aggTrades-{day:%Y-%m-%d}.npz"
+
+    def save_day(self, day: pd.Timestamp, times_ns: np.ndarray, prices: np.ndarray) -> Path:
+        """Writes one day of trades (sorted by time) as a compressed file."""
+        path = self.path_for(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        order = np.argsort(times_ns, kind='stable')
+        np.savez_compressed(path, time=np.asarray(times_ns, dtype=np.int64)[order],
+                            price=np.asarray(prices, dtype=np.float64)[order])
+        return path
+
+    def _load(self, day: pd.Timestamp) -> bool:
+        if day == self._day:
+            return self._times is not None
+        self._day = day
+        self._times = self._prices = None
+        path = self.path_for(day)
+        if not path.exists():
+            if day not in self._missing_days:
+                self._missing_days.add(day)
+                logger.warning(f"Tick replay: no aggTrades file for {day.date()} ({path}); those candles use the OHLC path.")
+            return False
+        with np.load(path) as data:
+            self._times, self._prices = data['time'], data['price']
+        return True
+
+    def prices(self, start: pd.Timestamp, end: pd.Timestamp) -> Optional[np.ndarray]:
+        """
+        Trade prices in [start, end) with consecutive repeats removed (a repeated
+        price cannot change a decision), or None when the day is not stored.
+        """
+        if not self._load(start.normalize()):
+            return None
+        times = self._times
+        lower, upper = np.searchsorted(times, [start.value, end.value], side='left')
+        prices = self._prices[lower:upper]
+        if len(prices) > 1:
+            prices = prices[np.r_[True, prices[1:] != prices[:-1]]]
+        return prices
+
+
+def price_for_pnl(position: dict, pnl: Decimal, commission_rate: Decimal) -> Decimal:
+    """Inverts StrategyRules.calculate_net_unrealized_pnl: the price at which the position's net PnL is `pnl`."""
+    quantity = Decimal(position['quantity'])
+    invested = Decimal(position['price']) * quantity + Decimal(position.get('commission_usd') or 0)
+    return (pnl + invested) / (quantity * (Decimal('1') - commission_rate))
+
+
+def position_levels(position: dict, strategy_rules, params: Dict[str, Decimal] = None) -> List[Decimal]:
+    """Prices at which the sell or smart-trailing decision for `position` can change."""
+    params = params or {}
+    commission_rate = strategy_rules.commission_rate
+    levels = [position.get('sell_target_price', Decimal('inf'))]
+    if not position.get('is_smart_trailing_active'):
+        activation = params.get('target_profit', strategy_rules.trailing_stop_profit)
+        levels.append(price_for_pnl(position, activation, commission_rate))
+        return levels
+
+    highest = Decimal(str(position.get('smart_trailing_highest_profit') or '0'))
+    trail = Decimal(str(position.get('current_trail_percentage') or strategy_rules.fixed_trail_percentage))
+    levels.append(price_for_pnl(position, Decimal('0'), commission_rate))
+    levels.append(price_for_pnl(position, highest * (Decimal('1') - trail), commission_rate))
+    peak_step = highest * (Decimal('1') + PEAK_UPDATE_THRESHOLD) if highest > 0 else highest
+    levels.append(price_for_pnl(position, peak_step, commission_rate))
+    levels.append(strategy_rules.calculate_break_even_price(position['price']))
+    return levels
+
+
+def buy_target(candle: dict, params: Dict[str, Decimal] = None) -> Optional[Decimal]:
+    """The dip-buy target of StrategyRules.evaluate_buy_signal without difficulty (its highest value)."""
+    ema_20 = candle.get('ema_20')
+    if ema_20 is None or pd.isna(ema_20):
+        return None
+    buy_dip = params.get('buy_dip_percentage', Decimal('0.02')) if params else Decimal('0.02')
+    return Decimal(str(ema_20)) * (Decimal('1') - buy_dip)
+
+
+def level_in_range(levels: Iterable[Optional[Decimal]], low: Decimal, high: Decimal) -> bool:
+    return any(level is not None and low <= level <= high for level in levels)
+
+
+def replay_path(prices: np.ndarray, close_price: Decimal, target: Optional[Decimal]) -> Tuple[List[Decimal], List[int], Dict[int, dict]]:
+    """
+    The candle's price path from its trades, ending at the close. Returns the
+    path, the path positions where buys are evaluated (the first trade at or
+    below the buy target, if any, and the close), and the market data that
+    replaces the candle's close/high/low at the intra-candle buy point.
+    """
+    path = [Decimal(str(price)) for price in prices.tolist()]
+    if not path or path[-1] != close_price:
+        path.append(close_price)
+    last = len(path) - 1
+    buy_points, intrabar = [last], {}
+    if target is not None and len(prices):
+        hits = np.flatnonzero(prices <= float(target))
+        if len(hits) and hits[0] < last:
+            point = int(hits[0])
+            buy_points.insert(0, point)
+            seen = prices[:point + 1]
+            intrabar[point] = {'close': float(prices[point]), 'high': float(seen.max()), 'low': float(seen.min())}
+    return path, buy_points, intrabar
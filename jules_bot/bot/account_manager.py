@@ -4,10 +4,13 @@ from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from jules_bot.utils.logger import logger
 from jules_bot.utils.config_manager import config_manager
+from jules_bot.core.exchange_snapshot import ExchangeSnapshotCache
 
 class AccountManager:
-    def __init__(self, binance_client: Client):
+    def __init__(self, binance_client: Client, snapshot_cache: ExchangeSnapshotCache = None):
         self.client = binance_client
+        # Sem cache compartilhado, um TTL de 0 mantém o comportamento de sempre consultar a API.
+        self.snapshot_cache = snapshot_cache or ExchangeSnapshotCache(ttl_seconds=0)
         self.base_asset = "BTC"
         self.quote_asset = config_manager.get('APP', 'symbol').replace("BTC", "")
 
@@ -17,7 +20,7 @@ class AccountManager:
             logger.warning("Cliente Binance não disponível (modo offline). Retornando saldo 0.")
             return 0.0
         try:
-            account_info = self.client.get_account()
+            account_info = self.snapshot_cache.get_account(self.client)
             balance_info = next(
                 (item for item in account_info['balances'] if item['asset'] == self.base_asset),
                 None
@@ -100,7 +103,7 @@ class AccountManager:
         try:
             # Esta chamada funciona tanto para a conta real quanto para a testnet,
             # dependendo de como o 'self.client' foi inicializado.
-            account_info = self.client.get_account()
+            account_info = self.snapshot_cache.get_account(self.client)
             
             # Procura o ativo de cotação (ex: USDT) nos saldos da conta.
             balance_info = next(
@@ -142,6 +145,7 @@ class AccountManager:
             if formatted_quantity > 0:
                 logger.info(f"Attempting to place market SELL order for {formatted_quantity:.8f} BTC...")
                 order = self.client.order_market_sell(symbol=config_manager.get('APP', 'symbol'), quantity=formatted_quantity)
+                self.snapshot_cache.invalidate_account()
                 logger.info(f"SUCCESS: Market SELL order placed: {order}")
                 return order # Retorna a ordem para o PositionManager
             else:
@@ -168,6 +172,7 @@ class AccountManager:
             rounded_qty = round(quote_order_qty, 2)
             logger.info(f"Attempting to place market BUY order for {rounded_qty:.2f} USDT...")
             order = self.client.order_market_buy(symbol=config_manager.get('APP', 'symbol'), quoteOrderQty=rounded_qty)
+            self.snapshot_cache.invalidate_account()
             logger.info(f"SUCCESS: Market BUY order placed: {order}")
             return True
         except BinanceAPIException as e:
@@ -221,9 +226,11 @@ class AccountManager:
             logger.warning("Binance client not available (offline mode). Returning empty list.")
             return []
         try:
-            account_info = self.client.get_account()
+            account_info = self.snapshot_cache.get_account(self.client)
             non_zero_balances = []
-            for balance in account_info['balances']:
+            for cached_balance in account_info['balances']:
+                # Copy so the shared snapshot is not mutated with derived fields.
+                balance = dict(cached_balance)
                 free_balance = float(balance['free'])
                 locked_balance = float(balance['locked'])
                 total_balance = free_balance + locked_balance
@@ -1,7 +1,13 @@
+from datetime import date
+from typing import Optional
+
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
 router = APIRouter()
+# Mounted without the /api prefix, where Prometheus expects to scrape.
+metrics_router = APIRouter()
 
 class ForceBuyPayload(BaseModel):
     amount_usd: str
@@ -10,7 +16,18 @@ class ForceSellPayload(BaseModel):
     trade_id: str
     percentage: str
 
+class ProfilingTogglePayload(BaseModel):
+    enabled: bool
+    reset: bool = False
+
+class ProfileCapturePayload(BaseModel):
+    cycles: int = 10
+    tool: str = "cprofile"
+
 from fastapi import Request, HTTPException
+from jules_bot.core.request_governor import get_request_governor
+from jules_bot.services.metrics_exporter import CONTENT_TYPE, render_metrics
+from jules_bot.utils.profiling import get_profiler
 
 @router.post("/force_buy")
 async def force_buy_endpoint(request: Request, payload: ForceBuyPayload):
@@ -43,3 +60,104 @@ async def force_sell_endpoint(request: Request, payload: ForceSellPayload):
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An internal error occurred: {str(e)}")
+
+
+@router.get("/exchange_cache")
+async def exchange_cache_metrics_endpoint(request: Request):
+    """
+    Returns the exchange snapshot cache counters, including how many API calls it saved.
+    """
+    bot = request.app.state.bot
+    return bot.trader.snapshot_cache.get_metrics()
+
+
+@router.get("/request_governor")
+async def request_governor_metrics_endpoint():
+    """
+    Returns the exchange request-weight usage and per-lane admission counters.
+    """
+    return get_request_governor().get_metrics()
+
+
+def _profiling_report() -> dict:
+    profiler = get_profiler()
+    return {"enabled": profiler.enabled, "timers": profiler.summary(), "capture": profiler.capture_status()}
+
+
+@router.get("/profiling")
+async def profiling_endpoint():
+    """
+    Returns p50/p95/p99 timings of each instrumented phase (cycle, features, regime,
+    DB, exchange, sell/buy evaluation, status publishing) and the profile capture state.
+    """
+    return _profiling_report()
+
+
+@router.post("/profiling")
+async def profiling_toggle_endpoint(payload: ProfilingTogglePayload):
+    """
+    Turns the phase timers on or off, optionally clearing what was recorded so far.
+    """
+    profiler = get_profiler()
+    if payload.reset:
+        profiler.reset()
+    if payload.enabled:
+        profiler.enable()
+    else:
+        profiler.disable()
+    return _profiling_report()
+
+
+@router.post("/profiling/capture")
+async def profiling_capture_endpoint(payload: ProfileCapturePayload):
+    """
+    Profiles the next N trading cycles with cProfile or pyinstrument. The result is
+    written to the profiles directory and summarized under `capture.last`.
+    """
+    try:
+        return get_profiler().start_capture(payload.cycles, payload.tool)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def metrics_endpoint(request: Request):
+    """
+    Prometheus scrape target: cycle/exchange/DB latency histograms, open positions,
+    cache hit rates, request weight and process RSS, all from memory.
+    """
+    return PlainTextResponse(render_metrics(request.app.state.bot), media_type=CONTENT_TYPE)
+
+
+@router.get("/trade_history")
+def trade_history_endpoint(
+    request: Request,
+    status: str = "all",
+    order_type: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sort_by: str = "timestamp",
+    descending: bool = True,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+):
+    """
+    Returns one page of the bot's trade history, filtered and sorted in the database.
+    Pass `next_cursor` back as `cursor` to fetch the following page. The summary of
+    the filtered history is only included with the first page.
+    """
+    bot = request.app.state.bot
+    filters = dict(status=status, order_type=order_type, start_date=start_date, end_date=end_date)
+    try:
+        trades, next_cursor = bot.db_manager.get_trade_history_page(
+            bot.mode, sort_by=sort_by, descending=descending, limit=limit, cursor=cursor, **filters
+        )
+        response = {"trades": [trade.to_dict() for trade in trades], "next_cursor": next_cursor}
+        if cursor is None:
+            summary = bot.db_manager.get_trade_history_summary(bot.mode, **filters)
+            response["summary"] = {key: str(value) for key, value in summary.items()}
+        return response
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An internal error occurred: {str(e)}")
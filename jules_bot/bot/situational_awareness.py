@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from jules_bot.utils.logger import logger
 from jules_bot.utils.config_manager import config_manager
@@ -27,20 +28,21 @@ class SituationalAwareness:
 
         self.volatility_percentile = 0.75 # O percentil do ATR a ser usado como limiar para alta volatilidade
 
-    def transform(self, features_df: pd.DataFrame) -> pd.DataFrame:
+    def transform(self, features_df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         """
         Aplica a lógica baseada em regras para determinar o regime de mercado para cada linha no DataFrame.
         Calcula um limiar de volatilidade dinâmico usando uma janela rolante para evitar lookahead bias.
 
         Args:
             features_df (pd.DataFrame): DataFrame com dados históricos, incluindo 'atr_14' e 'macd_diff_12_26_9'.
+            inplace (bool): Se True, escreve 'market_regime' no próprio `features_df` em vez de numa cópia.
 
         Returns:
             pd.DataFrame: O DataFrame original com uma nova coluna 'market_regime'.
         """
         logger.info(f"Calculando regimes de mercado com uma janela rolante de {self.rolling_window} períodos...")
         
-        df = features_df.copy()
+        df = features_df if inplace else features_df.copy()
         
         # Garante que as colunas necessárias existam
         required_cols = ['atr_14', 'macd_diff_12_26_9']
@@ -61,34 +63,19 @@ class SituationalAwareness:
         cols_to_fill = ['volatility_threshold', 'atr_14', 'macd_diff_12_26_9']
         df[cols_to_fill] = df[cols_to_fill].bfill().ffill()
 
-        # Define uma função para aplicar a lógica de regime a cada linha de forma mais clara
-        def get_regime(row):
-            # A verificação de NaN é uma salvaguarda. Com bfill().ffill(), isso não deve ocorrer
-            # a menos que toda a coluna seja NaN.
-            if pd.isna(row['volatility_threshold']) or pd.isna(row['atr_14']) or pd.isna(row['macd_diff_12_26_9']):
-                return -1  # Regime Indefinido
-
-            is_high_volatility = row['atr_14'] > row['volatility_threshold']
-            is_uptrend = row['macd_diff_12_26_9'] > 0
-            is_downtrend = row['macd_diff_12_26_9'] < 0
-
-            # A alta volatilidade tem a maior prioridade e sobrepõe outras condições.
-            if is_high_volatility:
-                return self.regime_map["HIGH_VOLATILITY"]
-
-            # Em seguida, verificamos as tendências.
-            if is_uptrend:
-                return self.regime_map["UPTREND"]
-
-            if is_downtrend:
-                return self.regime_map["DOWNTREND"]
-
-            # Se não houver volatilidade alta e o MACD estiver próximo de zero, consideramos "Ranging".
-            # Este é o caso em que não é nem tendência de alta nem de baixa.
-            return self.regime_map["RANGING"]
-
-        # Aplica a função para determinar o regime. fillna(-1) para os casos (raros) em que todas as features são NaN.
-        df['market_regime'] = df.apply(get_regime, axis=1).fillna(-1).astype(int)
+        # Regras, em ordem de prioridade (avaliadas de forma vetorizada para todas as linhas):
+        # - NaN em qualquer coluna (só se a coluna inteira for NaN) -> -1 (Indefinido);
+        # - alta volatilidade (ATR acima do limiar) sobrepõe as demais condições;
+        # - depois as tendências pelo MACD; com MACD igual a zero, o mercado é "Ranging".
+        atr = df['atr_14'].to_numpy(dtype=float)
+        threshold = df['volatility_threshold'].to_numpy(dtype=float)
+        macd = df['macd_diff_12_26_9'].to_numpy(dtype=float)
+        undefined = np.isnan(atr) | np.isnan(threshold) | np.isnan(macd)
+        df['market_regime'] = np.select(
+            [undefined, atr > threshold, macd > 0, macd < 0],
+            [-1, self.regime_map["HIGH_VOLATILITY"], self.regime_map["UPTREND"], self.regime_map["DOWNTREND"]],
+            default=self.regime_map["RANGING"],
+        ).astype(int)
         
         # Limpa a coluna de limiar que não é mais necessária fora deste contexto
         df.drop(columns=['volatility_threshold'], inplace=True)
@@ -1,10 +1,14 @@
+import bisect
 import datetime
 import uuid
 import math
+from dataclasses import dataclass
 from decimal import Decimal
+from typing import Iterable, Optional
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
 from jules_bot.core.schemas import TradePoint
+from jules_bot.core.request_governor import RequestLane, request_lane
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.utils.logger import logger
 from jules_bot.core_logic.strategy_rules import StrategyRules
@@ -13,6 +17,110 @@ from jules_bot.services.trade_logger import TradeLogger
 from jules_bot.utils.config_manager import config_manager
 
 
+# Quantities below this are treated as exhausted when matching lots.
+LOT_EPSILON = Decimal('1e-9')
+# A lot whose remaining quantity falls to this level is marked CLOSED.
+LOT_CLOSE_THRESHOLD = Decimal('1e-8')
+
+
+def _as_utc(ts: datetime.datetime) -> datetime.datetime:
+    # DB timestamps are naive UTC while freshly synced ones are tz-aware.
+    if ts is None:
+        return datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+    return ts.replace(tzinfo=datetime.timezone.utc) if ts.tzinfo is None else ts.astimezone(datetime.timezone.utc)
+
+
+@dataclass
+class Lot:
+    """A single open buy position as tracked by the FifoLotBook."""
+    trade_id: str
+    price: Decimal
+    quantity: Decimal
+    remaining_quantity: Decimal
+    commission_usd: Decimal
+    timestamp: datetime.datetime
+    # The pending insert dict when the buy was adopted in the current sync pass.
+    record: Optional[dict] = None
+    touched: bool = False
+
+    @property
+    def is_closed(self) -> bool:
+        return self.remaining_quantity <= LOT_CLOSE_THRESHOLD
+
+
+class FifoLotBook:
+    """
+    In-memory FIFO book of open buy lots, built once per synchronization.
+    Lots are kept ordered by timestamp and consumed oldest-first with exact
+    Decimal arithmetic, so matching N sells costs no database round-trips.
+    """
+    def __init__(self):
+        self._lots: list[Lot] = []
+        self._keys: list[datetime.datetime] = []
+        self._head = 0  # Index of the oldest lot that may still have quantity.
+
+    @classmethod
+    def from_trades(cls, trades: Iterable) -> "FifoLotBook":
+        book = cls()
+        for trade in trades:
+            book.add(Lot(
+                trade_id=trade.trade_id,
+                price=Decimal(str(trade.price)),
+                quantity=Decimal(str(trade.quantity)),
+                remaining_quantity=Decimal(str(trade.remaining_quantity if trade.remaining_quantity is not None else trade.quantity)),
+                commission_usd=Decimal(str(trade.commission_usd or 0)),
+                timestamp=trade.timestamp,
+            ))
+        return book
+
+    def add(self, lot: Lot):
+        key = _as_utc(lot.timestamp)
+        index = bisect.bisect_right(self._keys, key, lo=self._head)
+        self._keys.insert(index, key)
+        self._lots.insert(index, lot)
+
+    def add_record(self, record: dict):
+        """Adds a buy that is being created in the current sync pass."""
+        self.add(Lot(
+            trade_id=record['trade_id'],
+            price=Decimal(str(record['price'])),
+            quantity=Decimal(str(record['quantity'])),
+            remaining_quantity=Decimal(str(record['quantity'])),
+            commission_usd=Decimal(str(record.get('commission_usd') or 0)),
+            timestamp=record['timestamp'],
+            record=record,
+        ))
+
+    def is_empty(self) -> bool:
+        return all(lot.remaining_quantity <= LOT_EPSILON for lot in self._lots[self._head:])
+
+    def consume(self, quantity: Decimal) -> list[tuple[Lot, Decimal]]:
+        """
+        Consumes `quantity` from the oldest lots first.
+        Returns the (lot, matched quantity) pairs; any excess is left unmatched.
+        """
+        matches = []
+        to_match = quantity
+        index = self._head
+        while to_match > LOT_EPSILON and index < len(self._lots):
+            lot = self._lots[index]
+            if lot.remaining_quantity > LOT_EPSILON:
+                matched = min(to_match, lot.remaining_quantity)
+                lot.remaining_quantity -= matched
+                lot.touched = True
+                to_match -= matched
+                matches.append((lot, matched))
+            if lot.remaining_quantity <= LOT_EPSILON:
+                index += 1
+        # Lots before the first one with quantity left are exhausted for good.
+        while self._head < len(self._lots) and self._lots[self._head].remaining_quantity <= LOT_EPSILON:
+            self._head += 1
+        return matches
+
+    def touched_lots(self) -> list[Lot]:
+        return [lot for lot in self._lots if lot.touched]
+
+
 class SynchronizationManager:
     """
     Handles the synchronization of trade history between Binance and the local database.
@@ -37,7 +145,16 @@ class SynchronizationManager:
         """
         Synchronizes the bot's state with the exchange using an event-driven approach.
         It processes trades from the exchange and reconciles them against the local state.
+
+        Open buy lots are loaded once into an in-memory FIFO book, every new exchange
+        trade is applied to that book in a single chronological pass, and the resulting
+        inserts and updates are written to the database in one transaction at the end.
         """
+        # Sync paging is bulk work: it yields exchange weight to orders and market data.
+        with request_lane(RequestLane.SYNC):
+            self._run_full_sync()
+
+    def _run_full_sync(self):
         logger.info("--- Starting State Synchronization (Event-Driven) ---")
         try:
             if not self.symbol:
@@ -62,11 +179,20 @@ class SynchronizationManager:
                 logger.info(f"Found {len(new_trades_from_binance)} new trades on the exchange to process.")
                 new_trades_from_binance.sort(key=lambda t: t['time'])
 
+                lot_book = FifoLotBook.from_trades(
+                    t for t in local_trades if t.order_type == 'buy' and t.status == 'OPEN'
+                )
+                new_records = []
+
                 for trade in new_trades_from_binance:
                     if trade['isBuyer']:
-                        self._create_position_from_binance_trade(trade, all_prices, "OPEN")
+                        buy_record = self._build_position_record(trade, all_prices, "OPEN")
+                        new_records.append(buy_record)
+                        lot_book.add_record(buy_record)
                     else:
-                        self._reconcile_external_sell(trade, all_prices)
+                        new_records.extend(self._reconcile_external_sell(trade, all_prices, lot_book))
+
+                self._flush_sync_batch(new_records, lot_book)
             
             self._final_balance_sanity_check()
             logger.info("--- State Synchronization Finished ---")
@@ -74,85 +200,89 @@ class SynchronizationManager:
         except Exception as e:
             logger.critical(f"A critical error occurred during state synchronization: {e}", exc_info=True)
 
-    def _reconcile_external_sell(self, sell_trade_data: dict, all_prices: dict):
+    def _reconcile_external_sell(self, sell_trade_data: dict, all_prices: dict, lot_book: "FifoLotBook") -> list:
         """
         Reconciles a sell trade that occurred outside the bot.
-        It finds the corresponding open buy positions, calculates PnL,
-        creates a local sell record, and updates the buy positions' remaining quantities.
+        It consumes the oldest open lots from the in-memory book, calculates PnL
+        and returns the sell records to be persisted. The matched lots are updated
+        in place; nothing is written to the database here.
         """
         sell_id = sell_trade_data['id']
-        sell_qty_to_match = Decimal(str(sell_trade_data['qty']))
+        sell_qty = Decimal(str(sell_trade_data['qty']))
         sell_price = Decimal(str(sell_trade_data['price']))
-        logger.info(f"-> Reconciling external sell (Binance Trade ID: {sell_id}, Qty: {sell_qty_to_match}, Price: {sell_price})")
+        logger.info(f"-> Reconciling external sell (Binance Trade ID: {sell_id}, Qty: {sell_qty}, Price: {sell_price})")
         sell_commission = Decimal(str(sell_trade_data['commission']))
         sell_commission_asset = sell_trade_data['commissionAsset']
-        
-        open_buys = self.db.get_open_positions(self.environment, self.symbol)
-        open_buys.sort(key=lambda t: t.timestamp)
 
-        if not open_buys:
+        if lot_book.is_empty():
             logger.warning(f"Found an external sell (ID: {sell_trade_data['id']}) but no open buy positions to match it against. Logging as unlinked.")
-            self._create_unlinked_sell_record(sell_trade_data, all_prices)
-            return
+            return [self._build_unlinked_sell_record(sell_trade_data, all_prices)]
 
-        for buy_trade in open_buys:
-            if sell_qty_to_match <= Decimal('1e-9'):
-                break
-
-            if buy_trade.remaining_quantity > Decimal('1e-9'):
-                qty_to_sell_from_this_buy = min(sell_qty_to_match, buy_trade.remaining_quantity)
-                
-                sell_commission_usd = self._calculate_commission_in_usd(sell_commission, sell_commission_asset, sell_price, all_prices)
-                
-                # Pro-rate commissions for accurate PnL
-                prorated_sell_commission = (sell_commission_usd / Decimal(str(sell_trade_data['qty']))) * qty_to_sell_from_this_buy if Decimal(str(sell_trade_data['qty'])) > 0 else Decimal('0')
-                prorated_buy_commission = (buy_trade.commission_usd / buy_trade.quantity) * qty_to_sell_from_this_buy if buy_trade.quantity > 0 else Decimal('0')
-
-                realized_pnl = self.strategy_rules.calculate_realized_pnl(
-                    buy_price=buy_trade.price,
-                    sell_price=sell_price,
-                    quantity_sold=qty_to_sell_from_this_buy,
-                    buy_commission_usd=prorated_buy_commission,
-                    sell_commission_usd=prorated_sell_commission,
-                    buy_quantity=buy_trade.quantity
-                )
+        sell_commission_usd = self._calculate_commission_in_usd(sell_commission, sell_commission_asset, sell_price, all_prices)
+        sell_timestamp = datetime.datetime.fromtimestamp(sell_trade_data['time'] / 1000, tz=datetime.timezone.utc)
 
-                new_sell_trade_data = {
-                    'run_id': self.run_id, 'environment': self.environment,
-                    'strategy_name': 'sync_external', 'symbol': self.symbol,
-                    'trade_id': f"sync_sell_{uuid.uuid4()}", 'linked_trade_id': buy_trade.trade_id,
-                    'exchange': 'binance', 'status': 'CLOSED', 'order_type': 'sell',
-                    'price': sell_price, 'quantity': qty_to_sell_from_this_buy,
-                    'usd_value': sell_price * qty_to_sell_from_this_buy,
-                    'commission': (sell_commission / Decimal(str(sell_trade_data['qty']))) * qty_to_sell_from_this_buy if Decimal(str(sell_trade_data['qty'])) > 0 else Decimal('0'),
-                    'commission_asset': sell_commission_asset, 'commission_usd': prorated_sell_commission,
-                    'timestamp': datetime.datetime.fromtimestamp(sell_trade_data['time'] / 1000, tz=datetime.timezone.utc),
-                    'exchange_order_id': str(sell_trade_data['orderId']),
-                    'binance_trade_id': int(sell_trade_data['id']),
-                    'decision_context': {'reason': 'sync_reconciled_external_sell'},
-                    'realized_pnl_usd': realized_pnl
-                }
-                self.trade_logger.log_trade(new_sell_trade_data)
-
-                new_remaining_qty = buy_trade.remaining_quantity - qty_to_sell_from_this_buy
-                update_payload = {'remaining_quantity': new_remaining_qty}
-                
-                log_msg = (
-                    f"   - Matched {qty_to_sell_from_this_buy:.8f} qty against Buy Trade ID: {str(buy_trade.trade_id)} "
-                    f"(bought at ${Decimal(buy_trade.price):.4f})"
-                )
-                logger.info(log_msg)
-                logger.info(f"   - Calculated Realized PnL for this portion: {float(realized_pnl):.4f}")
+        sell_records = []
+        for lot, qty_to_sell_from_this_buy in lot_book.consume(sell_qty):
+            # Pro-rate commissions for accurate PnL
+            prorated_sell_commission = (sell_commission_usd / sell_qty) * qty_to_sell_from_this_buy if sell_qty > 0 else Decimal('0')
+            prorated_buy_commission = (lot.commission_usd / lot.quantity) * qty_to_sell_from_this_buy if lot.quantity > 0 else Decimal('0')
 
-                if new_remaining_qty <= Decimal('1e-8'):
-                    update_payload['status'] = 'CLOSED'
-                    logger.info(f"   - Buy Trade {buy_trade.trade_id} is now fully closed.")
-                else:
-                    logger.info(f"   - Buy Trade {buy_trade.trade_id} has new remaining quantity: {new_remaining_qty:.8f}")
+            realized_pnl = self.strategy_rules.calculate_realized_pnl(
+                buy_price=lot.price,
+                sell_price=sell_price,
+                quantity_sold=qty_to_sell_from_this_buy,
+                buy_commission_usd=prorated_buy_commission,
+                sell_commission_usd=prorated_sell_commission,
+                buy_quantity=lot.quantity
+            )
+
+            sell_records.append({
+                'run_id': self.run_id, 'environment': self.environment,
+                'strategy_name': 'sync_external', 'symbol': self.symbol,
+                'trade_id': f"sync_sell_{uuid.uuid4()}", 'linked_trade_id': lot.trade_id,
+                'exchange': 'binance', 'status': 'CLOSED', 'order_type': 'sell',
+                'price': sell_price, 'quantity': qty_to_sell_from_this_buy,
+                'usd_value': sell_price * qty_to_sell_from_this_buy,
+                'commission': (sell_commission / sell_qty) * qty_to_sell_from_this_buy if sell_qty > 0 else Decimal('0'),
+                'commission_asset': sell_commission_asset, 'commission_usd': prorated_sell_commission,
+                'timestamp': sell_timestamp,
+                'exchange_order_id': str(sell_trade_data['orderId']),
+                'binance_trade_id': int(sell_trade_data['id']),
+                'decision_context': {'reason': 'sync_reconciled_external_sell'},
+                'realized_pnl_usd': realized_pnl
+            })
+
+            logger.info(
+                f"   - Matched {qty_to_sell_from_this_buy:.8f} qty against Buy Trade ID: {str(lot.trade_id)} "
+                f"(bought at ${Decimal(lot.price):.4f})"
+            )
+            logger.info(f"   - Calculated Realized PnL for this portion: {float(realized_pnl):.4f}")
+            if lot.is_closed:
+                logger.info(f"   - Buy Trade {lot.trade_id} is now fully closed.")
+            else:
+                logger.info(f"   - Buy Trade {lot.trade_id} has new remaining quantity: {lot.remaining_quantity:.8f}")
+
+        return sell_records
+
+    def _flush_sync_batch(self, new_records: list, lot_book: "FifoLotBook"):
+        """
+        Writes every record produced during the sync pass in one transaction.
+        Buys adopted in this same pass are inserted with their final remaining
+        quantity; pre-existing buys only receive a single update each.
+        """
+        trade_updates = {}
+        for lot in lot_book.touched_lots():
+            payload = {'remaining_quantity': lot.remaining_quantity}
+            if lot.is_closed:
+                payload['status'] = 'CLOSED'
+
+            if lot.record is not None:
+                lot.record.update(payload)
+            else:
+                trade_updates[lot.trade_id] = payload
 
-                self.db.update_trade(buy_trade.trade_id, update_payload)
-                
-                sell_qty_to_match -= qty_to_sell_from_this_buy
+        logger.info(f"Persisting sync batch: {len(new_records)} new trades, {len(trade_updates)} position updates.")
+        self.db.bulk_apply_sync_changes(new_records, trade_updates)
 
     def _final_balance_sanity_check(self):
         """
@@ -230,15 +360,16 @@ class SynchronizationManager:
         logger.warning(f"Could not find price for commission asset '{asset}'.")
         return Decimal('0')
 
-    def _create_position_from_binance_trade(self, binance_trade: dict, all_prices: dict, final_status: str):
+    def _build_position_record(self, binance_trade: dict, all_prices: dict, final_status: str) -> dict:
         purchase_price = Decimal(str(binance_trade['price']))
         quantity = Decimal(str(binance_trade['qty']))
         commission = Decimal(str(binance_trade['commission']))
         commission_asset = binance_trade['commissionAsset']
         commission_usd = self._calculate_commission_in_usd(commission, commission_asset, purchase_price, all_prices)
         sell_target_price = self.strategy_rules.calculate_sell_target_price(purchase_price, quantity, params=None)
-        trade_data = {
+        return {
             "run_id": self.run_id, "trade_id": f"sync_{uuid.uuid4()}", "symbol": self.symbol,
+            "strategy_name": "default", "exchange": "binance",
             "price": purchase_price, "quantity": quantity, "usd_value": purchase_price * quantity,
             "commission": commission, "commission_asset": commission_asset, "commission_usd": commission_usd,
             "exchange_order_id": str(binance_trade['orderId']), "binance_trade_id": int(binance_trade['id']),
@@ -246,15 +377,14 @@ class SynchronizationManager:
             "decision_context": {"reason": "sync_adopted_buy"}, "environment": self.environment,
             "status": final_status, "order_type": "buy", "sell_target_price": sell_target_price
         }
-        self.trade_logger.log_trade(trade_data)
 
-    def _create_unlinked_sell_record(self, sell_trade: dict, all_prices: dict):
+    def _build_unlinked_sell_record(self, sell_trade: dict, all_prices: dict) -> dict:
         sell_price = Decimal(str(sell_trade['price']))
         quantity = Decimal(str(sell_trade['qty']))
         commission = Decimal(str(sell_trade['commission']))
         commission_asset = sell_trade['commissionAsset']
         commission_usd = self._calculate_commission_in_usd(commission, commission_asset, sell_price, all_prices)
-        trade_data = {
+        return {
             'run_id': self.run_id, 'environment': self.environment, 'strategy_name': 'sync',
             'symbol': self.symbol, 'trade_id': f"sync_{uuid.uuid4()}", 'linked_trade_id': None,
             'exchange': 'binance', 'status': 'CLOSED', 'order_type': 'sell',
@@ -263,6 +393,5 @@ class SynchronizationManager:
             'commission': commission, 'commission_asset': commission_asset, 'commission_usd': commission_usd,
             'timestamp': datetime.datetime.fromtimestamp(sell_trade['time'] / 1000, tz=datetime.timezone.utc),
             'exchange_order_id': str(sell_trade['orderId']), 'binance_trade_id': int(sell_trade['id']),
-            'decision_context': {'reason': 'sync_unlinked_sell'}, 'realized_pnl_usd': 0
+            'decision_context': {'reason': 'sync_unlinked_sell'}, 'realized_pnl_usd': Decimal('0')
         }
-        self.trade_logger.log_trade(trade_data)
@@ -3,14 +3,13 @@ from typing import Optional
 import uuid
 import json
 import os
-import shutil
-import tempfile
 import threading
 import uvicorn
 from fastapi import FastAPI
 from datetime import datetime, timedelta
 from decimal import Decimal, getcontext, InvalidOperation
 from jules_bot.utils.logger import logger
+from jules_bot.utils.profiling import get_profiler, timed
 from jules_bot.utils.config_manager import config_manager
 from jules_bot.bot.synchronization_manager import SynchronizationManager
 from jules_bot.bot.account_manager import AccountManager
@@ -21,12 +20,15 @@ from jules_bot.core_logic.capital_manager import CapitalManager
 from jules_bot.core_logic.dynamic_parameters import DynamicParameters
 from jules_bot.bot.situational_awareness import SituationalAwareness
 from jules_bot.core.market_data_provider import MarketDataProvider
+from jules_bot.core.request_governor import RequestLane, request_lane
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.database.portfolio_manager import PortfolioManager as DbPortfolioManager
 from jules_bot.research.live_feature_calculator import LiveFeatureCalculator
 from jules_bot.services.status_service import StatusService
+from jules_bot.services.status_publisher import CycleSnapshot, StatusPublisher
+from jules_bot.services.status_channel import StatusChannelWriter, status_log_path
 from jules_bot.utils.helpers import _calculate_progress_pct, calculate_buy_progress
-from jules_bot.bot.api import router as api_router
+from jules_bot.bot.api import metrics_router, router as api_router
 
 getcontext().prec = 28
 
@@ -72,11 +74,11 @@ class LivePortfolioManager:
         try:
             total_portfolio_value_usd = usd_balance + open_positions_value_usd
 
-            # Fetch ONLY closed sell trades for accurate PnL and treasury calculation
-            closed_sell_trades = self.db_manager.get_closed_sell_trades_for_run(run_id=self.state_manager.bot_id)
+            # Realized PnL and treasury totals for this run come from the maintained aggregates table
+            pnl_summary = self.db_manager.get_realized_pnl_summary(run_id=self.state_manager.bot_id)
 
-            realized_pnl_usd = sum(Decimal(str(t.realized_pnl_usd or '0')) for t in closed_sell_trades)
-            btc_treasury_amount = sum(Decimal(str(t.hodl_asset_amount or '0')) for t in closed_sell_trades)
+            realized_pnl_usd = pnl_summary["realized_pnl_usd"]
+            btc_treasury_amount = pnl_summary["hodl_asset_amount"]
 
             # Ensure the price is fetched as a string to maintain precision with Decimal
             btc_price_str = self.trader.get_current_price('BTCUSDT')
@@ -128,8 +130,12 @@ class TradingBot:
         # These are initialized here to be accessible throughout the bot's lifecycle (e.g., for status updates)
         self.feature_calculator = LiveFeatureCalculator(self.db_manager, mode=self.mode)
         self.status_service = StatusService(self.db_manager, config_manager, self.feature_calculator)
+        # Status files are rendered on their own thread from the snapshot of each trading cycle.
+        self.status_publisher = StatusPublisher(self._publish_status, interval_seconds=4.0)
+        # The TUI follows an append-only log of changed status sections instead of re-reading a full JSON file.
+        self.status_channel = StatusChannelWriter(status_log_path(self.bot_name))
         self.state_manager = StateManager(mode=self.mode, bot_id=self.run_id, db_manager=self.db_manager, feature_calculator=self.feature_calculator)
-        self.account_manager = AccountManager(self.trader.client)
+        self.account_manager = AccountManager(self.trader.client, snapshot_cache=self.trader.snapshot_cache)
         self.strategy_rules = StrategyRules(config_manager)
         self.capital_manager = CapitalManager(config_manager, self.strategy_rules, self.db_manager)
 
@@ -155,12 +161,15 @@ class TradingBot:
         self.api_app = FastAPI(title=f"Jules Bot API - {self.bot_name}")
         self.api_app.state.bot = self  # Make bot instance available to endpoints
         self.api_app.include_router(api_router, prefix="/api")
+        self.api_app.include_router(metrics_router)  # Prometheus scrapes /metrics at the root.
         self.api_port = int(os.getenv('API_PORT', '8766'))
 
         # State for TUI synchronization
         self.last_decision_reason: str = "Initializing..."
         self.last_operating_mode: str = "STARTUP"
         self.last_difficulty_factor: Decimal = Decimal('0')
+        # Open positions seen by the last trading cycle, so /metrics never has to query the DB.
+        self.open_positions_count: Optional[int] = None
 
         # State for Regime Fallback
         self.last_known_regime = -1
@@ -195,6 +204,7 @@ class TradingBot:
             # Use default params for sell target calculation on manual override
             sell_target_price = self.strategy_rules.calculate_sell_target_price(purchase_price, quantity_bought, params=None)
             self.state_manager.create_new_position(buy_result, sell_target_price)
+            self.capital_manager.difficulty_tracker.record_trade("buy", datetime.utcnow())
             logger.info("Force buy executed and position created successfully. Updating status file.")
             try:
                 # Gather data for status update
@@ -273,6 +283,7 @@ class TradingBot:
                 sell_commission_usd, Decimal(str(position.quantity))
             )
             self.state_manager.close_forced_position(trade_id, sell_result, realized_pnl_usd)
+            self.capital_manager.difficulty_tracker.record_trade("sell", datetime.utcnow())
             logger.info(f"Force sell for trade {trade_id} executed successfully. Updating status file.")
             try:
                 # Gather data for status update
@@ -320,8 +331,8 @@ class TradingBot:
         if os.path.exists(signal_file_path):
             logger.info(f"Force refresh signal detected at '{signal_file_path}'. Updating status file now.")
             try:
-                # Call the self-contained update function
-                self._update_status_file()
+                # Republish the latest cycle snapshot on the status thread
+                self.status_publisher.request_refresh()
                 # Clean up the signal file
                 os.remove(signal_file_path)
                 logger.info("Force refresh complete and signal file removed.")
@@ -384,6 +395,7 @@ class TradingBot:
 
         # --- Process Results for Each Position Post-Sale ---
         logger.info(f"Consolidated sell successful. Processing {len(positions_to_sell_now)} individual positions.")
+        self.capital_manager.difficulty_tracker.record_trade("sell", datetime.utcnow())
         avg_sell_price = Decimal(str(sell_result.get('price', '0')))
         total_commission_usd = Decimal(str(sell_result.get('commission_usd', '0')))
 
@@ -422,6 +434,17 @@ class TradingBot:
         # Recalculate portfolio value once at the end
         self.live_portfolio_manager.get_total_portfolio_value(current_price, force_recalculation=True)
 
+    def _reload_difficulty_tracker(self):
+        """
+        Rebuilds the consecutive-buy streak from the trades inside the difficulty
+        reset window. Runs after each synchronization, which can import trades
+        the bot did not place itself; between syncs the bot records its own.
+        """
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(hours=self.capital_manager.difficulty_reset_timeout_hours)
+        trade_history = self.db_manager.get_trade_rows(columns=('timestamp', 'order_type'), mode=self.mode, start_date=start_date, end_date=end_date)
+        self.capital_manager.difficulty_tracker.load_history(trade_history)
+
     def _evaluate_and_execute_buy(self, market_data, open_positions, current_params, current_regime, current_price):
         cash_balance = Decimal(self.trader.get_account_balance("USDT"))
         buy_from_reversal = False
@@ -441,14 +464,11 @@ class TradingBot:
             else:
                 return # Skip normal buy evaluation this cycle
 
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(hours=self.capital_manager.difficulty_reset_timeout_hours)
-        trade_history = self.db_manager.get_all_trades_in_range(mode=self.mode, start_date=start_date, end_date=end_date, bot_id=self.run_id)
-
         total_portfolio_value = self.live_portfolio_manager.cached_portfolio_value
+        # The difficulty factor comes from the capital manager's streak tracker (see _reload_difficulty_tracker).
         buy_amount_usdt, operating_mode, reason, regime, difficulty_factor = self.capital_manager.get_buy_order_details(
             market_data=market_data, open_positions=open_positions, portfolio_value=total_portfolio_value,
-            free_cash=cash_balance, params=current_params, trade_history=trade_history,
+            free_cash=cash_balance, params=current_params, current_time=datetime.utcnow(),
             force_buy_signal=buy_from_reversal, forced_reason="Buy triggered by price reversal."
         )
         self.last_decision_reason, self.last_operating_mode, self.last_difficulty_factor = reason, operating_mode, difficulty_factor
@@ -469,6 +489,7 @@ class TradingBot:
                     if purchase_price > 0 and quantity_bought > 0:
                         sell_target_price = self.strategy_rules.calculate_sell_target_price(purchase_price, quantity_bought, params=current_params)
                         self.state_manager.create_new_position(buy_result, sell_target_price)
+                        self.capital_manager.difficulty_tracker.record_trade("buy", datetime.utcnow())
                         self.live_portfolio_manager.get_total_portfolio_value(purchase_price, force_recalculation=True)
                     else:
                         logger.critical(f"Could not execute buy. Invalid trade data received: price={purchase_price}, quantity={quantity_bought}")
@@ -495,7 +516,10 @@ class TradingBot:
         logger.info("Bot is starting initial synchronization. Trading is paused.")
         self.is_syncing = True
         self._update_sync_status_file()
-        self.sync_manager.run_full_sync()
+        profiler = get_profiler()
+        with profiler.timer("sync"):
+            self.sync_manager.run_full_sync()
+        self._reload_difficulty_tracker()
         self.is_syncing = False
         self._update_sync_status_file()
         logger.info("Initial synchronization complete. Trading is now enabled.")
@@ -507,131 +531,145 @@ class TradingBot:
         uvicorn_config = uvicorn.Config(self.api_app, host="0.0.0.0", port=self.api_port, log_level="info")
         api_thread = threading.Thread(target=uvicorn.Server(config=uvicorn_config).run, daemon=True)
         api_thread.start()
+        self.status_publisher.start()
         logger.info(f"🚀 --- TRADING BOT STARTED (API on port {self.api_port}) --- BOT NAME: {self.bot_name} --- RUN ID: {self.run_id} --- SYMBOL: {self.symbol} --- MODE: {self.mode.upper()} --- 🚀")
         last_recalc_time = 0
         last_status_update_time = 0
+        # Skipped cycles wait here, before the next cycle starts, so the wait stays out of the 'cycle' timer.
+        skip_delay = 0
         try:
             while self.is_running:
+                if skip_delay:
+                    time.sleep(skip_delay)
+                    skip_delay = 0
                 try:
-                    now = datetime.now()
-                    current_time = time.time()
-                    if self.last_sync_time is None or (now - self.last_sync_time) > timedelta(minutes=30):
-                        logger.info("Starting periodic trade history synchronization. Pausing trading.")
-                        self.is_syncing = True
-                        self._update_sync_status_file()
-                        self.sync_manager.run_full_sync()
-                        self.last_sync_time = now
-                        self.is_syncing = False
-                        self._update_sync_status_file()
-                        logger.info("Periodic synchronization complete. Resuming trading.")
-                    # Only run trading logic if the bot is not currently syncing
-                    if not self.is_syncing:
-                        if current_time - last_recalc_time > 60:
-                            logger.info("--- Recalculating all open position sell targets ---")
-                            self.state_manager.recalculate_open_position_targets(self.strategy_rules, self.sa_instance, self.dynamic_params)
-                            last_recalc_time = current_time
-                        self._check_and_handle_refresh_signal()
-                        logger.info("--- Starting new trading cycle ---")
-                        features_df = self.feature_calculator.get_features_dataframe()
-                        if features_df.empty:
-                            logger.warning("Could not get features dataframe. Skipping cycle.")
-                            time.sleep(10)
-                            continue
-                        final_candle = features_df.iloc[-1]
-                        if final_candle.isnull().any():
-                            logger.warning(f"Final candle contains NaN values, skipping cycle. Data: {final_candle.to_dict()}")
-                            time.sleep(10)
-                            continue
-                        market_data = final_candle.to_dict()
-                        current_price = Decimal(final_candle['close'])
-                        regime_df = self.sa_instance.transform(features_df)
+                    with profiler.cycle():
+                        now = datetime.now()
+                        current_time = time.time()
+                        if self.last_sync_time is None or (now - self.last_sync_time) > timedelta(minutes=30):
+                            logger.info("Starting periodic trade history synchronization. Pausing trading.")
+                            self.is_syncing = True
+                            self._update_sync_status_file()
+                            with profiler.timer("sync"):
+                                self.sync_manager.run_full_sync()
+                            self._reload_difficulty_tracker()
+                            self.last_sync_time = now
+                            self.is_syncing = False
+                            self._update_sync_status_file()
+                            logger.info("Periodic synchronization complete. Resuming trading.")
+                        # Only run trading logic if the bot is not currently syncing
+                        if not self.is_syncing:
+                            if current_time - last_recalc_time > 60:
+                                logger.info("--- Recalculating all open position sell targets ---")
+                                with profiler.timer("recalculate_targets"):
+                                    self.state_manager.recalculate_open_position_targets(self.strategy_rules, self.sa_instance, self.dynamic_params)
+                                last_recalc_time = current_time
+                            self._check_and_handle_refresh_signal()
+                            logger.info("--- Starting new trading cycle ---")
+                            with profiler.timer("features"):
+                                features_df = self.feature_calculator.get_features_dataframe()
+                            if features_df.empty:
+                                logger.warning("Could not get features dataframe. Skipping cycle.")
+                                skip_delay = 10
+                                continue
+                            final_candle = features_df.iloc[-1]
+                            if final_candle.isnull().any():
+                                logger.warning(f"Final candle contains NaN values, skipping cycle. Data: {final_candle.to_dict()}")
+                                skip_delay = 10
+                                continue
+                            market_data = final_candle.to_dict()
+                            current_price = Decimal(final_candle['close'])
+                            with profiler.timer("regime"):
+                                regime_df = self.sa_instance.transform(features_df)
                         
-                        # Encontra o último regime válido, ignorando os -1s que podem aparecer no início do dataset
-                        valid_regimes = regime_df[regime_df['market_regime'] != -1]['market_regime']
-                        calculated_regime = int(valid_regimes.iloc[-1]) if not valid_regimes.empty else -1
-
-                        current_regime = calculated_regime
-                        regime_source = "Calculated"
-
-                        # Se o regime calculado for indefinido, tenta usar o fallback
-                        if calculated_regime == -1 and self.use_regime_fallback:
-                            if self.last_known_regime != -1 and self.last_known_regime_timestamp is not None:
-                                time_since_last_known = time.time() - self.last_known_regime_timestamp
-                                if time_since_last_known < self.regime_fallback_ttl_seconds:
-                                    current_regime = self.last_known_regime
-                                    regime_source = f"Fallback (age: {time_since_last_known:.0f}s)"
-                                    logger.warning(f"Regime indefinido. Usando último regime conhecido: {current_regime} de {time_since_last_known:.0f}s atrás.")
-                                else:
-                                    logger.warning(f"Regime indefinido. Último regime conhecido ({self.last_known_regime}) expirou ({time_since_last_known:.0f}s > {self.regime_fallback_ttl_seconds}s).")
-
-                        # Se o regime atual (calculado ou fallback) for válido, atualiza o estado
-                        if current_regime != -1:
-                            self.last_known_regime = current_regime
-                            self.last_known_regime_timestamp = time.time()
-
-                        # Atualiza os parâmetros dinâmicos com o regime encontrado
-                        self.dynamic_params.update_parameters(current_regime)
-
-                        # Adiciona uma verificação para logar o regime atual e os parâmetros carregados
-                        regime_name_map = {v: k for k, v in self.sa_instance.regime_map.items()}
-                        regime_name = regime_name_map.get(current_regime, "UNDEFINED")
-                        logger.info(f"Regime de mercado atual: {regime_name} ({current_regime}) | Fonte: {regime_source}. Parâmetros carregados.")
+                            # Encontra o último regime válido, ignorando os -1s que podem aparecer no início do dataset
+                            valid_regimes = regime_df[regime_df['market_regime'] != -1]['market_regime']
+                            calculated_regime = int(valid_regimes.iloc[-1]) if not valid_regimes.empty else -1
+
+                            current_regime = calculated_regime
+                            regime_source = "Calculated"
+
+                            # Se o regime calculado for indefinido, tenta usar o fallback
+                            if calculated_regime == -1 and self.use_regime_fallback:
+                                if self.last_known_regime != -1 and self.last_known_regime_timestamp is not None:
+                                    time_since_last_known = time.time() - self.last_known_regime_timestamp
+                                    if time_since_last_known < self.regime_fallback_ttl_seconds:
+                                        current_regime = self.last_known_regime
+                                        regime_source = f"Fallback (age: {time_since_last_known:.0f}s)"
+                                        logger.warning(f"Regime indefinido. Usando último regime conhecido: {current_regime} de {time_since_last_known:.0f}s atrás.")
+                                    else:
+                                        logger.warning(f"Regime indefinido. Último regime conhecido ({self.last_known_regime}) expirou ({time_since_last_known:.0f}s > {self.regime_fallback_ttl_seconds}s).")
+
+                            # Se o regime atual (calculado ou fallback) for válido, atualiza o estado
+                            if current_regime != -1:
+                                self.last_known_regime = current_regime
+                                self.last_known_regime_timestamp = time.time()
+
+                            # Atualiza os parâmetros dinâmicos com o regime encontrado
+                            self.dynamic_params.update_parameters(current_regime)
+
+                            # Adiciona uma verificação para logar o regime atual e os parâmetros carregados
+                            regime_name_map = {v: k for k, v in self.sa_instance.regime_map.items()}
+                            regime_name = regime_name_map.get(current_regime, "UNDEFINED")
+                            logger.info(f"Regime de mercado atual: {regime_name} ({current_regime}) | Fonte: {regime_source}. Parâmetros carregados.")
                         
-                        if current_regime == -1:
-                            logger.warning("Market regime is -1 (undefined) and fallback is disabled or expired. Skipping buy/sell logic for this cycle.")
-                            time.sleep(10)
-                            continue
-                        current_params = self.dynamic_params.parameters
-                        open_positions = self.state_manager.get_open_positions()
-                        sell_candidates = []
-                        for position in open_positions:
-                            sell_target_price = Decimal(str(position.sell_target_price)) if position.sell_target_price is not None else Decimal('inf')
-                            if current_price >= sell_target_price:
-                                logger.info(f"✅ TAKE PROFIT HIT for position {position.trade_id} at ${current_price:,.2f} (Target: ${sell_target_price:,.2f}).")
-                                sell_candidates.append((position, "take_profit"))
+                            if current_regime == -1:
+                                logger.warning("Market regime is -1 (undefined) and fallback is disabled or expired. Skipping buy/sell logic for this cycle.")
+                                skip_delay = 10
                                 continue
-                            net_unrealized_pnl = self.strategy_rules.calculate_net_unrealized_pnl(entry_price=Decimal(str(position.price)), current_price=current_price, total_quantity=Decimal(str(position.remaining_quantity)), buy_commission_usd=Decimal(str(position.commission_usd or '0')))
-                            decision, reason, new_trail_percentage = self.strategy_rules.evaluate_smart_trailing_stop(position.to_dict(), net_unrealized_pnl, self.dynamic_params.parameters)
-                            if decision == "ACTIVATE":
-                                logger.info(f"🚀 {reason}")
-                                self.state_manager.update_trade_smart_trailing_state(trade_id=position.trade_id, is_active=True, highest_profit=net_unrealized_pnl, activation_price=current_price)
-                                position.is_smart_trailing_active = True
-                                position.smart_trailing_highest_profit = net_unrealized_pnl
-                                position.smart_trailing_activation_price = current_price
-                            elif decision == "UPDATE_PEAK":
-                                logger.info(f"📈 {reason}")
-                                self.state_manager.update_trade_smart_trailing_state(trade_id=position.trade_id, is_active=True, highest_profit=net_unrealized_pnl, current_trail_percentage=new_trail_percentage)
-                                position.smart_trailing_highest_profit = net_unrealized_pnl
-                                if new_trail_percentage:
-                                    position.current_trail_percentage = new_trail_percentage
-                            elif decision == "DEACTIVATE":
-                                logger.info(f"🔵 {reason}")
-                                self.state_manager.update_trade_smart_trailing_state(
-                                    trade_id=position.trade_id,
-                                    is_active=False,
-                                    highest_profit=Decimal('0'),
-                                    activation_price=None,
-                                    current_trail_percentage=None
-                                )
-                                position.is_smart_trailing_active = False
-                                position.smart_trailing_highest_profit = Decimal('0')
-                                position.smart_trailing_activation_price = None
-                            elif decision == "SELL":
-                                logger.info(f"✅ {reason}")
-                                sell_candidates.append((position, "trailing_stop"))
-                        if sell_candidates:
-                            self._execute_sell_candidates(sell_candidates, current_price, base_asset, market_data)
-                        self._evaluate_and_execute_buy(market_data, open_positions, current_params, current_regime, current_price)
-                    else:
-                        logger.info("Trading logic is paused while the bot is synchronizing.")
-                    if current_time - last_status_update_time > 4:
-                        total_portfolio_value = self.live_portfolio_manager.get_total_portfolio_value(current_price, force_recalculation=True)
-                        all_prices = self.trader.get_all_prices()
-                        wallet_balances = self.account_manager.get_all_account_balances(all_prices)
-                        full_trade_history = self.state_manager.get_trade_history_for_run()
-                        self._write_state_to_file(open_positions, current_price, wallet_balances, full_trade_history, total_portfolio_value)
-                        self._update_status_file(market_data, current_params, open_positions, total_portfolio_value, current_regime)
-                        last_status_update_time = current_time
+                            current_params = self.dynamic_params.parameters
+                            with profiler.timer("positions.read"):
+                                open_positions = self.state_manager.get_open_positions()
+                            self.open_positions_count = len(open_positions)
+                            sell_candidates = []
+                            with profiler.timer("sell.evaluate"):
+                                for position in open_positions:
+                                    sell_target_price = Decimal(str(position.sell_target_price)) if position.sell_target_price is not None else Decimal('inf')
+                                    if current_price >= sell_target_price:
+                                        logger.info(f"✅ TAKE PROFIT HIT for position {position.trade_id} at ${current_price:,.2f} (Target: ${sell_target_price:,.2f}).")
+                                        sell_candidates.append((position, "take_profit"))
+                                        continue
+                                    net_unrealized_pnl = self.strategy_rules.calculate_net_unrealized_pnl(entry_price=Decimal(str(position.price)), current_price=current_price, total_quantity=Decimal(str(position.remaining_quantity)), buy_commission_usd=Decimal(str(position.commission_usd or '0')))
+                                    decision, reason, new_trail_percentage = self.strategy_rules.evaluate_smart_trailing_stop(position.to_dict(), net_unrealized_pnl, self.dynamic_params.parameters)
+                                    if decision == "ACTIVATE":
+                                        logger.info(f"🚀 {reason}")
+                                        self.state_manager.update_trade_smart_trailing_state(trade_id=position.trade_id, is_active=True, highest_profit=net_unrealized_pnl, activation_price=current_price)
+                                        position.is_smart_trailing_active = True
+                                        position.smart_trailing_highest_profit = net_unrealized_pnl
+                                        position.smart_trailing_activation_price = current_price
+                                    elif decision == "UPDATE_PEAK":
+                                        logger.info(f"📈 {reason}")
+                                        self.state_manager.update_trade_smart_trailing_state(trade_id=position.trade_id, is_active=True, highest_profit=net_unrealized_pnl, current_trail_percentage=new_trail_percentage)
+                                        position.smart_trailing_highest_profit = net_unrealized_pnl
+                                        if new_trail_percentage:
+                                            position.current_trail_percentage = new_trail_percentage
+                                    elif decision == "DEACTIVATE":
+                                        logger.info(f"🔵 {reason}")
+                                        self.state_manager.update_trade_smart_trailing_state(
+                                            trade_id=position.trade_id,
+                                            is_active=False,
+                                            highest_profit=Decimal('0'),
+                                            activation_price=None,
+                                            current_trail_percentage=None
+                                        )
+                                        position.is_smart_trailing_active = False
+                                        position.smart_trailing_highest_profit = Decimal('0')
+                                        position.smart_trailing_activation_price = None
+                                    elif decision == "SELL":
+                                        logger.info(f"✅ {reason}")
+                                        sell_candidates.append((position, "trailing_stop"))
+                            if sell_candidates:
+                                with profiler.timer("sell.execute"):
+                                    self._execute_sell_candidates(sell_candidates, current_price, base_asset, market_data)
+                            with profiler.timer("buy.evaluate"):
+                                self._evaluate_and_execute_buy(market_data, open_positions, current_params, current_regime, current_price)
+                        else:
+                            logger.info("Trading logic is paused while the bot is synchronizing.")
+                        if current_time - last_status_update_time > 4:
+                            with profiler.timer("status.submit"):
+                                total_portfolio_value = self.live_portfolio_manager.get_total_portfolio_value(current_price, force_recalculation=True)
+                                self.status_publisher.submit(self._build_cycle_snapshot(market_data, current_price, current_params, open_positions, total_portfolio_value, current_regime))
+                            last_status_update_time = current_time
                     logger.info("--- Cycle complete. Waiting 2 seconds...")
                     time.sleep(2)
                 except Exception as e:
@@ -651,42 +689,70 @@ class TradingBot:
 
     def _write_status_file_for_tui(self, status_data: dict):
         """
-        Safely writes the status data to a file for the TUI to consume.
-        Uses a temporary file and atomic move for safety.
+        Publishes the status data to the TUI's status log. Only the sections that
+        changed since the previous publish are appended.
         """
         try:
             self._ensure_tui_directory_exists()
-            status_file_path = os.path.join(".tui_files", f".bot_status_{self.bot_name}.json")
-            
-            # Use a temporary file in the same directory to ensure atomic move
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, dir=".tui_files", prefix=f".bot_status_{self.bot_name}_", suffix=".tmp") as temp_f:
-                json.dump(status_data, temp_f, default=str)
-                temp_path = temp_f.name
-
-            # shutil.move is more robust than os.rename across filesystems (common in Docker)
-            shutil.move(temp_path, status_file_path)
-            logger.info("Status file update complete.")
+            seq = self.status_channel.publish(status_data)
+            if seq is None:
+                logger.debug("Status unchanged, nothing published to the TUI.")
+            else:
+                logger.info(f"Status update #{seq} published to the TUI.")
         except Exception as e:
-            logger.error(f"Failed to write status file for TUI during update: {e}", exc_info=True)
-
+            logger.error(f"Failed to publish status for TUI during update: {e}", exc_info=True)
+
+
+    def _build_cycle_snapshot(self, market_data, current_price, current_params, open_positions, total_portfolio_value, current_regime) -> CycleSnapshot:
+        """Captures what this trading cycle already computed so the status thread can reuse it."""
+        return CycleSnapshot(
+            market_data=dict(market_data),
+            current_price=Decimal(str(current_price)),
+            current_regime=current_regime,
+            current_params=dict(current_params),
+            open_positions=list(open_positions),
+            portfolio_value=total_portfolio_value,
+            cash_balance=self.live_portfolio_manager.cached_cash_balance,
+            invested_value=self.live_portfolio_manager.cached_open_positions_value,
+            decision_reason=self.last_decision_reason,
+            operating_mode=self.last_operating_mode,
+            difficulty_factor=self.last_difficulty_factor,
+        )
 
     def _update_status_file(self, market_data, current_params, open_positions, total_portfolio_value, current_regime):
         """
-        Gathers the bot's current state and triggers the write to the JSON file for the TUI.
+        Hands the bot's current state to the status publisher and asks for an immediate refresh.
+        """
+        current_price = Decimal(str(market_data.get('close', '0'))) if market_data else Decimal('0')
+        snapshot = self._build_cycle_snapshot(market_data, current_price, current_params, open_positions, total_portfolio_value, current_regime)
+        self.status_publisher.submit(snapshot, force=True)
+
+    @timed("status.publish")
+    def _publish_status(self, snapshot: CycleSnapshot):
+        """
+        Runs on the status publisher thread: writes the state file, the DB status
+        row and the TUI status file from a cycle snapshot.
         """
         logger.info("Starting status file update...")
+        with request_lane(RequestLane.UI):
+            all_prices = self.trader.get_all_prices()
+            wallet_balances = self.account_manager.get_all_account_balances(all_prices)
+        full_trade_history = self.state_manager.get_trade_history_for_run()
+        self._write_state_to_file(snapshot.open_positions, snapshot.current_price, wallet_balances, full_trade_history, snapshot.portfolio_value)
+
         # 1. Update the status in the database (internal state)
+        buy_target, buy_progress = calculate_buy_progress(snapshot.market_data, snapshot.current_params, snapshot.difficulty_factor)
         self.status_service.update_bot_status(
-            bot_id=self.bot_name, mode=self.mode, reason=self.last_decision_reason,
-            open_positions=len(open_positions), portfolio_value=total_portfolio_value,
-            market_regime=current_regime, operating_mode=self.last_operating_mode,
-            buy_target=calculate_buy_progress(market_data, current_params, self.last_difficulty_factor)[0],
-            buy_progress=calculate_buy_progress(market_data, current_params, self.last_difficulty_factor)[1],
-            cash_balance=self.live_portfolio_manager.cached_cash_balance,
-            invested_value=self.live_portfolio_manager.cached_open_positions_value
+            bot_id=self.bot_name, mode=self.mode, reason=snapshot.decision_reason,
+            open_positions=len(snapshot.open_positions), portfolio_value=snapshot.portfolio_value,
+            market_regime=snapshot.current_regime, operating_mode=snapshot.operating_mode,
+            buy_target=buy_target,
+            buy_progress=buy_progress,
+            cash_balance=snapshot.cash_balance,
+            invested_value=snapshot.invested_value
         )
         # 2. Get the full, extended status for the TUI
-        status_data = self.status_service.get_extended_status(self.mode, self.bot_name)
+        status_data = self.status_service.get_extended_status(self.mode, self.bot_name, cycle_snapshot=snapshot)
 
         # 3. Add portfolio history to the TUI data
         portfolio_history = self.db_manager.get_portfolio_history(self.bot_name)
@@ -701,36 +767,29 @@ class TradingBot:
         logger.info("Updating TUI with sync status...")
         try:
             self._ensure_tui_directory_exists()
-            status_file_path = os.path.join(".tui_files", f".bot_status_{self.bot_name}.json")
-            
-            status_data = {}
-            # Read existing data if possible to not overwrite everything
-            if os.path.exists(status_file_path):
-                try:
-                    with open(status_file_path, "r") as f:
-                        status_data = json.load(f)
-                except (json.JSONDecodeError, IOError):
-                    logger.warning(f"Could not read existing status file at {status_file_path}. A new one will be created.")
-
-            # Override only the necessary fields for sync status
+            # Override only the sections needed for the sync status; the rest of the last publish is kept.
+            buy_signal_status = dict(self.status_channel.get_section('buy_signal_status') or {})
             if self.is_syncing:
-                status_data['bot_status'] = "SYNCHRONIZING..."
-                if 'buy_signal_status' not in status_data: status_data['buy_signal_status'] = {}
-                status_data['buy_signal_status']['operating_mode'] = "SYNCHRONIZING..."
-                status_data['buy_signal_status']['reason'] = "Performing state synchronization with the exchange."
+                bot_status = "SYNCHRONIZING..."
+                buy_signal_status['operating_mode'] = "SYNCHRONIZING..."
+                buy_signal_status['reason'] = "Performing state synchronization with the exchange."
             else:
-                status_data['bot_status'] = "RUNNING"
-                if 'buy_signal_status' in status_data:
-                    status_data['buy_signal_status']['operating_mode'] = self.last_operating_mode
-                    status_data['buy_signal_status']['reason'] = self.last_decision_reason
-
-            # Write the updated data to the file
-            self._write_status_file_for_tui(status_data)
+                bot_status = "RUNNING"
+                if buy_signal_status:
+                    buy_signal_status['operating_mode'] = self.last_operating_mode
+                    buy_signal_status['reason'] = self.last_decision_reason
+
+            sections = {'bot_status': bot_status}
+            if buy_signal_status:
+                sections['buy_signal_status'] = buy_signal_status
+            self.status_channel.update_sections(sections)
         except Exception as e:
             logger.error(f"Failed to write sync status file for TUI: {e}", exc_info=True)
 
     def shutdown(self):
         logger.info("[SHUTDOWN] Initiating graceful shutdown...")
+        if hasattr(self, 'status_publisher'):
+            self.status_publisher.stop()
         if hasattr(self, 'status_service'):
             self.status_service.set_bot_stopped(self.bot_name)
         logger.info("[SHUTDOWN] Cleanup complete. Goodbye!")
\ No newline at end of file
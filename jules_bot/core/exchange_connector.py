@@ -3,6 +3,8 @@ import pandas as pd
 import logging
 from binance.client import Client
 from jules_bot.utils.config_manager import config_manager
+from jules_bot.core.exchange_snapshot import get_snapshot_cache
+from jules_bot.core.request_governor import get_request_governor
 
 class ExchangeManager:
     """
@@ -16,6 +18,7 @@ class ExchangeManager:
         self.mode = mode
         self.bot_name = config_manager.bot_name # Get bot_name from the initialized manager
         self.client = self._initialize_binance_client()
+        self.snapshot_cache = get_snapshot_cache(mode)
 
     def _initialize_binance_client(self):
         """Initializes the Binance client based on the execution mode."""
@@ -38,6 +41,7 @@ class ExchangeManager:
 
         requests_params = {"timeout": 30}
         client = Client(api_key, api_secret, testnet=testnet, requests_params=requests_params)
+        get_request_governor().attach(client)
         logging.info(f"Binance client initialized for {'testnet' if testnet else 'mainnet'}.")
         return client
 
@@ -82,8 +86,7 @@ class ExchangeManager:
             logging.error("Binance client not initialized.")
             return None
         try:
-            ticker = self.client.get_ticker(symbol=symbol)
-            return float(ticker['lastPrice'])
+            return float(self.snapshot_cache.get_symbol_price(self.client, symbol))
         except Exception as e:
             logging.error(f"Error fetching current price for {symbol}: {e}")
             return None
@@ -96,7 +99,7 @@ class ExchangeManager:
             logging.error("Binance client not initialized.")
             return []
         try:
-            account_info = self.client.get_account()
+            account_info = self.snapshot_cache.get_account(self.client)
             balances = [
                 {
                     'asset': balance['asset'],
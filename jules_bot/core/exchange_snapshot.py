@@ -0,0 +1,136 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+
+DEFAULT_SNAPSHOT_TTL_SECONDS = 2.0
+
+
+class ExchangeSnapshotCache:
+    """
+    A short-lived, thread-safe snapshot of the account balances and ticker prices.
+
+    Every component that needs balances or prices within the same trading cycle
+    (Trader, AccountManager, ExchangeManager, StatusService) reads through the same
+    snapshot instead of hitting the exchange again. The account snapshot is dropped
+    as soon as an order fills, so balances are never served stale after a trade.
+    """
+    def __init__(self, ttl_seconds: float = DEFAULT_SNAPSHOT_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.RLock()
+
+        self._account: Optional[dict] = None
+        self._account_fetched_at = 0.0
+        self._tickers: Optional[list] = None
+        self._tickers_fetched_at = 0.0
+        self._symbol_prices: Dict[str, tuple[str, float]] = {}
+
+        self._metrics = {
+            "account_requests": 0,
+            "account_fetches": 0,
+            "ticker_requests": 0,
+            "ticker_fetches": 0,
+            "invalidations": 0,
+        }
+
+    def _is_fresh(self, fetched_at: float) -> bool:
+        return self.ttl_seconds > 0 and (self._clock() - fetched_at) < self.ttl_seconds
+
+    def get_account(self, client) -> dict:
+        """Returns the `client.get_account()` payload, fetching it only when the snapshot expired."""
+        with self._lock:
+            self._metrics["account_requests"] += 1
+            if self._account is not None and self._is_fresh(self._account_fetched_at):
+                return self._account
+
+            account = client.get_account()
+            self._metrics["account_fetches"] += 1
+            self._account = account
+            self._account_fetched_at = self._clock()
+            return account
+
+    def get_all_tickers(self, client) -> list:
+        """Returns the `client.get_all_tickers()` payload, fetching it only when the snapshot expired."""
+        with self._lock:
+            self._metrics["ticker_requests"] += 1
+            if self._tickers is not None and self._is_fresh(self._tickers_fetched_at):
+                return self._tickers
+
+            tickers = client.get_all_tickers()
+            self._metrics["ticker_fetches"] += 1
+            self._tickers = tickers
+            self._tickers_fetched_at = self._clock()
+            return tickers
+
+    def get_symbol_price(self, client, symbol: str) -> str:
+        """
+        Returns the latest price for a single symbol as a string.
+        A fresh all-tickers snapshot is used when available; otherwise only the
+        single symbol is requested and cached.
+        """
+        with self._lock:
+            self._metrics["ticker_requests"] += 1
+            if self._tickers is not None and self._is_fresh(self._tickers_fetched_at):
+                price = next((t['price'] for t in self._tickers if t['symbol'] == symbol), None)
+                if price is not None:
+                    return price
+
+            cached = self._symbol_prices.get(symbol)
+            if cached is not None and self._is_fresh(cached[1]):
+                return cached[0]
+
+            ticker = client.get_symbol_ticker(symbol=symbol)
+            self._metrics["ticker_fetches"] += 1
+            self._symbol_prices[symbol] = (ticker['price'], self._clock())
+            return ticker['price']
+
+    def invalidate_account(self):
+        """Drops the balances snapshot. Must be called right after any order fill."""
+        with self._lock:
+            self._account = None
+            self._metrics["invalidations"] += 1
+        logger.debug("Exchange snapshot: account balances invalidated after order fill.")
+
+    def invalidate_all(self):
+        """Drops both the balances and the price snapshots."""
+        with self._lock:
+            self._account = None
+            self._tickers = None
+            self._symbol_prices.clear()
+            self._metrics["invalidations"] += 1
+
+    def get_metrics(self) -> dict:
+        """Returns request counters, including how many exchange calls the cache saved."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        requests = metrics["account_requests"] + metrics["ticker_requests"]
+        fetches = metrics["account_fetches"] + metrics["ticker_fetches"]
+        metrics["calls_saved"] = requests - fetches
+        metrics["hit_ratio"] = round((requests - fetches) / requests, 4) if requests else 0.0
+        metrics["ttl_seconds"] = self.ttl_seconds
+        return metrics
+
+
+_snapshot_caches: Dict[str, ExchangeSnapshotCache] = {}
+_registry_lock = threading.Lock()
+
+
+def get_snapshot_cache(mode: str) -> ExchangeSnapshotCache:
+    """
+    Returns the process-wide snapshot cache for a trading mode.
+    'trade' and 'test' point at different accounts, so each gets its own cache.
+    """
+    with _registry_lock:
+        cache = _snapshot_caches.get(mode)
+        if cache is None:
+            try:
+                ttl = float(config_manager.get('APP', 'snapshot_ttl_seconds', fallback=str(DEFAULT_SNAPSHOT_TTL_SECONDS)))
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid APP.snapshot_ttl_seconds, using default of {DEFAULT_SNAPSHOT_TTL_SECONDS}s.")
+                ttl = DEFAULT_SNAPSHOT_TTL_SECONDS
+            cache = ExchangeSnapshotCache(ttl_seconds=ttl)
+            _snapshot_caches[mode] = cache
+        return cache
@@ -0,0 +1,284 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+from jules_bot.utils.profiling import timer
+
+DEFAULT_WEIGHT_LIMIT = 6000
+DEFAULT_WINDOW_SECONDS = 60.0
+USED_WEIGHT_HEADER = 'x-mbx-used-weight-1m'
+
+
+class RequestLane(IntEnum):
+    """Priority lanes for exchange requests. Lower values are served first."""
+    ORDERS = 0
+    MARKET_DATA = 1
+    SYNC = 2
+    UI = 3
+
+
+# Fraction of the weight limit each lane may consume, and how long it may queue
+# for capacity before the request is shed. UI work never queues.
+LANE_POLICIES: Dict[RequestLane, dict] = {
+    RequestLane.ORDERS: {"admit_fraction": 1.0, "max_wait_seconds": 15.0},
+    RequestLane.MARKET_DATA: {"admit_fraction": 0.9, "max_wait_seconds": 5.0},
+    RequestLane.SYNC: {"admit_fraction": 0.75, "max_wait_seconds": 30.0},
+    RequestLane.UI: {"admit_fraction": 0.6, "max_wait_seconds": 0.0},
+}
+
+# Approximate Binance spot weights. The response header corrects any drift.
+ENDPOINT_WEIGHTS = {
+    'account': 20,
+    'myTrades': 20,
+    'allOrders': 20,
+    'exchangeInfo': 20,
+    'klines': 2,
+    'aggTrades': 2,
+    'avgPrice': 2,
+}
+SYMBOL_OPTIONAL_WEIGHTS = {
+    # endpoint: (weight with symbol, weight without symbol)
+    'price': (2, 4),
+    '24hr': (2, 80),
+    'openOrders': (6, 80),
+}
+DEFAULT_ENDPOINT_WEIGHT = 1
+
+SYNC_ENDPOINTS = {'myTrades', 'allOrders'}
+
+_lane_context = threading.local()
+
+
+@contextmanager
+def request_lane(lane: RequestLane):
+    """Runs every exchange request made by the current thread inside `lane`."""
+    stack = getattr(_lane_context, 'stack', None)
+    if stack is None:
+        stack = _lane_context.stack = []
+    stack.append(lane)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def _current_lane() -> Optional[RequestLane]:
+    stack = getattr(_lane_context, 'stack', None)
+    return stack[-1] if stack else None
+
+
+class RequestShedError(BinanceRequestException):
+    """Raised when a request is dropped to protect the exchange weight budget."""
+
+
+def endpoint_name(uri: str) -> str:
+    """Returns the last path segment of a Binance REST URI, e.g. 'myTrades'."""
+    return urlparse(uri).path.rstrip('/').rsplit('/', 1)[-1]
+
+
+def classify_request(method: str, uri: str, params: Optional[dict] = None) -> tuple[RequestLane, int]:
+    """Returns the default lane and estimated weight for a raw Binance request."""
+    endpoint = endpoint_name(uri)
+    has_symbol = bool(params) and 'symbol' in params
+
+    if endpoint in SYMBOL_OPTIONAL_WEIGHTS:
+        with_symbol, without_symbol = SYMBOL_OPTIONAL_WEIGHTS[endpoint]
+        weight = with_symbol if has_symbol else without_symbol
+    else:
+        weight = ENDPOINT_WEIGHTS.get(endpoint, DEFAULT_ENDPOINT_WEIGHT)
+
+    if endpoint == 'order' and method.lower() != 'get':
+        lane = RequestLane.ORDERS
+    elif endpoint in SYNC_ENDPOINTS:
+        lane = RequestLane.SYNC
+    else:
+        # Balances and other reads default to market data; UI callers opt down explicitly.
+        lane = RequestLane.MARKET_DATA
+    return lane, weight
+
+
+class RequestWeightGovernor:
+    """
+    A process-wide scheduler for Binance REST requests.
+
+    It keeps a running count of the request weight used in the current one-minute
+    window, preferring the server's own `X-MBX-USED-WEIGHT-1M` header whenever a
+    response carries it. Each request is admitted through a priority lane; as usage
+    approaches the limit, lower lanes queue until the window rolls over (or shed
+    immediately, for UI work), so an order is never blocked by a status refresh.
+    A 429/418 response pauses every lane until the server's Retry-After expires.
+    """
+    def __init__(self, weight_limit: int = DEFAULT_WEIGHT_LIMIT, window_seconds: float = DEFAULT_WINDOW_SECONDS,
+                 clock: Callable[[], float] = time.time, poll_interval: float = 0.25):
+        self.weight_limit = weight_limit
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._poll_interval = poll_interval
+        self._condition = threading.Condition()
+
+        self._window_id = self._window_for(clock())
+        self._used_weight = 0
+        self._in_flight_weight = 0
+        self._banned_until = 0.0
+
+        self._waiters: list = []
+        self._sequence = itertools.count()
+        self._metrics = {lane.name.lower(): {"admitted": 0, "queued": 0, "shed": 0} for lane in RequestLane}
+        self._metrics["rate_limited_responses"] = 0
+
+    def _window_for(self, now: float) -> int:
+        return int(now // self.window_seconds)
+
+    def _roll_window(self, now: float):
+        window_id = self._window_for(now)
+        if window_id != self._window_id:
+            self._window_id = window_id
+            self._used_weight = self._in_flight_weight
+
+    def _has_capacity(self, lane: RequestLane, weight: int, now: float) -> bool:
+        if now < self._banned_until:
+            return False
+        budget = self.weight_limit * LANE_POLICIES[lane]["admit_fraction"]
+        return self._used_weight + weight <= budget
+
+    def _seconds_until_capacity_may_change(self, now: float) -> float:
+        if now < self._banned_until:
+            return self._banned_until - now
+        return (self._window_id + 1) * self.window_seconds - now
+
+    def acquire(self, lane: RequestLane, weight: int):
+        """Blocks until `weight` can be spent in `lane`, or raises RequestShedError."""
+        policy = LANE_POLICIES[lane]
+        lane_metrics = self._metrics[lane.name.lower()]
+
+        with self._condition:
+            now = self._clock()
+            deadline = now + policy["max_wait_seconds"]
+            ticket = (int(lane), next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            queued = False
+            try:
+                while True:
+                    now = self._clock()
+                    self._roll_window(now)
+                    if self._waiters[0] == ticket and self._has_capacity(lane, weight, now):
+                        heapq.heappop(self._waiters)
+                        self._used_weight += weight
+                        self._in_flight_weight += weight
+                        lane_metrics["admitted"] += 1
+                        self._condition.notify_all()
+                        return
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        lane_metrics["shed"] += 1
+                        raise RequestShedError(
+                            f"Request shed from lane '{lane.name}': {self._used_weight}/{self.weight_limit} weight used."
+                        )
+                    if not queued:
+                        queued = True
+                        lane_metrics["queued"] += 1
+                    self._condition.wait(timeout=min(remaining, self._seconds_until_capacity_may_change(now), self._poll_interval))
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._condition.notify_all()
+                raise
+
+    def release(self, weight: int, headers: Optional[dict] = None, status_code: Optional[int] = None):
+        """Records a finished request and reconciles usage with the response headers."""
+        with self._condition:
+            now = self._clock()
+            self._in_flight_weight = max(0, self._in_flight_weight - weight)
+            self._roll_window(now)
+
+            used_header = headers.get(USED_WEIGHT_HEADER) if headers else None
+            if used_header is not None:
+                try:
+                    self._used_weight = int(used_header) + self._in_flight_weight
+                except (TypeError, ValueError):
+                    logger.debug(f"Ignoring malformed {USED_WEIGHT_HEADER} header: {used_header!r}")
+
+            if status_code in (418, 429):
+                retry_after = headers.get('Retry-After') if headers else None
+                try:
+                    backoff = float(retry_after) if retry_after is not None else self.window_seconds
+                except (TypeError, ValueError):
+                    backoff = self.window_seconds
+                self._banned_until = max(self._banned_until, now + backoff)
+                self._metrics["rate_limited_responses"] += 1
+                logger.warning(f"Binance returned HTTP {status_code}. Pausing all exchange requests for {backoff:.0f}s.")
+
+            self._condition.notify_all()
+
+    def attach(self, client):
+        """Routes every REST call made by a python-binance `client` through this governor."""
+        if client is None or getattr(client, '_request_governor', None) is self:
+            return client
+
+        raw_request = client._request
+
+        def governed_request(method, uri, signed, force_params=False, **kwargs):
+            default_lane, weight = classify_request(method, uri, kwargs.get('data'))
+            lane = _current_lane()
+            if lane is None or default_lane == RequestLane.ORDERS:
+                lane = default_lane
+
+            self.acquire(lane, weight)
+            response = None
+            try:
+                with timer(f"exchange.{endpoint_name(uri)}"):
+                    result = raw_request(method, uri, signed, force_params, **kwargs)
+                response = getattr(client, 'response', None)
+                return result
+            except BinanceAPIException as e:
+                response = e.response
+                raise
+            finally:
+                self.release(weight, getattr(response, 'headers', None), getattr(response, 'status_code', None))
+
+        client._request = governed_request
+        client._request_governor = self
+        return client
+
+    def get_metrics(self) -> dict:
+        """Returns current weight usage and per-lane admission counters."""
+        with self._condition:
+            now = self._clock()
+            self._roll_window(now)
+            metrics = {key: dict(value) if isinstance(value, dict) else value for key, value in self._metrics.items()}
+            metrics.update({
+                "used_weight": self._used_weight,
+                "weight_limit": self.weight_limit,
+                "queued_now": len(self._waiters),
+                "banned_for_seconds": round(max(0.0, self._banned_until - now), 2),
+            })
+            return metrics
+
+
+_governor: Optional[RequestWeightGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_request_governor() -> RequestWeightGovernor:
+    """Returns the process-wide governor shared by every Binance client."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            try:
+                limit = int(config_manager.get('APP', 'request_weight_limit', fallback=str(DEFAULT_WEIGHT_LIMIT)))
+            except (TypeError, ValueError):
+                logger.warning(f"Invalid APP.request_weight_limit, using default of {DEFAULT_WEIGHT_LIMIT}.")
+                limit = DEFAULT_WEIGHT_LIMIT
+            _governor = RequestWeightGovernor(weight_limit=limit)
+        return _governor
@@ -1,14 +1,19 @@
 from decimal import Decimal, getcontext, InvalidOperation
 from jules_bot.utils.config_manager import ConfigManager
-from jules_bot.utils.logger import logger
+from jules_bot.utils.logger import logger, get_logger
 from jules_bot.core_logic.strategy_rules import StrategyRules
 from enum import Enum, auto
 from typing import Dict
+from collections import deque
+from datetime import timedelta
 import math
 
 # Set precision for Decimal calculations
 getcontext().prec = 28
 
+# Per-buy-decision logs; silenced by the 'simulation' logging profile in backtests.
+capital_logger = get_logger("capital")
+
 class OperatingMode(Enum):
     """Defines the strategic operating modes for the bot."""
     PRESERVATION = auto()
@@ -20,6 +25,64 @@ class OperatingMode(Enum):
 from jules_bot.database.postgres_manager import PostgresManager
 
 
+class DifficultyTracker:
+    """
+    Tracks the current consecutive-buy streak from buy and sell events, so the
+    difficulty factor does not need the trade history.
+
+    Only buys inside the reset window (the last `timeout_hours`) count, which is
+    the same result as filtering the history to that window and counting buys
+    back to the most recent sell. Events must be recorded in time order.
+    """
+    def __init__(self, timeout_hours: int):
+        self.timeout = timedelta(hours=timeout_hours)
+        # Timestamps of the buys since the last sell, oldest first.
+        self._streak_buys = deque()
+        self.last_trade_time = None
+
+    def reset(self):
+        self._streak_buys.clear()
+        self.last_trade_time = None
+
+    def record_trade(self, order_type: str, timestamp):
+        if timestamp is None or not order_type:
+            return
+        order_type = order_type.lower()
+        if order_type == 'buy':
+            self._streak_buys.append(timestamp)
+        elif order_type == 'sell':
+            # A sell breaks the consecutive buy streak.
+            self._streak_buys.clear()
+        else:
+            return
+        self.last_trade_time = timestamp
+
+    def load_history(self, trade_history: list):
+        """Rebuilds the streak from trade dicts, objects or rows, in any order."""
+        self.reset()
+        trades = [(_trade_attribute(t, 'timestamp'), _trade_attribute(t, 'order_type')) for t in trade_history]
+        for timestamp, order_type in sorted((t for t in trades if t[0] is not None), key=lambda t: t[0]):
+            self.record_trade(order_type, timestamp)
+
+    def consecutive_buys(self, current_time=None) -> int:
+        """
+        The streak length at `current_time`. Buys older than the reset window
+        are dropped, so after `timeout_hours` without trades the streak is 0.
+        """
+        if current_time is not None:
+            cutoff = current_time - self.timeout
+            while self._streak_buys and self._streak_buys[0] < cutoff:
+                self._streak_buys.popleft()
+        return len(self._streak_buys)
+
+
+def _trade_attribute(item, key):
+    # Handles both dicts from the backtester and objects or rows from live trading.
+    if isinstance(item, dict):
+        return item.get(key)
+    return getattr(item, key, None)
+
+
 class CapitalManager:
     """
     Manages capital allocation, determining buy amounts and strategy based on market conditions.
@@ -69,6 +132,9 @@ class CapitalManager:
         self.base_difficulty_percentage = self._safe_get_decimal('STRATEGY_RULES', 'base_difficulty_percentage', '0.005')
         self.per_buy_difficulty_increment = self._safe_get_decimal('STRATEGY_RULES', 'per_buy_difficulty_increment', '0.001')
 
+        # Fed with buy/sell events by the backtester and the live bot; used when no trade history is passed.
+        self.difficulty_tracker = DifficultyTracker(self.difficulty_reset_timeout_hours)
+
     def _safe_get_decimal(self, section: str, key: str, fallback: str) -> Decimal:
         """Safely gets a parameter from config and converts it to Decimal."""
         value_str = self.config_manager.get(section, key, fallback=fallback)
@@ -119,7 +185,10 @@ class CapitalManager:
         Returns the buy amount, operating mode, reason, the raw signal regime, and the difficulty factor used.
         """
         num_open_positions = len(open_positions)
-        difficulty_factor = self._calculate_difficulty_factor(trade_history or [], current_time)
+        if trade_history is None:
+            difficulty_factor = self._tracked_difficulty_factor(current_time)
+        else:
+            difficulty_factor = self._calculate_difficulty_factor(trade_history, current_time)
 
         if not self.use_dynamic_capital and num_open_positions >= self.max_open_positions:
             return Decimal('0'), OperatingMode.PRESERVATION.name, f"Max open positions ({self.max_open_positions}) reached.", "PRESERVATION", difficulty_factor
@@ -167,7 +236,7 @@ class CapitalManager:
             original_amount = buy_amount
             buy_amount *= (Decimal('1') - difficulty_factor)
             reason += f", Reduced by {difficulty_factor:.2%} difficulty"
-            logger.info(f"Buy amount {original_amount:.2f} reduced to {buy_amount:.2f} due to difficulty factor {difficulty_factor:.2%}")
+            capital_logger.info("Buy amount %.2f reduced to %.2f due to difficulty factor %.2f%%", original_amount, buy_amount, difficulty_factor * 100)
 
 
         # Check against the available working capital, not the total free cash
@@ -195,34 +264,28 @@ class CapitalManager:
             # No trades means no consecutive buys, so no difficulty.
             return Decimal('0')
 
-        # This now handles both dicts from the backtester and objects from live trading.
-        def get_attribute(item, key):
-            if isinstance(item, dict):
-                return item.get(key)
-            return getattr(item, key, None)
-
         # Filter out trades that don't have a valid timestamp and sort them
-        valid_trades = [t for t in trade_history if get_attribute(t, 'timestamp') is not None]
+        valid_trades = [t for t in trade_history if _trade_attribute(t, 'timestamp') is not None]
         if not valid_trades:
             return Decimal('0')
 
-        sorted_trades = sorted(valid_trades, key=lambda t: get_attribute(t, 'timestamp'), reverse=True)
+        sorted_trades = sorted(valid_trades, key=lambda t: _trade_attribute(t, 'timestamp'), reverse=True)
 
         # Check for timeout since the last trade
         if current_time:
-            from datetime import timedelta
-            last_trade_time = get_attribute(sorted_trades[0], 'timestamp')
+            last_trade_time = _trade_attribute(sorted_trades[0], 'timestamp')
             if last_trade_time:
                 time_since_last_trade = current_time - last_trade_time
                 if time_since_last_trade > timedelta(hours=self.difficulty_reset_timeout_hours):
-                    logger.info(f"Difficulty reset due to inactivity. Last trade was {time_since_last_trade.total_seconds() / 3600:.2f} hours ago (threshold: {self.difficulty_reset_timeout_hours}h).")
+                    capital_logger.info("Difficulty reset due to inactivity. Last trade was %.2f hours ago (threshold: %sh).",
+                                        time_since_last_trade.total_seconds() / 3600, self.difficulty_reset_timeout_hours)
                     return Decimal('0')
 
-        logger.info(f"Calculating difficulty factor based on up to {len(sorted_trades)} recent trades.")
+        capital_logger.info("Calculating difficulty factor based on up to %d recent trades.", len(sorted_trades))
 
         consecutive_buys = 0
         for trade in sorted_trades:
-            order_type = get_attribute(trade, 'order_type')
+            order_type = _trade_attribute(trade, 'order_type')
             if order_type and order_type.lower() == 'buy':
                 consecutive_buys += 1
             elif order_type and order_type.lower() == 'sell':
@@ -230,10 +293,26 @@ class CapitalManager:
                 break
 
         # 'effective_buys' is now the count of true consecutive buys from the most recent trade.
-        effective_buys = consecutive_buys
+        return self._difficulty_for_buys(consecutive_buys)
 
+    def _tracked_difficulty_factor(self, current_time=None) -> Decimal:
+        """The difficulty factor from `difficulty_tracker`, in O(1) amortized time."""
+        if not self.use_dynamic_capital:
+            return Decimal('0')
+        tracker = self.difficulty_tracker
+        consecutive_buys = tracker.consecutive_buys(current_time)
+        # No trade inside the reset window: same as an empty trade history.
+        if tracker.last_trade_time is None or (current_time is not None and tracker.last_trade_time < current_time - tracker.timeout):
+            return Decimal('0')
+        return self._difficulty_for_buys(consecutive_buys)
+
+    def _difficulty_for_buys(self, effective_buys: int) -> Decimal:
+        """
+        Difficulty for a streak of consecutive buys: 0 below the threshold, then
+        the base difficulty plus one increment per buy over the threshold.
+        """
         if effective_buys < self.consecutive_buys_threshold:
-            logger.info(f"No difficulty applied. Consecutive buys ({effective_buys}) is below threshold ({self.consecutive_buys_threshold}).")
+            capital_logger.info("No difficulty applied. Consecutive buys (%d) is below threshold (%d).", effective_buys, self.consecutive_buys_threshold)
             return Decimal('0')
 
         buys_over_threshold = effective_buys - self.consecutive_buys_threshold
@@ -242,12 +321,11 @@ class CapitalManager:
         additional_difficulty = Decimal(buys_over_threshold) * self.per_buy_difficulty_increment
         total_difficulty = base_difficulty + additional_difficulty
 
-        logger.info(
-            f"Difficulty applied: {total_difficulty:.4%}. "
-            f"Consecutive Buys: {effective_buys}. "
-            f"Threshold: {self.consecutive_buys_threshold}. "
-            f"Base: {base_difficulty:.2%}. "
-            f"Increment: {self.per_buy_difficulty_increment:.2%} x {buys_over_threshold} buys over threshold."
+        capital_logger.info(
+            "Difficulty applied: %.4f%%. Consecutive Buys: %d. Threshold: %d. Base: %.2f%%. "
+            "Increment: %.2f%% x %d buys over threshold.",
+            total_difficulty * 100, effective_buys, self.consecutive_buys_threshold, base_difficulty * 100,
+            self.per_buy_difficulty_increment * 100, buys_over_threshold
         )
 
         return total_difficulty
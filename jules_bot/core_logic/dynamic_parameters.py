@@ -1,11 +1,37 @@
 from jules_bot.utils.config_manager import ConfigManager
 from jules_bot.utils.logger import logger
 from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+
+# A safe, non-trading parameter set used while the market regime is undefined (-1).
+UNDEFINED_REGIME = -1
+UNDEFINED_REGIME_PARAMETERS = MappingProxyType({
+    'buy_dip_percentage': Decimal('1'),
+    'sell_rise_percentage': Decimal('1'),
+    'order_size_usd': Decimal('0'),
+    'target_profit': Decimal('1'),
+})
+
+# Regime parameter -> (STRATEGY_RULES key used as its default, default when that key is missing too).
+REGIME_PARAMETER_DEFAULTS = {
+    'buy_dip_percentage': ('buy_dip_percentage', '1.0'),
+    'sell_rise_percentage': ('sell_rise_percentage', '0.01'),
+    'order_size_usd': ('base_usd_per_trade', '20.0'),
+    'target_profit': ('trailing_stop_min_profit_usd', '0.02'),
+}
+
+# Regimes produced by SituationalAwareness; their parameter sets are built up front.
+KNOWN_REGIMES = (-1, 0, 1, 2, 3)
 
 class DynamicParameters:
     def __init__(self, config_manager: ConfigManager):
         self.config_manager = config_manager
         self.parameters = {}
+        self.current_regime = None
+        # regime -> parameter dict, rebuilt when the config's bot name or overrides change.
+        self._table = {}
+        self._table_source = None
+        self._build_table()
         # Initialize with fallback parameters to ensure it's never empty
         self.update_parameters(-1)
 
@@ -29,52 +55,51 @@ class DynamicParameters:
             )
             return Decimal(fallback)
 
-    def update_parameters(self, regime: int):
+    def _config_source(self):
+        return (self.config_manager.bot_name, self.config_manager.overrides)
+
+    def _build_table(self):
+        self._table_source = self._config_source()
+        self._table = {regime: self._load_parameters(regime) for regime in KNOWN_REGIMES}
+
+    def _load_parameters(self, regime: int) -> dict:
         """
-        Loads the strategy parameters for a given market regime.
+        Reads the strategy parameters for a given market regime.
         If the regime is -1 (undefined) or its config section is missing, it uses fallback values.
         """
-        if regime == -1:
+        if regime == UNDEFINED_REGIME:
             # A safe, non-trading default
-            logger.debug("Regime is -1 (undefined). Loading safe, non-trading parameters.")
-            self.parameters = {
-                'buy_dip_percentage': Decimal('1'),
-                'sell_rise_percentage': Decimal('1'),
-                'order_size_usd': Decimal('0'),
-                'target_profit': Decimal('1'),
-            }
-            return
+            return dict(UNDEFINED_REGIME_PARAMETERS)
 
         section_name = f'REGIME_{regime}'
-        
+
         if not self.config_manager.has_section(section_name):
             logger.warning(f"Config section '{section_name}' not found. Falling back to 'STRATEGY_RULES'.")
             section_name = 'STRATEGY_RULES'
 
-        # --- Load Parameters ---
-        # Get the default values from the main STRATEGY_RULES section first.
-        default_buy_dip = self.config_manager.get('STRATEGY_RULES', 'buy_dip_percentage', '1.0')
-        default_sell_rise = self.config_manager.get('STRATEGY_RULES', 'sell_rise_percentage', '0.01')
-        default_order_size = self.config_manager.get('STRATEGY_RULES', 'base_usd_per_trade', '20.0')
-        # The default for the trailing stop activation is 'trailing_stop_min_profit_usd'
-        default_target_profit = self.config_manager.get('STRATEGY_RULES', 'trailing_stop_min_profit_usd', '0.02')
-
-        # Now, load from the current section (which can be a REGIME or STRATEGY_RULES),
-        # using the defaults from STRATEGY_RULES as fallbacks.
-        buy_dip_percentage = self._safe_get_decimal(section_name, 'buy_dip_percentage', default_buy_dip)
-        sell_rise_percentage = self._safe_get_decimal(section_name, 'sell_rise_percentage', default_sell_rise)
-        order_size_usd = self._safe_get_decimal(section_name, 'order_size_usd', default_order_size)
-        
-        # The key is to load the 'target_profit' key from the regime section, but use the default
-        # from 'trailing_stop_min_profit_usd' as the fallback.
-        target_profit = self._safe_get_decimal(section_name, 'target_profit', default_target_profit)
+        # Each parameter is loaded from the current section (which can be a REGIME or
+        # STRATEGY_RULES), using the matching STRATEGY_RULES value as its fallback.
+        # e.g. 'target_profit' falls back to 'trailing_stop_min_profit_usd'.
+        parameters = {}
+        for name, (default_key, default_value) in REGIME_PARAMETER_DEFAULTS.items():
+            fallback = self.config_manager.get('STRATEGY_RULES', default_key, default_value)
+            parameters[name] = self._safe_get_decimal(section_name, name, fallback)
+        return parameters
 
-        self.parameters = {
-            'buy_dip_percentage': buy_dip_percentage,
-            'sell_rise_percentage': sell_rise_percentage,
-            'order_size_usd': order_size_usd,
-            'target_profit': target_profit,
-        }
+    def update_parameters(self, regime: int):
+        """
+        Switches to the precomputed parameters for a given market regime.
+        The table is rebuilt only when the config's overrides or bot name change.
+        """
+        if self._config_source() != self._table_source:
+            self._build_table()
+        parameters = self._table.get(regime)
+        if parameters is None:
+            parameters = self._table[regime] = self._load_parameters(regime)
+        if regime == UNDEFINED_REGIME and self.current_regime != regime:
+            logger.debug("Regime is -1 (undefined). Loading safe, non-trading parameters.")
+        self.current_regime = regime
+        self.parameters = parameters
 
     def get_param(self, param_name: str, default: Decimal = None) -> Decimal:
         """
@@ -8,6 +8,8 @@ from jules_bot.utils.logger import logger
 from typing import Optional, Tuple, Dict, Any
 import time
 from jules_bot.database.postgres_manager import PostgresManager
+from jules_bot.core.exchange_snapshot import get_snapshot_cache
+from jules_bot.core.request_governor import get_request_governor
 
 class Trader:
     """
@@ -18,6 +20,8 @@ class Trader:
         self.mode = mode
         self.environment = self._map_mode_to_environment(mode)
         self.client = self._init_binance_client()
+        # Balances and prices are shared with every other component of this mode.
+        self.snapshot_cache = get_snapshot_cache(mode)
         self.symbol = config_manager.get('APP', 'symbol')
         self.strategy_name = config_manager.get('APP', 'strategy_name', fallback='default_strategy')
         self.step_size = None
@@ -64,6 +68,7 @@ class Trader:
             
             requests_params = {"timeout": 30}
             client = Client(api_key, api_secret, tld='com', testnet=use_testnet, requests_params=requests_params)
+            get_request_governor().attach(client)
 
             try:
                 server_time = client.get_server_time()
@@ -95,8 +100,7 @@ class Trader:
             logger.warning("Trader is not ready. Cannot fetch current price.")
             return None
         try:
-            ticker = self.client.get_symbol_ticker(symbol=symbol)
-            return float(ticker['price'])
+            return float(self.snapshot_cache.get_symbol_price(self.client, symbol))
         except (BinanceAPIException, BinanceRequestException) as e:
             logger.error(f"API error fetching current price for {symbol}: {e}")
             return None
@@ -110,7 +114,7 @@ class Trader:
             logger.warning("Trader is not ready. Cannot fetch prices.")
             return {}
         try:
-            prices = self.client.get_all_tickers()
+            prices = self.snapshot_cache.get_all_tickers(self.client)
             return {item['symbol']: float(item['price']) for item in prices}
         except (BinanceAPIException, BinanceRequestException) as e:
             logger.error(f"API error fetching all prices: {e}")
@@ -125,7 +129,7 @@ class Trader:
             logger.warning("Trader is not ready. Cannot fetch account balance.")
             return 0.0
         try:
-            account_info = self.client.get_account()
+            account_info = self.snapshot_cache.get_account(self.client)
             for balance in account_info['balances']:
                 if balance['asset'] == asset:
                     return float(balance['free'])
@@ -286,6 +290,7 @@ class Trader:
             logger.info(f"EXECUTING BUY: {amount_usdt} USDT of {self.symbol} | Trade ID: {trade_id}")
             # Ensure amount_usdt is a float for the API call, not a Decimal
             order = self.client.order_market_buy(symbol=self.symbol, quoteOrderQty=float(amount_usdt))
+            self.snapshot_cache.invalidate_account()
             logger.info(f"✅ BUY ORDER EXECUTED: {order}")
 
             # Parse the response to get accurate, standardized data
@@ -329,6 +334,7 @@ class Trader:
             
             logger.info(f"EXECUTING SELL: {formatted_quantity} of {self.symbol} | Trade ID: {trade_id}")
             order = self.client.order_market_sell(symbol=self.symbol, quantity=formatted_quantity)
+            self.snapshot_cache.invalidate_account()
             logger.info(f"✅ SELL ORDER EXECUTED: {order}")
 
             # Parse the response to get accurate, standardized data
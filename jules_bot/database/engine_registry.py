@@ -0,0 +1,131 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from jules_bot.utils.logger import logger
+from jules_bot.utils.profiling import get_profiler
+
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_RECYCLE_SECONDS = 1800
+DEFAULT_POOL_TIMEOUT_SECONDS = 30
+
+
+class EngineEntry:
+    """An engine shared by every PostgresManager of one (database URL, schema) pair."""
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        # Names of the one-time setup steps (schema init, migrations) already run on this engine.
+        self.completed_steps: set = set()
+        self.lock = threading.RLock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if get_profiler().enabled:
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('query_start_time')
+    if started:
+        kind = "db.read" if statement.lstrip()[:6].upper().startswith(("SELECT", "WITH")) else "db.write"
+        get_profiler().record(kind, time.perf_counter() - started.pop())
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    connection = exception_context.connection
+    started = connection.info.get('query_start_time') if connection is not None else None
+    if started:
+        started.pop()
+
+
+def instrument_engine(engine: Engine):
+    """Records every statement's execution time as 'db.read' or 'db.write' while profiling is enabled."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+_entries: Dict[Tuple[str, str], EngineEntry] = {}
+_registry_lock = threading.Lock()
+
+
+def get_engine_entry(db_url: str, schema: str, pool_size: int = DEFAULT_POOL_SIZE, max_overflow: int = DEFAULT_MAX_OVERFLOW,
+                     pool_recycle: int = DEFAULT_POOL_RECYCLE_SECONDS, pool_timeout: int = DEFAULT_POOL_TIMEOUT_SECONDS,
+                     connect_args: Optional[dict] = None) -> EngineEntry:
+    """
+    Returns the process-wide engine for a database URL and schema, creating it on
+    first use. The pool settings only apply to the call that creates the engine.
+    """
+    key = (db_url, schema)
+    with _registry_lock:
+        entry = _entries.get(key)
+        if entry is None:
+            engine = create_engine(
+                db_url,
+                connect_args=connect_args or {},
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                # Recycle before server/proxy idle timeouts close the connection under us.
+                pool_recycle=pool_recycle,
+                pool_timeout=pool_timeout,
+                # Handle connections that may have been closed by the DB server.
+                pool_pre_ping=True
+            )
+            instrument_engine(engine)
+            entry = EngineEntry(engine)
+            _entries[key] = entry
+            logger.info(f"Created database engine for schema '{schema}' (pool_size={pool_size}, max_overflow={max_overflow}, recycle={pool_recycle}s).")
+        return entry
+
+
+def entry_for_engine(engine: Engine) -> Optional[EngineEntry]:
+    """Returns the registry entry that owns `engine`, if it came from the registry."""
+    with _registry_lock:
+        return next((entry for entry in _entries.values() if entry.engine is engine), None)
+
+
+def run_once(entry: EngineEntry, step: str, func: Callable[[], None]) -> bool:
+    """
+    Runs `func` the first time `step` is requested for this engine in this
+    process. Concurrent callers wait for the first one to finish. A step that
+    raises is not marked as done, so the next caller retries it. Returns
+    whether `func` ran.
+    """
+    if step in entry.completed_steps:
+        return False
+    with entry.lock:
+        if step in entry.completed_steps:
+            return False
+        func()
+        entry.completed_steps.add(step)
+        return True
+
+
+def dispose_all():
+    """Closes every pooled connection and forgets all engines (tests, shutdown)."""
+    with _registry_lock:
+        for entry in _entries.values():
+            entry.engine.dispose()
+        _entries.clear()
+
+
+def _reset_after_fork():
+    # A forked child (e.g. an optimizer worker) must not reuse the parent's sockets.
+    # Dropping the pools without closing them leaves the parent's connections intact.
+    global _registry_lock
+    _registry_lock = threading.Lock()
+    for entry in _entries.values():
+        entry.engine.dispose(close=False)
+        entry.lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,138 @@
+"""
+Ordered, versioned schema migrations for a bot schema.
+
+Each step is idempotent: it inspects the schema and only changes what is
+missing, so it is safe on a schema created by `create_all` as well as on one
+that predates the step. Applied versions are recorded in `schema_migrations`;
+once a schema is at `LATEST_VERSION`, startup skips the inspector entirely.
+
+To change the schema of an existing table (a new column, a new index on the
+model), append a step with the next version number. Never renumber or edit a
+step that has shipped.
+"""
+from typing import Callable, NamedTuple
+
+from sqlalchemy import text
+
+from jules_bot.database import partitioning
+from jules_bot.database.models import PriceHistory, Trade
+from jules_bot.utils.logger import logger
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    apply: Callable  # (db_manager, connection, inspector) -> None
+
+
+def _add_missing_columns(db_manager, connection, inspector, table: str, columns: dict):
+    if not inspector.has_table(table, schema=db_manager.bot_name):
+        return
+    existing = {c['name'] for c in inspector.get_columns(table, schema=db_manager.bot_name)}
+    for name, ddl in columns.items():
+        if name in existing:
+            continue
+        logger.info(f"Running migration: Adding missing column '{name}' to table '{db_manager.bot_name}.{table}'")
+        with connection.begin():
+            connection.execute(text(f"ALTER TABLE {db_manager.bot_name}.{table} ADD COLUMN {name} {ddl}"))
+
+
+def _trade_exchange_and_trailing_columns(db_manager, connection, inspector):
+    _add_missing_columns(db_manager, connection, inspector, 'trades', {
+        'binance_trade_id': 'INTEGER',
+        'is_trailing': 'BOOLEAN NOT NULL DEFAULT FALSE',
+        'highest_price_since_breach': 'NUMERIC(20, 8)',
+        # Intelligent Trailing Stop columns
+        'is_smart_trailing_active': 'BOOLEAN NOT NULL DEFAULT FALSE',
+        'smart_trailing_activation_price': 'NUMERIC(20, 8)',
+        'smart_trailing_highest_profit': 'NUMERIC(20, 8)',
+        'current_trail_percentage': 'NUMERIC(10, 5)',
+    })
+
+
+def _trade_remaining_quantity(db_manager, connection, inspector):
+    schema = db_manager.bot_name
+    if not inspector.has_table('trades', schema=schema):
+        return
+    if 'remaining_quantity' in {c['name'] for c in inspector.get_columns('trades', schema=schema)}:
+        return
+    logger.info(f"Running migration: Adding and backfilling 'remaining_quantity' to table '{schema}.trades'")
+    with connection.begin():
+        # 1. Add the column, allowing nulls for back-filling
+        connection.execute(text(f'ALTER TABLE {schema}.trades ADD COLUMN remaining_quantity NUMERIC(20, 8)'))
+
+        # 2. Set a baseline of 0 for all trades
+        logger.info("Back-filling 'remaining_quantity': setting to 0 for all trades initially.")
+        connection.execute(text(f'UPDATE {schema}.trades SET remaining_quantity = 0'))
+
+        # 3. For open buy trades, set remaining_quantity to the original quantity
+        logger.info("Back-filling 'remaining_quantity': setting to full quantity for open buys.")
+        connection.execute(text(f'''
+            UPDATE {schema}.trades
+            SET remaining_quantity = quantity
+            WHERE status = 'OPEN' AND order_type = 'buy'
+        '''))
+
+        # 4. Now that all rows are populated, enforce the NOT NULL constraint
+        logger.info("Finalizing 'remaining_quantity' migration: setting column to NOT NULL.")
+        connection.execute(text(f'ALTER TABLE {schema}.trades ALTER COLUMN remaining_quantity SET NOT NULL'))
+
+
+def _bot_status_last_buy_condition(db_manager, connection, inspector):
+    _add_missing_columns(db_manager, connection, inspector, 'bot_status', {'last_buy_condition': 'VARCHAR'})
+
+
+def _query_indexes(db_manager, connection, inspector):
+    # New tables get these from create_all; older ones are brought up to the model.
+    for table in (Trade.__table__, PriceHistory.__table__):
+        if inspector.has_table(table.name, schema=db_manager.bot_name):
+            db_manager._create_missing_indexes(connection, inspector, table)
+
+
+def _trade_aggregates_backfill(db_manager, connection, inspector):
+    # Populate the aggregates once for databases that predate the table.
+    schema = db_manager.bot_name
+    if not inspector.has_table('trade_aggregates', schema=schema):
+        return
+    has_aggregates = connection.execute(text(f"SELECT 1 FROM {schema}.trade_aggregates LIMIT 1")).first()
+    has_sells = connection.execute(text(f"SELECT 1 FROM {schema}.trades WHERE order_type = 'sell' LIMIT 1")).first()
+    connection.rollback()  # End the implicit read transaction before the rebuild opens its own session.
+    if has_sells and not has_aggregates:
+        logger.info(f"Running migration: Back-filling '{schema}.trade_aggregates' from existing sell trades")
+        db_manager.rebuild_trade_aggregates()
+
+
+def _partitioned_trade_uniqueness(db_manager, connection, inspector):
+    # Partitioned trades tables created before this step have no unique key on trade_id at all.
+    if not db_manager.is_partitioned('trades'):
+        return
+    logger.info(f"Running migration: Creating unique index '{partitioning.TRADE_UNIQUE_INDEX}' on '{db_manager.bot_name}.trades'")
+    with connection.begin():
+        connection.execute(text(partitioning.trade_unique_index_ddl(db_manager.bot_name)))
+
+
+MIGRATIONS = (
+    Migration(1, "trades: exchange id and trailing stop columns", _trade_exchange_and_trailing_columns),
+    Migration(2, "trades: remaining_quantity back-filled from open buys", _trade_remaining_quantity),
+    Migration(3, "bot_status: last_buy_condition column", _bot_status_last_buy_condition),
+    Migration(4, "trades/price_history: query indexes", _query_indexes),
+    Migration(5, "trade_aggregates: back-fill from existing sells", _trade_aggregates_backfill),
+    Migration(6, "trades: unique (environment, trade_id, timestamp) on partitioned tables", _partitioned_trade_uniqueness),
+)
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(connection, schema: str) -> int:
+    """The highest applied version, or 0 when the schema has no version table yet."""
+    try:
+        version = connection.execute(text(f"SELECT max(version) FROM {schema}.schema_migrations")).scalar()
+    except Exception:
+        version = None
+    finally:
+        # Leave no implicit transaction open; every step manages its own.
+        connection.rollback()
+    return version or 0
+
+
+def pending_migrations(applied_version: int) -> list:
+    return [migration for migration in MIGRATIONS if migration.version > applied_version]
@@ -1,12 +1,29 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Boolean, Numeric, BigInteger
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, DateTime, Date, JSON, Boolean, Numeric, BigInteger, UniqueConstraint, Index
+from sqlalchemy.sql import func, text
 import datetime
 from decimal import Decimal
 import pytz
 from .base import Base
 
+
+def serialize_trade_value(value):
+    """JSON-friendly form of a trade column value, as returned by Trade.to_dict."""
+    if isinstance(value, datetime.datetime):
+        # Tornar o datetime ciente do fuso horário (UTC) e converter para America/Sao_Paulo
+        sao_paulo_tz = pytz.timezone('America/Sao_Paulo')
+        aware_datetime = value.replace(tzinfo=pytz.utc) if value.tzinfo is None else value
+        return aware_datetime.astimezone(sao_paulo_tz).isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
 class PriceHistory(Base):
     __tablename__ = 'price_history'
+    __table_args__ = (
+        # get_price_data and the collectors read one symbol over a time range.
+        Index('ix_price_history_symbol_timestamp', 'symbol', 'timestamp'),
+    )
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=datetime.datetime.utcnow)
     open = Column(Numeric(20, 8))
@@ -18,21 +35,27 @@ class PriceHistory(Base):
 
 class Trade(Base):
     def to_dict(self):
-        result = {}
-        for key in self.__mapper__.c.keys():
-            value = getattr(self, key)
-            if isinstance(value, datetime.datetime):
-                # Tornar o datetime ciente do fuso horário (UTC) e converter para America/Sao_Paulo
-                sao_paulo_tz = pytz.timezone('America/Sao_Paulo')
-                aware_datetime = value.replace(tzinfo=pytz.utc).astimezone(sao_paulo_tz)
-                result[key] = aware_datetime.isoformat()
-            elif isinstance(value, Decimal):
-                result[key] = str(value)
-            else:
-                result[key] = value
-        return result
+        return {key: serialize_trade_value(getattr(self, key)) for key in self.__mapper__.c.keys()}
 
     __tablename__ = 'trades'
+    __table_args__ = (
+        # Backs the paginated trade history and date-range scans: filter by environment, keyset on (timestamp, id).
+        Index('ix_trades_environment_timestamp', 'environment', 'timestamp', 'id'),
+        # get_all_trades_for_sync: every trade of one environment and symbol, oldest first.
+        Index('ix_trades_environment_symbol_timestamp', 'environment', 'symbol', 'timestamp'),
+        # Open positions are a tiny slice of the table; partial indexes keep them cheap to find.
+        Index('ix_trades_open_environment_symbol', 'environment', 'symbol', 'timestamp',
+              postgresql_where=text("status = 'OPEN'"), sqlite_where=text("status = 'OPEN'")),
+        Index('ix_trades_open_buys_timestamp', 'timestamp',
+              postgresql_where=text("status = 'OPEN' AND order_type = 'buy'"), sqlite_where=text("status = 'OPEN' AND order_type = 'buy'")),
+        # Per-run reports (get_trades_by_run_id, get_closed_sell_trades_for_run).
+        Index('ix_trades_run_id_timestamp', 'run_id', 'timestamp'),
+        # Exchange-id lookups used by the synchronization manager.
+        Index('ix_trades_binance_trade_id', 'binance_trade_id',
+              postgresql_where=text("binance_trade_id IS NOT NULL"), sqlite_where=text("binance_trade_id IS NOT NULL")),
+        Index('ix_trades_exchange_order_id', 'exchange_order_id',
+              postgresql_where=text("exchange_order_id IS NOT NULL"), sqlite_where=text("exchange_order_id IS NOT NULL")),
+    )
     id = Column(Integer, primary_key=True)
     run_id = Column(String, nullable=False)
     environment = Column(String, nullable=False)
@@ -73,6 +96,28 @@ class Trade(Base):
     current_trail_percentage = Column(Numeric(10, 5), nullable=True)
 
 
+class TradeAggregate(Base):
+    """
+    Running realized-PnL totals per environment, symbol, run and UTC day.
+    Maintained in the same transaction as every sell insert, so summaries
+    never have to scan the trades table.
+    """
+    __tablename__ = 'trade_aggregates'
+    __table_args__ = (
+        UniqueConstraint('environment', 'symbol', 'run_id', 'day', name='uq_trade_aggregates_key'),
+    )
+    id = Column(Integer, primary_key=True)
+    environment = Column(String, nullable=False)
+    symbol = Column(String, nullable=False)
+    run_id = Column(String, nullable=False)
+    day = Column(Date, nullable=False)
+    sell_count = Column(Integer, nullable=False, default=0)
+    realized_pnl_usd = Column(Numeric(20, 8), nullable=False, default=0)
+    realized_pnl_btc = Column(Numeric(20, 8), nullable=False, default=0)
+    hodl_asset_amount = Column(Numeric(20, 8), nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+
 class BotStatus(Base):
     __tablename__ = 'bot_status'
     id = Column(Integer, primary_key=True)
@@ -91,3 +136,11 @@ class BotStatus(Base):
     buy_progress = Column(Numeric(5, 2))
     last_buy_condition = Column(String) # To store detailed feedback
     timestamp = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+
+class SchemaMigration(Base):
+    """One row per schema migration step applied to this bot's schema."""
+    __tablename__ = 'schema_migrations'
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    description = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
@@ -0,0 +1,238 @@
+"""
+Declarative PostgreSQL partitioning for the largest tables.
+
+- `price_history` is range-partitioned by month on `timestamp`.
+- `trades` is list-partitioned by `environment`, and each environment is
+  range-partitioned by month on `timestamp`.
+
+Every partitioned level has a DEFAULT partition, so a write never fails
+because a month partition is missing; creating that month later moves its
+rows out of the default partition. The physical primary keys include the
+partition keys, as PostgreSQL requires. The ORM models keep `id` as their
+identity, which stays unique because it comes from a single sequence.
+"""
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import Index, MetaData, PrimaryKeyConstraint, UniqueConstraint, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from jules_bot.database.models import PriceHistory, Trade
+from jules_bot.utils.logger import logger
+
+PARTITIONED_ENVIRONMENTS = ('trade', 'test', 'backtest')
+
+# table name -> (partition clause, physical primary key)
+PARTITION_LAYOUTS = {
+    'trades': ('LIST (environment)', ('id', 'environment', 'timestamp')),
+    'price_history': ('RANGE (timestamp)', ('id', 'timestamp')),
+}
+MODEL_TABLES = {'trades': Trade.__table__, 'price_history': PriceHistory.__table__}
+# The model's unique trade_id, narrowed to what a partitioned table allows: it must contain every partition key.
+TRADE_UNIQUE_INDEX = 'ux_trades_environment_trade_id_timestamp'
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    return date(value.year + (value.month == 12), value.month % 12 + 1, 1)
+
+
+def iter_months(start, end) -> Iterator[date]:
+    """Yields the first day of every month between `start` and `end`, inclusive."""
+    current, last = month_start(start), month_start(end)
+    while current <= last:
+        yield current
+        current = next_month(current)
+
+
+def month_partition_name(parent: str, month: date) -> str:
+    return f"{parent}_{month.year:04d}_{month.month:02d}"
+
+
+def environment_partition_name(environment: str) -> str:
+    return f"trades_{environment}"
+
+
+def partitioned_table_ddl(table_name: str, schema: str) -> str:
+    """
+    Renders CREATE TABLE for the partitioned parent from the ORM model, so the
+    physical table can never drift from the model's columns.
+    """
+    partition_by, key_columns = PARTITION_LAYOUTS[table_name]
+    table = MODEL_TABLES[table_name].to_metadata(MetaData(), schema=schema)
+    # Unique constraints must contain the partition keys; see trade_unique_index_ddl.
+    for constraint in [c for c in table.constraints if isinstance(c, UniqueConstraint)]:
+        table.constraints.remove(constraint)
+    for column in table.columns:
+        column.unique = False
+        column.primary_key = column.name in key_columns
+    table.append_constraint(PrimaryKeyConstraint(*key_columns))
+    table.c.id.autoincrement = True
+    table.dialect_options['postgresql']['partition_by'] = partition_by
+    return str(CreateTable(table).compile(dialect=postgresql.dialect()))
+
+
+def _model_index_ddl(table_name: str, schema: str) -> list[str]:
+    table = MODEL_TABLES[table_name].to_metadata(MetaData(), schema=schema)
+    indexes = [index for index in table.indexes if not index.unique]
+    if table_name == 'trades':
+        # Replaces the global unique constraint, which a partitioned table cannot have.
+        indexes.append(Index('ix_trades_trade_id', table.c.trade_id))
+    statements = [str(CreateIndex(index).compile(dialect=postgresql.dialect())) for index in indexes]
+    if table_name == 'trades':
+        statements.append(trade_unique_index_ddl(schema))
+    return statements
+
+
+def trade_unique_index_ddl(schema: str) -> str:
+    """Unique (environment, trade_id, timestamp) on the partitioned trades parent; cascades to every partition."""
+    return f"CREATE UNIQUE INDEX IF NOT EXISTS {TRADE_UNIQUE_INDEX} ON {schema}.trades (environment, trade_id, timestamp)"
+
+
+def is_partitioned(connection, schema: str, table_name: str) -> bool:
+    return connection.execute(text("""
+        SELECT 1 FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = :schema AND c.relname = :table
+    """), {"schema": schema, "table": table_name}).first() is not None
+
+
+def _relation_exists(connection, schema: str, name: str) -> bool:
+    return connection.execute(text("SELECT to_regclass(:name)"), {"name": f"{schema}.{name}"}).scalar() is not None
+
+
+def create_partitioned_table(connection, schema: str, table_name: str):
+    """Creates a partitioned parent with its DEFAULT partitions and the model's indexes."""
+    connection.execute(text(partitioned_table_ddl(table_name, schema)))
+    if table_name == 'trades':
+        for environment in PARTITIONED_ENVIRONMENTS:
+            env_partition = environment_partition_name(environment)
+            connection.execute(text(
+                f"CREATE TABLE {schema}.{env_partition} PARTITION OF {schema}.trades "
+                f"FOR VALUES IN ('{environment}') PARTITION BY RANGE (timestamp)"
+            ))
+            connection.execute(text(f"CREATE TABLE {schema}.{env_partition}_default PARTITION OF {schema}.{env_partition} DEFAULT"))
+        connection.execute(text(f"CREATE TABLE {schema}.trades_default PARTITION OF {schema}.trades DEFAULT"))
+    else:
+        connection.execute(text(f"CREATE TABLE {schema}.{table_name}_default PARTITION OF {schema}.{table_name} DEFAULT"))
+    # Indexes on the parent cascade to every current and future partition.
+    for statement in _model_index_ddl(table_name, schema):
+        connection.execute(text(statement))
+    logger.info(f"Created partitioned table '{schema}.{table_name}'.")
+
+
+def ensure_month_partitions(connection, schema: str, parent: str, start, end) -> list[str]:
+    """
+    Creates the monthly partitions of `parent` covering `start`..`end`. Rows that
+    already landed in the DEFAULT partition for those months are moved into the
+    new partition before it is attached.
+
+    Concurrent callers (parallel optimizer trials, the bot and a script) are
+    serialized by a transaction-level advisory lock on the parent, and the
+    existence check is repeated under it. The DEFAULT partition is locked
+    against writes while its rows move, so a row inserted meanwhile cannot be
+    deleted without being copied.
+    """
+    months = [month for month in iter_months(start, end)
+              if not _relation_exists(connection, schema, month_partition_name(parent, month))]
+    if not months:
+        return []
+    connection.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"{schema}.{parent}"})
+
+    created = []
+    default = f"{schema}.{parent}_default"
+    for month in months:
+        name = month_partition_name(parent, month)
+        if _relation_exists(connection, schema, name):
+            continue
+        lower, upper = month.isoformat(), next_month(month).isoformat()
+        connection.execute(text(f"LOCK TABLE {default} IN EXCLUSIVE MODE"))
+        connection.execute(text(f"CREATE TABLE {schema}.{name} (LIKE {schema}.{parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        connection.execute(text(
+            f"WITH moved AS (DELETE FROM {default} WHERE timestamp >= :lower AND timestamp < :upper RETURNING *) "
+            f"INSERT INTO {schema}.{name} SELECT * FROM moved"
+        ), {"lower": lower, "upper": upper})
+        connection.execute(text(f"ALTER TABLE {schema}.{parent} ATTACH PARTITION {schema}.{name} FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+        created.append(name)
+    if created:
+        logger.info(f"Created {len(created)} monthly partition(s) of '{schema}.{parent}': {', '.join(created)}")
+    return created
+
+
+def list_month_partitions(connection, schema: str, parent: str) -> dict[str, date]:
+    """Returns the monthly partitions attached to `parent`, keyed by name."""
+    rows = connection.execute(text("""
+        SELECT child.relname FROM pg_inherits i
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        JOIN pg_class child ON child.oid = i.inhrelid
+        JOIN pg_namespace n ON n.oid = parent.relnamespace
+        WHERE n.nspname = :schema AND parent.relname = :parent
+    """), {"schema": schema, "parent": parent}).scalars().all()
+    partitions = {}
+    prefix = f"{parent}_"
+    for name in rows:
+        suffix = name[len(prefix):] if name.startswith(prefix) else ''
+        try:
+            partitions[name] = datetime.strptime(suffix, "%Y_%m").date()
+        except ValueError:
+            continue  # The DEFAULT partition.
+    return partitions
+
+
+def drop_month_partitions_before(connection, schema: str, parent: str, cutoff: date) -> list[str]:
+    """Drops every monthly partition of `parent` that ends on or before `cutoff`."""
+    dropped = []
+    for name, month in sorted(list_month_partitions(connection, schema, parent).items(), key=lambda item: item[1]):
+        if next_month(month) <= cutoff:
+            connection.execute(text(f"DROP TABLE {schema}.{name}"))
+            dropped.append(name)
+    if dropped:
+        logger.info(f"Dropped {len(dropped)} partition(s) of '{schema}.{parent}': {', '.join(dropped)}")
+    return dropped
+
+
+def migrate_table_to_partitions(connection, schema: str, table_name: str, keep_legacy: bool = False) -> Optional[str]:
+    """
+    Converts an existing regular table into its partitioned layout: the table is
+    renamed aside, the partitioned parent is created, month partitions are made
+    for the data's range, rows are copied over and the id sequence is carried
+    forward. Returns the legacy table name when it is kept.
+    """
+    legacy = f"{table_name}_legacy"
+    connection.execute(text(f"ALTER TABLE {schema}.{table_name} RENAME TO {legacy}"))
+    # Index names are schema-wide; move the legacy ones aside so the new parent can reuse them.
+    legacy_indexes = connection.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = :schema AND tablename = :table"
+    ), {"schema": schema, "table": legacy}).scalars().all()
+    for index_name in legacy_indexes:
+        connection.execute(text(f'ALTER INDEX {schema}."{index_name}" RENAME TO "{index_name[:50]}_legacy"'))
+
+    create_partitioned_table(connection, schema, table_name)
+
+    bounds = connection.execute(text(f"SELECT min(timestamp), max(timestamp) FROM {schema}.{legacy}")).first()
+    if bounds and bounds[0] is not None:
+        if table_name == 'trades':
+            environments = connection.execute(text(f"SELECT DISTINCT environment FROM {schema}.{legacy}")).scalars().all()
+            for environment in environments:
+                if environment in PARTITIONED_ENVIRONMENTS:
+                    ensure_month_partitions(connection, schema, environment_partition_name(environment), bounds[0], bounds[1])
+        else:
+            ensure_month_partitions(connection, schema, table_name, bounds[0], bounds[1])
+
+    columns = ', '.join(f'"{column.name}"' for column in MODEL_TABLES[table_name].columns)
+    copied = connection.execute(text(f"INSERT INTO {schema}.{table_name} ({columns}) SELECT {columns} FROM {schema}.{legacy}")).rowcount
+    connection.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('{schema}.{table_name}', 'id'), "
+        f"COALESCE((SELECT max(id) FROM {schema}.{table_name}), 0) + 1, false)"
+    ))
+    logger.info(f"Copied {copied} rows from '{schema}.{legacy}' into the partitioned '{schema}.{table_name}'.")
+
+    if keep_legacy:
+        return legacy
+    connection.execute(text(f"DROP TABLE {schema}.{legacy}"))
+    return None
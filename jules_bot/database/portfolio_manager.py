@@ -4,6 +4,7 @@ from contextlib import contextmanager
 from typing import Iterator, Optional
 from decimal import Decimal
 
+from jules_bot.database import engine_registry
 from jules_bot.database.portfolio_models import Base, PortfolioSnapshot, FinancialMovement
 from jules_bot.utils.logger import logger
 
@@ -20,6 +21,10 @@ class PortfolioManager:
 
     def create_tables(self):
         """Creates the portfolio-related tables in the database if they don't exist."""
+        entry = engine_registry.entry_for_engine(self.engine)
+        if entry is not None and "initialize_db" in entry.completed_steps:
+            # PostgresManager already ran create_all for the shared Base on this engine.
+            return
         try:
             Base.metadata.create_all(bind=self.engine)
             logger.info("Successfully created or verified portfolio tables (portfolio_snapshots, financial_movements).")
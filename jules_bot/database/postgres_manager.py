@@ -1,22 +1,57 @@
+import base64
 import json
 import logging
 import os
 import uuid
 from decimal import Decimal
-from typing import Optional, Iterator
-from datetime import datetime
+from types import SimpleNamespace
+from typing import Optional, Iterator, Iterable
+from datetime import datetime, date, time, timedelta
 import pandas as pd
+import pytz
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, desc, and_, not_, text, inspect, asc
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy import desc, and_, not_, text, inspect, asc, func, case, tuple_, select, cast, Float, Numeric
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
 from contextlib import contextmanager
 from jules_bot.core.schemas import TradePoint
 from jules_bot.database.base import Base
-from jules_bot.database.models import Trade, BotStatus, PriceHistory
+from jules_bot.database.models import Trade, BotStatus, PriceHistory, TradeAggregate, SchemaMigration
+from jules_bot.database import engine_registry, migrations, partitioning
 from jules_bot.database.portfolio_models import PortfolioSnapshot, FinancialMovement
 from jules_bot.utils.logger import logger
 from jules_bot.utils.config_manager import config_manager
 
+# Trade columns that feed the trade_aggregates table.
+AGGREGATE_SOURCE_FIELDS = ('order_type', 'environment', 'symbol', 'run_id', 'timestamp', 'price', 'realized_pnl_usd', 'hodl_asset_amount')
+AGGREGATE_VALUE_FIELDS = ('sell_count', 'realized_pnl_usd', 'realized_pnl_btc', 'hodl_asset_amount')
+
+# Sortable trade-history columns. Nullable numeric columns are sorted through a
+# sentinel so that rows without a value always come last and keyset cursors stay valid.
+HISTORY_SORT_COLUMNS = {
+    'timestamp': (Trade.timestamp, None),
+    'symbol': (Trade.symbol, None),
+    'order_type': (Trade.order_type, None),
+    'status': (Trade.status, None),
+    'trade_id': (Trade.trade_id, None),
+    'price': (Trade.price, None),
+    'quantity': (Trade.quantity, None),
+    'usd_value': (Trade.usd_value, None),
+    'sell_price': (Trade.sell_price, Decimal('1e15')),
+    'realized_pnl_usd': (Trade.realized_pnl_usd, Decimal('1e15')),
+}
+MAX_HISTORY_PAGE_SIZE = 500
+# Trade.to_dict() renders timestamps in this timezone, so date filters use its calendar days.
+HISTORY_TIMEZONE = pytz.timezone('America/Sao_Paulo')
+
+# Columns read by the analytics paths (reports, validation, difficulty); the JSON
+# decision_context is only fetched when a caller explicitly asks for it.
+TRADE_SUMMARY_COLUMNS = (
+    'trade_id', 'linked_trade_id', 'run_id', 'environment', 'symbol', 'status', 'order_type',
+    'price', 'quantity', 'usd_value', 'commission_usd', 'realized_pnl_usd', 'hodl_asset_amount',
+    'sell_price', 'timestamp', 'binance_trade_id',
+)
+
 class PostgresManager:
     def __init__(self, config_manager=None):
         if config_manager is None:
@@ -43,30 +78,52 @@ class PostgresManager:
         self.bot_name = config_manager.bot_name.replace("-", "_")
 
         self.db_url = f"postgresql+psycopg2://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        self.engine = create_engine(
+        # Every PostgresManager of this process shares one engine (and pool) per schema.
+        self._engine_entry = engine_registry.get_engine_entry(
             self.db_url,
+            self.bot_name,
+            pool_size=self._pool_setting(db_config, 'pool_size', engine_registry.DEFAULT_POOL_SIZE),
+            max_overflow=self._pool_setting(db_config, 'max_overflow', engine_registry.DEFAULT_MAX_OVERFLOW),
+            pool_recycle=self._pool_setting(db_config, 'pool_recycle_seconds', engine_registry.DEFAULT_POOL_RECYCLE_SECONDS),
+            pool_timeout=self._pool_setting(db_config, 'pool_timeout_seconds', engine_registry.DEFAULT_POOL_TIMEOUT_SECONDS),
             connect_args={
                 'connect_timeout': 5,
                 # Each bot operates in its own schema for data isolation.
                 'options': f'-csearch_path={self.bot_name},public'
             },
-            # Add pool_pre_ping to handle connections that may have been closed by the DB server.
-            pool_pre_ping=True
         )
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-        self._initialized = False
+        self.engine = self._engine_entry.engine
+        self.SessionLocal = self._engine_entry.session_factory
+        # New schemas create 'trades' and 'price_history' as partitioned tables.
+        self.partitioning_enabled = self.config_manager.getboolean('POSTGRES', 'partitioning', fallback=True)
         self.initialize_db()
 
+    @staticmethod
+    def _pool_setting(db_config: dict, key: str, default: int) -> int:
+        value = db_config.get(key)
+        if value in (None, ''):
+            return default
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Invalid POSTGRES.{key} '{value}', using default of {default}.")
+            return default
+
     def initialize_db(self):
         """
-        Cria schema, tabelas e executa migrações.
+        Cria schema, tabelas e executa migrações, uma única vez por processo e schema.
         """
-        if self._initialized:
+        if engine_registry.run_once(self._engine_entry, "initialize_db", self._initialize_schema):
+            logger.info(f"Database schema '{self.bot_name}' initialized.")
+
+    def _initialize_schema(self):
+        if self._schema_is_current():
+            logger.info(f"Schema '{self.bot_name}' is at migration version {migrations.LATEST_VERSION}; skipping schema checks.")
             return
         self.create_schema()
         self.create_tables()
         self._run_migrations()
-        self._initialized = True
+        self._ensure_current_partitions()
 
     def create_schema(self):
         """
@@ -81,79 +138,67 @@ class PostgresManager:
                 logger.error(f"Failed to create schema '{self.bot_name}': {e}")
                 raise
 
-    def _run_migrations(self):
-        inspector = inspect(self.engine)
+    def _schema_is_current(self) -> bool:
+        """
+        Fast path for startup: a single query that tells whether every migration
+        is applied and next month's partitions exist. Any error (e.g. a new
+        schema without the version table) means the full initialization runs.
+        """
+        if not self._partitioning_supported():
+            return False
+        next_month = partitioning.next_month(partitioning.month_start(datetime.utcnow()))
         with self.engine.connect() as connection:
             try:
-                # Migration for 'trades' table
-                if inspector.has_table("trades", schema=self.bot_name):
-                    trade_columns = [c['name'] for c in inspector.get_columns('trades', schema=self.bot_name)]
-                    if 'binance_trade_id' not in trade_columns:
-                        logger.info(f"Running migration: Adding missing column 'binance_trade_id' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            connection.execute(text(f'ALTER TABLE {self.bot_name}.trades ADD COLUMN binance_trade_id INTEGER'))
-                    if 'is_trailing' not in trade_columns:
-                        logger.info(f"Running migration: Adding missing column 'is_trailing' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            connection.execute(text(f"ALTER TABLE {self.bot_name}.trades ADD COLUMN is_trailing BOOLEAN NOT NULL DEFAULT FALSE"))
-                    if 'highest_price_since_breach' not in trade_columns:
-                        logger.info(f"Running migration: Adding missing column 'highest_price_since_breach' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            connection.execute(text(f"ALTER TABLE {self.bot_name}.trades ADD COLUMN highest_price_since_breach NUMERIC(20, 8)"))
-                    
-                    # Migration for Intelligent Trailing Stop columns
-                    if 'is_smart_trailing_active' not in trade_columns:
-                        logger.info(f"Running migration: Adding missing column 'is_smart_trailing_active' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            connection.execute(text(f"ALTER TABLE {self.bot_name}.trades ADD COLUMN is_smart_trailing_active BOOLEAN NOT NULL DEFAULT FALSE"))
-                    
-                    if 'smart_trailing_activation_price' not in trade_columns:
-                        logger.info(f"Running migration: Adding missing column 'smart_trailing_activation_price' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            connection.execute(text(f"ALTER TABLE {self.bot_name}.trades ADD COLUMN smart_trailing_activation_price NUMERIC(20, 8)"))
-
-                    if 'smart_trailing_highest_profit' not in trade_columns:
-                        logger.info(f"Running migration: Adding missing column 'smart_trailing_highest_profit' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            connection.execute(text(f"ALTER TABLE {self.bot_name}.trades ADD COLUMN smart_trailing_highest_profit NUMERIC(20, 8)"))
-                    
-                    if 'current_trail_percentage' not in trade_columns:
-                        logger.info(f"Running migration: Adding missing column 'current_trail_percentage' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            connection.execute(text(f"ALTER TABLE {self.bot_name}.trades ADD COLUMN current_trail_percentage NUMERIC(10, 5)"))
-                    
-                    if 'remaining_quantity' not in trade_columns:
-                        logger.info(f"Running migration: Adding and backfilling 'remaining_quantity' to table '{self.bot_name}.trades'")
-                        with connection.begin():
-                            # 1. Add the column, allowing nulls for back-filling
-                            connection.execute(text(f'ALTER TABLE {self.bot_name}.trades ADD COLUMN remaining_quantity NUMERIC(20, 8)'))
-                            
-                            # 2. Set a baseline of 0 for all trades
-                            logger.info("Back-filling 'remaining_quantity': setting to 0 for all trades initially.")
-                            connection.execute(text(f'UPDATE {self.bot_name}.trades SET remaining_quantity = 0'))
-
-                            # 3. For open buy trades, set remaining_quantity to the original quantity
-                            logger.info("Back-filling 'remaining_quantity': setting to full quantity for open buys.")
-                            connection.execute(text(f'''
-                                UPDATE {self.bot_name}.trades
-                                SET remaining_quantity = quantity
-                                WHERE status = 'OPEN' AND order_type = 'buy'
-                            '''))
-                            
-                            # 4. Now that all rows are populated, enforce the NOT NULL constraint
-                            logger.info("Finalizing 'remaining_quantity' migration: setting column to NOT NULL.")
-                            connection.execute(text(f'ALTER TABLE {self.bot_name}.trades ALTER COLUMN remaining_quantity SET NOT NULL'))
-
-                # Migration for 'bot_status' table
-                if inspector.has_table("bot_status", schema=self.bot_name):
-                    status_columns = [c['name'] for c in inspector.get_columns('bot_status', schema=self.bot_name)]
-                    if 'last_buy_condition' not in status_columns:
-                        logger.info(f"Running migration: Adding missing column 'last_buy_condition' to table '{self.bot_name}.bot_status'")
-                        with connection.begin():
-                            connection.execute(text(f'ALTER TABLE {self.bot_name}.bot_status ADD COLUMN last_buy_condition VARCHAR'))
-
-            except Exception as e:
-                logger.error(f"Failed to run migration: {e}")
+                version, partitions_current = connection.execute(text(f"""
+                    SELECT (SELECT max(version) FROM {self.bot_name}.schema_migrations),
+                           to_regclass(:default_partition) IS NULL OR to_regclass(:next_partition) IS NOT NULL
+                """), {
+                    "default_partition": f"{self.bot_name}.price_history_default",
+                    "next_partition": f"{self.bot_name}.{partitioning.month_partition_name('price_history', next_month)}",
+                }).one()
+            except Exception:
+                return False
+        return (version or 0) >= migrations.LATEST_VERSION and bool(partitions_current)
+
+    def _run_migrations(self) -> list[int]:
+        """
+        Applies the pending steps of jules_bot/database/migrations.py in order and
+        records each one in 'schema_migrations'. Stops at the first failure so the
+        next start retries from there. Returns the versions applied.
+        """
+        applied = []
+        with self.engine.connect() as connection:
+            pending = migrations.pending_migrations(migrations.current_version(connection, self.bot_name))
+            if not pending:
+                return applied
+            inspector = inspect(self.engine)
+            for migration in pending:
+                try:
+                    migration.apply(self, connection, inspector)
+                    with connection.begin():
+                        connection.execute(SchemaMigration.__table__.insert().values(
+                            version=migration.version, description=migration.description, applied_at=datetime.utcnow()))
+                    applied.append(migration.version)
+                    logger.info(f"Applied schema migration {migration.version}: {migration.description}")
+                except Exception as e:
+                    if connection.in_transaction():
+                        connection.rollback()
+                    logger.error(f"Failed to run migration {migration.version} ({migration.description}): {e}", exc_info=True)
+                    break
+        return applied
+
+    def _create_missing_indexes(self, connection, inspector, table=Trade.__table__) -> list[str]:
+        """Creates any index declared on a model that its existing table lacks."""
+        existing = {i['name'] for i in inspector.get_indexes(table.name, schema=self.bot_name)}
+        created = []
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            if index.name in existing:
+                continue
+            logger.info(f"Running migration: Creating index '{index.name}' on '{self.bot_name}.{table.name}'")
+            with connection.begin():
+                index.create(bind=connection, checkfirst=True)
+            created.append(index.name)
+        return created
 
     def check_connection(self) -> tuple[bool, Optional[str]]:
         """
@@ -168,9 +213,96 @@ class PostgresManager:
             # Retorna a mensagem de erro para ser exibida ao usuário
             return False, str(e)
 
+    def _partitioning_supported(self) -> bool:
+        return self.engine.dialect.name == 'postgresql'
+
+    def is_partitioned(self, table_name: str) -> bool:
+        """Whether `table_name` exists in this bot's schema as a partitioned table."""
+        if not self._partitioning_supported():
+            return False
+        with self.engine.connect() as connection:
+            return partitioning.is_partitioned(connection, self.bot_name, table_name)
+
     def create_tables(self):
+        if self._partitioning_supported() and self.partitioning_enabled:
+            inspector = inspect(self.engine)
+            with self.engine.begin() as connection:
+                for table_name in partitioning.PARTITION_LAYOUTS:
+                    if not inspector.has_table(table_name, schema=self.bot_name):
+                        partitioning.create_partitioned_table(connection, self.bot_name, table_name)
         Base.metadata.create_all(bind=self.engine)
 
+    def _ensure_current_partitions(self):
+        """Makes sure this month's and next month's partitions exist for live writes."""
+        now = datetime.utcnow()
+        try:
+            self.ensure_price_history_partitions(now, now + timedelta(days=32))
+            for environment in ('trade', 'test'):
+                self.ensure_trade_partitions(environment, now, now + timedelta(days=32))
+        except Exception as e:
+            logger.error(f"Failed to create the current monthly partitions: {e}", exc_info=True)
+
+    def ensure_trade_partitions(self, environment: str, start, end) -> list[str]:
+        """
+        Creates the monthly `trades` partitions of an environment for `start`..`end`.
+        Call before bulk-writing historical trades (e.g. a backtest) so they are
+        pruned by month instead of piling up in the DEFAULT partition.
+        """
+        if environment not in partitioning.PARTITIONED_ENVIRONMENTS or not self.is_partitioned('trades'):
+            return []
+        with self.engine.begin() as connection:
+            return partitioning.ensure_month_partitions(
+                connection, self.bot_name, partitioning.environment_partition_name(environment), start, end)
+
+    def ensure_price_history_partitions(self, start, end) -> list[str]:
+        """Creates the monthly `price_history` partitions for `start`..`end`."""
+        if not self.is_partitioned('price_history'):
+            return []
+        with self.engine.begin() as connection:
+            return partitioning.ensure_month_partitions(connection, self.bot_name, 'price_history', start, end)
+
+    def drop_trade_partitions_before(self, environment: str, cutoff: date) -> list[str]:
+        """
+        Drops an environment's monthly trade partitions that end on or before
+        `cutoff`, and rebuilds that environment's aggregates. Returns the dropped names.
+        """
+        if environment not in partitioning.PARTITIONED_ENVIRONMENTS or not self.is_partitioned('trades'):
+            raise ValueError(f"'{self.bot_name}.trades' has no monthly partitions for environment '{environment}'.")
+        with self.engine.begin() as connection:
+            dropped = partitioning.drop_month_partitions_before(
+                connection, self.bot_name, partitioning.environment_partition_name(environment), cutoff)
+        if dropped:
+            self.rebuild_trade_aggregates(environment)
+        return dropped
+
+    def drop_price_history_partitions_before(self, cutoff: date) -> list[str]:
+        """Drops the monthly price_history partitions that end on or before `cutoff`."""
+        if not self.is_partitioned('price_history'):
+            raise ValueError(f"'{self.bot_name}.price_history' is not partitioned.")
+        with self.engine.begin() as connection:
+            return partitioning.drop_month_partitions_before(connection, self.bot_name, 'price_history', cutoff)
+
+    def migrate_to_partitioned_tables(self, keep_legacy: bool = False) -> list[str]:
+        """
+        Converts this schema's regular 'trades' and 'price_history' tables into
+        their partitioned layout, one transaction per table. Returns the names of
+        the tables that were migrated.
+        """
+        if not self._partitioning_supported():
+            raise ValueError("Table partitioning requires PostgreSQL.")
+        migrated = []
+        for table_name in partitioning.PARTITION_LAYOUTS:
+            if self.is_partitioned(table_name):
+                logger.info(f"'{self.bot_name}.{table_name}' is already partitioned.")
+                continue
+            logger.info(f"Migrating '{self.bot_name}.{table_name}' to a partitioned table...")
+            with self.engine.begin() as connection:
+                connection.execute(text(f"LOCK TABLE {self.bot_name}.{table_name} IN ACCESS EXCLUSIVE MODE"))
+                partitioning.migrate_table_to_partitions(connection, self.bot_name, table_name, keep_legacy=keep_legacy)
+            migrated.append(table_name)
+        self._ensure_current_partitions()
+        return migrated
+
     @contextmanager
     def get_db(self) -> Iterator[Session]:
         db = self.SessionLocal()
@@ -265,9 +397,11 @@ class PostgresManager:
                     trade_data_for_db.pop('order_type', None)
                     
                     logger.info(f"Updating existing trade record for trade_id: {trade_point.trade_id}")
+                    previous_values = SimpleNamespace(**{f: getattr(existing_trade, f) for f in AGGREGATE_SOURCE_FIELDS})
                     for key, value in trade_data_for_db.items():
                         if value is not None:
                             setattr(existing_trade, key, value)
+                    self._apply_sell_aggregates(db, [(previous_values, -1), (existing_trade, 1)])
                 else:
                     # Create new trade
                     logger.info(f"Creating new trade record for trade_id: {trade_point.trade_id}")
@@ -286,6 +420,7 @@ class PostgresManager:
                     
                     new_trade = Trade(**trade_data_for_db)
                     db.add(new_trade)
+                    self._apply_sell_aggregates(db, [(new_trade, 1)])
 
                 db.commit()
                 logger.info(f"Successfully logged '{trade_point.order_type}' for trade_id: {trade_point.trade_id}")
@@ -578,42 +713,47 @@ class PostgresManager:
                 logger.error(f"Failed to check for open positions: {e}", exc_info=True)
                 raise
 
+    def _trade_range_filters(self, mode: Optional[str] = None, symbol: Optional[str] = None, start_date: any = None, end_date: any = "now()",
+                             order_type: Optional[str] = None, status: Optional[str] = None, run_id: Optional[str] = None) -> list:
+        filters = []
+        if mode:
+            filters.append(Trade.environment == mode)
+        if symbol:
+            filters.append(Trade.symbol == symbol)
+        if order_type:
+            filters.append(Trade.order_type == order_type)
+        if status:
+            filters.append(Trade.status == status)
+        if run_id:
+            filters.append(Trade.run_id == run_id)
+
+        # Handle start_date
+        if start_date:
+            if isinstance(start_date, datetime):
+                filters.append(Trade.timestamp >= start_date)
+            elif isinstance(start_date, str) and '-' in start_date:
+                filters.append(Trade.timestamp >= text(f"now() - interval '{start_date.replace('-', '')}'"))
+            else:
+                filters.append(Trade.timestamp >= text(f"'{start_date}'"))
+
+        # Handle end_date
+        if end_date:
+            if isinstance(end_date, datetime):
+                filters.append(Trade.timestamp <= end_date)
+            else:
+                filters.append(Trade.timestamp <= text("now()") if end_date == "now()" else text(f"'{end_date}'"))
+        return filters
+
     def get_all_trades_in_range(self, mode: Optional[str] = None, symbol: Optional[str] = None, bot_id: Optional[str] = None, start_date: any = None, end_date: any = "now()", order_type: Optional[str] = None, status: Optional[str] = None):
         with self.get_db() as db:
             try:
                 query = db.query(Trade).order_by(desc(Trade.timestamp))
 
-                filters = []
-                if mode:
-                    filters.append(Trade.environment == mode)
-                if symbol:
-                    filters.append(Trade.symbol == symbol)
-                if order_type:
-                    filters.append(Trade.order_type == order_type)
-                if status:
-                    filters.append(Trade.status == status)
                 # The bot_id (run_id) filter is intentionally omitted here for the difficulty
                 # calculation. We want the difficulty to be based on the bot's overall
                 # recent activity, even across restarts, to prevent the reset issue.
                 # The query is already scoped to the bot's schema and environment (mode).
-                pass
-
-                # Handle start_date
-                if start_date:
-                    if isinstance(start_date, datetime):
-                        filters.append(Trade.timestamp >= start_date)
-                    elif isinstance(start_date, str) and '-' in start_date:
-                        filters.append(Trade.timestamp >= text(f"now() - interval '{start_date.replace('-', '')}'"))
-                    else:
-                        filters.append(Trade.timestamp >= text(f"'{start_date}'"))
-
-                # Handle end_date
-                if end_date:
-                    if isinstance(end_date, datetime):
-                        filters.append(Trade.timestamp <= end_date)
-                    else:
-                        filters.append(Trade.timestamp <= text("now()") if end_date == "now()" else text(f"'{end_date}'"))
-
+                filters = self._trade_range_filters(mode, symbol, start_date, end_date, order_type, status)
                 if filters:
                     query = query.filter(and_(*filters))
 
@@ -624,6 +764,68 @@ class PostgresManager:
                 logger.error(f"Failed to get all trades from DB: {e}", exc_info=True)
                 raise
 
+    def _trade_rows_statement(self, columns: Iterable[str], include_decision_context: bool, newest_first: bool,
+                              numeric_as_float: bool = False, **filters):
+        names = list(columns)
+        if include_decision_context and 'decision_context' not in names:
+            names.append('decision_context')
+        selected = [Trade.__table__.c[name] for name in names]
+        if numeric_as_float:
+            # Casting in SQL lets the driver return floats instead of building a Decimal per value.
+            selected = [cast(column, Float).label(column.name) if isinstance(column.type, Numeric) else column
+                        for column in selected]
+        statement = select(*selected)
+        conditions = self._trade_range_filters(**filters)
+        if conditions:
+            statement = statement.where(and_(*conditions))
+        order = desc if newest_first else asc
+        return statement.order_by(order(Trade.timestamp), order(Trade.id))
+
+    def get_trade_rows(self, columns: Iterable[str] = TRADE_SUMMARY_COLUMNS, mode: Optional[str] = None, symbol: Optional[str] = None,
+                       run_id: Optional[str] = None, start_date: any = None, end_date: any = "now()", order_type: Optional[str] = None,
+                       status: Optional[str] = None, include_decision_context: bool = False, newest_first: bool = True) -> list:
+        """
+        Column-projected read of trades for analytics paths. Returns lightweight
+        rows that support attribute access like a Trade (`row.order_type`) but are
+        not ORM objects: nothing is tracked by a session, and the JSON
+        `decision_context` is only fetched when `include_decision_context` is set.
+        """
+        statement = self._trade_rows_statement(
+            columns, include_decision_context, newest_first, mode=mode, symbol=symbol, run_id=run_id,
+            start_date=start_date, end_date=end_date, order_type=order_type, status=status)
+        with self.engine.connect() as connection:
+            try:
+                return connection.execute(statement).all()
+            except Exception as e:
+                logger.error(f"Failed to get trade rows from DB: {e}", exc_info=True)
+                raise
+
+    def get_trades_frame(self, columns: Iterable[str] = TRADE_SUMMARY_COLUMNS, mode: Optional[str] = None, symbol: Optional[str] = None,
+                         run_id: Optional[str] = None, start_date: any = None, end_date: any = "now()", order_type: Optional[str] = None,
+                         status: Optional[str] = None, include_decision_context: bool = False, newest_first: bool = True,
+                         numeric_as_float: bool = False) -> pd.DataFrame:
+        """
+        Same projection as `get_trade_rows`, returned as a DataFrame with one
+        column per selected field (timestamps are naive UTC). Numeric columns hold
+        Decimals, or float64 when `numeric_as_float` is set.
+        """
+        statement = self._trade_rows_statement(
+            columns, include_decision_context, newest_first, numeric_as_float, mode=mode, symbol=symbol, run_id=run_id,
+            start_date=start_date, end_date=end_date, order_type=order_type, status=status)
+        with self.engine.connect() as connection:
+            try:
+                result = connection.execute(statement)
+                frame = pd.DataFrame(result.all(), columns=list(result.keys()))
+            except Exception as e:
+                logger.error(f"Failed to get trades frame from DB: {e}", exc_info=True)
+                raise
+        if numeric_as_float:
+            # Columns that are entirely NULL would otherwise stay object dtype.
+            for column in statement.selected_columns:
+                if isinstance(column.type, Float):
+                    frame[column.name] = frame[column.name].astype('float64')
+        return frame
+
     def get_trades_by_run_id(self, run_id: str) -> list:
         """Fetches all trades associated with a specific run_id."""
         with self.get_db() as db:
@@ -681,7 +883,9 @@ class PostgresManager:
         with self.get_db() as db:
             try:
                 # No environment filter, we want the absolute last trade ID recorded for this bot
-                last_trade = db.query(Trade).order_by(desc(Trade.binance_trade_id)).first()
+                # PostgreSQL sorts NULLs first in DESC order, so exclude them explicitly
+                # (this also lets the partial binance_trade_id index answer the query).
+                last_trade = db.query(Trade).filter(Trade.binance_trade_id.isnot(None)).order_by(desc(Trade.binance_trade_id)).first()
                 if last_trade and last_trade.binance_trade_id is not None:
                     logger.info(f"Last known Binance trade ID is {last_trade.binance_trade_id}")
                     return last_trade.binance_trade_id
@@ -784,6 +988,58 @@ class PostgresManager:
                 logger.error(f"Failed to perform dynamic update for trade_id '{trade_id}': {e}", exc_info=True)
                 raise
 
+    def bulk_apply_sync_changes(self, new_trades: list[dict], trade_updates: dict[str, dict]):
+        """
+        Persists a whole synchronization batch in a single transaction.
+        `new_trades` are inserted as new Trade rows and `trade_updates` maps an
+        existing trade_id to the fields that must be changed on it.
+        Either everything is written or nothing is.
+        """
+        if not new_trades and not trade_updates:
+            return
+
+        with self.get_db() as db:
+            try:
+                valid_columns = {c.name for c in Trade.__table__.columns}
+
+                # trade_id is unique, as log_trade enforces; a partitioned table only guards (environment, trade_id, timestamp).
+                candidate_ids = [trade_data.get('trade_id') for trade_data in new_trades]
+                known_ids = {trade_id for (trade_id,) in db.query(Trade.trade_id).filter(Trade.trade_id.in_(candidate_ids))} \
+                    if candidate_ids else set()
+
+                new_rows = []
+                for trade_data in new_trades:
+                    trade_id = trade_data.get('trade_id')
+                    if trade_id in known_ids:
+                        logger.warning(f"Sync batch: trade_id '{trade_id}' already exists; skipping the duplicate insert.")
+                        continue
+                    known_ids.add(trade_id)
+                    row = {k: v for k, v in trade_data.items() if k in valid_columns}
+                    if row.get('remaining_quantity') is None:
+                        row['remaining_quantity'] = row.get('quantity') if row.get('order_type') == 'buy' else Decimal('0')
+                    new_rows.append(Trade(**row))
+                db.add_all(new_rows)
+                self._apply_sell_aggregates(db, [(row, 1) for row in new_rows])
+
+                if trade_updates:
+                    trades_to_update = db.query(Trade).filter(Trade.trade_id.in_(list(trade_updates.keys()))).all()
+                    found_ids = {t.trade_id for t in trades_to_update}
+                    for missing_id in set(trade_updates.keys()) - found_ids:
+                        logger.error(f"Could not find trade with trade_id '{missing_id}' to update.")
+
+                    for trade in trades_to_update:
+                        for key, value in trade_updates[trade.trade_id].items():
+                            # Never allow a batch update to turn a buy into a sell.
+                            if key in valid_columns and key != 'order_type':
+                                setattr(trade, key, value)
+
+                db.commit()
+                logger.info(f"Sync batch committed: {len(new_rows)} new trades, {len(trade_updates)} updated trades.")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to apply sync batch: {e}", exc_info=True)
+                raise
+
     def find_linked_sell_trade(self, buy_trade_id: str) -> Optional[Trade]:
         """
         Finds the sell trade that is linked to a specific buy trade.
@@ -799,10 +1055,238 @@ class PostgresManager:
                 logger.error(f"Failed to find linked sell trade for buy_trade_id '{buy_trade_id}': {e}", exc_info=True)
                 return None
 
+    @staticmethod
+    def _sell_aggregate_contribution(trade) -> tuple[tuple, dict]:
+        """Returns the trade_aggregates key and the values a single sell adds to it."""
+        timestamp = trade.timestamp or datetime.utcnow()
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        realized_pnl = Decimal(str(trade.realized_pnl_usd)) if trade.realized_pnl_usd is not None else Decimal('0')
+        price = Decimal(str(trade.price)) if trade.price is not None else Decimal('0')
+        hodl_amount = Decimal(str(trade.hodl_asset_amount)) if trade.hodl_asset_amount is not None else Decimal('0')
+
+        key = (trade.environment, trade.symbol, trade.run_id, timestamp.date())
+        values = {
+            "sell_count": 1,
+            "realized_pnl_usd": realized_pnl,
+            "realized_pnl_btc": realized_pnl / price if price > 0 else Decimal('0'),
+            "hodl_asset_amount": hodl_amount,
+        }
+        return key, values
+
+    def _apply_sell_aggregates(self, db: Session, changes: Iterable) -> int:
+        """
+        Adds (sign 1) or removes (sign -1) sells from trade_aggregates within the
+        caller's session, so the totals commit or roll back together with the trades.
+        Non-sell trades are ignored. Returns the number of sells applied.
+        """
+        deltas = {}
+        applied = 0
+        for trade, sign in changes:
+            if trade.order_type != 'sell':
+                continue
+            applied += 1
+            key, values = self._sell_aggregate_contribution(trade)
+            bucket = deltas.setdefault(key, {field: Decimal('0') for field in AGGREGATE_VALUE_FIELDS})
+            for field in AGGREGATE_VALUE_FIELDS:
+                bucket[field] += sign * values[field]
+
+        # One upsert per key: concurrent writers of a new key cannot both insert it, and the
+        # increments are applied by the database, so there is no read-modify-write to lock.
+        insert = postgresql.insert if self.engine.dialect.name == 'postgresql' else sqlite.insert
+        table = TradeAggregate.__table__
+        for (environment, symbol, run_id, day), delta in deltas.items():
+            statement = insert(table).values(
+                environment=environment, symbol=symbol, run_id=run_id, day=day,
+                updated_at=datetime.utcnow(), **dict(delta, sell_count=int(delta["sell_count"]))
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=['environment', 'symbol', 'run_id', 'day'],
+                set_={**{field: table.c[field] + statement.excluded[field] for field in AGGREGATE_VALUE_FIELDS},
+                      'updated_at': statement.excluded.updated_at}
+            )
+            db.execute(statement)
+        return applied
+
+    def get_realized_pnl_summary(self, environment: Optional[str] = None, symbol: Optional[str] = None, run_id: Optional[str] = None) -> dict:
+        """
+        Returns realized PnL, BTC-denominated PnL, treasury amount and sell count
+        from the trade_aggregates table, optionally filtered.
+        """
+        with self.get_db() as db:
+            try:
+                query = db.query(
+                    func.coalesce(func.sum(TradeAggregate.sell_count), 0),
+                    func.coalesce(func.sum(TradeAggregate.realized_pnl_usd), 0),
+                    func.coalesce(func.sum(TradeAggregate.realized_pnl_btc), 0),
+                    func.coalesce(func.sum(TradeAggregate.hodl_asset_amount), 0)
+                )
+                if environment:
+                    query = query.filter(TradeAggregate.environment == environment)
+                if symbol:
+                    query = query.filter(TradeAggregate.symbol == symbol)
+                if run_id:
+                    query = query.filter(TradeAggregate.run_id == run_id)
+                sell_count, realized_pnl_usd, realized_pnl_btc, hodl_asset_amount = query.one()
+                return {
+                    "sell_count": int(sell_count),
+                    "realized_pnl_usd": Decimal(str(realized_pnl_usd)),
+                    "realized_pnl_btc": Decimal(str(realized_pnl_btc)),
+                    "hodl_asset_amount": Decimal(str(hodl_asset_amount)),
+                }
+            except Exception as e:
+                logger.error(f"Failed to read realized PnL summary: {e}", exc_info=True)
+                raise
+
+    def rebuild_trade_aggregates(self, environment: Optional[str] = None) -> int:
+        """
+        Recomputes trade_aggregates from the trades table, for one environment or all of them.
+        Returns the number of sell trades that were aggregated.
+        """
+        with self.get_db() as db:
+            try:
+                delete_query = db.query(TradeAggregate)
+                sells_query = db.query(Trade).filter(Trade.order_type == 'sell')
+                if environment:
+                    delete_query = delete_query.filter(TradeAggregate.environment == environment)
+                    sells_query = sells_query.filter(Trade.environment == environment)
+                delete_query.delete(synchronize_session=False)
+
+                sell_count = self._apply_sell_aggregates(db, ((trade, 1) for trade in sells_query.yield_per(1000)))
+                db.commit()
+                logger.info(f"Rebuilt trade aggregates from {sell_count} sell trades.")
+                return sell_count
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to rebuild trade aggregates: {e}", exc_info=True)
+                raise
+
+    def get_recent_trades(self, environment: str, limit: int = 200) -> list[Trade]:
+        """Fetches the most recent trades for an environment, newest first."""
+        with self.get_db() as db:
+            try:
+                return db.query(Trade).filter(Trade.environment == environment).order_by(desc(Trade.timestamp)).limit(limit).all()
+            except Exception as e:
+                logger.error(f"Failed to get recent trades for '{environment}': {e}", exc_info=True)
+                raise
+
+    def _trade_history_filters(self, environment: str, status: Optional[str] = None, order_type: Optional[str] = None,
+                               start_date: Optional[date] = None, end_date: Optional[date] = None) -> list:
+        """Filters shared by the paginated trade history and its summary."""
+        filters = [
+            Trade.environment == environment,
+            # Closed buys are represented in the history by their sell record.
+            not_(and_(Trade.order_type == 'buy', Trade.status == 'CLOSED')),
+        ]
+        if status and status != 'all':
+            filters.append(Trade.status == status.upper())
+        if order_type:
+            filters.append(Trade.order_type == order_type)
+        if start_date:
+            start = HISTORY_TIMEZONE.localize(datetime.combine(start_date, time.min)).astimezone(pytz.utc)
+            filters.append(Trade.timestamp >= start.replace(tzinfo=None))
+        if end_date:
+            end = HISTORY_TIMEZONE.localize(datetime.combine(end_date + timedelta(days=1), time.min)).astimezone(pytz.utc)
+            filters.append(Trade.timestamp < end.replace(tzinfo=None))
+        return filters
+
+    @staticmethod
+    def _encode_history_cursor(sort_by: str, descending: bool, value, row_id: int) -> str:
+        payload = json.dumps([sort_by, descending, value.isoformat() if isinstance(value, datetime) else str(value), row_id])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_history_cursor(cursor: str, sort_by: str, descending: bool) -> tuple:
+        try:
+            cursor_sort_by, cursor_descending, raw_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except Exception as e:
+            raise ValueError(f"Invalid trade history cursor: {e}") from e
+        if cursor_sort_by != sort_by or cursor_descending != descending:
+            raise ValueError("Trade history cursor does not match the requested sort order.")
+        column, _ = HISTORY_SORT_COLUMNS[sort_by]
+        if sort_by == 'timestamp':
+            value = datetime.fromisoformat(raw_value)
+        elif column.type.python_type is Decimal:
+            value = Decimal(raw_value)
+        else:
+            value = raw_value
+        return value, int(row_id)
+
+    def get_trade_history_page(self, environment: str, status: Optional[str] = None, order_type: Optional[str] = None,
+                               start_date: Optional[date] = None, end_date: Optional[date] = None,
+                               sort_by: str = 'timestamp', descending: bool = True, limit: int = 100,
+                               cursor: Optional[str] = None) -> tuple[list[Trade], Optional[str]]:
+        """
+        Returns one page of the trade history and the cursor for the next page
+        (None on the last page). Pagination is keyset-based on (sort column, id),
+        so every page costs the same regardless of how deep it is.
+        """
+        if sort_by not in HISTORY_SORT_COLUMNS:
+            raise ValueError(f"Unsupported sort column '{sort_by}'. Use one of: {', '.join(HISTORY_SORT_COLUMNS)}.")
+        limit = max(1, min(int(limit), MAX_HISTORY_PAGE_SIZE))
+
+        column, null_sentinel = HISTORY_SORT_COLUMNS[sort_by]
+        sort_expr = column
+        if null_sentinel is not None:
+            sort_expr = func.coalesce(column, -null_sentinel if descending else null_sentinel)
+
+        filters = self._trade_history_filters(environment, status, order_type, start_date, end_date)
+        if cursor:
+            value, row_id = self._decode_history_cursor(cursor, sort_by, descending)
+            if descending:
+                filters.append(tuple_(sort_expr, Trade.id) < tuple_(value, row_id))
+            else:
+                filters.append(tuple_(sort_expr, Trade.id) > tuple_(value, row_id))
+
+        order = (desc(sort_expr), desc(Trade.id)) if descending else (asc(sort_expr), asc(Trade.id))
+        with self.get_db() as db:
+            try:
+                rows = db.query(Trade, sort_expr).filter(*filters).order_by(*order).limit(limit + 1).all()
+            except Exception as e:
+                logger.error(f"Failed to get trade history page for '{environment}': {e}", exc_info=True)
+                raise
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_trade, last_value = rows[-1]
+            next_cursor = self._encode_history_cursor(sort_by, descending, last_value, last_trade.id)
+        return [trade for trade, _ in rows], next_cursor
+
+    def get_trade_history_summary(self, environment: str, status: Optional[str] = None, order_type: Optional[str] = None,
+                                  start_date: Optional[date] = None, end_date: Optional[date] = None) -> dict:
+        """Aggregates the filtered trade history in the database instead of over every row in Python."""
+        is_buy = Trade.order_type == 'buy'
+        is_closed_sell = and_(Trade.order_type == 'sell', Trade.status == 'CLOSED')
+        filters = self._trade_history_filters(environment, status, order_type, start_date, end_date)
+        with self.get_db() as db:
+            try:
+                row = db.query(
+                    func.count(Trade.id),
+                    func.sum(case((is_buy, 1), else_=0)),
+                    func.sum(case((is_closed_sell, 1), else_=0)),
+                    func.sum(case((is_buy, Trade.usd_value), else_=0)),
+                    func.sum(case((is_closed_sell, Trade.sell_usd_value), else_=0)),
+                    func.sum(case((is_closed_sell, Trade.realized_pnl_usd), else_=0)),
+                ).filter(*filters).one()
+            except Exception as e:
+                logger.error(f"Failed to get trade history summary for '{environment}': {e}", exc_info=True)
+                raise
+
+        total, buys, sells, invested, returned, realized = row
+        return {
+            "total_trades": int(total or 0),
+            "buy_count": int(buys or 0),
+            "sell_count": int(sells or 0),
+            "total_invested": Decimal(str(invested or 0)),
+            "total_returned": Decimal(str(returned or 0)),
+            "realized_pnl_usd": Decimal(str(realized or 0)),
+        }
+
     def clear_all_tables(self):
         with self.get_db() as db:
             try:
-                db.execute(text(f"TRUNCATE TABLE {self.bot_name}.trades, {self.bot_name}.bot_status, {self.bot_name}.price_history RESTART IDENTITY;"))
+                db.execute(text(f"TRUNCATE TABLE {self.bot_name}.trades, {self.bot_name}.trade_aggregates, {self.bot_name}.bot_status, {self.bot_name}.price_history RESTART IDENTITY;"))
                 db.commit()
                 logger.info("All tables cleared successfully.")
             except Exception as e:
@@ -829,13 +1313,31 @@ class PostgresManager:
                 logger.error(f"Error querying first timestamp from PostgreSQL for measurement '{measurement}': {e}", exc_info=True)
                 return None
 
+    def _truncate_environment_partition(self, environment: str):
+        """Empties an environment's trade partition (and its monthly partitions) without a row-by-row DELETE."""
+        partition = partitioning.environment_partition_name(environment)
+        with self.get_db() as db:
+            try:
+                db.execute(text(f"TRUNCATE TABLE {self.bot_name}.{partition}"))
+                db.execute(text(f"DELETE FROM {self.bot_name}.trade_aggregates WHERE environment = :env"), {"env": environment})
+                db.commit()
+                logger.info(f"Successfully truncated the '{environment}' trades partition.")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Failed to truncate the '{environment}' trades partition: {e}", exc_info=True)
+                raise
+
     def clear_backtest_trades(self):
         """Deletes all trades from the 'trades' table where the environment is 'backtest'."""
+        if self.is_partitioned('trades'):
+            self._truncate_environment_partition("backtest")
+            return
         with self.get_db() as db:
             try:
                 # Using text for a simple delete statement for clarity
                 statement = text(f"DELETE FROM {self.bot_name}.trades WHERE environment = :env")
                 result = db.execute(statement, {"env": "backtest"})
+                db.execute(text(f"DELETE FROM {self.bot_name}.trade_aggregates WHERE environment = :env"), {"env": "backtest"})
                 db.commit()
                 logger.info(f"Successfully cleared {result.rowcount} backtest trades from the database.")
             except Exception as e:
@@ -845,10 +1347,14 @@ class PostgresManager:
 
     def clear_testnet_trades(self):
         """Deletes all trades from the 'trades' table where the environment is 'test'."""
+        if self.is_partitioned('trades'):
+            self._truncate_environment_partition("test")
+            return
         with self.get_db() as db:
             try:
                 statement = text(f"DELETE FROM {self.bot_name}.trades WHERE environment = :env")
                 result = db.execute(statement, {"env": "test"})
+                db.execute(text(f"DELETE FROM {self.bot_name}.trade_aggregates WHERE environment = :env"), {"env": "test"})
                 db.commit()
                 logger.info(f"Successfully cleared {result.rowcount} testnet trades from the database.")
             except Exception as e:
@@ -7,8 +7,9 @@ import concurrent.futures
 import threading
 from tqdm.auto import tqdm
 from jules_bot.utils.logger import logger
+from jules_bot.utils.config_manager import config_manager
 from jules_bot.database.postgres_manager import PostgresManager
-from jules_bot.genius_optimizer.objective import create_objective_function
+from jules_bot.genius_optimizer.objective import create_objective_function, run_batched_trials
 from jules_bot.genius_optimizer.regime_analyzer import RegimeAnalyzer
 from jules_bot.genius_optimizer.results import (
     save_best_params_for_regime,
@@ -26,7 +27,7 @@ class GeniusOptimizer:
     Orchestrates the entire process of data segmentation, regime-specific
     optimization, and results aggregation.
     """
-    def __init__(self, bot_name: str, n_trials: int, active_params: dict, days: Optional[int] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, seed_params: Optional[dict] = None, progress_bar_desc: Optional[str] = None):
+    def __init__(self, bot_name: str, n_trials: int, active_params: dict, days: Optional[int] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, seed_params: Optional[dict] = None, progress_bar_desc: Optional[str] = None, batch_size: Optional[int] = None):
         self.bot_name = bot_name
         self.days = days
         self.start_date = start_date
@@ -35,6 +36,10 @@ class GeniusOptimizer:
         self.active_params = active_params
         self.seed_params = seed_params
         self.progress_bar_desc = progress_bar_desc
+        # Trials simulated together by the BatchBacktester; 1 runs each trial through the Backtester.
+        if batch_size is None:
+            batch_size = int(config_manager.get('OPTIMIZER', 'batch_size', fallback='1') or 1)
+        self.batch_size = max(1, batch_size)
         self.studies = {}
         self.db_manager = PostgresManager() # Initialize db manager for the whole process
         self.global_best_lock = threading.Lock() # Lock for thread-safe access to the global best trial file
@@ -178,11 +183,21 @@ class GeniusOptimizer:
                     logger.info(f"🏆 New best trial! Score: {trial.value:.4f}, R: {regime}, T: {trial.number}")
 
 
-        study.optimize(
-            objective_function,
-            n_trials=self.n_trials,
-            callbacks=[tui_callback]
-        )
+        if self.batch_size > 1:
+            run_batched_trials(
+                study,
+                n_trials=self.n_trials,
+                batch_size=self.batch_size,
+                active_params=regime_active_params,
+                data_segment=data_segment,
+                callbacks=[tui_callback]
+            )
+        else:
+            study.optimize(
+                objective_function,
+                n_trials=self.n_trials,
+                callbacks=[tui_callback]
+            )
 
         self.studies[regime] = study
         logger.info(f"--- Finished optimization for [Regime {regime}] ---")
@@ -5,6 +5,7 @@ from decimal import Decimal
 
 from jules_bot.utils.logger import logger
 from jules_bot.backtesting.engine import Backtester
+from jules_bot.backtesting.batch_engine import BatchBacktester
 from jules_bot.utils.config_manager import ConfigManager
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.genius_optimizer.search_space import define_search_space
@@ -84,6 +85,29 @@ def calculate_genius_score(results: dict) -> float:
     return final_score
 
 
+def _trial_config_manager(config_overrides: dict) -> ConfigManager:
+    # Each trial needs its own ConfigManager instance to hold the overrides.
+    # The global config_manager is a singleton and should not be modified here.
+    # The bot_name is automatically picked up from the environment, so no .initialize() is needed.
+    trial_config_manager = ConfigManager()
+    trial_config_manager.apply_overrides(config_overrides)
+
+    if not trial_config_manager.get('BACKTEST', 'initial_balance'):
+         trial_config_manager.set('BACKTEST', 'initial_balance', '1000.0')
+    return trial_config_manager
+
+
+def _score_trial(trial: optuna.Trial, results: dict) -> float:
+    score = calculate_genius_score(results)
+
+    if results:
+        # Serialize results to be JSON-friendly (convert Decimals to strings)
+        serializable_results = {k: str(v) if isinstance(v, Decimal) else v for k, v in results.items()}
+        trial.set_user_attr("full_summary", serializable_results)
+
+    return score
+
+
 def create_objective_function(bot_name: str, db_manager: PostgresManager, active_params: dict, data_segment: pd.DataFrame):
     """
     Factory function to create the objective function with specific context.
@@ -97,16 +121,7 @@ def create_objective_function(bot_name: str, db_manager: PostgresManager, active
         It runs a backtest on a specific data segment and returns the 'Genius Score'.
         """
         try:
-            config_overrides = define_search_space(trial, active_params)
-
-            # Each trial needs its own ConfigManager instance to hold the overrides.
-            # The global config_manager is a singleton and should not be modified here.
-            # The bot_name is automatically picked up from the environment, so no .initialize() is needed.
-            trial_config_manager = ConfigManager()
-            trial_config_manager.apply_overrides(config_overrides)
-
-            if not trial_config_manager.get('BACKTEST', 'initial_balance'):
-                 trial_config_manager.set('BACKTEST', 'initial_balance', '1000.0')
+            trial_config_manager = _trial_config_manager(define_search_space(trial, active_params))
 
             # The Backtester is now initialized with the specific data segment
             backtester = Backtester(
@@ -117,14 +132,7 @@ def create_objective_function(bot_name: str, db_manager: PostgresManager, active
 
             results = backtester.run(trial=trial, return_full_results=True)
 
-            score = calculate_genius_score(results)
-
-            if results:
-                # Serialize results to be JSON-friendly (convert Decimals to strings)
-                serializable_results = {k: str(v) if isinstance(v, Decimal) else v for k, v in results.items()}
-                trial.set_user_attr("full_summary", serializable_results)
-
-            return score
+            return _score_trial(trial, results)
 
         except optuna.TrialPruned:
             raise
@@ -133,3 +141,31 @@ def create_objective_function(bot_name: str, db_manager: PostgresManager, active
             return -1000.0
 
     return objective
+
+
+def run_batched_trials(study: optuna.Study, n_trials: int, batch_size: int, active_params: dict,
+                       data_segment: pd.DataFrame, callbacks: list = None):
+    """
+    Runs `n_trials` trials of `study` in batches: each batch asks the sampler for
+    `batch_size` parameter sets, simulates them together with the BatchBacktester
+    in one pass over 'data_segment', then tells the study every score.
+
+    The sampler only learns from a batch once it is finished, and batched trials
+    are not pruned. Callbacks receive each finished trial, as with `study.optimize`.
+    """
+    remaining = n_trials
+    while remaining > 0:
+        trials = [study.ask() for _ in range(min(batch_size, remaining))]
+        remaining -= len(trials)
+        try:
+            config_managers = [_trial_config_manager(define_search_space(trial, active_params)) for trial in trials]
+            batch_results = BatchBacktester(data=data_segment, config_managers=config_managers).run()
+            scores = [_score_trial(trial, results) for trial, results in zip(trials, batch_results)]
+        except Exception as e:
+            logger.error(f"--- Genius Optuna batch of trials #{trials[0].number}-#{trials[-1].number}: FAILED. Error: {e} ---", exc_info=True)
+            scores = [-1000.0] * len(trials)
+
+        for trial, score in zip(trials, scores):
+            frozen_trial = study.tell(trial, score)
+            for callback in callbacks or []:
+                callback(study, frozen_trial)
@@ -2,6 +2,7 @@ import pandas as pd
 from jules_bot.utils.logger import logger
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.research.feature_engineering import add_all_features
+from jules_bot.research.feature_dtypes import apply_dtype_policy
 from jules_bot.bot.situational_awareness import SituationalAwareness
 from jules_bot.utils.config_manager import config_manager
 
@@ -57,11 +58,12 @@ class RegimeAnalyzer:
         This replicates the process used by the live bot and backtester.
         """
         logger.info("Calculating features for regime analysis...")
-        # live_mode=False is important to ensure all features are calculated
-        features_df = add_all_features(self.full_data, live_mode=False)
+        # live_mode=False is important to ensure all features are calculated.
+        # full_data was just loaded here, so the stages write into it instead of copying.
+        features_df = add_all_features(self.full_data, live_mode=False, inplace=True)
 
         logger.info("Calculating market regimes for the full dataset...")
-        self.full_data = self.sa_model.transform(features_df).dropna()
+        self.full_data = apply_dtype_policy(self.sa_model.transform(features_df, inplace=True).dropna())
         logger.info("Market regime calculation complete.")
 
     def segment_data(self) -> dict:
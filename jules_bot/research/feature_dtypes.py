@@ -0,0 +1,79 @@
+"""
+Compact dtypes for feature frames held by the backtester and the optimizer.
+
+`add_all_features` returns float64 everywhere. For a year of 1m candles that
+is ~40 columns x 525k rows. `FeatureDtypePolicy` shrinks such a frame in place:
+- indicators become float32;
+- `market_regime` becomes int8;
+- the placeholder columns that feature engineering fills with 0.0 when their
+  input (macro, sentiment or derivatives data) is missing are dropped;
+- configured unused columns (e.g. the training `target`) are dropped.
+
+OHLC prices stay float64: trade prices are built from them.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from jules_bot.utils.logger import logger
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+# Written as 0.0 by add_all_features when the input column is absent.
+PLACEHOLDER_FEATURES = (
+    'fng_change_3d', 'funding_rate_mean_24h', 'open_interest_pct_change_4h',
+    'btc_dxy_corr_30d', 'btc_vix_corr_30d', 'btc_spx_corr_30d', 'btc_ndx_corr_30d', 'btc_gold_corr_30d',
+)
+
+
+@dataclass(frozen=True)
+class FeatureDtypePolicy:
+    float_dtype: str = 'float64'
+    regime_dtype: str = 'int8'
+    drop_placeholders: bool = False
+    drop_columns: Tuple[str, ...] = field(default_factory=tuple)
+
+    @classmethod
+    def from_config(cls, config_manager=None) -> 'FeatureDtypePolicy':
+        """Reads `feature_float_dtype`, `drop_placeholder_features` and `drop_feature_columns` from [DATA_PIPELINE]."""
+        if config_manager is None:
+            from jules_bot.utils.config_manager import config_manager as global_config_manager
+            config_manager = global_config_manager
+        float_dtype = config_manager.get('DATA_PIPELINE', 'feature_float_dtype', fallback=None) or 'float64'
+        drop_placeholders = str(config_manager.get('DATA_PIPELINE', 'drop_placeholder_features', fallback='false')).lower() == 'true'
+        try:
+            drop_columns = tuple(json.loads(config_manager.get('DATA_PIPELINE', 'drop_feature_columns', fallback=None) or '[]'))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Invalid 'drop_feature_columns' in [DATA_PIPELINE]; no columns will be dropped. Error: {e}")
+            drop_columns = ()
+        if float_dtype not in ('float32', 'float64'):
+            logger.warning(f"Unsupported feature_float_dtype '{float_dtype}'; using float64.")
+            float_dtype = 'float64'
+        return cls(float_dtype=float_dtype, drop_placeholders=drop_placeholders, drop_columns=drop_columns)
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Converts `df` in place, one column at a time, and returns it."""
+        unused = [column for column in self.drop_columns if column in df.columns]
+        if self.drop_placeholders:
+            unused += [column for column in PLACEHOLDER_FEATURES
+                       if column in df.columns and column not in unused and not df[column].any()]
+        if unused:
+            df.drop(columns=unused, inplace=True)
+
+        float_dtype = np.dtype(self.float_dtype)
+        for column in df.columns:
+            dtype = df[column].dtype
+            if column in PRICE_COLUMNS or not pd.api.types.is_float_dtype(dtype) or dtype == float_dtype:
+                continue
+            df[column] = df[column].astype(float_dtype)
+
+        if 'market_regime' in df.columns and not df['market_regime'].isna().any():
+            df['market_regime'] = df['market_regime'].astype(self.regime_dtype)
+        return df
+
+
+def apply_dtype_policy(df: pd.DataFrame, policy: FeatureDtypePolicy = None) -> pd.DataFrame:
+    """Applies `policy` (the configured one by default) to `df` in place."""
+    return (policy or FeatureDtypePolicy.from_config()).apply(df)
@@ -9,14 +9,16 @@ from tqdm import tqdm
 from jules_bot.utils.logger import logger
 from jules_bot.utils.config_manager import config_manager
 
-def add_all_features(df: pd.DataFrame, live_mode: bool = False) -> pd.DataFrame:
+def add_all_features(df: pd.DataFrame, live_mode: bool = False, inplace: bool = False) -> pd.DataFrame:
     """
     Função central que adiciona todas as features.
     :param df: DataFrame com os dados brutos.
     :param live_mode: Se True, não calcula o 'target', que só é usado para treino.
+    :param inplace: Se True, as features são escritas no próprio `df` (sem cópia), para
+        quem já é dono do DataFrame (ex.: dados recém-lidos do banco no backtester).
     """
     logger.debug(f"Iniciando a adição de features (Modo Live: {live_mode})...")
-    df_copy = df.copy()
+    df_copy = df if inplace else df.copy()
 
     # --- GARANTIA DE DADOS DE ENTRADA ---
     ohlc_cols = ['open', 'high', 'low', 'close', 'volume']
@@ -0,0 +1,191 @@
+import math
+import time
+from decimal import Decimal
+from typing import Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from jules_bot.core.request_governor import get_request_governor
+from jules_bot.utils.logger import logger
+from jules_bot.utils.profiling import get_profiler
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "jules_bot"
+
+# Timer name (or name prefix) -> (histogram family, label name for the rest of the timer name, help text).
+TIMER_FAMILIES = {
+    "cycle": ("cycle_duration_seconds", None, "Duration of a full trading cycle."),
+    "sync": ("sync_duration_seconds", None, "Duration of a trade history synchronization with the exchange."),
+    "status.publish": ("status_publish_duration_seconds", None, "Time to render and publish the bot status on the publisher thread."),
+    "exchange.": ("exchange_request_duration_seconds", "endpoint", "Latency of Binance REST calls by endpoint."),
+    "db.": ("db_query_duration_seconds", "kind", "Execution time of database statements (read or write)."),
+}
+PHASE_FAMILY = ("phase_duration_seconds", "phase", "Duration of the other instrumented phases of the cycle and backtests.")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if not value.is_integer() else str(int(value))
+
+
+class MetricsWriter:
+    """
+    Builds a Prometheus text exposition (format 0.0.4). Every series carries the
+    common labels, so the scrapes of many bots on one host stay distinguishable.
+    """
+    def __init__(self, common_labels: Optional[dict] = None):
+        self.common_labels = common_labels or {}
+        self._lines: list = []
+        self._declared: set = set()
+
+    def _declare(self, name: str, kind: str, help_text: str):
+        if name not in self._declared:
+            self._declared.add(name)
+            self._lines.append(f"# HELP {name} {help_text}")
+            self._lines.append(f"# TYPE {name} {kind}")
+
+    def _series(self, name: str, value, labels: Optional[dict] = None):
+        all_labels = {**self.common_labels, **(labels or {})}
+        label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in all_labels.items())
+        self._lines.append(f"{name}{{{label_text}}} {_format_value(value)}" if label_text else f"{name} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, value, labels: Optional[dict] = None):
+        if value is None:
+            return
+        self._declare(name, "gauge", help_text)
+        self._series(name, value, labels)
+
+    def counter(self, name: str, help_text: str, value, labels: Optional[dict] = None):
+        if value is None:
+            return
+        self._declare(name, "counter", help_text)
+        self._series(name, value, labels)
+
+    def histogram(self, name: str, help_text: str, buckets: list, count: int, total: float, labels: Optional[dict] = None):
+        """Writes one histogram series from cumulative [(upper bound, count)] buckets ending in '+Inf'."""
+        self._declare(name, "histogram", help_text)
+        for bound, bucket_count in buckets:
+            self._series(f"{name}_bucket", bucket_count, {**(labels or {}), "le": bound if bound == "+Inf" else _format_value(bound)})
+        self._series(f"{name}_count", count, labels)
+        self._series(f"{name}_sum", total, labels)
+
+    def render(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+
+def _timer_family(timer_name: str) -> tuple:
+    """Maps a profiler timer name to (family, labels, help)."""
+    for key, (family, label, help_text) in TIMER_FAMILIES.items():
+        if label is None and timer_name == key:
+            return family, {}, help_text
+        if label is not None and timer_name.startswith(key):
+            return family, {label: timer_name[len(key):]}, help_text
+    family, label, help_text = PHASE_FAMILY
+    return family, {label: timer_name}, help_text
+
+
+def _write_timers(writer: MetricsWriter):
+    # Sorted by family so each family's series stay together under one HELP/TYPE header.
+    series = []
+    for timer_name, (buckets, count, total) in get_profiler().cumulative().items():
+        family, labels, help_text = _timer_family(timer_name)
+        series.append((family, timer_name, labels, help_text, buckets, count, total))
+    for family, _, labels, help_text, buckets, count, total in sorted(series, key=lambda s: (s[0], s[1])):
+        writer.histogram(f"{PREFIX}_{family}", help_text, buckets, count, total, labels)
+
+
+def _write_bot_state(writer: MetricsWriter, bot):
+    writer.gauge(f"{PREFIX}_open_positions", "Open positions seen by the last trading cycle.", bot.open_positions_count)
+    writer.gauge(f"{PREFIX}_syncing", "1 while a trade history synchronization pauses trading.", bot.is_syncing)
+    writer.gauge(f"{PREFIX}_market_regime", "Market regime used by the last cycle (-1 is undefined).", bot.dynamic_params.current_regime)
+    if bot.last_sync_time is not None:
+        writer.gauge(f"{PREFIX}_last_sync_timestamp_seconds", "Unix time of the last completed periodic sync.", bot.last_sync_time.timestamp())
+
+    portfolio = bot.live_portfolio_manager
+    for name, value, help_text in (
+        ("portfolio_value_usd", portfolio.cached_portfolio_value, "Last computed portfolio value."),
+        ("cash_balance_usd", portfolio.cached_cash_balance, "Last fetched quote asset balance."),
+        ("invested_value_usd", portfolio.cached_open_positions_value, "Last computed value of the open positions."),
+    ):
+        writer.gauge(f"{PREFIX}_{name}", help_text, float(value) if isinstance(value, Decimal) else value)
+
+
+def _write_exchange_cache(writer: MetricsWriter, bot):
+    cache_metrics = bot.trader.snapshot_cache.get_metrics()
+    for kind in ("account", "ticker"):
+        labels = {"kind": kind}
+        writer.counter(f"{PREFIX}_exchange_cache_requests_total", "Reads served through the exchange snapshot cache.", cache_metrics[f"{kind}_requests"], labels)
+        writer.counter(f"{PREFIX}_exchange_cache_fetches_total", "Reads that had to call the exchange.", cache_metrics[f"{kind}_fetches"], labels)
+    writer.gauge(f"{PREFIX}_exchange_cache_hit_ratio", "Share of snapshot cache reads served without an exchange call.", cache_metrics["hit_ratio"])
+
+
+def _write_request_governor(writer: MetricsWriter):
+    governor_metrics = get_request_governor().get_metrics()
+    writer.gauge(f"{PREFIX}_request_weight_used", "Binance request weight used in the current window.", governor_metrics["used_weight"])
+    writer.gauge(f"{PREFIX}_request_weight_limit", "Binance request weight budget per window.", governor_metrics["weight_limit"])
+    writer.gauge(f"{PREFIX}_requests_queued", "Exchange requests waiting for weight right now.", governor_metrics["queued_now"])
+    writer.counter(f"{PREFIX}_rate_limited_responses_total", "HTTP 418/429 responses from Binance.", governor_metrics["rate_limited_responses"])
+    for lane, counters in governor_metrics.items():
+        if not isinstance(counters, dict):
+            continue
+        for outcome, value in counters.items():
+            writer.counter(f"{PREFIX}_governor_requests_total", "Exchange requests by priority lane and admission outcome.", value, {"lane": lane, "outcome": outcome})
+
+
+def _write_db_pool(writer: MetricsWriter, bot):
+    # Pool counters are kept in memory by SQLAlchemy; reading them never opens a connection.
+    pool = bot.db_manager.engine.pool
+    for name, method, help_text in (
+        ("db_pool_size", "size", "Configured size of the connection pool."),
+        ("db_pool_checked_out", "checkedout", "Connections currently in use."),
+        ("db_pool_overflow", "overflow", "Connections opened beyond the pool size."),
+    ):
+        if hasattr(pool, method):
+            writer.gauge(f"{PREFIX}_{name}", help_text, getattr(pool, method)())
+
+
+def _write_process(writer: MetricsWriter):
+    if psutil is None:
+        return
+    process = psutil.Process()
+    with process.oneshot():
+        cpu = process.cpu_times()
+        writer.gauge("process_resident_memory_bytes", "Resident memory size in bytes.", process.memory_info().rss)
+        writer.counter("process_cpu_seconds_total", "Total user and system CPU time in seconds.", cpu.user + cpu.system)
+        writer.gauge("process_num_threads", "Number of OS threads in the process.", process.num_threads())
+        writer.gauge("process_start_time_seconds", "Start time of the process since the Unix epoch.", process.create_time())
+        if hasattr(process, "num_fds"):
+            writer.gauge("process_open_fds", "Number of open file descriptors.", process.num_fds())
+
+
+def render_metrics(bot) -> str:
+    """
+    Renders the bot's metrics in the Prometheus text format. Everything comes from
+    in-memory state (timers, caches, pool counters, the last cycle), so a scrape
+    never touches the database or the exchange.
+    """
+    writer = MetricsWriter({"bot": bot.bot_name, "mode": bot.mode})
+    started = time.perf_counter()
+    for section in (_write_timers, _write_process, _write_request_governor):
+        try:
+            section(writer)
+        except Exception as e:
+            logger.error(f"Failed to collect metrics in {section.__name__}: {e}", exc_info=True)
+    for section in (_write_bot_state, _write_exchange_cache, _write_db_pool):
+        try:
+            section(writer, bot)
+        except Exception as e:
+            logger.error(f"Failed to collect metrics in {section.__name__}: {e}", exc_info=True)
+    writer.gauge(f"{PREFIX}_metrics_render_seconds", "Time spent rendering this scrape.", time.perf_counter() - started)
+    return writer.render()
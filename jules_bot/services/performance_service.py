@@ -1,4 +1,4 @@
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
 import sys
 import os
 
@@ -14,8 +14,8 @@ from jules_bot.utils.logger import logger
 
 def get_summary(bot_name: str = None):
     """
-    Connects to the database, fetches all sell trades for a specific bot,
-    and calculates a summary of performance including PnL in USD, PnL in BTC,
+    Connects to the database, reads the realized-PnL aggregates for a specific bot,
+    and returns a summary of performance including PnL in USD, PnL in BTC,
     and total assets sent to treasury. The connection is scoped to the bot's
     schema via the config_manager, which must be initialized by the caller.
 
@@ -42,15 +42,11 @@ def get_summary(bot_name: str = None):
         current_mode = config_manager.get('APP', 'mode', fallback='trade')
         logger.info(f"PerformanceService: Calculating summary for environment: '{current_mode}'")
 
-        # Fetch only successfully closed 'sell' trades for the current environment.
-        # This is the single source of truth for realized PnL.
-        closed_sell_trades = db_manager.get_all_trades_in_range(
-            mode=current_mode,
-            order_type='sell',
-            status='CLOSED'
-        )
+        # Sells are always recorded as CLOSED, and the aggregates table is maintained
+        # on every sell insert, so this is a single lookup regardless of history size.
+        pnl_summary = db_manager.get_realized_pnl_summary(environment=current_mode)
 
-        if not closed_sell_trades:
+        if pnl_summary["sell_count"] == 0:
             logger.warning(f"PerformanceService: No closed sell trades found for environment '{current_mode}'.")
             return {
                 "sell_trade_count": 0,
@@ -59,30 +55,10 @@ def get_summary(bot_name: str = None):
                 "total_treasury_btc": "0.00000000"
             }
 
-        sell_trade_count = len(closed_sell_trades)
-
-        for trade in closed_sell_trades:
-                # The loop now only iterates over confirmed, closed sell trades.
-                if trade.realized_pnl_usd is not None:
-                    try:
-                        total_usd_pnl += Decimal(trade.realized_pnl_usd)
-                    except InvalidOperation:
-                        pass # Logged in the calling script if needed
-
-                pnl_usd = trade.realized_pnl_usd
-                sell_price = trade.price
-                if pnl_usd is not None and sell_price is not None and sell_price > Decimal('0'):
-                    try:
-                        pnl_btc = Decimal(pnl_usd) / Decimal(sell_price)
-                        total_btc_pnl += pnl_btc
-                    except InvalidOperation:
-                        pass
-
-                if trade.hodl_asset_amount is not None:
-                    try:
-                        total_treasury_btc += Decimal(trade.hodl_asset_amount)
-                    except InvalidOperation:
-                        pass
+        sell_trade_count = pnl_summary["sell_count"]
+        total_usd_pnl = pnl_summary["realized_pnl_usd"]
+        total_btc_pnl = pnl_summary["realized_pnl_btc"]
+        total_treasury_btc = pnl_summary["hodl_asset_amount"]
 
         summary = {
             "sell_trade_count": sell_trade_count,
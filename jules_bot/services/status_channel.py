@@ -0,0 +1,250 @@
+import json
+import os
+import tempfile
+import threading
+import uuid
+from typing import Optional
+
+from jules_bot.utils.logger import logger
+
+DEFAULT_COMPACT_AFTER_BYTES = 2 * 1024 * 1024
+
+
+def status_log_path(bot_name: str, directory: str = ".tui_files") -> str:
+    """Path of the append-only status log shared by a bot and its TUI."""
+    return os.path.join(directory, f".bot_status_{bot_name}.jsonl")
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, default=str, separators=(',', ':'))
+
+
+class StatusChannelWriter:
+    """
+    Publishes the bot status as an append-only log of JSON lines.
+
+    The first line of the log is always a full `snapshot`; every later line is a
+    `delta` carrying only the top-level sections whose content changed since the
+    previous line, tagged with a strictly increasing sequence number. List
+    sections that behave as newest-first windows (trade history, portfolio
+    history) are sent as a `window` patch: the new head rows plus how many of the
+    previous rows to keep. Once the log grows past `compact_after_bytes` it is
+    atomically replaced by a fresh snapshot, so a reader that (re)connects never
+    has to replay more than one compaction period.
+    """
+    def __init__(self, path: str, compact_after_bytes: int = DEFAULT_COMPACT_AFTER_BYTES):
+        self.path = path
+        self.compact_after_bytes = compact_after_bytes
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self._state: dict = {}
+        self._serialized: dict[str, str] = {}
+        self._list_items: dict[str, list[str]] = {}
+        self._log_bytes = 0
+        self._needs_snapshot = True
+        self._lock = threading.RLock()
+
+    def get_section(self, name: str, default=None):
+        """Returns the last published value of a section."""
+        return self._state.get(name, default)
+
+    def update_sections(self, sections: dict) -> Optional[int]:
+        """Publishes a partial update, keeping every section not mentioned as is."""
+        with self._lock:
+            merged = dict(self._state)
+            merged.update(sections)
+            return self.publish(merged)
+
+    def publish(self, status: dict) -> Optional[int]:
+        """
+        Publishes the full status. Returns the sequence number of the line that
+        was written, or None when nothing changed.
+        """
+        with self._lock:
+            return self._publish(status)
+
+    def _publish(self, status: dict) -> Optional[int]:
+        serialized, list_items = {}, {}
+        for key, value in status.items():
+            if isinstance(value, list):
+                items = [_dumps(item) for item in value]
+                list_items[key] = items
+                serialized[key] = '[' + ','.join(items) + ']'
+            else:
+                serialized[key] = _dumps(value)
+
+        if self._needs_snapshot or self._log_bytes >= self.compact_after_bytes:
+            self.seq += 1
+            self._write_snapshot(serialized)
+        else:
+            changed = [key for key, text in serialized.items() if self._serialized.get(key) != text]
+            removed = [key for key in self._serialized if key not in serialized]
+            if not changed and not removed:
+                return None
+            self.seq += 1
+            self._append_delta(changed, removed, serialized, list_items)
+
+        self._state = dict(status)
+        self._serialized = serialized
+        self._list_items = list_items
+        return self.seq
+
+    def _header(self, line_type: str) -> str:
+        return f'{{"seq":{self.seq},"epoch":"{self.epoch}","type":"{line_type}"'
+
+    def _window_patch(self, old_items: list[str], new_items: list[str]) -> Optional[str]:
+        """
+        Encodes `new_items` as `head + old_items[:keep]` when the list only gained
+        rows at the front and/or lost rows at the back. Returns None otherwise.
+        """
+        if not old_items:
+            return None
+        try:
+            head_len = new_items.index(old_items[0])
+        except ValueError:
+            return None
+        keep = len(new_items) - head_len
+        if keep > len(old_items) or new_items[head_len:] != old_items[:keep]:
+            return None
+        return '{"head":[' + ','.join(new_items[:head_len]) + f'],"keep":{keep}}}'
+
+    def _append_delta(self, changed: list, removed: list, serialized: dict, list_items: dict):
+        sections, windows = [], []
+        for key in changed:
+            patch = None
+            if key in list_items and key in self._list_items:
+                patch = self._window_patch(self._list_items[key], list_items[key])
+            if patch is not None:
+                windows.append(f'{_dumps(key)}:{patch}')
+            else:
+                sections.append(f'{_dumps(key)}:{serialized[key]}')
+
+        line = (
+            self._header("delta")
+            + ',"sections":{' + ','.join(sections) + '}'
+            + ',"windows":{' + ','.join(windows) + '}'
+            + ',"removed":' + _dumps(removed) + '}\n'
+        )
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            self._log_bytes += len(line)
+        except OSError as e:
+            logger.error(f"Failed to append status delta to '{self.path}': {e}", exc_info=True)
+            self._needs_snapshot = True
+
+    def _write_snapshot(self, serialized: dict):
+        line = (
+            self._header("snapshot")
+            + ',"sections":{' + ','.join(f'{_dumps(key)}:{text}' for key, text in serialized.items()) + '}}\n'
+        )
+        directory = os.path.dirname(self.path) or '.'
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # Replace the log atomically so a reader never sees a half-written snapshot.
+            with tempfile.NamedTemporaryFile(mode='w', delete=False, dir=directory, encoding='utf-8',
+                                             prefix=os.path.basename(self.path) + '_', suffix='.tmp') as temp_f:
+                temp_f.write(line)
+                temp_path = temp_f.name
+            os.replace(temp_path, self.path)
+            self._log_bytes = len(line)
+            self._needs_snapshot = False
+        except OSError as e:
+            logger.error(f"Failed to write status snapshot to '{self.path}': {e}", exc_info=True)
+            self._needs_snapshot = True
+
+
+class StatusChannelReader:
+    """
+    Follows a status log written by StatusChannelWriter.
+
+    Each `poll()` reads only the bytes appended since the previous call and
+    applies them as patches. The whole log is re-read (starting from its
+    snapshot) on the first poll and whenever continuity is lost: the file was
+    compacted or recreated, a sequence number was skipped, or a line could not
+    be parsed.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.state: dict = {}
+        self.seq = 0
+        self.epoch: Optional[str] = None
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self.resync_count = 0
+
+    def poll(self) -> Optional[set]:
+        """
+        Applies any new lines. Returns the set of section names that changed
+        (every section after a resync), or None when there was nothing new.
+        Raises FileNotFoundError if the bot has not created the log yet.
+        """
+        stat = os.stat(self.path)
+        if self._inode is None or stat.st_ino != self._inode or stat.st_size < self._offset:
+            return self._resync()
+        if stat.st_size == self._offset:
+            return None
+
+        with open(self.path, 'rb') as f:
+            f.seek(self._offset)
+            chunk = f.read()
+        changed = set()
+        consumed = 0
+        for raw_line in chunk.splitlines(keepends=True):
+            if not raw_line.endswith(b'\n'):
+                break  # The writer is still appending this line.
+            consumed += len(raw_line)
+            try:
+                entry = json.loads(raw_line)
+                if entry.get("type") == "snapshot" or entry.get("epoch") != self.epoch or entry.get("seq") != self.seq + 1:
+                    return self._resync()
+                changed |= self._apply_delta(entry)
+            except (ValueError, KeyError, TypeError):
+                return self._resync()
+        self._offset += consumed
+        return changed or None
+
+    def _resync(self) -> Optional[set]:
+        self.resync_count += 1
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            content = f.read()
+
+        lines = content.splitlines(keepends=True)
+        complete = [line for line in lines if line.endswith(b'\n')]
+        self.state, self.seq, self.epoch = {}, 0, None
+        self._inode = stat.st_ino
+        self._offset = sum(len(line) for line in complete)
+        if not complete:
+            # The log is empty; try again on the next poll.
+            self._inode = None
+            return None
+
+        snapshot = json.loads(complete[0])
+        if snapshot.get("type") != "snapshot":
+            raise ValueError(f"Status log '{self.path}' does not start with a snapshot.")
+        self.state = dict(snapshot["sections"])
+        self.seq, self.epoch = snapshot["seq"], snapshot["epoch"]
+
+        for offset_lines, raw_line in enumerate(complete[1:], start=1):
+            entry = json.loads(raw_line)
+            if entry.get("epoch") != self.epoch or entry.get("seq") != self.seq + 1:
+                # Unexpected gap: keep what is consistent and resync again next poll.
+                self._offset = sum(len(line) for line in complete[:offset_lines])
+                self._inode = None
+                break
+            self._apply_delta(entry)
+        return set(self.state)
+
+    def _apply_delta(self, entry: dict) -> set:
+        changed = set(entry.get("sections", {}))
+        self.state.update(entry.get("sections", {}))
+        for key, patch in entry.get("windows", {}).items():
+            previous = self.state.get(key) or []
+            self.state[key] = patch["head"] + previous[:patch["keep"]]
+            changed.add(key)
+        for key in entry.get("removed", []):
+            self.state.pop(key, None)
+            changed.add(key)
+        self.seq, self.epoch = entry["seq"], entry["epoch"]
+        return changed
@@ -0,0 +1,113 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Optional
+
+from jules_bot.utils.logger import logger
+
+
+@dataclass
+class CycleSnapshot:
+    """
+    The state the trading loop has already computed for one cycle.
+    Handed to the status publisher so status refreshes never recompute it.
+    """
+    market_data: dict
+    current_price: Decimal
+    current_regime: int
+    current_params: dict
+    open_positions: list
+    portfolio_value: Decimal
+    cash_balance: Decimal
+    invested_value: Decimal
+    decision_reason: str
+    operating_mode: str
+    difficulty_factor: Decimal
+    created_at: float = field(default_factory=time.time)
+
+
+class StatusPublisher:
+    """
+    Publishes bot status on its own daemon thread.
+
+    The trading loop only hands over its latest CycleSnapshot (a non-blocking
+    assignment); the publisher renders and writes it at most once per
+    `interval_seconds`. Older snapshots that were never published are simply
+    replaced, so a slow status write can never back up the trading thread.
+    """
+    def __init__(self, publish_fn: Callable[[CycleSnapshot], None], interval_seconds: float = 4.0):
+        self._publish_fn = publish_fn
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._latest: Optional[CycleSnapshot] = None
+        self._last_published: Optional[CycleSnapshot] = None
+        self._force_next = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="status-publisher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def submit(self, snapshot: CycleSnapshot, force: bool = False):
+        """Replaces the pending snapshot. With `force`, it is published without waiting for the interval."""
+        with self._lock:
+            self._latest = snapshot
+            self._force_next = self._force_next or force
+        if force:
+            self._wake.set()
+
+    def request_refresh(self):
+        """Republishes the most recent snapshot as soon as possible."""
+        with self._lock:
+            if self._latest is None:
+                self._latest = self._last_published
+            self._force_next = True
+        self._wake.set()
+
+    def _take_pending(self) -> Optional[CycleSnapshot]:
+        with self._lock:
+            snapshot, self._latest = self._latest, None
+            self._force_next = False
+            return snapshot
+
+    def publish_pending(self) -> bool:
+        """Publishes the pending snapshot on the calling thread. Returns True if one was published."""
+        snapshot = self._take_pending()
+        if snapshot is None:
+            return False
+        try:
+            self._publish_fn(snapshot)
+            self._last_published = snapshot
+        except Exception as e:
+            logger.error(f"Status publisher failed to publish snapshot: {e}", exc_info=True)
+        return True
+
+    def _run(self):
+        logger.info("Status publisher thread started.")
+        last_publish_time = 0.0
+        while not self._stop.is_set():
+            with self._lock:
+                forced = self._force_next
+            wait_for = 0.0 if forced else max(0.0, self.interval_seconds - (time.monotonic() - last_publish_time))
+            if wait_for > 0:
+                self._wake.wait(timeout=wait_for)
+                self._wake.clear()
+                continue
+            if self.publish_pending():
+                last_publish_time = time.monotonic()
+            else:
+                self._wake.wait(timeout=self.interval_seconds)
+                self._wake.clear()
+        logger.info("Status publisher thread stopped.")
@@ -3,6 +3,7 @@ import os
 import re
 from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
+from typing import Optional
 import pytz
 
 from sqlalchemy import select
@@ -10,12 +11,14 @@ from sqlalchemy.exc import OperationalError
 
 from jules_bot.bot.situational_awareness import SituationalAwareness
 from jules_bot.core.exchange_connector import ExchangeManager
+from jules_bot.core.request_governor import RequestLane, request_lane
 from jules_bot.core_logic.capital_manager import CapitalManager
 from jules_bot.core_logic.dynamic_parameters import DynamicParameters
 from jules_bot.core_logic.strategy_rules import StrategyRules
 from jules_bot.database.models import BotStatus
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.research.live_feature_calculator import LiveFeatureCalculator
+from jules_bot.services.status_publisher import CycleSnapshot
 from jules_bot.utils.config_manager import ConfigManager
 from jules_bot.utils.helpers import _calculate_progress_pct, calculate_buy_progress
 
@@ -29,6 +32,7 @@ class StatusService:
         self.feature_calculator = feature_calculator
         self.strategy = StrategyRules(self.config_manager)
         self.capital_manager = CapitalManager(self.config_manager, self.strategy)
+        self._exchange_managers: dict[str, ExchangeManager] = {}
 
 
     def update_bot_status(self, bot_id: str, mode: str, reason: str, open_positions: int, portfolio_value: Decimal, market_regime: int, operating_mode: str, buy_target: Decimal, buy_progress: Decimal, cash_balance: Decimal, invested_value: Decimal):
@@ -86,65 +90,50 @@ class StatusService:
                 session.rollback()
                 logger.error(f"Failed to set bot status to running for {bot_id}: {e}", exc_info=True)
 
-    def get_extended_status(self, environment: str, bot_id: str):
+    def get_extended_status(self, environment: str, bot_id: str, cycle_snapshot: Optional[CycleSnapshot] = None):
         """
         Gathers and calculates extended status information, including
         open positions' PnL, progress towards sell targets, and buy signal readiness.
+
+        When the trading loop provides a `cycle_snapshot`, its market data, regime,
+        parameters and open positions are reused as-is; only when called standalone
+        (e.g. from scripts) are they computed here.
         """
         try:
-            exchange_manager = ExchangeManager(mode=environment)
-            symbol = "BTCUSDT"
-
-            market_data_series = self.feature_calculator.get_current_candle_with_features()
-            if market_data_series.empty:
-                return {"error": "Could not fetch current market data."}
-            market_data = market_data_series.to_dict()
-            current_price = Decimal(str(market_data.get('close', '0')))
-
-            # Fetch all open positions for the bot, not just for this specific run_id
-            open_positions_db = self.db_manager.get_open_positions(environment) or []
+            exchange_manager = self._get_exchange_manager(environment)
+
+            if cycle_snapshot is not None:
+                market_data = cycle_snapshot.market_data
+                current_price = cycle_snapshot.current_price
+                current_regime = cycle_snapshot.current_regime
+                current_params = cycle_snapshot.current_params
+                open_positions_db = cycle_snapshot.open_positions
+            else:
+                market_data_series = self.feature_calculator.get_current_candle_with_features()
+                if market_data_series.empty:
+                    return {"error": "Could not fetch current market data."}
+                market_data = market_data_series.to_dict()
+                current_price = Decimal(str(market_data.get('close', '0')))
+                current_regime = self._calculate_current_regime()
+
+                dynamic_params = DynamicParameters(self.config_manager)
+                dynamic_params.update_parameters(current_regime)
+                current_params = dynamic_params.parameters
+
+                # Fetch all open positions for the bot, not just for this specific run_id
+                open_positions_db = self.db_manager.get_open_positions(environment) or []
             open_positions_count = len(open_positions_db)
 
-            # --- LIVE STRATEGY EVALUATION ---
-            current_regime = -1
-            try:
-                sa_instance = SituationalAwareness()
-                historical_data = self.feature_calculator.get_historical_data_with_features()
-                if historical_data is not None and not historical_data.empty:
-                    regime_df = sa_instance.transform(historical_data)
-                    if not regime_df.empty and 'market_regime' in regime_df.columns:
-                        current_regime = regime_df['market_regime'].iloc[-1]
-            except Exception as e:
-                logger.warning(f"Could not determine market regime for status: {e}")
-
-            dynamic_params = DynamicParameters(self.config_manager)
-            dynamic_params.update_parameters(current_regime)
-            current_params = dynamic_params.parameters
-
             positions_status = self._process_open_positions(open_positions_db, current_price, current_params)
 
             wallet_balances, total_wallet_usd_value = self._process_wallet_balances(exchange_manager, current_price)
-            
-            # --- LIVE STRATEGY EVALUATION ---
-            current_regime = -1
-            try:
-                sa_instance = SituationalAwareness()
-                historical_data = self.feature_calculator.get_historical_data_with_features()
-                if historical_data is not None and not historical_data.empty:
-                    regime_df = sa_instance.transform(historical_data)
-                    if not regime_df.empty and 'market_regime' in regime_df.columns:
-                        current_regime = regime_df['market_regime'].iloc[-1]
-            except Exception as e:
-                logger.warning(f"Could not determine market regime for status: {e}")
-
-            dynamic_params = DynamicParameters(self.config_manager)
-            dynamic_params.update_parameters(current_regime)
-            current_params = dynamic_params.parameters
 
             cash_balance = next((bal['free'] for bal in wallet_balances if bal['asset'] == 'USDT'), Decimal('0'))
             end_date = datetime.now(pytz.utc)
             start_date = end_date - timedelta(hours=self.capital_manager.difficulty_reset_timeout_hours)
-            trade_history = self.db_manager.get_all_trades_in_range(
+            # The difficulty factor only needs each trade's time and side.
+            trade_history = self.db_manager.get_trade_rows(
+                columns=('timestamp', 'order_type'),
                 mode=environment,
                 start_date=start_date,
                 end_date=end_date
@@ -170,9 +159,6 @@ class StatusService:
                 market_data, current_params, difficulty_factor
             )
 
-            bot_status_db = self.db_manager.get_bot_status(bot_id)
-            bot_status_str = "RUNNING" if bot_status_db and bot_status_db.is_running else "STOPPED"
-
             # Format the target price for display
             condition_target = f"${condition_target_price:,.2f}" if condition_target_price > 0 else "N/A"
 
@@ -184,25 +170,20 @@ class StatusService:
                 except InvalidOperation:
                     pass
 
-            # Get all trades for the bot's schema, not just this run, for accurate PnL
-            full_trade_history = self.db_manager.get_all_trades_in_range(mode=environment, bot_id=None, start_date=None) or []
-
             # --- PnL and Count Calculation ---
-            total_realized_pnl = sum(
-                Decimal(str(trade.realized_pnl_usd))
-                for trade in full_trade_history
-                if trade.order_type == 'sell' and trade.realized_pnl_usd is not None
-            )
+            # Realized PnL and the sell count come from the maintained aggregates table.
+            pnl_summary = self.db_manager.get_realized_pnl_summary(environment=environment)
+            total_realized_pnl = pnl_summary["realized_pnl_usd"]
             total_unrealized_pnl = sum(
                 pos['unrealized_pnl'] for pos in positions_status
             )
             net_total_pnl = total_realized_pnl + total_unrealized_pnl
 
             # Total trades are the sum of open positions and closed positions (sells).
-            sell_trades_count = sum(1 for trade in full_trade_history if trade.order_type == 'sell')
-            total_trades_count = open_positions_count + sell_trades_count
-            trade_history_dicts = [trade.to_dict() for trade in full_trade_history]
-
+            total_trades_count = open_positions_count + pnl_summary["sell_count"]
+            # The history itself is paged through the API; the TUI only needs to know when it changed.
+            latest_trades = self.db_manager.get_recent_trades(environment, limit=1) or []
+            latest_trade_id = latest_trades[0].trade_id if latest_trades else None
 
             # --- Capital Allocation Calculation ---
             total_btc_balance = next((bal['total'] for bal in wallet_balances if bal['asset'] == 'BTC'), Decimal('0'))
@@ -235,7 +216,7 @@ class StatusService:
                     "buy_target_percentage_drop": buy_target_percentage_drop,
                     "condition_label": "N/A"
                 },
-                "trade_history": trade_history_dicts,
+                "latest_trade_id": latest_trade_id,
                 "wallet_balances": wallet_balances,
                 "total_realized_pnl": total_realized_pnl,
                 "total_unrealized_pnl": total_unrealized_pnl,
@@ -250,6 +231,27 @@ class StatusService:
             logger.error(f"Error getting extended status: {e}", exc_info=True)
             return {"error": str(e), "bot_status": "ERROR"}
 
+    def _get_exchange_manager(self, environment: str) -> ExchangeManager:
+        """Returns one ExchangeManager per environment instead of building a new client on every call."""
+        exchange_manager = self._exchange_managers.get(environment)
+        if exchange_manager is None:
+            exchange_manager = ExchangeManager(mode=environment)
+            self._exchange_managers[environment] = exchange_manager
+        return exchange_manager
+
+    def _calculate_current_regime(self) -> int:
+        current_regime = -1
+        try:
+            sa_instance = SituationalAwareness()
+            historical_data = self.feature_calculator.get_historical_data_with_features()
+            if historical_data is not None and not historical_data.empty:
+                regime_df = sa_instance.transform(historical_data)
+                if not regime_df.empty and 'market_regime' in regime_df.columns:
+                    current_regime = regime_df['market_regime'].iloc[-1]
+        except Exception as e:
+            logger.warning(f"Could not determine market regime for status: {e}")
+        return current_regime
+
     def _calculate_buy_condition_details(self, reason: str, market_data: dict, current_params: dict, should_buy: bool) -> tuple[str, Decimal, str]:
         if should_buy:
             return "Met", Decimal('100'), "Signal Active"
@@ -372,7 +374,9 @@ class StatusService:
         return positions_status
 
     def _process_wallet_balances(self, exchange_manager, current_price):
-        wallet_balances = exchange_manager.get_account_balance() or []
+        # Status refreshes are the first work to be shed when the exchange weight budget runs low.
+        with request_lane(RequestLane.UI):
+            wallet_balances = exchange_manager.get_account_balance() or []
         processed_balances_dict = {
             'BTC': {'asset': 'BTC', 'free': '0.0', 'locked': '0.0'},
             'USDT': {'asset': 'USDT', 'free': '0.0', 'locked': '0.0'}
@@ -4,7 +4,10 @@ from typing import Dict, Any
 from jules_bot.core.schemas import TradePoint
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.utils.config_manager import config_manager
-from jules_bot.utils.logger import logger
+from jules_bot.utils.logger import logger, get_logger
+
+# Per-trade success logs; silenced by the 'simulation' logging profile in backtests.
+trade_log = get_logger("trade_logger")
 
 class TradeLogger:
     """
@@ -36,7 +39,7 @@ class TradeLogger:
 
             trade_point = self._create_trade_point(trade_data)
             self.db_manager.log_trade(trade_point)
-            logger.info(f"Successfully logged '{trade_point.order_type}' trade for trade_id: {trade_point.trade_id}")
+            trade_log.info("Successfully logged '%s' trade for trade_id: %s", trade_point.order_type, trade_point.trade_id)
             return True
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"TradeLogger: Failed to create or log trade point. Error: {e}", exc_info=True)
@@ -78,7 +81,7 @@ class TradeLogger:
             update_payload.pop('trade_id', None)
             
             self.db_manager.update_trade(trade_id, update_payload)
-            logger.info(f"Successfully requested update for trade_id: {trade_id}")
+            trade_log.info("Successfully requested update for trade_id: %s", trade_id)
             return True
         except (KeyError, ValueError, TypeError) as e:
             logger.error(f"TradeLogger: Failed to prepare trade update. Error: {e}", exc_info=True)
@@ -1,9 +1,13 @@
 import configparser
 import os
+import threading
 from pathlib import Path
 from typing import Dict, Optional
 from dotenv import load_dotenv
 
+# Bounds the per-instance snapshot cache when many override sets are applied in turn.
+MAX_CACHED_SNAPSHOTS = 16
+
 class ConfigManager:
     """
     A class to manage loading and accessing configuration from a .ini file.
@@ -26,22 +30,51 @@ class ConfigManager:
         self.bot_name: str = os.getenv("BOT_NAME", "jules_bot")
         
         self.overrides: Optional[Dict[str, str]] = None
+        self._overrides_key: tuple = ()
         self.config = configparser.ConfigParser(interpolation=None)
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_file}")
         self.config.read(config_file)
 
+        # Resolved snapshots, memoized per (bot name, overrides). See `snapshot`.
+        self._snapshots: Dict[tuple, "ConfigSnapshot"] = {}
+        self._snapshot_lock = threading.Lock()
+
+    def snapshot(self) -> "ConfigSnapshot":
+        """
+        Returns a frozen snapshot of every value resolved for the current bot name
+        and overrides. It is built on first use and reused until either changes.
+        Environment variables are read once, when the snapshot is built.
+        """
+        key = (self.bot_name, self._overrides_key)
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            from jules_bot.utils.config_snapshot import ConfigSnapshot
+
+            with self._snapshot_lock:
+                snapshot = self._snapshots.get(key)
+                if snapshot is None:
+                    if len(self._snapshots) >= MAX_CACHED_SNAPSHOTS:
+                        self._snapshots.clear()
+                    snapshot = ConfigSnapshot.build(self)
+                    self._snapshots[key] = snapshot
+        return snapshot
+
     def apply_overrides(self, override_dict: Dict[str, str]):
         """
         Applies a dictionary of temporary overrides. These take highest precedence.
         """
+        from jules_bot.utils.config_snapshot import overrides_key
+
         self.overrides = override_dict
+        self._overrides_key = overrides_key(override_dict)
 
     def clear_overrides(self):
         """
         Clears any temporary overrides.
         """
         self.overrides = None
+        self._overrides_key = ()
 
     def _resolve_value(self, value: str, force_bot_specific: bool = False) -> Optional[str]:
         """
@@ -106,7 +139,12 @@ class ConfigManager:
         3. The provided fallback value.
         This ensures that the .ini file is the single source of truth for which
         environment variables are used.
+        Values are served from the memoized `snapshot`, except bot-specific
+        lookups, which are resolved on every call so that they can raise.
         """
+        if not force_bot_specific:
+            return self.snapshot().get(section, key, fallback)
+
         env_key_name = key.upper()
 
         # 1. Check for temporary override
@@ -199,5 +237,34 @@ class ConfigManager:
         return all_params
 
 
-# Instantiate the config manager for global use
-config_manager = ConfigManager()
+class _LazyConfigManager:
+    """
+    The process-wide ConfigManager, created on first use so that importing this
+    module does not read `.env` or `config.ini`. Attribute reads, writes and
+    deletes (e.g. `config_manager.bot_name = ...`) go to the real instance.
+    """
+    def __init__(self):
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _get_instance(self) -> ConfigManager:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, '_instance', ConfigManager())
+                instance = self._instance
+        return instance
+
+    def __getattr__(self, name):
+        return getattr(self._get_instance(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._get_instance(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._get_instance(), name)
+
+
+# The config manager for global use
+config_manager = _LazyConfigManager()
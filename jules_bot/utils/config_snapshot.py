@@ -0,0 +1,57 @@
+"""
+A frozen, fully resolved view of a ConfigManager.
+
+Resolving a value means checking the overrides, reading configparser and
+following `@env/` pointers through one or two `os.getenv` calls. A snapshot
+does that once for every key, so reads on hot paths (per-candle parameter
+updates, per-trial rule construction) are plain dictionary lookups.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+
+def overrides_key(overrides: Optional[Mapping]) -> Tuple:
+    """A hashable, order-independent key for an overrides dictionary."""
+    if not overrides:
+        return ()
+    return tuple(sorted((key, repr(value)) for key, value in overrides.items()))
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    bot_name: str
+    overrides: Mapping[str, object]
+    # (section, lower-case key) -> resolved value, with overrides already applied.
+    values: Mapping[Tuple[str, str], object]
+    sections: Tuple[str, ...]
+
+    @classmethod
+    def build(cls, config_manager) -> "ConfigSnapshot":
+        """Resolves every key of `config_manager` for its current bot name and overrides."""
+        overrides = dict(config_manager.overrides or {})
+        values = {}
+        for section in config_manager.config.sections():
+            for key, raw_value in config_manager.config.items(section):
+                value = overrides.get(key.upper())
+                if value is None:
+                    value = config_manager._resolve_value(raw_value)
+                if value is not None:
+                    values[(section, key)] = value
+
+        return cls(
+            bot_name=config_manager.bot_name,
+            overrides=MappingProxyType(overrides),
+            values=MappingProxyType(values),
+            sections=tuple(config_manager.config.sections()),
+        )
+
+    def has_section(self, section: str) -> bool:
+        return section in self.sections
+
+    def get(self, section: str, key: str, fallback=None):
+        """Same lookup order as ConfigManager.get: overrides, then the .ini value, then the fallback."""
+        value = self.values.get((section, key.lower()))
+        if value is None and self.overrides:
+            value = self.overrides.get(key.upper())
+        return fallback if value is None else value
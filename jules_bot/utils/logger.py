@@ -1,11 +1,14 @@
 # src/logger.py (VERSÃO 5.2 - ISOLAMENTO DE LOGS)
 
+import atexit
 import logging
+import logging.handlers
 import json
+import queue
 import sys
 import os
-from tabulate import tabulate
-import pandas as pd
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 import pytz
 
@@ -23,15 +26,25 @@ logging.Logger.performance = performance
 class JsonFormatter(logging.Formatter):
     _timezone = pytz.timezone('America/Sao_Paulo')
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The timezone conversion only changes once per second; reuse it for every record in that second.
+        self._cached_second = None
+        self._cached_second_text = None
+
     def formatTime(self, record, datefmt=None):
-        dt = datetime.fromtimestamp(record.created, tz=pytz.utc).astimezone(self._timezone)
         if datefmt:
+            dt = datetime.fromtimestamp(record.created, tz=pytz.utc).astimezone(self._timezone)
             return dt.strftime(datefmt)
 
         # This format is what the user's log shows, so let's stick to it.
         # YYYY-MM-DD HH:MM:SS,ms
-        t = dt.strftime('%Y-%m-%d %H:%M:%S')
-        return '%s,%03d' % (t, record.msecs)
+        second = int(record.created)
+        if second != self._cached_second:
+            dt = datetime.fromtimestamp(second, tz=pytz.utc).astimezone(self._timezone)
+            self._cached_second_text = dt.strftime('%Y-%m-%d %H:%M:%S')
+            self._cached_second = second
+        return '%s,%03d' % (self._cached_second_text, record.msecs)
 
     def format(self, record):
         log_object = {
@@ -60,11 +73,74 @@ bot_mode = os.getenv("BOT_MODE", "main")  # 'main' as default for scripts withou
 # Create a unique logger name for each bot instance and mode
 logger_name = f"gcsBot.{bot_name}.{bot_mode}"
 logger = logging.getLogger(logger_name)
-logger.setLevel(logging.DEBUG)
+logger.setLevel(os.getenv("LOG_LEVEL", "DEBUG").upper())
 logger.propagate = False # Impede que os logs sejam passados para o logger root
 
+# --- SUBSISTEMAS E PERFIS ---
+# Hot paths log through child loggers (e.g. 'gcsBot.<bot>.<mode>.capital') so their level can be
+# tuned on its own. LOG_LEVELS sets them explicitly, e.g. "capital=WARNING,trade_logger=INFO".
+SUBSYSTEM_LEVELS = {}
+for _entry in filter(None, (item.strip() for item in os.getenv("LOG_LEVELS", "").split(","))):
+    _subsystem, _, _level = _entry.partition("=")
+    SUBSYSTEM_LEVELS[_subsystem.strip()] = _level.strip().upper()
+
+# Levels applied while a profile is active. Explicit LOG_LEVELS entries always win.
+# 'simulation' silences the per-candle and per-trade logs of backtests and optimizer trials.
+LOG_PROFILES = {
+    "default": {},
+    "simulation": {"capital": "WARNING", "trade_logger": "WARNING"},
+}
+
+def get_logger(subsystem: str) -> logging.Logger:
+    """Returns the child logger of a subsystem; its records go to the bot's handlers."""
+    return logger.getChild(subsystem)
+
+for _subsystem, _level in SUBSYSTEM_LEVELS.items():
+    get_logger(_subsystem).setLevel(_level)
+
+_profile_lock = threading.Lock()
+# Active profiles: name -> [number of open blocks, levels to restore when the last one exits].
+# Concurrent runs (e.g. parallel optimizer trials) share one application of the profile.
+_active_profiles = {}
+
+def _apply_profile_levels(levels: dict) -> dict:
+    """Sets subsystem levels, skipping explicitly configured ones. Returns the previous levels."""
+    previous = {}
+    for subsystem, level in levels.items():
+        if subsystem in SUBSYSTEM_LEVELS:
+            continue
+        child = get_logger(subsystem)
+        previous[subsystem] = child.level
+        child.setLevel(level)
+    return previous
+
+@contextmanager
+def log_profile(name: str):
+    """
+    Applies a logging profile (see LOG_PROFILES) for the duration of the block,
+    e.g. `with log_profile("simulation"): backtester.run()`. Blocks may overlap
+    across threads: the first to enter applies the levels, the last to exit restores them.
+    """
+    levels = LOG_PROFILES[name]
+    with _profile_lock:
+        active = _active_profiles.get(name)
+        if active is None:
+            active = _active_profiles[name] = [0, _apply_profile_levels(levels)]
+        active[0] += 1
+    try:
+        yield
+    finally:
+        with _profile_lock:
+            active[0] -= 1
+            if active[0] == 0:
+                del _active_profiles[name]
+                for subsystem, level in active[1].items():
+                    get_logger(subsystem).setLevel(level)
+
 # Como não estamos mais logando para arquivos, só precisamos de um handler de console.
 # Este handler enviará logs para o stderr, que é o que o 'docker logs' captura.
+_queue_listener = None
+
 if not logger.handlers:
     json_formatter = JsonFormatter()
 
@@ -73,12 +149,29 @@ if not logger.handlers:
     console_handler.setFormatter(json_formatter)
     # Define o nível para DEBUG para capturar tudo.
     console_handler.setLevel(logging.DEBUG)
-    logger.addHandler(console_handler)
+
+    if os.getenv("LOG_ASYNC", "false").lower() in ("true", "1", "yes"):
+        # Modo não bloqueante: o chamador só enfileira o registro; formatação JSON e escrita
+        # acontecem na thread do listener. O listener é drenado na saída do processo.
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _queue_listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
+    else:
+        logger.addHandler(console_handler)
 
     logger.info(f"Logger configurado para output de console (stderr). Logger Name: '{logger_name}'")
 
+# Applied process-wide when set, e.g. LOG_PROFILE=simulation for optimizer workers.
+if os.getenv("LOG_PROFILE") in LOG_PROFILES:
+    _apply_profile_levels(LOG_PROFILES[os.getenv("LOG_PROFILE")])
+
 def log_table(title, data, headers="keys", tablefmt="heavy_grid"):
     """Helper function to log tabular data using the correct logger instance."""
+    # Imported here so that every module importing the logger does not pay for pandas.
+    import pandas as pd
+    from tabulate import tabulate
     try:
         is_empty = False
         if isinstance(data, pd.DataFrame): is_empty = data.empty
@@ -0,0 +1,324 @@
+import bisect
+import cProfile
+import io
+import math
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional
+
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+
+DEFAULT_WINDOW = 1024
+# Upper bounds (seconds) of the cumulative buckets exported to Prometheus. Syncs can take minutes.
+BUCKET_BOUNDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+DEFAULT_PROFILES_DIR = "profiles"
+CAPTURE_TOOLS = ("cprofile", "pyinstrument")
+MAX_CAPTURE_CYCLES = 1000
+# Lines of the text report kept in memory for the API after a capture finishes.
+CAPTURE_REPORT_LINES = 40
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class TimingHistogram:
+    """
+    Durations of one timer: a rolling window for percentiles plus lifetime
+    totals and per-bucket counts (samples above the last bound only count in `count`).
+    """
+    __slots__ = ("samples", "count", "total", "bucket_counts")
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.bucket_counts = [0] * len(BUCKET_BOUNDS)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        bucket = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        if bucket < len(BUCKET_BOUNDS):
+            self.bucket_counts[bucket] += 1
+
+    def cumulative_buckets(self) -> list:
+        """Returns [(upper bound, samples <= bound)], ending with ('+Inf', count)."""
+        buckets, running = [], 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS, self.bucket_counts):
+            running += bucket_count
+            buckets.append((bound, running))
+        buckets.append(("+Inf", self.count))
+        return buckets
+
+    def summary(self) -> dict:
+        """Lifetime count/total and p50/p95/p99/max (in ms) over the rolling window."""
+        ordered = sorted(self.samples)
+        summary = {"count": self.count, "total_seconds": round(self.total, 3)}
+        if not ordered:
+            return summary
+        summary.update({
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 3),
+            "p95_ms": round(_percentile(ordered, 95) * 1000, 3),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 3),
+            "max_ms": round(ordered[-1] * 1000, 3),
+        })
+        return summary
+
+
+class _Timer:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class _NullTimer:
+    """Returned while profiling is disabled: entering and leaving it does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _CycleCapture:
+    """A cProfile or pyinstrument session that accumulates over the next `cycles` cycles."""
+    def __init__(self, cycles: int, tool: str, profiles_dir: str):
+        self.cycles = cycles
+        self.tool = tool
+        self.profiles_dir = profiles_dir
+        self.completed = 0
+        if tool == "pyinstrument":
+            from pyinstrument import Profiler as PyinstrumentProfiler
+            self.session = PyinstrumentProfiler()
+        else:
+            self.session = cProfile.Profile()
+
+    def start(self):
+        if self.tool == "pyinstrument":
+            self.session.start()
+        else:
+            self.session.enable()
+
+    def stop(self):
+        if self.tool == "pyinstrument":
+            self.session.stop()
+        else:
+            self.session.disable()
+        self.completed += 1
+
+    @property
+    def done(self) -> bool:
+        return self.completed >= self.cycles
+
+    def save(self, label: str) -> dict:
+        """Writes the capture to the profiles directory and returns a short report."""
+        os.makedirs(self.profiles_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if self.tool == "pyinstrument":
+            path = os.path.join(self.profiles_dir, f"{label}_{stamp}.html")
+            with open(path, "w") as f:
+                f.write(self.session.output_html())
+            report = self.session.output_text(unicode=False, color=False)
+        else:
+            path = os.path.join(self.profiles_dir, f"{label}_{stamp}.prof")
+            self.session.dump_stats(path)
+            stream = io.StringIO()
+            pstats.Stats(self.session, stream=stream).sort_stats("cumulative").print_stats(25)
+            report = stream.getvalue()
+        return {
+            "tool": self.tool,
+            "cycles": self.completed,
+            "path": path,
+            "finished_at": time.time(),
+            "report": "\n".join(report.strip().splitlines()[:CAPTURE_REPORT_LINES]),
+        }
+
+
+class Profiler:
+    """
+    Collects named timings into rolling histograms and, on request, captures a
+    cProfile/pyinstrument profile of the next N trading cycles.
+
+    While disabled, `timer()` hands out a shared no-op context manager, so the
+    instrumented code pays for one attribute check per timed block.
+    """
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW, profiles_dir: str = DEFAULT_PROFILES_DIR,
+                 label: str = "cycles"):
+        self.enabled = enabled
+        self.window = window
+        self.profiles_dir = profiles_dir
+        self.label = label
+        self._histograms: dict = {}
+        self._lock = threading.Lock()
+        self._capture: Optional[_CycleCapture] = None
+        self.last_capture: Optional[dict] = None
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def timer(self, name: str):
+        """Context manager that records the duration of its block under `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = TimingHistogram(self.window)
+            histogram.add(seconds)
+
+    def cumulative(self) -> dict:
+        """Returns {timer name: (cumulative buckets, count, total seconds)} for exporters."""
+        with self._lock:
+            return {name: (histogram.cumulative_buckets(), histogram.count, histogram.total)
+                    for name, histogram in self._histograms.items()}
+
+    def summary(self) -> dict:
+        """Returns {timer name: summary} for every timer recorded so far."""
+        with self._lock:
+            return {name: self._histograms[name].summary() for name in sorted(self._histograms)}
+
+    def start_capture(self, cycles: int, tool: str = "cprofile") -> dict:
+        """
+        Arms a profile capture of the next `cycles` cycles. Raises ValueError for
+        bad arguments, an unavailable tool or a capture already in progress.
+        """
+        tool = tool.lower()
+        if tool not in CAPTURE_TOOLS:
+            raise ValueError(f"Unknown profiling tool '{tool}'. Use one of: {', '.join(CAPTURE_TOOLS)}.")
+        if not 1 <= cycles <= MAX_CAPTURE_CYCLES:
+            raise ValueError(f"cycles must be between 1 and {MAX_CAPTURE_CYCLES}.")
+        with self._lock:
+            if self._capture is not None:
+                raise ValueError("A profile capture is already in progress.")
+            try:
+                self._capture = _CycleCapture(cycles, tool, self.profiles_dir)
+            except ImportError:
+                raise ValueError("pyinstrument is not installed. Install it or use the 'cprofile' tool.")
+        logger.info(f"Profiling the next {cycles} cycle(s) with {tool}.")
+        return self.capture_status()
+
+    def capture_status(self) -> dict:
+        capture = self._capture
+        active = None
+        if capture is not None:
+            active = {"tool": capture.tool, "cycles": capture.cycles, "completed": capture.completed}
+        return {"active": active, "last": self.last_capture}
+
+    @contextmanager
+    def cycle(self):
+        """
+        Wraps one full cycle: records it under 'cycle' and, when a capture is
+        armed, profiles it. Only the thread running the cycle is profiled.
+        """
+        capture = self._capture
+        if capture is not None:
+            try:
+                capture.start()
+            except Exception as e:
+                # e.g. another profiler is already attached to this interpreter.
+                logger.error(f"Could not start the profile capture: {e}", exc_info=True)
+                self._capture = capture = None
+        try:
+            with self.timer("cycle"):
+                yield
+        finally:
+            if capture is not None:
+                capture.stop()
+                if capture.done:
+                    self._finish_capture(capture)
+
+    def _finish_capture(self, capture: _CycleCapture):
+        self._capture = None
+        try:
+            self.last_capture = capture.save(self.label)
+            logger.info(f"Profile of {capture.completed} cycle(s) saved to {self.last_capture['path']}.")
+        except Exception as e:
+            logger.error(f"Failed to save the profile capture: {e}", exc_info=True)
+
+
+_profiler: Optional[Profiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> Profiler:
+    """
+    Returns the process-wide profiler. Its timers feed the /metrics endpoint, so
+    they start enabled unless APP.profiling_enabled is false.
+    """
+    global _profiler
+    if _profiler is not None:
+        return _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            try:
+                enabled = config_manager.getboolean('APP', 'profiling_enabled', fallback=True)
+            except ValueError:
+                logger.warning("Invalid APP.profiling_enabled, timers stay enabled.")
+                enabled = True
+            profiles_dir = config_manager.get('APP', 'profiles_dir', fallback=DEFAULT_PROFILES_DIR) or DEFAULT_PROFILES_DIR
+            label = config_manager.bot_name or "cycles"
+            _profiler = Profiler(enabled=enabled, profiles_dir=profiles_dir, label=label)
+        return _profiler
+
+
+def timer(name: str):
+    """Times a block with the process-wide profiler: `with timer("features"): ...`."""
+    return (_profiler or get_profiler()).timer(name)
+
+
+def timed(name: str):
+    """Decorator that times every call with the process-wide profiler."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def format_summary(summary: dict) -> str:
+    """Renders a `Profiler.summary()` as a fixed-width table for terminals and logs."""
+    if not summary:
+        return "No timings recorded."
+    columns = ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+    width = max(len("timer"), *(len(name) for name in summary)) + 2
+    lines = [f"{'timer':<{width}}" + "".join(f"{column:>11}" for column in columns)]
+    for name, stats in summary.items():
+        lines.append(f"{name:<{width}}" + "".join(f"{stats.get(column, '-'):>11}" for column in columns))
+    return "\n".join(lines)
@@ -10,17 +10,6 @@ import glob
 import json
 from pathlib import Path
 from jules_bot.utils import process_manager
-try:
-    import questionary
-except ImportError:
-    questionary = None
-try:
-    import optuna
-except ImportError:
-    optuna = None
-
-from jules_bot.database.postgres_manager import PostgresManager
-from jules_bot.utils.config_manager import config_manager
 
 PROJECT_NAME = "gcsbot-btc"
 DOCKER_IMAGE_NAME = f"{PROJECT_NAME}-app"
@@ -39,6 +28,14 @@ def main(ctx: typer.Context):
 import socket
 import errno
 
+def _load_questionary():
+    """Imports questionary only for the commands that prompt the user."""
+    try:
+        import questionary
+    except ImportError:
+        return None
+    return questionary
+
 def find_free_port(start_port=8766, exclude_ports=None):
     if exclude_ports is None:
         exclude_ports = []
@@ -362,6 +359,7 @@ def _setup_bot_run(bot_name: Optional[str]) -> str:
 
 @app.command()
 def trade(bot_name: Optional[str] = typer.Option(None, "--bot-name", "-n", help="O nome do bot para executar."), detached: Optional[bool] = typer.Option(None, "--detached", "-d", help="Executa em segundo plano. Se não for especificado, será perguntado.")):
+    questionary = _load_questionary()
     if not _ensure_env_is_running():
         raise typer.Exit(1)
     was_interactive = bot_name is None
@@ -399,6 +397,7 @@ def trade(bot_name: Optional[str] = typer.Option(None, "--bot-name", "-n", help=
 
 @app.command()
 def test(bot_name: Optional[str] = typer.Option(None, "--bot-name", "-n", help="O nome do bot para executar."), detached: Optional[bool] = typer.Option(None, "--detached", "-d", help="Executa em segundo plano. Se não for especificado, será perguntado.")):
+    questionary = _load_questionary()
     if not _ensure_env_is_running():
         raise typer.Exit(1)
     was_interactive = bot_name is None
@@ -455,6 +454,7 @@ def list_bots():
 
 @app.command("stop-bot")
 def stop_bot(process_name: Optional[str] = typer.Option(None, "--name", "-n", help="Nome do processo para parar.")):
+    questionary = _load_questionary()
     running_processes = process_manager.sync_and_get_running_bots()
     if not running_processes:
         print("ℹ️ Nenhum processo em execução para parar.")
@@ -488,6 +488,7 @@ def stop_bot(process_name: Optional[str] = typer.Option(None, "--name", "-n", he
 
 @app.command("logs")
 def logs(process_name: Optional[str] = typer.Option(None, "--name", "-n", help="Nome do processo para ver os logs.")):
+    questionary = _load_questionary()
     running_processes = process_manager.sync_and_get_running_bots()
     if not running_processes:
         print("ℹ️ Nenhum processo em execução para ver os logs.")
@@ -517,6 +518,7 @@ def logs(process_name: Optional[str] = typer.Option(None, "--name", "-n", help="
 
 @app.command("display")
 def display(process_name: Optional[str] = typer.Option(None, "--name", "-n", help="Nome do processo para visualizar.")):
+    questionary = _load_questionary()
     running_processes = process_manager.sync_and_get_running_bots()
     if not running_processes:
         print("ℹ️ Nenhum processo em execução para monitorar.")
@@ -564,6 +566,71 @@ def display(process_name: Optional[str] = typer.Option(None, "--name", "-n", hel
         print(f"❌ Erro ao iniciar o display: {e}")
     print("\n✅ Display encerrado.")
 
+@app.command("profile")
+def profile(
+    process_name: Optional[str] = typer.Option(None, "--name", "-n", help="Nome do bot em execução."),
+    enable: Optional[bool] = typer.Option(None, "--enable/--disable", help="Liga ou desliga os timers de cada fase do ciclo."),
+    reset: bool = typer.Option(False, "--reset", help="Zera os timers registrados até agora."),
+    capture: int = typer.Option(0, "--capture", "-c", help="Captura um perfil completo dos próximos N ciclos."),
+    tool: str = typer.Option("cprofile", "--tool", help="Ferramenta da captura: 'cprofile' ou 'pyinstrument'."),
+):
+    """Mostra os tempos p50/p95/p99 de cada fase do ciclo de um bot em execução."""
+    import requests
+    from tabulate import tabulate
+
+    questionary = _load_questionary()
+    running_bots = [p for p in process_manager.sync_and_get_running_bots() if p.process_type == "bot"]
+    if not running_bots:
+        print("ℹ️ Nenhum bot em execução para analisar.")
+        raise typer.Exit()
+    if process_name:
+        bot = next((p for p in running_bots if p.bot_name == process_name), None)
+        if not bot:
+            print(f"❌ Bot '{process_name}' não está em execução.")
+            raise typer.Exit(1)
+    elif len(running_bots) == 1:
+        bot = running_bots[0]
+    else:
+        selected_name = questionary.select("Selecione o bot:", choices=sorted(p.bot_name for p in running_bots)).ask()
+        if not selected_name: raise typer.Exit()
+        bot = next(p for p in running_bots if p.bot_name == selected_name)
+
+    base_url = f"http://localhost:{bot.host_port}/api/profiling"
+    try:
+        if enable is not None or reset:
+            # --reset alone keeps the timers in their current state.
+            enabled = enable if enable is not None else requests.get(base_url, timeout=10).json()["enabled"]
+            requests.post(base_url, json={"enabled": enabled, "reset": reset}, timeout=10).raise_for_status()
+            print(f"✅ Timers {'ligados' if enabled else 'desligados'} para '{bot.bot_name}'.")
+        if capture:
+            response = requests.post(f"{base_url}/capture", json={"cycles": capture, "tool": tool}, timeout=10)
+            if response.status_code == 400:
+                print(f"❌ Captura recusada: {response.json().get('detail')}")
+                raise typer.Exit(1)
+            response.raise_for_status()
+            print(f"🎯 Capturando os próximos {capture} ciclos com {tool}. Rode 'profile' de novo para ver o resultado.")
+        report = requests.get(base_url, timeout=10).json()
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Falha ao falar com a API do bot em {base_url}: {e}")
+        raise typer.Exit(1)
+
+    print(f"\n⏱️  Tempos do bot '{bot.bot_name}' (timers {'ligados' if report['enabled'] else 'desligados'})")
+    if report["timers"]:
+        columns = ["count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+        rows = [[name] + [stats.get(column, "-") for column in columns] for name, stats in report["timers"].items()]
+        print(tabulate(rows, headers=["fase"] + columns, tablefmt="heavy_grid"))
+    elif not report["enabled"]:
+        print("ℹ️ Nenhum tempo registrado. Ligue os timers com 'profile --enable'.")
+    else:
+        print("ℹ️ Nenhum tempo registrado ainda. Aguarde alguns ciclos.")
+
+    active, last = report["capture"]["active"], report["capture"]["last"]
+    if active:
+        print(f"\n⏳ Captura em andamento: {active['completed']}/{active['cycles']} ciclos ({active['tool']}).")
+    if last:
+        print(f"\n📄 Última captura ({last['tool']}, {last['cycles']} ciclos) salva em {last['path']} (no container):")
+        print(last["report"])
+
 import re
 
 def _get_bots_from_env(env_file_path: str = ".env") -> list[str]:
@@ -609,6 +676,7 @@ NEW_BOT_TEMPLATE = """
 
 @app.command("new-bot")
 def new_bot():
+    questionary = _load_questionary()
     print("🤖 Criando um novo bot...")
     env_file = ".env"
     if questionary is None:
@@ -639,6 +707,7 @@ def new_bot():
 
 @app.command("delete-bot")
 def delete_bot():
+    questionary = _load_questionary()
     print("🗑️  Deletando um bot...")
     env_file = ".env"
     if questionary is None:
@@ -673,6 +742,7 @@ def delete_bot():
         raise typer.Exit(1)
 
 def _interactive_bot_selection() -> str:
+    questionary = _load_questionary()
     available_bots = _get_bots_from_env()
     if not available_bots:
         print("❌ Nenhum bot encontrado. Use o comando 'new-bot' para criar um.")
@@ -702,6 +772,47 @@ def validate(bot_name: Optional[str] = typer.Option(None, "--bot-name", "-n", he
     else:
         print("✅ Script de validação concluído.")
 
+@app.command("backfill-aggregates")
+def backfill_aggregates(
+    bot_name: Optional[str] = typer.Option(None, "--bot-name", "-n", help="O nome do bot para recalcular os agregados."),
+    environment: Optional[str] = typer.Option(None, "--environment", "-e", help="Recalcula apenas este ambiente (trade, test, backtest)."),
+):
+    """Recalcula a tabela de agregados de PnL realizado a partir dos trades de venda existentes."""
+    if not _ensure_env_is_running():
+        raise typer.Exit(1)
+
+    final_bot_name = _setup_bot_run(bot_name)
+    command = ["scripts/backfill_trade_aggregates.py"]
+    if environment:
+        command += ["--environment", environment]
+    print(f"🧮 Recalculando agregados de PnL para o bot '{final_bot_name}'...")
+    if not run_command_in_container(command, final_bot_name):
+        print("❌ Falha ao recalcular os agregados.")
+    else:
+        print("✅ Agregados recalculados.")
+
+@app.command("partition-tables")
+def partition_tables(
+    bot_name: Optional[str] = typer.Option(None, "--bot-name", "-n", help="O nome do bot cujas tabelas serão particionadas."),
+    keep_legacy: bool = typer.Option(False, "--keep-legacy", help="Mantém as tabelas originais como '<tabela>_legacy' após a cópia."),
+    drop_backtest_before: Optional[str] = typer.Option(None, "--drop-backtest-before", help="Remove as partições de trades de backtest que terminam até esta data (YYYY-MM-DD)."),
+):
+    """Converte as tabelas 'trades' e 'price_history' para tabelas particionadas por mês."""
+    if not _ensure_env_is_running():
+        raise typer.Exit(1)
+
+    final_bot_name = _setup_bot_run(bot_name)
+    command = ["scripts/partition_tables.py"]
+    if keep_legacy:
+        command.append("--keep-legacy")
+    if drop_backtest_before:
+        command += ["--drop-backtest-before", drop_backtest_before]
+    print(f"🗂️ Particionando as tabelas do bot '{final_bot_name}'...")
+    if not run_command_in_container(command, final_bot_name):
+        print("❌ Falha ao particionar as tabelas.")
+    else:
+        print("✅ Tabelas particionadas.")
+
 @app.command()
 def wfo(
     bot_name: Optional[str] = typer.Option(None, "--bot-name", "-n", help="The name of the bot to run the WFO for."),
@@ -758,6 +869,7 @@ def backtest(
     use_best: bool = typer.Option(False, "--use-best", help="Rodar um backtest com os melhores parâmetros encontrados pelo Walk-Forward Optimizer."),
 ):
     """Executa um backtest, com a opção de otimizar ou usar resultados da otimização."""
+    questionary = _load_questionary()
     final_bot_name = _setup_bot_run(bot_name)
 
     if optimize:
@@ -12,7 +12,7 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 sys.path.append(project_root)
 
-from jules_bot.database.database_manager import DatabaseManager
+from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.utils.config_manager import config_manager
 
 def analyze_confidence_performance(environment: str):
@@ -22,17 +22,23 @@ def analyze_confidence_performance(environment: str):
     """
     print(f"--- Iniciando Análise de Confiança vs. Performance do ambiente '{environment}' ---")
 
-    # Instancia o DatabaseManager com o modo de execução correto
-    db_config = config_manager.get_section('INFLUXDB')
-    if environment == 'test':
-        db_config['bucket'] = 'jules_bot_test_v1'
-    elif environment == 'backtest':
-        db_config['bucket'] = 'jules_bot_backtest_v1'
-    db_manager = DatabaseManager(config=db_config)
-
-
-    # Carrega os dados diretamente do banco de dados
-    analysis_df = db_manager.get_all_trades_for_analysis()
+    # O schema do bot vem do config_manager; o ambiente filtra os trades.
+    db_manager = PostgresManager()
+
+    # Carrega apenas as colunas usadas na análise, já como DataFrame (sem objetos ORM).
+    # A confiança do modelo fica no decision_context, por isso ele é pedido explicitamente.
+    analysis_df = db_manager.get_trades_frame(
+        columns=('trade_id', 'realized_pnl_usd'),
+        mode=environment,
+        order_type='sell',
+        include_decision_context=True,
+        numeric_as_float=True,
+    )
+    if not analysis_df.empty:
+        analysis_df['final_confidence'] = analysis_df['decision_context'].map(
+            lambda context: (context or {}).get('final_confidence')
+        ).astype('float64')
+        analysis_df['pnl'] = analysis_df['realized_pnl_usd']
 
     # Verifica se foram encontrados trades
     if analysis_df.empty:
@@ -0,0 +1,38 @@
+import os
+import sys
+import argparse
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jules_bot.database.postgres_manager import PostgresManager
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+
+def backfill_trade_aggregates(environment: str = None):
+    """
+    Rebuilds the realized-PnL aggregates table from the existing sell trades
+    of a bot, for a single environment or for all of them.
+    """
+    try:
+        bot_name = config_manager.bot_name
+        scope = f"environment '{environment}'" if environment else "all environments"
+        logger.info(f"Rebuilding trade aggregates for bot '{bot_name}' ({scope})...")
+
+        db_manager = PostgresManager()
+        sell_count = db_manager.rebuild_trade_aggregates(environment)
+
+        summary = db_manager.get_realized_pnl_summary(environment=environment)
+        logger.info(
+            f"Trade aggregates rebuilt from {sell_count} sell trades. "
+            f"Realized PnL: ${summary['realized_pnl_usd']:,.2f} | Treasury: {summary['hodl_asset_amount']:.8f} BTC"
+        )
+    except Exception as e:
+        logger.error(f"An error occurred while rebuilding trade aggregates: {e}", exc_info=True)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuilds the realized-PnL aggregates table from existing sell trades.")
+    parser.add_argument("--environment", "-e", default=None, help="Only rebuild this environment (e.g. 'trade', 'test', 'backtest').")
+    args = parser.parse_args()
+    backfill_trade_aggregates(args.environment)
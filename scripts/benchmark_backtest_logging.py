@@ -0,0 +1,89 @@
+import argparse
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+# Each case runs in a fresh interpreter because the logger reads LOG_ASYNC/LOG_LEVELS at import.
+CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+import pandas as pd
+from jules_bot.backtesting.engine import Backtester
+from jules_bot.database.postgres_manager import PostgresManager
+data = pd.read_pickle({features!r})
+db_manager = PostgresManager()
+start = time.perf_counter()
+Backtester(db_manager=db_manager, data=data, log_profile={profile!r}).run()
+sys.stdout.write('ELAPSED %f\\n' % (time.perf_counter() - start))
+"""
+
+# name -> (logging profile, LOG_ASYNC)
+CASES = {
+    "logging on (sync)": ("default", "false"),
+    "logging on (queue handler)": ("default", "true"),
+    "simulation profile (sync)": ("simulation", "false"),
+    "simulation profile (queue handler)": ("simulation", "true"),
+}
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _prepare_features(days: int, path: str):
+    """Loads price data and computes features/regimes once, so every run simulates the same frame."""
+    from jules_bot.bot.situational_awareness import SituationalAwareness
+    from jules_bot.database.postgres_manager import PostgresManager
+    from jules_bot.research.feature_engineering import add_all_features
+    from jules_bot.utils.config_manager import config_manager
+
+    db_manager = PostgresManager()
+    symbol = config_manager.get('APP', 'symbol')
+    price_data = db_manager.get_price_data(measurement=symbol, start_date=f"-{days}d")
+    if price_data.empty:
+        raise SystemExit(f"No price data for the last {days} days. Run prepare_backtest_data.py first.")
+    features = add_all_features(price_data, live_mode=False).dropna()
+    SituationalAwareness().transform(features).to_pickle(path)
+    return len(features)
+
+
+def _run_case(features_path: str, profile: str, log_async: str, stderr_sink) -> float:
+    code = CHILD.format(root=PROJECT_ROOT, features=features_path, profile=profile)
+    env = {**os.environ, "LOG_ASYNC": log_async}
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=stderr_sink, text=True)
+    return next((float(line.split()[1]) for line in completed.stdout.splitlines() if line.startswith("ELAPSED ")), float('nan'))
+
+
+def benchmark_backtest_logging(days: int, runs: int, show_logs: bool):
+    """Compares backtest wall time with full logging versus the 'simulation' profile, with and without the queue handler."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        features_path = os.path.join(tmp_dir, "features.pkl")
+        candles = _prepare_features(days, features_path)
+        # Logs are written to a real sink by default so formatting and I/O are part of the measurement.
+        with open(os.devnull, "w") as devnull:
+            stderr_sink = None if show_logs else devnull
+            print(f"\nBacktest wall time over {candles} candles, {runs} run(s) per case (seconds)")
+            print(f"{'case':<38}{'p50':>10}{'min':>10}")
+            for name, (profile, log_async) in CASES.items():
+                samples = [_run_case(features_path, profile, log_async, stderr_sink) for _ in range(runs)]
+                print(f"{name:<38}{_percentile(samples, 50):>10.3f}{min(samples):>10.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks backtest wall time with logging on and off.")
+    parser.add_argument("--days", type=int, default=30, help="Days of price history to simulate.")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per case.")
+    parser.add_argument("--show-logs", action="store_true", help="Write the children's logs to this terminal instead of /dev/null.")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    benchmark_backtest_logging(args.days, args.runs, args.show_logs)
+    print(f"\nTotal benchmark time: {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,74 @@
+import math
+import os
+import subprocess
+import sys
+import time
+import argparse
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Runs in a fresh interpreter so every sample pays the full import and connection cost.
+# With force_full the schema fast path is disabled, reproducing the inspector-based startup.
+CHILD = """
+import runpy, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from jules_bot.database.postgres_manager import PostgresManager
+if {force_full}:
+    PostgresManager._schema_is_current = lambda self: False
+if {script!r}:
+    sys.argv = [{script!r}] + {script_args!r}
+    try:
+        runpy.run_path({script!r}, run_name='__main__')
+    except SystemExit:
+        pass
+else:
+    PostgresManager()
+sys.stderr.write('ELAPSED %f\\n' % (time.perf_counter() - start))
+"""
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _run(force_full: bool, script: str, script_args: list) -> tuple:
+    """Returns (wall seconds for the whole process, seconds measured inside it)."""
+    code = CHILD.format(root=PROJECT_ROOT, force_full=force_full, script=script, script_args=script_args)
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    inner = next((float(line.split()[1]) for line in completed.stderr.splitlines() if line.startswith("ELAPSED ")), float('nan'))
+    return wall, inner
+
+
+def benchmark_cold_start(runs: int, mode: str):
+    """
+    Measures cold-start time of scripts/get_bot_data.py, and of PostgresManager()
+    alone, with the schema fast path versus the full inspector-based initialization.
+    """
+    cases = {
+        "PostgresManager() full init": (True, "", []),
+        "PostgresManager() fast path": (False, "", []),
+        f"get_bot_data.py {mode} full init": (True, "scripts/get_bot_data.py", [mode]),
+        f"get_bot_data.py {mode} fast path": (False, "scripts/get_bot_data.py", [mode]),
+    }
+    # Make sure the schema exists and is fully migrated before timing anything.
+    _run(True, "", [])
+
+    print(f"\nCold start over {runs} fresh processes (seconds)")
+    print(f"{'case':<38}{'p50 wall':>10}{'p95 wall':>10}{'p50 inner':>11}")
+    for name, (force_full, script, script_args) in cases.items():
+        samples = [_run(force_full, script, script_args) for _ in range(runs)]
+        walls, inners = [s[0] for s in samples], [s[1] for s in samples]
+        print(f"{name:<38}{_percentile(walls, 50):>10.3f}{_percentile(walls, 95):>10.3f}{_percentile(inners, 50):>11.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks cold-start time with and without the schema version fast path.")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes per case.")
+    parser.add_argument("--mode", default="test", choices=["trade", "test"], help="Environment passed to get_bot_data.py.")
+    args = parser.parse_args()
+    benchmark_cold_start(args.runs, args.mode)
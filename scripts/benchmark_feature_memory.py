@@ -0,0 +1,58 @@
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks.synthetic import DEFAULT_SEED, generate_candles
+from jules_bot.bot.situational_awareness import SituationalAwareness
+from jules_bot.research.feature_dtypes import FeatureDtypePolicy
+from jules_bot.research.feature_engineering import add_all_features
+
+COMPACT = FeatureDtypePolicy(float_dtype='float32', drop_placeholders=True, drop_columns=('target',))
+
+# name -> (stages write in place, dtype policy)
+CASES = {
+    "float64, copying stages": (False, FeatureDtypePolicy()),
+    "float64, in-place stages": (True, FeatureDtypePolicy()),
+    "float32 policy, in-place stages": (True, COMPACT),
+}
+
+
+def _pipeline(price_data, inplace: bool, policy: FeatureDtypePolicy):
+    """The backtester's feature pipeline: features, dropna, regimes, dtype policy."""
+    features = add_all_features(price_data, live_mode=False, inplace=inplace).dropna()
+    return policy.apply(SituationalAwareness().transform(features, inplace=inplace))
+
+
+def benchmark_feature_memory(days: int, seed: int):
+    """Compares peak and retained memory of the feature pipeline with and without the compact dtype policy."""
+    candles = generate_candles(days, seed=seed)
+    input_mb = candles.memory_usage(deep=True).sum() / 1e6
+    print(f"\nFeature pipeline memory over {len(candles)} synthetic 1m candles ({input_mb:.1f} MB of price data)")
+    print(f"{'case':<36}{'peak MB':>10}{'frame MB':>10}{'seconds':>10}")
+    for name, (inplace, policy) in CASES.items():
+        # The backtester owns the loaded price data, so each case gets a private copy outside the measurement.
+        price_data = candles.copy()
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        frame = _pipeline(price_data, inplace, policy)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        frame_mb = frame.memory_usage(deep=True).sum() / 1e6
+        print(f"{name:<36}{peak / 1e6:>10.1f}{frame_mb:>10.1f}{elapsed:>10.2f}")
+        del price_data, frame
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the memory of the backtest feature pipeline per dtype policy.")
+    parser.add_argument("--days", type=int, default=90, help="Days of synthetic 1m candles.")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the synthetic candles.")
+    args = parser.parse_args()
+    benchmark_feature_memory(args.days, args.seed)
@@ -0,0 +1,76 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that must stay out of CLI startup; the commands that need them import them on demand.
+HEAVY_MODULES = ("pandas", "numpy", "sqlalchemy", "psycopg2", "binance", "optuna", "fastapi", "uvicorn", "questionary")
+
+DEFAULT_BUDGET_MS = 400.0
+
+# "import time: self [us] | cumulative | imported package"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _parse_importtime(stderr: str) -> list:
+    """Returns (module, cumulative microseconds, nesting depth) for every import reported by -X importtime."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            rows.append((match.group(4), int(match.group(2)), depth))
+    return rows
+
+
+def measure_import_time(argv: list) -> dict:
+    """
+    Runs `python -X importtime run.py <argv>` in a fresh interpreter and returns the
+    total top-level import time, the slowest top-level imports and any heavy modules loaded.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "run.py", *argv],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    rows = _parse_importtime(completed.stderr)
+    top_level = [(module, us) for module, us, depth in rows if depth == 0]
+    loaded = {module for module, _, _ in rows}
+    return {
+        "command": " ".join(["run.py", *argv]),
+        "returncode": completed.returncode,
+        "total_ms": sum(us for _, us in top_level) / 1000,
+        "slowest": sorted(top_level, key=lambda row: row[1], reverse=True)[:10],
+        "heavy": sorted(name for name in HEAVY_MODULES if name in loaded),
+    }
+
+
+def main(budget_ms: float, commands: list) -> int:
+    failures = 0
+    for command in commands:
+        result = measure_import_time(command.split())
+        print(f"\n{result['command']}: {result['total_ms']:.1f} ms of imports (budget {budget_ms:.0f} ms)")
+        for module, us in result["slowest"]:
+            print(f"  {us / 1000:>8.1f} ms  {module}")
+        if result["returncode"] != 0:
+            print(f"  ❌ Command exited with code {result['returncode']}.")
+            failures += 1
+        if result["heavy"]:
+            print(f"  ❌ Heavy modules imported at startup: {', '.join(result['heavy'])}")
+            failures += 1
+        if result["total_ms"] > budget_ms:
+            print(f"  ❌ Import time over budget by {result['total_ms'] - budget_ms:.1f} ms.")
+            failures += 1
+    print("\n✅ Import time within budget." if not failures else f"\n❌ {failures} import-time check(s) failed.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fails when run.py CLI startup imports exceed a time budget or pull in heavy modules.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Maximum cumulative import time per command.")
+    parser.add_argument("--command", action="append", dest="commands",
+                        help="run.py arguments to measure (repeatable). Defaults to '--help'.")
+    args = parser.parse_args()
+    sys.exit(main(args.budget_ms, args.commands or ["--help"]))
@@ -0,0 +1,112 @@
+import math
+import os
+import sys
+import time
+import argparse
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+
+SEED_SQL = """
+INSERT INTO trades (
+    run_id, environment, strategy_name, symbol, trade_id, linked_trade_id, exchange, status, order_type,
+    price, quantity, remaining_quantity, usd_value, commission_usd, timestamp, realized_pnl_usd,
+    decision_context, is_trailing, is_smart_trailing_active
+)
+SELECT
+    'hydration-run',
+    'backtest',
+    'default',
+    'BTCUSDT',
+    'hydration-' || g,
+    CASE WHEN g % 2 = 1 THEN 'hydration-' || (g - 1) END,
+    'binance',
+    'CLOSED',
+    CASE WHEN g % 2 = 0 THEN 'buy' ELSE 'sell' END,
+    30000 + (g % 40000), 0.001, 0, 30 + (g % 40), 0.03,
+    now() - ((:count - g) * interval '90 seconds'),
+    CASE WHEN g % 2 = 1 THEN (g % 200) - 100 END,
+    json_build_object(
+        'operating_mode', 'ACCUMULATION', 'market_regime', g % 4, 'final_confidence', (g % 100) / 100.0,
+        'buy_trigger_reason', 'Price dropped below the dynamic buy target after a sustained downtrend.'
+    ),
+    FALSE, FALSE
+FROM generate_series(:start, :stop) AS g
+"""
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _seed(db_manager, count: int, batch_size: int = 50_000):
+    with db_manager.engine.begin() as connection:
+        existing = connection.execute(text("SELECT count(*) FROM trades WHERE run_id = 'hydration-run'")).scalar()
+    if existing == count:
+        logger.info(f"Reusing {existing} seeded trades in schema '{db_manager.bot_name}'.")
+        return
+    with db_manager.engine.begin() as connection:
+        connection.execute(text("DELETE FROM trades WHERE run_id = 'hydration-run'"))
+    for start in range(1, count + 1, batch_size):
+        stop = min(count, start + batch_size - 1)
+        with db_manager.engine.begin() as connection:
+            connection.execute(text(SEED_SQL), {"count": count, "start": start, "stop": stop})
+        logger.info(f"Seeded {stop}/{count} trades...")
+
+
+def _readers(db_manager) -> dict:
+    """Each read path the analytics callers used before and after the lean projection."""
+    return {
+        "ORM Trade objects": lambda: db_manager.get_all_trades_in_range(mode="backtest"),
+        "ORM Trade + to_dict()": lambda: [t.to_dict() for t in db_manager.get_all_trades_in_range(mode="backtest")],
+        "get_trade_rows (summary cols)": lambda: db_manager.get_trade_rows(mode="backtest"),
+        "get_trade_rows (2 cols)": lambda: db_manager.get_trade_rows(columns=('timestamp', 'order_type'), mode="backtest"),
+        "get_trades_frame (Decimal)": lambda: db_manager.get_trades_frame(mode="backtest"),
+        "get_trades_frame (float64)": lambda: db_manager.get_trades_frame(mode="backtest", numeric_as_float=True),
+    }
+
+
+def benchmark_trade_hydration(bot_name: str, count: int, repeats: int):
+    """
+    Seeds a scratch bot schema with trades carrying a realistic decision_context
+    and compares full ORM hydration with the column-projected read paths.
+    """
+    if bot_name == os.getenv("BOT_NAME"):
+        raise SystemExit(f"Refusing to benchmark against the active bot '{bot_name}'; pass a scratch --bot-name.")
+    config_manager.bot_name = bot_name
+    from jules_bot.database.postgres_manager import PostgresManager
+
+    db_manager = PostgresManager()
+    _seed(db_manager, count)
+    with db_manager.engine.begin() as connection:
+        connection.execute(text("ANALYZE trades"))
+
+    print(f"\nReading {count:,} trades ({repeats} runs each, milliseconds)")
+    print(f"{'read path':<34}{'p50':>10}{'p99':>10}{'rows':>10}{'vs ORM':>10}")
+    baseline = None
+    for name, reader in _readers(db_manager).items():
+        rows = len(reader())  # Warm up caches and the connection pool.
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            reader()
+            samples.append((time.perf_counter() - start) * 1000)
+        p50, p99 = _percentile(samples, 50), _percentile(samples, 99)
+        baseline = baseline or p50
+        print(f"{name:<34}{p50:>10.1f}{p99:>10.1f}{rows:>10,}{baseline / p50:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks ORM hydration against the lean column-projected trade reads.")
+    parser.add_argument("--bot-name", default="bench_trades", help="Scratch bot whose schema is seeded. Never point this at a live bot.")
+    parser.add_argument("--count", type=int, default=100_000, help="Number of synthetic trades to seed.")
+    parser.add_argument("--repeats", type=int, default=10, help="Timed executions per read path.")
+    args = parser.parse_args()
+    benchmark_trade_hydration(args.bot_name, args.count, args.repeats)
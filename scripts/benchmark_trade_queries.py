@@ -0,0 +1,172 @@
+import math
+import os
+import sys
+import time
+import argparse
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import Index, inspect, text
+
+from jules_bot.database.models import Trade
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+
+# The query indexes declared on the model; these are dropped for the "before" run.
+QUERY_INDEX_NAMES = [item.name for item in Trade.__table_args__ if isinstance(item, Index)]
+
+SEED_SQL = """
+INSERT INTO trades (
+    run_id, environment, strategy_name, symbol, trade_id, exchange, status, order_type,
+    price, quantity, remaining_quantity, usd_value, timestamp, exchange_order_id, binance_trade_id,
+    realized_pnl_usd, is_trailing, is_smart_trailing_active
+)
+SELECT
+    'run-' || (g % :runs),
+    CASE WHEN g % 20 = 0 THEN 'trade' WHEN g % 20 = 1 THEN 'test' ELSE 'backtest' END,
+    'default',
+    CASE WHEN g % 4 = 0 THEN 'ETHUSDT' ELSE 'BTCUSDT' END,
+    'bench-' || g,
+    'binance',
+    CASE WHEN g % 50 = 0 THEN 'OPEN' ELSE 'CLOSED' END,
+    CASE WHEN g % 2 = 0 THEN 'buy' ELSE 'sell' END,
+    30000 + (g % 40000), 0.001, 0, 30 + (g % 40),
+    now() - ((:count - g) * interval '90 seconds'),
+    CASE WHEN g % 20 IN (0, 1) THEN 10000000 + g END,
+    CASE WHEN g % 20 IN (0, 1) THEN 20000000 + g END,
+    CASE WHEN g % 2 = 1 THEN (g % 200) - 100 END,
+    FALSE, FALSE
+FROM generate_series(:start, :stop) AS g
+"""
+
+
+def _percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _queries(db_manager, count: int) -> dict:
+    """The PostgresManager calls on the bot's hot paths, with representative arguments."""
+    live_id = (count // 20) * 20  # A live ('trade') row that exists in the seeded data.
+    return {
+        "get_open_positions": lambda: db_manager.get_open_positions("trade", symbol="BTCUSDT"),
+        "has_open_positions": lambda: db_manager.has_open_positions(),
+        "get_oldest_open_buy_trade": lambda: db_manager.get_oldest_open_buy_trade(),
+        "get_all_trades_in_range(30d)": lambda: db_manager.get_all_trades_in_range(
+            mode="trade", start_date=datetime.utcnow() - timedelta(days=30), end_date=datetime.utcnow()),
+        "get_trades_by_run_id": lambda: db_manager.get_trades_by_run_id("run-7"),
+        "get_closed_sell_trades_for_run": lambda: db_manager.get_closed_sell_trades_for_run("run-7"),
+        "get_trade_by_binance_trade_id": lambda: db_manager.get_trade_by_binance_trade_id(20000000 + live_id),
+        "get_trade_by_exchange_order_id": lambda: db_manager.get_trade_by_exchange_order_id(str(10000000 + live_id)),
+        "get_last_binance_trade_id": lambda: db_manager.get_last_binance_trade_id(),
+        "get_recent_trades": lambda: db_manager.get_recent_trades("trade", limit=200),
+        "get_trade_history_page": lambda: db_manager.get_trade_history_page("trade", limit=100),
+    }
+
+
+def _measure(queries: dict, repeats: int) -> dict:
+    results = {}
+    for name, query in queries.items():
+        query()  # Warm up caches and the connection pool.
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            query()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[name] = (_percentile(samples, 50), _percentile(samples, 99))
+    return results
+
+
+def _seed(db_manager, count: int, runs: int, batch_size: int = 100_000):
+    with db_manager.engine.begin() as connection:
+        existing = connection.execute(text("SELECT count(*) FROM trades")).scalar()
+    if existing >= count:
+        logger.info(f"Reusing {existing} existing trades in schema '{db_manager.bot_name}'.")
+        return
+    if existing:
+        raise SystemExit(f"Schema '{db_manager.bot_name}' has {existing} trades but {count} were requested; "
+                         f"use a fresh --bot-name or --reset.")
+    for start in range(1, count + 1, batch_size):
+        stop = min(count, start + batch_size - 1)
+        with db_manager.engine.begin() as connection:
+            connection.execute(text(SEED_SQL), {"runs": runs, "count": count, "start": start, "stop": stop})
+        logger.info(f"Seeded {stop}/{count} trades...")
+
+
+def _analyze(db_manager):
+    with db_manager.engine.begin() as connection:
+        connection.execute(text("ANALYZE trades"))
+
+
+def _explain(db_manager, label: str):
+    """Prints the plan of the main raw queries so index usage can be audited."""
+    statements = {
+        "open positions": "SELECT * FROM trades WHERE status = 'OPEN' AND environment = 'trade' AND symbol = 'BTCUSDT' ORDER BY timestamp DESC",
+        "oldest open buy": "SELECT * FROM trades WHERE status = 'OPEN' AND order_type = 'buy' ORDER BY timestamp LIMIT 1",
+        "range scan": "SELECT * FROM trades WHERE environment = 'trade' AND timestamp >= now() - interval '30 days' ORDER BY timestamp DESC",
+        "closed sells by run": "SELECT * FROM trades WHERE run_id = 'run-7' AND order_type = 'sell' AND status = 'CLOSED' ORDER BY timestamp",
+        "last binance id": "SELECT * FROM trades WHERE binance_trade_id IS NOT NULL ORDER BY binance_trade_id DESC LIMIT 1",
+    }
+    print(f"\n--- Query plans ({label}) ---")
+    with db_manager.engine.connect() as connection:
+        for name, statement in statements.items():
+            plan = connection.execute(text(f"EXPLAIN {statement}")).scalars().all()
+            print(f"{name}: {plan[0]}")
+
+
+def benchmark_trade_queries(bot_name: str, count: int, runs: int, repeats: int, reset: bool, explain: bool):
+    """
+    Seeds a scratch bot schema with synthetic trades and reports p50/p99 latency
+    of each PostgresManager query without and with the trade query indexes.
+    """
+    if bot_name == os.getenv("BOT_NAME"):
+        raise SystemExit(f"Refusing to benchmark against the active bot '{bot_name}'; pass a scratch --bot-name.")
+    config_manager.bot_name = bot_name
+    from jules_bot.database.postgres_manager import PostgresManager
+
+    db_manager = PostgresManager()
+    if reset:
+        with db_manager.engine.begin() as connection:
+            connection.execute(text("TRUNCATE TABLE trades RESTART IDENTITY"))
+    _seed(db_manager, count, runs)
+
+    logger.info("Dropping the query indexes for the baseline run...")
+    with db_manager.engine.begin() as connection:
+        for name in QUERY_INDEX_NAMES:
+            connection.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+    _analyze(db_manager)
+    if explain:
+        _explain(db_manager, "before")
+    queries = _queries(db_manager, count)
+    before = _measure(queries, repeats)
+
+    logger.info("Recreating the query indexes through the migration...")
+    with db_manager.engine.connect() as connection:
+        db_manager._create_missing_indexes(connection, inspect(db_manager.engine), Trade.__table__)
+    _analyze(db_manager)
+    if explain:
+        _explain(db_manager, "after")
+    after = _measure(queries, repeats)
+
+    print(f"\nTrade query latency over {count:,} trades ({repeats} runs each, milliseconds)")
+    print(f"{'query':<34}{'p50 before':>12}{'p99 before':>12}{'p50 after':>12}{'p99 after':>12}{'speedup':>10}")
+    for name in queries:
+        p50_before, p99_before = before[name]
+        p50_after, p99_after = after[name]
+        speedup = p50_before / p50_after if p50_after > 0 else float('inf')
+        print(f"{name:<34}{p50_before:>12.2f}{p99_before:>12.2f}{p50_after:>12.2f}{p99_after:>12.2f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks the trades table queries before and after the query indexes.")
+    parser.add_argument("--bot-name", default="bench_trades", help="Scratch bot whose schema is seeded. Never point this at a live bot.")
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of synthetic trades to seed.")
+    parser.add_argument("--runs", type=int, default=500, help="Number of distinct run_ids in the seeded data.")
+    parser.add_argument("--repeats", type=int, default=50, help="Timed executions per query.")
+    parser.add_argument("--reset", action="store_true", help="Truncate the scratch schema's trades before seeding.")
+    parser.add_argument("--explain", action="store_true", help="Also print the query plans before and after.")
+    args = parser.parse_args()
+    benchmark_trade_queries(args.bot_name, args.count, args.runs, args.repeats, args.reset, args.explain)
@@ -10,7 +10,7 @@ if project_root not in sys.path:
 from jules_bot.utils.logger import logger
 from jules_bot.utils.config_manager import config_manager
 from jules_bot.database.postgres_manager import PostgresManager
-from jules_bot.database.models import Trade
+from jules_bot.database.models import Trade, TradeAggregate
 
 def main(environment: str):
     """
@@ -20,8 +20,8 @@ def main(environment: str):
         # BOT_NAME is passed from the environment by the `run.py` script
         bot_name = os.getenv("BOT_NAME", "jules_bot")
 
-        # 1. Initialize ConfigManager
-        config_manager.initialize(bot_name)
+        # 1. Point ConfigManager at this bot
+        config_manager.bot_name = bot_name
 
         logger.info(f"--- LIMPANDO A TABELA 'TRADES' DO AMBIENTE '{environment}' PARA O BOT '{bot_name}' ---")
 
@@ -33,6 +33,7 @@ def main(environment: str):
 
             # Executa a exclusão
             num_deleted = session.query(Trade).filter(Trade.environment == environment).delete(synchronize_session=False)
+            session.query(TradeAggregate).filter(TradeAggregate.environment == environment).delete(synchronize_session=False)
             session.commit()
 
             logger.info(f"✅ Sucesso! {num_deleted} registros de trade foram deletados do ambiente '{environment}'.")
@@ -76,8 +76,8 @@ def main(
     logger.info(f"Gathering bot data for '{bot_name}' in '{mode}' environment...")
 
     try:
-        # 1. Initialize ConfigManager
-        config_manager.initialize(bot_name)
+        # 1. Point the ConfigManager singleton at this bot
+        config_manager.bot_name = bot_name
 
         # 2. Instantiate services
         db_manager = PostgresManager()
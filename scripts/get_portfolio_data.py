@@ -22,8 +22,8 @@ def get_portfolio_data():
         sys.exit(1)
 
     try:
-        # 1. Initialize ConfigManager
-        config_manager.initialize(bot_name)
+        # 1. Point ConfigManager at this bot
+        config_manager.bot_name = bot_name
 
         # 2. Instantiate services
         db_manager = PostgresManager()
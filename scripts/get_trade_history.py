@@ -24,7 +24,7 @@ def main(
         raise typer.Exit(1)
 
     try:
-        config_manager.initialize(bot_name)
+        config_manager.bot_name = bot_name
         db_manager = PostgresManager()
 
         # Use the provided date filters, or None if not provided.
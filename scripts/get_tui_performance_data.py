@@ -20,8 +20,8 @@ def main():
         print(json.dumps({"error": "BOT_NAME environment variable not set."}), file=sys.stderr)
         sys.exit(1)
 
-    # Initialize the config manager with the bot name to load correct .env variables
-    config_manager.initialize(bot_name)
+    # Point the config manager at the bot so the correct schema and .env variables are used
+    config_manager.bot_name = bot_name
 
     summary_data = get_summary(bot_name=bot_name)
     print(json.dumps(summary_data))
@@ -0,0 +1,43 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from jules_bot.database.postgres_manager import PostgresManager
+from jules_bot.utils.config_manager import config_manager
+from jules_bot.utils.logger import logger
+
+def partition_tables(keep_legacy: bool = False, drop_backtest_before: str = None):
+    """
+    Converts a bot's 'trades' and 'price_history' tables to their partitioned
+    layout and, optionally, drops the backtest trade partitions older than a date.
+    """
+    try:
+        bot_name = config_manager.bot_name
+        db_manager = PostgresManager()
+
+        migrated = db_manager.migrate_to_partitioned_tables(keep_legacy=keep_legacy)
+        if migrated:
+            logger.info(f"Partitioned tables for bot '{bot_name}': {', '.join(migrated)}")
+            if keep_legacy:
+                logger.info("The original tables were kept as '<table>_legacy'; drop them once the migration is verified.")
+        else:
+            logger.info(f"All tables of bot '{bot_name}' are already partitioned.")
+
+        if drop_backtest_before:
+            cutoff = datetime.strptime(drop_backtest_before, "%Y-%m-%d").date()
+            dropped = db_manager.drop_trade_partitions_before('backtest', cutoff)
+            logger.info(f"Dropped {len(dropped)} backtest trade partition(s) ending on or before {cutoff}.")
+    except Exception as e:
+        logger.error(f"An error occurred while partitioning tables: {e}", exc_info=True)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Partitions the trades and price_history tables of a bot.")
+    parser.add_argument("--keep-legacy", action="store_true", help="Keep the original tables as '<table>_legacy' after copying.")
+    parser.add_argument("--drop-backtest-before", default=None, help="Drop backtest trade partitions that end on or before this date (YYYY-MM-DD).")
+    args = parser.parse_args()
+    partition_tables(args.keep_legacy, args.drop_backtest_before)
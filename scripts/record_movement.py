@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from jules_bot.utils.config_manager import config_manager
 from jules_bot.database.portfolio_manager import PortfolioManager
+from jules_bot.database.postgres_manager import PostgresManager
 
 def record_movement():
     """
@@ -37,9 +38,9 @@ def record_movement():
         sys.exit(1)
 
     try:
-        # Initialize PortfolioManager
-        db_config = config_manager.get_section('POSTGRES')
-        portfolio_manager = PortfolioManager(db_config)
+        # Initialize PortfolioManager on the shared engine of this bot's schema
+        db_manager = PostgresManager()
+        portfolio_manager = PortfolioManager(db_manager.SessionLocal)
 
         result = portfolio_manager.create_financial_movement(
             movement_type=args.movement_type.upper(),
@@ -1,3 +1,4 @@
+import cProfile
 import os
 import sys
 import argparse
@@ -13,6 +14,7 @@ from jules_bot.backtesting.engine import Backtester
 from jules_bot.database.postgres_manager import PostgresManager
 from jules_bot.utils.config_manager import config_manager
 from jules_bot.utils.logger import logger
+from jules_bot.utils.profiling import format_summary, get_profiler
 
 def main():
     """
@@ -44,6 +46,50 @@ def main():
         action="store_true",
         help="If set, the script will clear all previous backtest trades before running the new simulation."
     )
+    parser.add_argument(
+        "--verbose-logs",
+        action="store_true",
+        help="Keep per-candle and per-trade logs (disables the 'simulation' logging profile)."
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Read candles and features in chunks instead of loading the whole range (for multi-year 1m runs)."
+    )
+    parser.add_argument(
+        "--chunk-days",
+        type=int,
+        help="Days per chunk in --stream mode (default: [BACKTEST] stream_chunk_days)."
+    )
+    parser.add_argument(
+        "--equity-downsample",
+        type=int,
+        metavar="N",
+        help="Keep the portfolio value of every Nth candle in the equity curve (default: [BACKTEST] equity_downsample)."
+    )
+    parser.add_argument(
+        "--tick-replay",
+        action="store_true",
+        default=None,
+        help="Replay aggTrades inside candles where a decision level is in range (default: [BACKTEST] tick_replay)."
+    )
+    parser.add_argument(
+        "--event-skipping",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Skip candles that cannot change any decision (default: [BACKTEST] event_skipping)."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time the backtest phases (data load, features, regimes, simulation, DB writes) and print a summary."
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=str,
+        metavar="PATH",
+        help="Run the simulation under cProfile and write the stats to PATH (open with snakeviz or pstats)."
+    )
 
     args = parser.parse_args()
 
@@ -99,14 +145,30 @@ def main():
             logger.info("Clearing previous backtest trades as requested...")
             db_manager.clear_backtest_trades()
         
+        profiler = get_profiler()
+        if args.profile:
+            profiler.enable()
+
         backtester = None
+        log_profile = "default" if args.verbose_logs else "simulation"
+        options = dict(log_profile=log_profile, stream=args.stream, chunk_days=args.chunk_days,
+                       equity_downsample=args.equity_downsample, tick_replay=args.tick_replay,
+                       event_skipping=args.event_skipping)
         if args.days:
-            backtester = Backtester(db_manager=db_manager, days=args.days)
+            backtester = Backtester(db_manager=db_manager, days=args.days, **options)
         else:
-            backtester = Backtester(db_manager=db_manager, start_date=args.start_date, end_date=args.end_date)
+            backtester = Backtester(db_manager=db_manager, start_date=args.start_date, end_date=args.end_date, **options)
         
-        backtester.run()
+        if args.cprofile:
+            cprofile_session = cProfile.Profile()
+            cprofile_session.runcall(backtester.run)
+            cprofile_session.dump_stats(args.cprofile)
+            logger.info(f"cProfile stats written to {args.cprofile}.")
+        else:
+            backtester.run()
         logger.info("--- Backtest Simulation Finished ---")
+        if args.profile:
+            print(f"\nBacktest phase timings\n{format_summary(profiler.summary())}")
 
     except ValueError as e:
         if "No price data found" in str(e):
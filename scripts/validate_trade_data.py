@@ -32,8 +32,11 @@ def main(bot_name: str = typer.Argument(..., help="The name of the bot to valida
         db_manager = PostgresManager()
 
         logger.info(f"Fetching all trades from the database for schema '{db_manager.bot_name}' (no date limit)...")
-        # Because we changed the default start_date to None, this gets all trades
-        all_trades = db_manager.get_all_trades_in_range()
+        # Because we changed the default start_date to None, this gets all trades.
+        # Only the columns checked below are fetched, as plain rows rather than ORM objects.
+        all_trades = db_manager.get_trade_rows(
+            columns=('trade_id', 'linked_trade_id', 'order_type', 'status', 'quantity', 'binance_trade_id')
+        )
         logger.info(f"Found a total of {len(all_trades)} trades.")
 
         buy_trades = {t.trade_id: t for t in all_trades if t.order_type == 'buy'}
@@ -12,3 +12,25 @@ def mock_db_manager():
 def mock_binance_client():
     """Pytest fixture for a mocked Binance client."""
     return Mock()
+
+@pytest.fixture
+def feature_frame():
+    """
+    Factory for synthetic 1m candles with the indicator columns the backtesters
+    read (as add_all_features leaves them) and the market regimes.
+    """
+    from benchmarks.synthetic import generate_candles
+    from jules_bot.bot.situational_awareness import SituationalAwareness
+
+    def build(days=3, seed=11):
+        df = generate_candles(days, seed=seed)
+        close = df['close']
+        df['ema_20'] = close.ewm(span=20, adjust=False).mean()
+        df['ema_100'] = close.ewm(span=100, adjust=False).mean()
+        df['bbl_20_2_0'] = (close.rolling(20).mean() - 2 * close.rolling(20).std()).bfill()
+        df['atr_14'] = (df['high'] - df['low']).ewm(alpha=1 / 14, adjust=False).mean()
+        df['macd_diff_12_26_9'] = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        df['cvd'] = (df['taker_buy_volume'] - df['taker_sell_volume']).cumsum()
+        return SituationalAwareness().transform(df)
+
+    return build
@@ -10,6 +10,8 @@ from jules_bot.database.postgres_manager import PostgresManager
 def mock_config_manager():
     """Provides a mock ConfigManager for testing."""
     mock = MagicMock(spec=ConfigManager)
+    mock.bot_name = "test_bot"
+    mock.overrides = None
     
     config_data = {
         'STRATEGY_RULES': {
@@ -61,7 +63,7 @@ def mock_db_manager():
     df = pd.DataFrame(price_data).set_index('timestamp')
     
     mock.get_price_data.return_value = df
-    mock.get_trades_by_run_id.return_value = []
+    mock.get_trades_frame.return_value = pd.DataFrame()
     return mock
 
 @patch('jules_bot.backtesting.engine.Backtester._generate_and_save_summary')
@@ -0,0 +1,116 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jules_bot.backtesting.batch_engine import BatchBacktester
+from jules_bot.core_logic.strategy_rules import StrategyRules
+from jules_bot.utils.config_manager import ConfigManager, config_manager
+
+BASE_VALUES = {
+    ('BACKTEST', 'initial_balance'): '1000',
+    ('STRATEGY_RULES', 'commission_rate'): '0.001',
+    ('STRATEGY_RULES', 'sell_factor'): '0.9',
+    ('STRATEGY_RULES', 'max_open_positions'): '20',
+    ('TRADING_STRATEGY', 'min_trade_size_usdt'): '10.0',
+}
+
+
+def make_config(**regime_values):
+    """A config whose REGIME_0..3 sections all hold `regime_values`; other keys use their fallbacks."""
+    values = dict(BASE_VALUES)
+    for regime in range(4):
+        values.update({(f'REGIME_{regime}', key): str(value) for key, value in regime_values.items()})
+    booleans = {key: value for key, value in values.items() if isinstance(value, bool)}
+
+    config = MagicMock(spec=ConfigManager)
+    config.bot_name = "batch_test"
+    config.overrides = None
+    config.get.side_effect = lambda section, key, fallback=None: values.get((section, key), fallback)
+    config.getboolean.side_effect = lambda section, key, fallback=None: booleans.get((section, key), fallback)
+    config.has_section.side_effect = lambda section: section.startswith('REGIME_') or section == 'STRATEGY_RULES'
+    return config
+
+
+@pytest.fixture
+def feature_data(feature_frame):
+    # Every regime gets a quarter of the run, so each REGIME_n section is exercised.
+    candles = feature_frame()
+    candles['market_regime'] = np.repeat([0, 1, 2, 3], 1080)[:len(candles)]
+    return candles
+
+
+@pytest.fixture
+def no_slippage():
+    real_get = config_manager.get
+    def get(section, key, fallback=None, **kwargs):
+        return '0.0' if (section, key) == ('BACKTEST', 'slippage_rate') else real_get(section, key, fallback, **kwargs)
+    with patch.object(config_manager, "get", side_effect=get):
+        yield
+
+
+def test_portfolios_in_a_batch_are_independent(feature_data):
+    configs = [
+        make_config(buy_dip_percentage='0.002', sell_rise_percentage='0.003', order_size_usd='25', target_profit='0.05'),
+        make_config(buy_dip_percentage='0.001', sell_rise_percentage='0.02', order_size_usd='40', target_profit='0.02'),
+        make_config(buy_dip_percentage='0.004', sell_rise_percentage='0.01', order_size_usd='15', target_profit='0.5'),
+    ]
+    batch = BatchBacktester(feature_data, configs).run()
+    alone = [BatchBacktester(feature_data, [config]).run()[0] for config in configs]
+
+    assert batch == alone
+    assert all(result['buy_trades_count'] > 0 for result in batch)
+    assert len({result['final_balance'] for result in batch}) == 3
+
+
+def test_target_sell_matches_the_strategy_rules(no_slippage):
+    index = pd.date_range('2024-01-01', periods=3, freq='1min', name='timestamp')
+    data = pd.DataFrame({
+        'open': [100.2, 100.0, 100.5], 'high': [100.5, 102.0, 101.0], 'low': [99.5, 99.8, 100.2],
+        'close': [100.0, 100.5, 100.8], 'ema_20': [101.0, 101.0, 101.0], 'ema_100': [200.0, 200.0, 200.0],
+        'market_regime': [0, 0, 0],
+    }, index=index)
+    config = make_config(buy_dip_percentage='0.005', sell_rise_percentage='0.01', order_size_usd='50', target_profit='100')
+
+    result = BatchBacktester(data, [config]).run()[0]
+
+    # A first dip buy below EMA100 at the first close (100 <= 101 * 0.995) is a correction entry
+    # (2.5x the order size); the second candle's high crosses its sell target.
+    rules = StrategyRules(config)
+    buy_price = Decimal('100')
+    quantity = Decimal('125') / buy_price
+    target = rules.calculate_sell_target_price(buy_price, params={'sell_rise_percentage': Decimal('0.01')})
+    assert Decimal('102') > target
+    sell_quantity = quantity * rules.sell_factor
+    expected_pnl = rules.calculate_realized_pnl(buy_price, Decimal('102'), sell_quantity, Decimal('0.125'),
+                                                sell_quantity * Decimal('102') * rules.commission_rate, quantity)
+
+    assert result['buy_trades_count'] == 1
+    assert result['sell_trades_count'] == 1
+    assert result['open_positions_count'] == 0
+    assert float(result['total_realized_pnl']) == pytest.approx(float(expected_pnl), rel=1e-9)
+    assert result['avg_trade_duration_seconds'] == 60.0
+    assert result['profit_factor'] == Decimal('inf')
+    # The unsold 10% stays in the portfolio at the last close.
+    assert float(result['final_open_positions_value']) == pytest.approx(float(quantity - sell_quantity) * 100.8)
+
+
+def test_matches_the_backtester(feature_data):
+    pytest.importorskip("pandas_ta")
+    from jules_bot.backtesting.engine import Backtester
+
+    config = make_config(buy_dip_percentage='0.002', sell_rise_percentage='0.003', order_size_usd='25', target_profit='0.05')
+    db_manager = MagicMock()
+    backtester = Backtester(db_manager=db_manager, config_manager=config, data=feature_data)
+    logged = []
+    backtester._log_trades_to_db = logged.extend
+    db_manager.get_trades_frame.side_effect = lambda **kwargs: pd.DataFrame([trade.to_dict() for trade in logged])
+    expected = backtester.run(return_full_results=True)
+
+    result = BatchBacktester(feature_data, [config]).run()[0]
+    for key in ('buy_trades_count', 'sell_trades_count', 'open_positions_count'):
+        assert result[key] == expected[key]
+    for key in ('final_balance', 'total_realized_pnl', 'total_fees_usd', 'max_drawdown', 'sortino_ratio'):
+        assert float(result[key]) == pytest.approx(float(expected[key]), rel=1e-6, abs=1e-9)
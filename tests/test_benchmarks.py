@@ -0,0 +1,77 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import runner
+from benchmarks.cases import BenchmarkCase, BenchmarkContext, SkipBenchmark
+from benchmarks.synthetic import generate_candles
+from jules_bot.utils.config_manager import config_manager
+
+
+def test_synthetic_candles_are_reproducible_and_consistent():
+    candles = generate_candles(2, seed=7)
+    assert len(candles) == 2 * 1440
+    assert candles.index.freq == pd.tseries.frequencies.to_offset("1min")
+    pd.testing.assert_frame_equal(candles, generate_candles(2, seed=7))
+    assert not candles.equals(generate_candles(2, seed=8))
+
+    assert (candles["high"] >= candles[["open", "close"]].max(axis=1)).all()
+    assert (candles["low"] <= candles[["open", "close"]].min(axis=1)).all()
+    assert np.allclose(candles["taker_buy_volume"] + candles["taker_sell_volume"], candles["volume"])
+    assert (candles["open"].iloc[1:].to_numpy() == candles["close"].iloc[:-1].to_numpy()).all()
+
+
+def test_run_case_reports_samples_skips_and_errors():
+    context = BenchmarkContext()
+    teardown = MagicMock()
+    ok = runner.run_case(BenchmarkCase("ok", run=lambda state: state + 1, setup=lambda c: 1, teardown=teardown, repeat=3, number=10), context)
+    assert ok["status"] == "ok"
+    assert len(ok["samples_s"]) == 3
+    teardown.assert_called_once_with(context, 1)
+
+    def missing_module(context):
+        import not_a_real_module  # noqa: F401
+
+    def no_database(context):
+        raise SkipBenchmark("Postgres not available")
+
+    assert runner.run_case(BenchmarkCase("m", run=print, setup=missing_module), context) == {
+        "status": "skipped", "reason": "missing module 'not_a_real_module'"}
+    assert runner.run_case(BenchmarkCase("db", run=print, setup=no_database), context)["status"] == "skipped"
+    assert runner.run_case(BenchmarkCase("boom", run=lambda state: 1 / 0), context)["status"] == "error"
+
+
+def _document(**medians):
+    return {"commit": "abc", "results": {name: {"status": "ok", "median_s": median} for name, median in medians.items()}}
+
+
+def test_compare_applies_default_and_per_case_thresholds():
+    baseline = _document(fast=1.0, slow=1.0, noisy=1.0, gone=1.0)
+    current = _document(fast=0.5, slow=1.2, noisy=1.2, new=1.0)
+    rows = {row["name"]: row for row in runner.compare(current, baseline, 0.1, {"noisy": 0.25})}
+    assert rows["fast"]["status"] == "improved"
+    assert rows["slow"]["status"] == "regression"
+    assert rows["noisy"]["status"] == "ok"
+    assert rows["new"]["status"] == "not compared"
+
+
+def test_main_writes_json_and_fails_on_regression(tmp_path):
+    case = BenchmarkCase("unit.sleepless", run=lambda state: None, repeat=2)
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(_document(**{"unit.sleepless": 1e-12})))
+    thresholds_path = tmp_path / "thresholds.json"
+    thresholds_path.write_text(json.dumps({"default": 0.5}))
+
+    # main() switches the process to the benchmark bot; restore it for the other tests.
+    with patch.dict(runner.CASES, {"unit.sleepless": case}, clear=True), \
+            patch.object(config_manager, "bot_name", config_manager.bot_name):
+        output = tmp_path / "current.json"
+        assert runner.main(["--output", str(output), "--bot-name", "benchmarks_test"]) == 0
+        document = json.loads(output.read_text())
+        assert document["results"]["unit.sleepless"]["status"] == "ok"
+        assert document["seed"] == 42
+
+        exit_code = runner.main(["--output", str(output), "--compare", str(baseline_path), "--thresholds", str(thresholds_path)])
+        assert exit_code == 1
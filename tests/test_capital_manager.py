@@ -231,3 +231,60 @@ class TestConsecutiveBuyDifficulty(unittest.TestCase):
         trade_history.insert(2, self.create_mock_trade('sell', 2.5)) # A sell in the middle
         difficulty = self.capital_manager._calculate_difficulty_factor(trade_history)
         self.assertEqual(difficulty, self.capital_manager.base_difficulty_percentage)
+
+class TestDifficultyTracker(unittest.TestCase):
+    def setUp(self):
+        self.config_values = {
+            ('STRATEGY_RULES', 'use_dynamic_capital'): True,
+            ('STRATEGY_RULES', 'consecutive_buys_threshold'): '3',
+            ('STRATEGY_RULES', 'difficulty_reset_timeout_hours'): '2',
+            ('STRATEGY_RULES', 'base_difficulty_percentage'): '0.005',
+            ('STRATEGY_RULES', 'per_buy_difficulty_increment'): '0.001'
+        }
+        mock_config_manager = MagicMock()
+        mock_config_manager.get.side_effect = lambda section, key, fallback=None: self.config_values.get((section, key), fallback)
+        mock_config_manager.getboolean.side_effect = lambda section, key, fallback=None: self.config_values.get((section, key), fallback)
+        self.capital_manager = CapitalManager(mock_config_manager, MagicMock(spec=StrategyRules))
+        self.start = datetime(2024, 1, 1)
+
+    def test_streak_counts_buys_since_last_sell(self):
+        tracker = self.capital_manager.difficulty_tracker
+        for minutes in (0, 10, 20):
+            tracker.record_trade('buy', self.start + timedelta(minutes=minutes))
+        tracker.record_trade('sell', self.start + timedelta(minutes=30))
+        for minutes in (40, 50, 60, 70):
+            tracker.record_trade('buy', self.start + timedelta(minutes=minutes))
+
+        factor = self.capital_manager._tracked_difficulty_factor(self.start + timedelta(minutes=80))
+        self.assertEqual(factor, Decimal('0.006'))  # 4 buys: base + 1 increment.
+
+    def test_timeout_resets_the_streak(self):
+        tracker = self.capital_manager.difficulty_tracker
+        for minutes in (0, 10, 20, 30):
+            tracker.record_trade('buy', self.start + timedelta(minutes=minutes))
+        self.assertEqual(self.capital_manager._tracked_difficulty_factor(self.start + timedelta(hours=1)), Decimal('0.006'))
+        self.assertEqual(self.capital_manager._tracked_difficulty_factor(self.start + timedelta(hours=3)), Decimal('0'))
+
+    def test_matches_the_windowed_trade_history(self):
+        """The tracker gives the same factor as the history filtered to the reset window."""
+        trades = []
+        pattern = ['buy', 'buy', 'sell', 'buy', 'buy', 'buy', 'buy', 'buy', 'sell', 'buy', 'buy', 'buy', 'buy', 'buy', 'buy']
+        tracker = self.capital_manager.difficulty_tracker
+        for step, order_type in enumerate(pattern):
+            now = self.start + timedelta(minutes=25 * step)
+            window_start = now - timedelta(hours=2)
+            windowed = [t for t in trades if t['timestamp'] >= window_start]
+            expected = self.capital_manager._calculate_difficulty_factor(windowed, now)
+            self.assertEqual(self.capital_manager._tracked_difficulty_factor(now), expected, f"step {step}")
+            trades.append({'order_type': order_type, 'timestamp': now})
+            tracker.record_trade(order_type, now)
+
+    def test_load_history_accepts_unordered_rows(self):
+        history = [
+            {'order_type': 'buy', 'timestamp': self.start + timedelta(minutes=30)},
+            {'order_type': 'sell', 'timestamp': self.start},
+            {'order_type': 'buy', 'timestamp': self.start + timedelta(minutes=10)},
+            {'order_type': 'buy', 'timestamp': None},
+        ]
+        self.capital_manager.difficulty_tracker.load_history(history)
+        self.assertEqual(self.capital_manager.difficulty_tracker.consecutive_buys(self.start + timedelta(minutes=40)), 2)
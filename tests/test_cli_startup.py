@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+from scripts.benchmark_import_time import HEAVY_MODULES, _parse_importtime
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def test_cli_help_does_not_import_heavy_modules():
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "run.py", "--help"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+    assert completed.returncode == 0
+    loaded = {module for module, _, _ in _parse_importtime(completed.stderr)}
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_config_manager_is_built_on_first_use():
+    code = (
+        "from jules_bot.utils import config_manager as cm\n"
+        "assert cm.config_manager._instance is None\n"
+        "cm.config_manager.bot_name = 'lazy-bot'\n"
+        "assert cm.config_manager._instance is not None\n"
+        "assert cm.config_manager.bot_name == 'lazy-bot'\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert completed.returncode == 0, completed.stderr
@@ -0,0 +1,62 @@
+import dataclasses
+
+import pytest
+
+from jules_bot.utils.config_manager import ConfigManager
+
+CONFIG = """
+[STRATEGY_RULES]
+buy_dip_percentage = 0.02
+sell_rise_percentage = 0.03
+base_usd_per_trade = 50
+use_dynamic_capital = yes
+max_open_positions = @env/SNAPSHOT_TEST_MAX_OPEN_POSITIONS
+
+[REGIME_0]
+buy_dip_percentage = 0.01
+sell_rise_percentage = @env/SNAPSHOT_TEST_REGIME_0_SELL_RISE
+order_size_usd = not-a-number
+
+[REGIME_2]
+target_profit = 0.5
+"""
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setenv("BOT_NAME", "snapshot_bot")
+    monkeypatch.setenv("SNAPSHOT_TEST_MAX_OPEN_POSITIONS", "7")
+    monkeypatch.setenv("SNAPSHOT_BOT_SNAPSHOT_TEST_REGIME_0_SELL_RISE", "0.04")
+    config_file = tmp_path / "config.ini"
+    config_file.write_text(CONFIG)
+    return ConfigManager(config_file=config_file)
+
+
+def test_snapshot_resolves_values_like_get(config):
+    snapshot = config.snapshot()
+    assert snapshot.get('STRATEGY_RULES', 'max_open_positions') == '7'
+    assert snapshot.get('REGIME_0', 'sell_rise_percentage') == '0.04'  # Bot-specific env var wins.
+    assert snapshot.get('STRATEGY_RULES', 'missing', fallback='x') == 'x'
+    assert config.get('STRATEGY_RULES', 'max_open_positions') == '7'
+    assert config.getboolean('STRATEGY_RULES', 'use_dynamic_capital') is True
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snapshot.bot_name = "other"
+
+
+def test_snapshot_is_memoized_per_overrides_and_bot_name(config, monkeypatch):
+    first = config.snapshot()
+    assert config.snapshot() is first
+
+    # Environment changes are not seen until the bot name or overrides change.
+    monkeypatch.setenv("SNAPSHOT_TEST_MAX_OPEN_POSITIONS", "9")
+    assert config.get('STRATEGY_RULES', 'max_open_positions') == '7'
+
+    config.apply_overrides({'MAX_OPEN_POSITIONS': '3'})
+    assert config.snapshot() is not first
+    assert config.get('STRATEGY_RULES', 'max_open_positions') == '3'
+    config.clear_overrides()
+    assert config.snapshot() is first
+
+    config.bot_name = "other_bot"
+    assert config.get('REGIME_0', 'sell_rise_percentage') is None
+
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+
+from jules_bot.core_logic.dynamic_parameters import DynamicParameters
+from jules_bot.utils.config_manager import ConfigManager
+
+
+@pytest.fixture
+def config_values():
+    return {
+        ('STRATEGY_RULES', 'buy_dip_percentage'): '0.02',
+        ('STRATEGY_RULES', 'base_usd_per_trade'): '50',
+        ('REGIME_0', 'buy_dip_percentage'): '0.01',
+        ('REGIME_0', 'order_size_usd'): '30',
+        ('REGIME_2', 'target_profit'): 'bad',
+    }
+
+
+@pytest.fixture
+def mock_config(config_values):
+    mock = MagicMock(spec=ConfigManager)
+    mock.bot_name = "test_bot"
+    mock.overrides = None
+    mock.get.side_effect = lambda section, key, fallback=None: config_values.get((section, key), fallback)
+    mock.has_section.side_effect = lambda section: section in {'STRATEGY_RULES', 'REGIME_0', 'REGIME_2'}
+    return mock
+
+
+def test_parameters_are_precomputed_for_known_regimes(mock_config):
+    dynamic_params = DynamicParameters(mock_config)
+    assert dynamic_params.parameters['order_size_usd'] == Decimal('0')  # Regime -1 is non-trading.
+
+    calls_after_init = mock_config.get.call_count
+    dynamic_params.update_parameters(0)
+    assert dynamic_params.parameters == {
+        'buy_dip_percentage': Decimal('0.01'),
+        'sell_rise_percentage': Decimal('0.01'),
+        'order_size_usd': Decimal('30'),
+        'target_profit': Decimal('0.02'),
+    }
+    dynamic_params.update_parameters(2)
+    assert dynamic_params.get_param('target_profit') == Decimal('0.02')  # Invalid value falls back.
+    dynamic_params.update_parameters(3)  # No section: STRATEGY_RULES values.
+    assert dynamic_params.get_param('buy_dip_percentage') == Decimal('0.02')
+    assert dynamic_params.get_param('order_size_usd') == Decimal('50')
+    assert mock_config.get.call_count == calls_after_init
+
+
+def test_table_is_rebuilt_when_overrides_change(mock_config, config_values):
+    dynamic_params = DynamicParameters(mock_config)
+    config_values[('REGIME_0', 'buy_dip_percentage')] = '0.05'
+    dynamic_params.update_parameters(0)
+    assert dynamic_params.get_param('buy_dip_percentage') == Decimal('0.01')
+
+    mock_config.overrides = {'BUY_DIP_PERCENTAGE': '0.05'}
+    dynamic_params.update_parameters(0)
+    assert dynamic_params.get_param('buy_dip_percentage') == Decimal('0.05')
+
+
+def test_unknown_regimes_are_loaded_once(mock_config):
+    dynamic_params = DynamicParameters(mock_config)
+    dynamic_params.update_parameters(7)
+    calls = mock_config.get.call_count
+    dynamic_params.update_parameters(7)
+    assert mock_config.get.call_count == calls
+    assert dynamic_params.get_param('order_size_usd') == Decimal('50')
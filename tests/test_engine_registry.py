@@ -0,0 +1,70 @@
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from jules_bot.database import engine_registry
+from jules_bot.database.postgres_manager import PostgresManager
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    engine_registry.dispose_all()
+    yield
+    engine_registry.dispose_all()
+
+
+def _config(bot_name="registry-bot"):
+    config = MagicMock()
+    config.bot_name = bot_name
+    config.get_section.return_value = {
+        "user": "u", "password": "p", "host": "localhost", "port": "5432", "dbname": "db",
+        "pool_size": "3", "max_overflow": "not-a-number",
+    }
+    config.getboolean.return_value = False
+    return config
+
+
+def test_engines_are_shared_per_url_and_schema(tmp_path):
+    url = f"sqlite:///{tmp_path / 'registry.db'}"
+    first = engine_registry.get_engine_entry(url, "bot_a")
+    assert engine_registry.get_engine_entry(url, "bot_a") is first
+    assert engine_registry.get_engine_entry(url, "bot_b") is not first
+    assert engine_registry.entry_for_engine(first.engine) is first
+
+
+def test_run_once_runs_a_step_once_across_threads(tmp_path):
+    entry = engine_registry.get_engine_entry(f"sqlite:///{tmp_path / 'registry.db'}", "bot_a")
+    calls = []
+    threads = [threading.Thread(target=engine_registry.run_once, args=(entry, "init", lambda: calls.append(1)))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+
+
+def test_a_failed_step_is_retried(tmp_path):
+    entry = engine_registry.get_engine_entry(f"sqlite:///{tmp_path / 'registry.db'}", "bot_a")
+
+    def fail():
+        raise RuntimeError("database unavailable")
+
+    with pytest.raises(RuntimeError):
+        engine_registry.run_once(entry, "init", fail)
+    assert engine_registry.run_once(entry, "init", lambda: None) is True
+
+
+def test_postgres_managers_share_the_engine_and_initialize_once():
+    with patch.object(PostgresManager, '_initialize_schema') as initialize_schema:
+        first = PostgresManager(config_manager=_config())
+        second = PostgresManager(config_manager=_config())
+        other_bot = PostgresManager(config_manager=_config("other-bot"))
+
+    assert first.engine is second.engine
+    assert first.SessionLocal is second.SessionLocal
+    assert other_bot.engine is not first.engine
+    assert initialize_schema.call_count == 2  # Once per schema.
+    assert first.engine.pool.size() == 3
+    assert first.engine.pool._max_overflow == engine_registry.DEFAULT_MAX_OVERFLOW
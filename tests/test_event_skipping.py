@@ -0,0 +1,105 @@
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jules_bot.backtesting.equity import EquityCurve
+from jules_bot.backtesting.event_skipping import EventSkipper, combined_band, quiet_band
+from jules_bot.backtesting.tick_replay import price_for_pnl
+from jules_bot.core_logic.strategy_rules import StrategyRules
+from jules_bot.utils.config_manager import ConfigManager
+
+
+def test_equity_extend_matches_append():
+    index = pd.date_range('2024-01-01 22:00', periods=3000, freq='1min')
+    values = 1000 * np.exp(np.cumsum(np.random.default_rng(2).normal(0, 0.001, len(index))))
+    appended, extended = EquityCurve(downsample=7, capacity=16), EquityCurve(downsample=7, capacity=16)
+    for timestamp, value in zip(index, values):
+        appended.append(timestamp, float(value))
+    # Runs of candles as the Backtester records them: single processed candles and skipped spans.
+    for start, end in ((0, 1), (1, 500), (500, 501), (501, 2999), (2999, 3000)):
+        extended.extend(index[start:end], values[start:end])
+
+    pd.testing.assert_series_equal(extended.to_series(), appended.to_series())
+    pd.testing.assert_series_equal(extended.daily_values(), appended.daily_values())
+    assert extended.max_drawdown == appended.max_drawdown
+    assert (len(extended), extended.last_value) == (len(appended), appended.last_value)
+
+
+def _decision(rules, position, price):
+    """What the Backtester would do with `position` at `price`: 'SELL_TARGET' or a trailing decision."""
+    if price >= position['sell_target_price']:
+        return "SELL_TARGET"
+    pnl = rules.calculate_net_unrealized_pnl(entry_price=position['price'], current_price=price,
+                                             total_quantity=position['quantity'], buy_commission_usd=position['commission_usd'])
+    return rules.evaluate_smart_trailing_stop(position, pnl)[0]
+
+
+@pytest.mark.parametrize("active", [False, True])
+def test_quiet_band_is_where_the_strategy_holds(active):
+    rules = StrategyRules(ConfigManager())
+    position = {'price': Decimal('100'), 'quantity': Decimal('0.5'), 'commission_usd': Decimal('0.05'),
+                'sell_target_price': Decimal('104'), 'is_smart_trailing_active': active,
+                'smart_trailing_highest_profit': Decimal('1.2') if active else None, 'current_trail_percentage': None}
+    low, high = quiet_band(position, rules)
+
+    assert low < high
+    margin = Decimal('1e-9')
+    for price in np.linspace(float(low if active else 95), float(high), 50)[1:-1]:
+        assert _decision(rules, position, Decimal(str(price))) == "HOLD"
+    assert _decision(rules, position, high * (1 + margin)) != "HOLD"
+    if active:
+        assert _decision(rules, position, low * (1 - margin)) != "HOLD"
+    else:
+        assert high == min(position['sell_target_price'], price_for_pnl(position, rules.trailing_stop_profit, rules.commission_rate))
+
+
+def test_next_event_stops_at_band_exits_and_buy_signals():
+    index = pd.date_range('2024-01-01', periods=400, freq='1min')
+    frame = pd.DataFrame({'open': 100.0, 'high': 100.5, 'low': 99.5, 'close': 100.0,
+                          'ema_20': 101.0, 'ema_100': 102.0, 'bbl_20_2_0': 98.0}, index=index)
+    frame.loc[index[300], 'high'] = 103.0
+    frame.loc[index[200], 'close'] = 98.5
+    skipper = EventSkipper(frame)
+    band = (99.0, 102.0)
+
+    # Without buys only the high at 300 leaves the band; with a 2% dip target the close at 200 can buy.
+    assert skipper.next_event(1, len(frame), band, 0.02, 1, buys_possible=False) == 300
+    assert skipper.next_event(1, len(frame), band, 0.02, 1, buys_possible=True) == 200
+    assert skipper.next_event(1, 150, band, 0.02, 1, buys_possible=True) == 150
+    assert skipper.next_event(1, len(frame), (99.6, 102.0), 0.02, 1, buys_possible=False) == 1
+    assert combined_band([], None) == (-np.inf, np.inf)
+
+
+@pytest.mark.parametrize("overrides", [
+    {"BUY_DIP_PERCENTAGE": "0.002", "SELL_RISE_PERCENTAGE": "0.003"},
+    {"BUY_DIP_PERCENTAGE": "0.001", "SELL_RISE_PERCENTAGE": "0.02", "USE_DYNAMIC_TRAILING_STOP": "true", "TARGET_PROFIT": "0.02"},
+    {"BUY_DIP_PERCENTAGE": "0.01", "SELL_RISE_PERCENTAGE": "0.02", "MAX_OPEN_POSITIONS": "2"},
+])
+def test_event_skipping_keeps_every_trade(overrides, feature_frame):
+    pytest.importorskip("pandas_ta")
+    from jules_bot.backtesting.engine import Backtester
+
+    data = feature_frame(days=4, seed=7)
+
+    def run(event_skipping):
+        config = ConfigManager()
+        config.apply_overrides(overrides)
+        db_manager = MagicMock()
+        backtester = Backtester(db_manager=db_manager, config_manager=config, data=data, event_skipping=event_skipping)
+        logged = []
+        backtester._log_trades_to_db = logged.extend
+        db_manager.get_trades_frame.side_effect = lambda **_: pd.DataFrame([trade.to_dict() for trade in logged])
+        return backtester, logged, backtester.run(return_full_results=True)
+
+    full, full_trades, expected = run(False)
+    skipping, trades, result = run(True)
+
+    assert full_trades
+    assert [(t.order_type, t.timestamp, t.price, t.quantity) for t in trades] == \
+        [(t.order_type, t.timestamp, t.price, t.quantity) for t in full_trades]
+    np.testing.assert_allclose(skipping.equity_curve.to_series(), full.equity_curve.to_series(), rtol=1e-12)
+    for key in ('final_balance', 'total_realized_pnl', 'max_drawdown', 'sharpe_ratio', 'sortino_ratio'):
+        assert float(result[key]) == pytest.approx(float(expected[key]), rel=1e-9)
@@ -0,0 +1,102 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from jules_bot.core.exchange_snapshot import ExchangeSnapshotCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.get_account.return_value = {'balances': [{'asset': 'USDT', 'free': '100.0', 'locked': '0.0'}]}
+    client.get_all_tickers.return_value = [
+        {'symbol': 'BTCUSDT', 'price': '50000.0'},
+        {'symbol': 'ETHUSDT', 'price': '3000.0'},
+    ]
+    client.get_symbol_ticker.return_value = {'symbol': 'BTCUSDT', 'price': '50001.0'}
+    return client
+
+
+def test_account_is_served_from_snapshot_within_ttl(client, clock):
+    cache = ExchangeSnapshotCache(ttl_seconds=2.0, clock=clock)
+
+    cache.get_account(client)
+    clock.now = 1.5
+    cache.get_account(client)
+    assert client.get_account.call_count == 1
+
+    clock.now = 2.5
+    cache.get_account(client)
+    assert client.get_account.call_count == 2
+
+
+def test_invalidate_account_forces_refetch_after_fill(client, clock):
+    cache = ExchangeSnapshotCache(ttl_seconds=2.0, clock=clock)
+
+    cache.get_account(client)
+    cache.invalidate_account()
+    cache.get_account(client)
+
+    assert client.get_account.call_count == 2
+    assert cache.get_metrics()['invalidations'] == 1
+
+
+def test_symbol_price_prefers_fresh_all_tickers_snapshot(client, clock):
+    cache = ExchangeSnapshotCache(ttl_seconds=2.0, clock=clock)
+
+    cache.get_all_tickers(client)
+    assert cache.get_symbol_price(client, 'ETHUSDT') == '3000.0'
+    client.get_symbol_ticker.assert_not_called()
+
+    # Once the tickers snapshot expires, only the single symbol is requested.
+    clock.now = 3.0
+    assert cache.get_symbol_price(client, 'BTCUSDT') == '50001.0'
+    assert cache.get_symbol_price(client, 'BTCUSDT') == '50001.0'
+    client.get_symbol_ticker.assert_called_once_with(symbol='BTCUSDT')
+
+
+def test_zero_ttl_is_a_passthrough(client, clock):
+    cache = ExchangeSnapshotCache(ttl_seconds=0, clock=clock)
+
+    cache.get_account(client)
+    cache.get_account(client)
+
+    assert client.get_account.call_count == 2
+    assert cache.get_metrics()['calls_saved'] == 0
+
+
+def test_failed_fetch_is_not_cached(client, clock):
+    cache = ExchangeSnapshotCache(ttl_seconds=2.0, clock=clock)
+    client.get_account.side_effect = [Exception("timeout"), {'balances': []}]
+
+    with pytest.raises(Exception):
+        cache.get_account(client)
+    assert cache.get_account(client) == {'balances': []}
+
+
+def test_metrics_report_calls_saved(client, clock):
+    cache = ExchangeSnapshotCache(ttl_seconds=2.0, clock=clock)
+
+    for _ in range(3):
+        cache.get_account(client)
+        cache.get_all_tickers(client)
+
+    metrics = cache.get_metrics()
+    assert metrics['account_requests'] == 3
+    assert metrics['account_fetches'] == 1
+    assert metrics['ticker_fetches'] == 1
+    assert metrics['calls_saved'] == 4
+    assert metrics['hit_ratio'] == pytest.approx(4 / 6, abs=1e-4)
@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jules_bot.backtesting.batch_engine import BatchBacktester
+from jules_bot.research.feature_dtypes import FeatureDtypePolicy
+from jules_bot.utils.config_manager import ConfigManager
+
+COMPACT = FeatureDtypePolicy(float_dtype='float32', drop_placeholders=True, drop_columns=('target',))
+
+
+def _with_placeholders(df):
+    """Adds the placeholders written when sentiment/macro data is missing; funding data is present here."""
+    df['fng_change_3d'] = 0.0
+    df['btc_dxy_corr_30d'] = 0.0
+    df['funding_rate_mean_24h'] = 0.0001
+    df['target'] = 1
+    return df
+
+
+def test_policy_converts_the_frame_in_place(feature_frame):
+    df = _with_placeholders(feature_frame())
+    original = df.copy()
+
+    assert COMPACT.apply(df) is df
+
+    assert not {'fng_change_3d', 'btc_dxy_corr_30d', 'target'} & set(df.columns)
+    assert 'funding_rate_mean_24h' in df.columns
+    assert df['market_regime'].dtype == np.int8
+    for column in ('open', 'high', 'low', 'close'):
+        assert df[column].dtype == np.float64
+        assert df[column].equals(original[column])
+    for column in ('ema_20', 'ema_100', 'bbl_20_2_0', 'atr_14', 'volume', 'cvd'):
+        assert df[column].dtype == np.float32
+        np.testing.assert_allclose(df[column], original[column], rtol=1e-6)
+    assert (df['market_regime'] == original['market_regime']).all()
+    assert df.memory_usage(deep=True).sum() < 0.7 * original.memory_usage(deep=True).sum()
+
+
+def test_policy_from_config():
+    values = {'feature_float_dtype': 'float32', 'drop_placeholder_features': 'true', 'drop_feature_columns': '["target"]'}
+    config = MagicMock()
+    config.get.side_effect = lambda section, key, fallback=None: values.get(key, fallback)
+    assert FeatureDtypePolicy.from_config(config) == COMPACT
+
+    values.update(feature_float_dtype='float16', drop_feature_columns='not json')
+    policy = FeatureDtypePolicy.from_config(config)
+    assert (policy.float_dtype, policy.drop_columns) == ('float64', ())
+
+    # Unset variables leave every column as it is, except the lossless int8 regime.
+    assert FeatureDtypePolicy.from_config(MagicMock(**{'get.return_value': None})) == FeatureDtypePolicy()
+
+
+def test_compact_frame_backtests_within_tolerance(feature_frame):
+    full = _with_placeholders(feature_frame(days=5))
+    compact = COMPACT.apply(full.copy())
+    configs = []
+    for buy_dip, sell_rise in (('0.002', '0.003'), ('0.004', '0.01')):
+        config = ConfigManager()
+        config.apply_overrides({"BUY_DIP_PERCENTAGE": buy_dip, "SELL_RISE_PERCENTAGE": sell_rise})
+        configs.append(config)
+
+    expected = BatchBacktester(full, configs).run()
+    results = BatchBacktester(compact, configs).run()
+
+    for result, reference in zip(results, expected):
+        assert reference['buy_trades_count'] > 0
+        assert result['buy_trades_count'] == pytest.approx(reference['buy_trades_count'], rel=0.02)
+        assert float(result['final_balance']) == pytest.approx(float(reference['final_balance']), rel=1e-3)
@@ -0,0 +1,32 @@
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+optuna = pytest.importorskip("optuna")
+
+
+def test_score_trial_stores_the_trade_list_in_rdb_storage(tmp_path, feature_frame):
+    pytest.importorskip("pandas_ta")
+    from jules_bot.backtesting.engine import Backtester
+    from jules_bot.genius_optimizer.objective import _score_trial
+
+    db_manager = MagicMock()
+    backtester = Backtester(db_manager=db_manager, data=feature_frame())
+    logged = []
+    backtester._log_trades_to_db = logged.extend
+    db_manager.get_trades_frame.side_effect = lambda **_: pd.DataFrame([trade.to_dict() for trade in logged])
+    results = backtester.run(return_full_results=True)
+    assert results['trades']
+
+    # The optimizer's studies live in SQLite; user attributes must be JSON serializable there.
+    study = optuna.create_study(storage=f"sqlite:///{tmp_path / 'study.db'}", direction="maximize")
+    trial = study.ask()
+    score = _score_trial(trial, results)
+    study.tell(trial, score)
+
+    summary = study.trials[0].user_attrs["full_summary"]
+    first_trade = summary["trades"][0]
+    assert isinstance(first_trade["timestamp"], str)
+    assert isinstance(first_trade["price"], str)
+    assert pd.Timestamp(first_trade["timestamp"]).tz_convert(None) == logged[0].timestamp
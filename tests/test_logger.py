@@ -0,0 +1,59 @@
+import logging
+from unittest.mock import patch
+
+from jules_bot.utils import logger as logger_module
+from jules_bot.utils.logger import JsonFormatter, get_logger, log_profile
+
+
+def test_simulation_profile_silences_subsystems_and_restores_them():
+    capital = get_logger("capital")
+    capital.setLevel(logging.NOTSET)
+
+    with log_profile("simulation"):
+        assert not capital.isEnabledFor(logging.INFO)
+        assert capital.isEnabledFor(logging.WARNING)
+    assert capital.level == logging.NOTSET
+
+
+def test_explicit_subsystem_levels_win_over_profiles():
+    trade_log = get_logger("trade_logger")
+    trade_log.setLevel(logging.INFO)
+    with patch.dict(logger_module.SUBSYSTEM_LEVELS, {"trade_logger": "INFO"}):
+        with log_profile("simulation"):
+            assert trade_log.isEnabledFor(logging.INFO)
+    trade_log.setLevel(logging.NOTSET)
+
+
+def test_subsystem_records_reach_the_bot_handlers_with_lazy_args():
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger_module.logger.addHandler(handler)
+    try:
+        get_logger("capital").info("Consecutive buys (%d) below threshold (%d).", 2, 5)
+    finally:
+        logger_module.logger.removeHandler(handler)
+    assert [r.getMessage() for r in records] == ["Consecutive buys (2) below threshold (5)."]
+
+
+def test_formatter_time_cache_matches_uncached_output():
+    formatter = JsonFormatter()
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "m", None, None)
+    formatter.formatTime(record)
+    record.created += 0.5
+    record.msecs = (record.created - int(record.created)) * 1000
+    assert formatter.formatTime(record) == JsonFormatter().formatTime(record)
+
+
+def test_overlapping_profiles_restore_levels_after_the_last_exit():
+    capital = get_logger("capital")
+    capital.setLevel(logging.NOTSET)
+    first, second = log_profile("simulation"), log_profile("simulation")
+
+    # Interleaved like two optimizer trials on different threads: enter A, enter B, exit A, exit B.
+    first.__enter__()
+    second.__enter__()
+    first.__exit__(None, None, None)
+    assert not capital.isEnabledFor(logging.INFO)
+    second.__exit__(None, None, None)
+    assert capital.level == logging.NOTSET
@@ -0,0 +1,99 @@
+import re
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from jules_bot.bot.api import metrics_router
+from jules_bot.core.exchange_snapshot import ExchangeSnapshotCache
+from jules_bot.services.metrics_exporter import MetricsWriter, render_metrics
+from jules_bot.utils import profiling
+from jules_bot.utils.profiling import Profiler
+
+SAMPLE_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_]+="[^"]*",?)*\})? [-+0-9.eInf]+$')
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler(enabled=True)
+    with patch.object(profiling, "_profiler", profiler):
+        yield profiler
+
+
+@pytest.fixture
+def bot():
+    snapshot_cache = ExchangeSnapshotCache(ttl_seconds=60)
+    client = MagicMock()
+    client.get_account.return_value = {"balances": []}
+    snapshot_cache.get_account(client)
+    snapshot_cache.get_account(client)
+
+    db_manager = MagicMock()
+    db_manager.engine.pool.size.return_value = 5
+    db_manager.engine.pool.checkedout.return_value = 1
+    db_manager.engine.pool.overflow.return_value = 0
+    return SimpleNamespace(
+        bot_name="metrics_bot", mode="test", is_syncing=False, open_positions_count=3,
+        last_sync_time=datetime(2024, 1, 1, 12, 0, 0),
+        dynamic_params=SimpleNamespace(current_regime=1),
+        live_portfolio_manager=SimpleNamespace(cached_portfolio_value=Decimal("1500.5"), cached_cash_balance=Decimal("500"),
+                                               cached_open_positions_value=Decimal("1000.5")),
+        trader=SimpleNamespace(snapshot_cache=snapshot_cache),
+        db_manager=db_manager,
+    )
+
+
+def test_histogram_series_are_cumulative_and_end_in_inf():
+    writer = MetricsWriter({"bot": "b"})
+    writer.histogram("x_seconds", "help", [(0.1, 1), (1.0, 3), ("+Inf", 4)], 4, 2.5, {"phase": "features"})
+    lines = writer.render().splitlines()
+    assert lines[:2] == ["# HELP x_seconds help", "# TYPE x_seconds histogram"]
+    assert 'x_seconds_bucket{bot="b",phase="features",le="1"} 3' in lines
+    assert 'x_seconds_bucket{bot="b",phase="features",le="+Inf"} 4' in lines
+    assert 'x_seconds_sum{bot="b",phase="features"} 2.5' in lines
+
+
+def test_render_exposes_timers_state_and_caches_without_touching_the_db(profiler, bot):
+    profiler.record("cycle", 0.2)
+    profiler.record("cycle", 3.0)
+    profiler.record("exchange.myTrades", 0.05)
+    profiler.record("db.read", 0.002)
+    profiler.record("features", 0.01)
+
+    text = render_metrics(bot)
+    lines = text.splitlines()
+    for line in lines:
+        assert line.startswith("# ") or SAMPLE_LINE.match(line), line
+
+    assert 'jules_bot_cycle_duration_seconds_count{bot="metrics_bot",mode="test"} 2' in lines
+    assert 'jules_bot_cycle_duration_seconds_bucket{bot="metrics_bot",mode="test",le="0.25"} 1' in lines
+    assert 'jules_bot_exchange_request_duration_seconds_count{bot="metrics_bot",mode="test",endpoint="myTrades"} 1' in lines
+    assert 'jules_bot_db_query_duration_seconds_count{bot="metrics_bot",mode="test",kind="read"} 1' in lines
+    assert 'jules_bot_phase_duration_seconds_count{bot="metrics_bot",mode="test",phase="features"} 1' in lines
+    assert 'jules_bot_open_positions{bot="metrics_bot",mode="test"} 3' in lines
+    assert 'jules_bot_portfolio_value_usd{bot="metrics_bot",mode="test"} 1500.5' in lines
+    assert 'jules_bot_exchange_cache_hit_ratio{bot="metrics_bot",mode="test"} 0.5' in lines
+    assert 'jules_bot_db_pool_checked_out{bot="metrics_bot",mode="test"} 1' in lines
+    assert "process_resident_memory_bytes" in text
+    # Each family is declared once.
+    assert text.count("# TYPE jules_bot_governor_requests_total counter") == 1
+
+    # Only the in-memory pool counters were read.
+    assert [call[0] for call in bot.db_manager.method_calls] == ["engine.pool.size", "engine.pool.checkedout", "engine.pool.overflow"]
+
+
+def test_metrics_endpoint_serves_the_prometheus_content_type(profiler, bot):
+    bot.open_positions_count = None  # No cycle has run yet: the gauge is omitted.
+    app = FastAPI()
+    app.state.bot = bot
+    app.include_router(metrics_router)
+
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "jules_bot_open_positions" not in response.text
+    assert 'jules_bot_market_regime{bot="metrics_bot",mode="test"} 1' in response.text
@@ -0,0 +1,74 @@
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+from jules_bot.database import partitioning
+
+
+def test_iter_months_covers_both_ends_and_year_boundary():
+    months = list(partitioning.iter_months(datetime(2023, 11, 15, 12), date(2024, 2, 1)))
+    assert months == [date(2023, 11, 1), date(2023, 12, 1), date(2024, 1, 1), date(2024, 2, 1)]
+    assert partitioning.month_partition_name('trades_backtest', months[1]) == 'trades_backtest_2023_12'
+
+
+def test_trades_ddl_is_partitioned_by_environment_with_partition_key_in_primary_key():
+    ddl = partitioning.partitioned_table_ddl('trades', 'my_bot')
+    assert 'CREATE TABLE my_bot.trades' in ddl
+    assert 'PARTITION BY LIST (environment)' in ddl
+    assert 'PRIMARY KEY (id, environment, timestamp)' in ddl
+    assert 'id SERIAL NOT NULL' in ddl
+    assert 'UNIQUE' not in ddl
+
+
+def test_price_history_ddl_is_partitioned_by_month():
+    ddl = partitioning.partitioned_table_ddl('price_history', 'my_bot')
+    assert 'PARTITION BY RANGE (timestamp)' in ddl
+    assert 'PRIMARY KEY (id, timestamp)' in ddl
+
+
+def test_trade_index_ddl_replaces_unique_trade_id():
+    statements = partitioning._model_index_ddl('trades', 'my_bot')
+    assert any('ix_trades_trade_id ON my_bot.trades (trade_id)' in s for s in statements)
+    assert any('ix_trades_open_buys_timestamp' in s and 'WHERE' in s for s in statements)
+    # The only unique index carries every partition key, as PostgreSQL requires.
+    unique = [s for s in statements if 'UNIQUE' in s]
+    assert unique == [f"CREATE UNIQUE INDEX IF NOT EXISTS {partitioning.TRADE_UNIQUE_INDEX} "
+                      "ON my_bot.trades (environment, trade_id, timestamp)"]
+
+
+def _recording_connection(existing=()):
+    """A connection that records its statements; to_regclass finds only `existing`."""
+    connection = MagicMock()
+    statements = []
+
+    def execute(statement, params=None):
+        sql = str(statement)
+        statements.append(sql)
+        result = MagicMock()
+        result.scalar.return_value = 'x' if 'to_regclass' in sql and params['name'] in existing else None
+        return result
+
+    connection.execute.side_effect = execute
+    return connection, statements
+
+
+def test_month_partitions_are_created_under_a_lock_and_moved_atomically():
+    connection, statements = _recording_connection(existing={'my_bot.trades_backtest_2024_01'})
+
+    created = partitioning.ensure_month_partitions(connection, 'my_bot', 'trades_backtest', date(2024, 1, 5), date(2024, 2, 5))
+
+    assert created == ['trades_backtest_2024_02']
+    work = [s for s in statements if 'to_regclass' not in s]
+    assert 'pg_advisory_xact_lock' in work[0]
+    assert work[1] == 'LOCK TABLE my_bot.trades_backtest_default IN EXCLUSIVE MODE'
+    # Rows leave the DEFAULT partition in the same statement that copies them.
+    move = next(s for s in work if 'DELETE' in s)
+    assert 'RETURNING *' in move and 'INSERT INTO my_bot.trades_backtest_2024_02 SELECT * FROM moved' in move
+    assert sum('DELETE' in s for s in work) == 1
+    assert 'ATTACH PARTITION' in work[-1]
+
+
+def test_existing_month_partitions_take_no_lock():
+    connection, statements = _recording_connection(existing={'my_bot.price_history_2024_03'})
+    assert partitioning.ensure_month_partitions(connection, 'my_bot', 'price_history', date(2024, 3, 1), date(2024, 3, 31)) == []
+    assert not any('pg_advisory_xact_lock' in s for s in statements)
+
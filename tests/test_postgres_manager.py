@@ -77,3 +77,265 @@ def test_update_trade_status_and_quantity(postgres_manager):
         assert updated_trade is not None
         assert updated_trade.status == new_status
         assert updated_trade.quantity == new_quantity
+
+def test_bulk_apply_sync_changes(postgres_manager):
+    """Inserts and updates from a sync batch are committed together."""
+    common = dict(run_id="sync", environment="test", strategy_name="default", symbol="BTCUSDT",
+                  exchange="binance", price=Decimal("100"), usd_value=Decimal("100"))
+    with postgres_manager.get_db() as db:
+        db.add(Trade(trade_id="existing-buy", status="OPEN", order_type="buy",
+                     quantity=Decimal("1"), remaining_quantity=Decimal("1"), **common))
+        db.commit()
+
+    new_trades = [
+        dict(trade_id="new-buy", status="OPEN", order_type="buy", quantity=Decimal("2"),
+             remaining_quantity=Decimal("1.5"), not_a_column="ignored", **common),
+        dict(trade_id="new-sell", status="CLOSED", order_type="sell", quantity=Decimal("0.5"), **common),
+    ]
+    updates = {"existing-buy": {"remaining_quantity": Decimal("0"), "status": "CLOSED", "order_type": "sell"}}
+
+    postgres_manager.bulk_apply_sync_changes(new_trades, updates)
+
+    with postgres_manager.get_db() as db:
+        trades = {t.trade_id: t for t in db.query(Trade).all()}
+    assert trades["existing-buy"].status == "CLOSED"
+    assert trades["existing-buy"].order_type == "buy"
+    assert trades["new-buy"].remaining_quantity == Decimal("1.5")
+    assert trades["new-sell"].remaining_quantity == Decimal("0")
+
+
+def test_sync_batch_skips_trade_ids_that_already_exist(postgres_manager):
+    """A sync batch never inserts a second row for a trade_id, whether it is stored already or repeated in the batch."""
+    common = dict(run_id="sync", environment="test", strategy_name="default", symbol="BTCUSDT", exchange="binance",
+                  status="OPEN", order_type="buy", price=Decimal("100"), quantity=Decimal("1"), usd_value=Decimal("100"))
+    postgres_manager.bulk_apply_sync_changes([dict(trade_id="known", **common)], {})
+
+    postgres_manager.bulk_apply_sync_changes(
+        [dict(trade_id="known", **common), dict(trade_id="fresh", **common), dict(trade_id="fresh", **common)], {})
+
+    with postgres_manager.get_db() as db:
+        assert sorted(t.trade_id for t in db.query(Trade).all()) == ["fresh", "known"]
+
+
+
+def _sell_point(trade_id, pnl, hodl=0.0, environment="test", timestamp=None):
+    import datetime
+    from jules_bot.core.schemas import TradePoint
+    return TradePoint(
+        run_id="run-1", environment=environment, strategy_name="default", symbol="BTCUSDT",
+        trade_id=trade_id, exchange="binance", status="CLOSED", order_type="sell",
+        price=100.0, quantity=1.0, usd_value=100.0, commission=0.0, commission_asset="USDT",
+        timestamp=timestamp or datetime.datetime(2024, 1, 2, 12, 0, tzinfo=datetime.timezone.utc),
+        realized_pnl_usd=pnl, hodl_asset_amount=hodl,
+    )
+
+
+def test_log_trade_maintains_trade_aggregates(postgres_manager):
+    """Sell inserts and updates keep the aggregates table in step; buys are ignored."""
+    postgres_manager.log_trade(_sell_point("s1", 10.0, hodl=0.001))
+    postgres_manager.log_trade(_sell_point("s2", -4.0))
+    postgres_manager.log_trade(_sell_point("s-trade", 99.0, environment="trade"))
+
+    summary = postgres_manager.get_realized_pnl_summary(environment="test")
+    assert summary["sell_count"] == 2
+    assert summary["realized_pnl_usd"] == Decimal("6")
+    assert summary["realized_pnl_btc"] == Decimal("0.06")
+    assert summary["hodl_asset_amount"] == Decimal("0.001")
+
+    # Correcting a sell's PnL replaces its contribution instead of adding it twice.
+    postgres_manager.log_trade(_sell_point("s2", -1.0))
+    summary = postgres_manager.get_realized_pnl_summary(environment="test", run_id="run-1")
+    assert summary["sell_count"] == 2
+    assert summary["realized_pnl_usd"] == Decimal("9")
+
+
+def test_sync_batch_and_rebuild_match_trade_aggregates(postgres_manager):
+    """Aggregates written by a sync batch equal a full rebuild from the trades table."""
+    import datetime
+    common = dict(run_id="sync", environment="test", strategy_name="default", symbol="BTCUSDT",
+                  exchange="binance", price=Decimal("200"), quantity=Decimal("1"), usd_value=Decimal("200"), status="CLOSED")
+    new_trades = [
+        dict(trade_id="b1", order_type="buy", timestamp=datetime.datetime(2024, 1, 1), **common),
+        dict(trade_id="s1", order_type="sell", realized_pnl_usd=Decimal("20"), timestamp=datetime.datetime(2024, 1, 1), **common),
+        dict(trade_id="s2", order_type="sell", realized_pnl_usd=Decimal("2"), timestamp=datetime.datetime(2024, 1, 1, 23), **common),
+        dict(trade_id="s3", order_type="sell", realized_pnl_usd=Decimal("-6"), timestamp=datetime.datetime(2024, 1, 3), **common),
+    ]
+    postgres_manager.bulk_apply_sync_changes(new_trades, {})
+
+    from jules_bot.database.models import TradeAggregate
+    with postgres_manager.get_db() as db:
+        rows = {(r.day.isoformat(), r.sell_count, r.realized_pnl_usd) for r in db.query(TradeAggregate).all()}
+    assert rows == {("2024-01-01", 2, Decimal("22")), ("2024-01-03", 1, Decimal("-6"))}
+    incremental = postgres_manager.get_realized_pnl_summary(environment="test")
+
+    assert postgres_manager.rebuild_trade_aggregates("test") == 3
+    assert postgres_manager.get_realized_pnl_summary(environment="test") == incremental
+    assert incremental["sell_count"] == 3
+    assert incremental["realized_pnl_usd"] == Decimal("16")
+
+
+def test_sell_aggregates_are_upserted_on_postgres(postgres_manager):
+    """On Postgres a new aggregate key is inserted with ON CONFLICT, so concurrent first sells add up instead of failing."""
+    import datetime
+    from unittest.mock import MagicMock
+    from sqlalchemy.dialects import postgresql
+
+    postgres_manager.engine = MagicMock()
+    postgres_manager.engine.dialect.name = 'postgresql'
+    db = MagicMock()
+    sell = Trade(environment="test", symbol="BTCUSDT", run_id="run-1", order_type="sell", price=Decimal("100"),
+                 realized_pnl_usd=Decimal("10"), timestamp=datetime.datetime(2024, 1, 2))
+
+    assert postgres_manager._apply_sell_aggregates(db, [(sell, 1)]) == 1
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (environment, symbol, run_id, day) DO UPDATE" in sql
+    assert "sell_count = (trade_aggregates.sell_count + excluded.sell_count)" in sql
+
+
+def _history_trades(postgres_manager):
+    import datetime
+    common = dict(run_id="run-1", environment="test", strategy_name="default", symbol="BTCUSDT",
+                  exchange="binance", quantity=Decimal("1"))
+    rows = []
+    for day in range(1, 8):
+        rows.append(Trade(trade_id=f"buy-{day}", order_type="buy", status="OPEN" if day % 2 else "CLOSED",
+                          price=Decimal(100 + day), usd_value=Decimal(100 + day),
+                          timestamp=datetime.datetime(2024, 1, day, 15), **common))
+    for day in (2, 4, 6):
+        rows.append(Trade(trade_id=f"sell-{day}", order_type="sell", status="CLOSED", price=Decimal(100 + day),
+                          usd_value=Decimal(100 + day), sell_usd_value=Decimal(110 + day),
+                          realized_pnl_usd=Decimal(day), timestamp=datetime.datetime(2024, 1, day, 16), **common))
+    rows.append(Trade(trade_id="other-env", order_type="buy", status="OPEN", price=Decimal(1), usd_value=Decimal(1),
+                      timestamp=datetime.datetime(2024, 1, 5), **{**common, "environment": "trade"}))
+    with postgres_manager.get_db() as db:
+        db.add_all(rows)
+        db.commit()
+
+
+def test_trade_history_pages_follow_the_cursor(postgres_manager):
+    """Keyset pages cover the filtered history exactly once, newest first, without closed buys."""
+    _history_trades(postgres_manager)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        trades, cursor = postgres_manager.get_trade_history_page("test", limit=3, cursor=cursor)
+        seen.extend(t.trade_id for t in trades)
+        pages += 1
+        if cursor is None:
+            break
+    assert pages == 3
+    assert seen == ["buy-7", "sell-6", "buy-5", "sell-4", "buy-3", "sell-2", "buy-1"]
+
+    # Nullable sort columns keep rows without a value at the end in either direction.
+    trades, _ = postgres_manager.get_trade_history_page("test", sort_by="realized_pnl_usd", descending=False, limit=20)
+    assert [t.trade_id for t in trades[:3]] == ["sell-2", "sell-4", "sell-6"]
+    first, cursor = postgres_manager.get_trade_history_page("test", sort_by="realized_pnl_usd", limit=4)
+    rest, _ = postgres_manager.get_trade_history_page("test", sort_by="realized_pnl_usd", limit=4, cursor=cursor)
+    assert [t.trade_id for t in first[:3]] == ["sell-6", "sell-4", "sell-2"]
+    assert len(first) + len(rest) == 7
+
+    with pytest.raises(ValueError):
+        postgres_manager.get_trade_history_page("test", sort_by="price", cursor=cursor)
+
+
+def test_trade_history_filters_and_summary(postgres_manager):
+    import datetime
+    _history_trades(postgres_manager)
+
+    trades, cursor = postgres_manager.get_trade_history_page(
+        "test", status="closed", start_date=datetime.date(2024, 1, 3), end_date=datetime.date(2024, 1, 6))
+    assert [t.trade_id for t in trades] == ["sell-6", "sell-4"]
+    assert cursor is None
+
+    summary = postgres_manager.get_trade_history_summary("test")
+    assert summary["total_trades"] == 7
+    assert summary["buy_count"] == 4
+    assert summary["sell_count"] == 3
+    assert summary["total_invested"] == Decimal("416")
+    assert summary["total_returned"] == Decimal("342")
+    assert summary["realized_pnl_usd"] == Decimal("12")
+
+
+def test_missing_trade_indexes_are_created_by_migration(postgres_manager):
+    """Existing 'trades' tables get the model's query indexes, including the partial ones."""
+    from sqlalchemy import inspect
+    postgres_manager.bot_name = None
+    with postgres_manager.engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_trades_open_environment_symbol"))
+        connection.execute(text("DROP INDEX ix_trades_run_id_timestamp"))
+
+    with postgres_manager.engine.connect() as connection:
+        created = postgres_manager._create_missing_indexes(connection, inspect(postgres_manager.engine))
+    assert created == ["ix_trades_open_environment_symbol", "ix_trades_run_id_timestamp"]
+
+    with postgres_manager.get_db() as db:
+        plan = " ".join(str(row) for row in db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM trades WHERE status = 'OPEN' AND environment = 'trade' AND symbol = 'BTCUSDT'"
+        )))
+    assert "ix_trades_open_environment_symbol" in plan
+
+def test_partitioning_is_a_no_op_outside_postgresql(postgres_manager):
+    """SQLite tables are never partitioned, so partition maintenance is skipped."""
+    from datetime import date
+    assert postgres_manager.is_partitioned('trades') is False
+    assert postgres_manager.ensure_trade_partitions('backtest', date(2024, 1, 1), date(2024, 3, 1)) == []
+    assert postgres_manager.ensure_price_history_partitions(date(2024, 1, 1), date(2024, 3, 1)) == []
+
+def test_lean_trade_reads_project_columns_without_decision_context(postgres_manager):
+    """Projected reads return plain rows/frames and only fetch decision_context on request."""
+    import datetime
+    _history_trades(postgres_manager)
+    with postgres_manager.get_db() as db:
+        db.query(Trade).filter(Trade.trade_id == "sell-4").update({"decision_context": {"final_confidence": 0.8}})
+        db.commit()
+
+    rows = postgres_manager.get_trade_rows(columns=('timestamp', 'order_type'), mode="test", end_date=None)
+    assert len(rows) == 10
+    assert rows[0].timestamp == datetime.datetime(2024, 1, 7, 15) and rows[0].order_type == "buy"
+    assert not isinstance(rows[0], Trade) and not hasattr(rows[0], "decision_context")
+
+    frame = postgres_manager.get_trades_frame(mode="test", order_type="sell", end_date=None, newest_first=False,
+                                              include_decision_context=True, numeric_as_float=True)
+    assert list(frame["trade_id"]) == ["sell-2", "sell-4", "sell-6"]
+    assert str(frame["realized_pnl_usd"].dtype) == "float64" and frame["realized_pnl_usd"].sum() == 12.0
+    assert frame.loc[1, "decision_context"] == {"final_confidence": 0.8}
+
+    decimals = postgres_manager.get_trades_frame(columns=('trade_id', 'price'), run_id="run-1", end_date=None)
+    assert "decision_context" not in decimals.columns
+    assert isinstance(decimals.loc[0, "price"], Decimal)
+
+def test_versioned_migrations_run_once_and_are_recorded(postgres_manager):
+    """Pending steps run in order, are recorded in schema_migrations, and are skipped afterwards."""
+    from jules_bot.database import migrations
+    postgres_manager.bot_name = "main"  # SQLite's schema name.
+    with postgres_manager.engine.begin() as connection:
+        connection.execute(text("ALTER TABLE bot_status DROP COLUMN last_buy_condition"))
+
+    assert postgres_manager._run_migrations() == [m.version for m in migrations.MIGRATIONS]
+    with postgres_manager.get_db() as db:
+        columns = [row[1] for row in db.execute(text("PRAGMA table_info(bot_status)"))]
+        assert "last_buy_condition" in columns
+        assert db.execute(text("SELECT max(version) FROM schema_migrations")).scalar() == migrations.LATEST_VERSION
+    assert postgres_manager._run_migrations() == []
+
+
+def test_a_failed_migration_stops_and_is_retried(postgres_manager):
+    from jules_bot.database import migrations
+    postgres_manager.bot_name = "main"
+    calls = []
+
+    def broken(db_manager, connection, inspector):
+        calls.append("broken")
+        raise RuntimeError("lock timeout")
+
+    steps = (migrations.Migration(1, "first", lambda *args: calls.append("first")),
+             migrations.Migration(2, "broken", broken),
+             migrations.Migration(3, "third", lambda *args: calls.append("third")))
+    with patch.object(migrations, "MIGRATIONS", steps):
+        assert postgres_manager._run_migrations() == [1]
+        assert calls == ["first", "broken"]
+
+        steps = steps[:1] + (migrations.Migration(2, "fixed", lambda *args: calls.append("fixed")),) + steps[2:]
+        with patch.object(migrations, "MIGRATIONS", steps):
+            assert postgres_manager._run_migrations() == [2, 3]
+    assert calls == ["first", "broken", "fixed", "third"]
@@ -0,0 +1,109 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from jules_bot.bot.api import router
+from jules_bot.database.engine_registry import instrument_engine
+from jules_bot.utils import profiling
+from jules_bot.utils.profiling import Profiler, TimingHistogram, format_summary, timed
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    profiler = Profiler(enabled=True, profiles_dir=str(tmp_path), label="test_bot")
+    with patch.object(profiling, "_profiler", profiler):
+        yield profiler
+
+
+def test_disabled_profiler_hands_out_a_shared_noop_timer():
+    profiler = Profiler(enabled=False)
+    first, second = profiler.timer("features"), profiler.timer("regime")
+    assert first is second
+    with first:
+        pass
+    assert profiler.summary() == {}
+
+
+def test_histogram_reports_percentiles_over_the_rolling_window():
+    histogram = TimingHistogram(window=100)
+    for ms in range(1, 201):
+        histogram.add(ms / 1000)
+    summary = histogram.summary()
+    assert summary["count"] == 200  # Lifetime count, while percentiles only see the last 100 samples.
+    assert summary["p50_ms"] == 150.0
+    assert summary["p95_ms"] == 195.0
+    assert summary["p99_ms"] == 199.0
+    assert summary["max_ms"] == 200.0
+
+
+def test_timed_decorator_records_each_call(profiler):
+    @timed("status.publish")
+    def publish(value):
+        return value * 2
+
+    assert publish(2) == 4
+    publish(3)
+    assert profiler.summary()["status.publish"]["count"] == 2
+    assert "status.publish" in format_summary(profiler.summary())
+
+
+def test_capture_profiles_the_requested_number_of_cycles(profiler):
+    profiler.start_capture(2, "cprofile")
+    with pytest.raises(ValueError):
+        profiler.start_capture(1)
+
+    for _ in range(2):
+        with profiler.cycle():
+            sum(range(1000))
+
+    status = profiler.capture_status()
+    assert status["active"] is None
+    assert status["last"]["cycles"] == 2
+    assert os.path.exists(status["last"]["path"])
+    assert status["last"]["path"].endswith(".prof")
+    assert profiler.summary()["cycle"]["count"] == 2
+
+
+@pytest.mark.parametrize("cycles, tool", [(0, "cprofile"), (5, "perf")])
+def test_capture_rejects_invalid_requests(profiler, cycles, tool):
+    with pytest.raises(ValueError):
+        profiler.start_capture(cycles, tool)
+
+
+def test_engine_statements_are_timed_as_reads_and_writes(profiler):
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+        conn.execute(text("SELECT x FROM t"))
+        with pytest.raises(Exception):
+            conn.execute(text("SELECT x FROM missing"))
+        assert conn.info["query_start_time"] == []
+
+    summary = profiler.summary()
+    assert summary["db.read"]["count"] == 1
+    assert summary["db.write"]["count"] == 2
+
+
+def test_api_toggles_timers_and_arms_captures(profiler):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    client = TestClient(app)
+
+    response = client.post("/api/profiling", json={"enabled": False})
+    assert response.json()["enabled"] is False
+    assert profiler.enabled is False
+
+    profiler.enable()
+    with profiler.timer("features"):
+        pass
+    report = client.get("/api/profiling").json()
+    assert set(report["timers"]["features"]) >= {"p50_ms", "p95_ms", "p99_ms"}
+
+    assert client.post("/api/profiling/capture", json={"cycles": 3}).json()["active"]["cycles"] == 3
+    assert client.post("/api/profiling/capture", json={"cycles": 3}).status_code == 400
@@ -0,0 +1,175 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from jules_bot.core.request_governor import (
+    RequestLane,
+    RequestShedError,
+    RequestWeightGovernor,
+    classify_request,
+    request_lane,
+)
+
+BASE = "https://api.binance.com/api/v3"
+
+
+class FakeClock:
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBinanceClient:
+    """
+    Mimics python-binance's `_request` entry point and the exchange's per-minute
+    weight accounting, including the used-weight header and 429 responses.
+    """
+    def __init__(self, clock, limit, external_weight=0):
+        self.clock = clock
+        self.limit = limit
+        self.window_id = None
+        self.server_used = 0
+        self.external_weight = external_weight
+        self.response = None
+        self.calls = []
+        self.rate_limited = 0
+
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        window_id = int(self.clock() // 60)
+        if window_id != self.window_id:
+            self.window_id = window_id
+            self.server_used = self.external_weight
+        _, weight = classify_request(method, uri, kwargs.get('data'))
+        self.server_used += weight
+        headers = {'x-mbx-used-weight-1m': str(self.server_used)}
+        if self.server_used > self.limit:
+            self.rate_limited += 1
+            headers['Retry-After'] = '30'
+            self.response = SimpleNamespace(status_code=429, headers=headers, text='{"code": -1003, "msg": "Too many requests"}')
+            raise BinanceAPIException(self.response, 429, self.response.text)
+        self.response = SimpleNamespace(status_code=200, headers=headers)
+        self.calls.append(uri.rsplit('/', 1)[-1])
+        return {}
+
+    # Thin wrappers matching the public client methods the bot uses.
+    def get_account(self):
+        return self._request('get', f"{BASE}/account", True, data={})
+
+    def get_symbol_ticker(self, symbol):
+        return self._request('get', f"{BASE}/ticker/price", False, data={'symbol': symbol})
+
+    def get_my_trades(self, symbol):
+        return self._request('get', f"{BASE}/myTrades", True, data={'symbol': symbol})
+
+    def order_market_sell(self, symbol, quantity):
+        return self._request('post', f"{BASE}/order", True, data={'symbol': symbol, 'quantity': quantity})
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_classify_request_lanes_and_weights():
+    assert classify_request('post', f"{BASE}/order", {'symbol': 'BTCUSDT'}) == (RequestLane.ORDERS, 1)
+    assert classify_request('get', f"{BASE}/myTrades", {'symbol': 'BTCUSDT'}) == (RequestLane.SYNC, 20)
+    assert classify_request('get', f"{BASE}/ticker/price", {'symbol': 'BTCUSDT'}) == (RequestLane.MARKET_DATA, 2)
+    assert classify_request('get', f"{BASE}/ticker/price", {}) == (RequestLane.MARKET_DATA, 4)
+
+
+def test_busy_period_sheds_ui_but_never_blocks_a_sell(clock):
+    governor = RequestWeightGovernor(weight_limit=100, clock=clock)
+    client = governor.attach(FakeBinanceClient(clock, limit=100))
+
+    shed = 0
+    for _ in range(10):
+        try:
+            with request_lane(RequestLane.UI):
+                client.get_account()
+        except RequestShedError:
+            shed += 1
+
+    # UI may only use 60% of the budget: three 20-weight account calls fit.
+    assert shed == 7
+    client.order_market_sell(symbol='BTCUSDT', quantity=0.01)
+    assert client.calls[-1] == 'order'
+    assert client.rate_limited == 0
+
+    metrics = governor.get_metrics()
+    assert metrics['ui']['admitted'] == 3
+    assert metrics['ui']['shed'] == 7
+    assert metrics['orders']['admitted'] == 1
+
+
+def test_server_header_accounts_for_weight_used_elsewhere(clock):
+    governor = RequestWeightGovernor(weight_limit=100, clock=clock)
+    # Another process on the same IP has already spent 70 weight this minute.
+    client = governor.attach(FakeBinanceClient(clock, limit=100, external_weight=70))
+
+    client.get_symbol_ticker(symbol='BTCUSDT')
+    assert governor.get_metrics()['used_weight'] == 72
+
+    with pytest.raises(RequestShedError):
+        with request_lane(RequestLane.UI):
+            client.get_symbol_ticker(symbol='BTCUSDT')
+    client.order_market_sell(symbol='BTCUSDT', quantity=0.01)
+    assert client.rate_limited == 0
+
+
+def test_sync_queues_until_the_window_rolls_over(clock):
+    governor = RequestWeightGovernor(weight_limit=100, clock=clock, poll_interval=0.01)
+    client = governor.attach(FakeBinanceClient(clock, limit=100))
+
+    for _ in range(3):
+        client.get_my_trades(symbol='BTCUSDT')
+    # 60 used; the next 20-weight sync page would exceed the 75% sync budget.
+    results = []
+    worker = threading.Thread(target=lambda: results.append(client.get_my_trades(symbol='BTCUSDT')))
+    worker.start()
+    time.sleep(0.05)
+    assert worker.is_alive()
+    assert governor.get_metrics()['sync']['queued'] == 1
+
+    clock.now = 61.0
+    worker.join(timeout=2)
+    assert not worker.is_alive()
+    assert results == [{}]
+    assert governor.get_metrics()['used_weight'] == 20
+
+
+def test_rate_limit_response_pauses_all_lanes(clock):
+    governor = RequestWeightGovernor(weight_limit=1000, clock=clock)
+    # The exchange is stricter than our configured budget, so we hit a 429.
+    client = governor.attach(FakeBinanceClient(clock, limit=30))
+
+    client.get_account()
+    with pytest.raises(BinanceAPIException):
+        client.get_account()
+
+    metrics = governor.get_metrics()
+    assert metrics['rate_limited_responses'] == 1
+    assert metrics['banned_for_seconds'] == 30
+
+    with pytest.raises(RequestShedError):
+        with request_lane(RequestLane.UI):
+            client.get_symbol_ticker(symbol='BTCUSDT')
+
+    # Once the ban and the exchange's minute window have both passed, traffic resumes.
+    clock.now = 61.0
+    client.get_symbol_ticker(symbol='BTCUSDT')
+    assert client.calls[-1] == 'price'
+
+
+def test_attach_is_idempotent(clock):
+    governor = RequestWeightGovernor(weight_limit=100, clock=clock)
+    client = FakeBinanceClient(clock, limit=100)
+    governor.attach(client)
+    governor.attach(client)
+
+    client.get_account()
+    assert governor.get_metrics()['market_data']['admitted'] == 1
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from jules_bot.services.status_channel import StatusChannelReader, StatusChannelWriter
+
+
+def _trade(i):
+    return {"trade_id": f"t{i}", "price": str(100 + i)}
+
+
+def _status(history, price="100.00", bot_status="RUNNING"):
+    return {
+        "bot_status": bot_status,
+        "current_btc_price": price,
+        "buy_signal_status": {"operating_mode": "ACCUMULATION", "reason": "waiting"},
+        "trade_history": history,
+    }
+
+
+def _read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / ".bot_status_test.jsonl")
+
+
+def test_only_changed_sections_are_appended(log_path):
+    writer = StatusChannelWriter(log_path)
+    assert writer.publish(_status([_trade(2), _trade(1)])) == 1
+    assert writer.publish(_status([_trade(2), _trade(1)])) is None
+    assert writer.publish(_status([_trade(2), _trade(1)], price="101.00")) == 2
+
+    lines = _read_lines(log_path)
+    assert [line["type"] for line in lines] == ["snapshot", "delta"]
+    assert lines[1]["sections"] == {"current_btc_price": "101.00"}
+    assert lines[1]["windows"] == {}
+
+
+def test_newest_first_lists_are_sent_as_window_patches(log_path):
+    writer = StatusChannelWriter(log_path)
+    writer.publish(_status([_trade(3), _trade(2), _trade(1)]))
+    # A new trade arrives and the oldest one falls out of the limited history.
+    writer.publish(_status([_trade(4), _trade(3), _trade(2)]))
+
+    delta = _read_lines(log_path)[-1]
+    assert delta["sections"] == {}
+    assert delta["windows"] == {"trade_history": {"head": [_trade(4)], "keep": 2}}
+
+    reader = StatusChannelReader(log_path)
+    reader.poll()
+    assert reader.state["trade_history"] == [_trade(4), _trade(3), _trade(2)]
+
+
+def test_reader_applies_only_new_entries(log_path):
+    writer = StatusChannelWriter(log_path)
+    reader = StatusChannelReader(log_path)
+    writer.publish(_status([_trade(1)]))
+
+    assert reader.poll() == {"bot_status", "current_btc_price", "buy_signal_status", "trade_history"}
+    assert reader.poll() is None
+
+    writer.update_sections({"bot_status": "SYNCHRONIZING..."})
+    writer.publish(_status([_trade(2), _trade(1)], bot_status="RUNNING"))
+    assert reader.poll() == {"bot_status", "trade_history"}
+    assert reader.state == _status([_trade(2), _trade(1)])
+    assert reader.seq == writer.seq == 3
+    assert reader.resync_count == 1
+
+
+def test_reader_ignores_a_partially_written_line(log_path):
+    writer = StatusChannelWriter(log_path)
+    reader = StatusChannelReader(log_path)
+    writer.publish(_status([]))
+    reader.poll()
+
+    with open(log_path, "a") as f:
+        f.write('{"seq":2,"epoch":"')
+    assert reader.poll() is None
+    assert reader.seq == 1
+
+
+def test_reader_resyncs_after_compaction_and_restart(log_path):
+    writer = StatusChannelWriter(log_path, compact_after_bytes=1)
+    reader = StatusChannelReader(log_path)
+    writer.publish(_status([_trade(1)]))
+    reader.poll()
+
+    # Every publish now replaces the log with a fresh snapshot.
+    writer.publish(_status([_trade(1)], price="105.00"))
+    assert [line["type"] for line in _read_lines(log_path)] == ["snapshot"]
+    reader.poll()
+    assert reader.state["current_btc_price"] == "105.00"
+    assert reader.resync_count == 2
+
+    # A restarted bot starts a new epoch at sequence 1.
+    restarted = StatusChannelWriter(log_path)
+    restarted.publish(_status([], price="99.00"))
+    reader.poll()
+    assert reader.epoch == restarted.epoch
+    assert reader.state["trade_history"] == []
+
+
+def test_reader_resyncs_on_sequence_gap(log_path):
+    writer = StatusChannelWriter(log_path)
+    reader = StatusChannelReader(log_path)
+    writer.publish(_status([]))
+    reader.poll()
+    writer.publish(_status([], price="101.00"))
+    reader.seq = 0  # Simulate a missed entry.
+
+    changed = reader.poll()
+    assert reader.resync_count == 2
+    assert changed == set(reader.state)
+    assert reader.state["current_btc_price"] == "101.00"
@@ -0,0 +1,77 @@
+import threading
+import time
+from decimal import Decimal
+
+from jules_bot.services.status_publisher import CycleSnapshot, StatusPublisher
+
+
+def make_snapshot(price):
+    return CycleSnapshot(
+        market_data={'close': price}, current_price=Decimal(str(price)), current_regime=1,
+        current_params={}, open_positions=[], portfolio_value=Decimal('0'), cash_balance=Decimal('0'),
+        invested_value=Decimal('0'), decision_reason="", operating_mode="", difficulty_factor=Decimal('0'),
+    )
+
+
+def test_only_the_latest_pending_snapshot_is_published():
+    published = []
+    publisher = StatusPublisher(published.append)
+
+    publisher.submit(make_snapshot(100))
+    publisher.submit(make_snapshot(101))
+    assert publisher.publish_pending() is True
+    assert publisher.publish_pending() is False
+
+    assert [s.current_price for s in published] == [Decimal('101')]
+
+
+def test_publish_errors_do_not_propagate():
+    def failing_publish(snapshot):
+        raise RuntimeError("disk full")
+
+    publisher = StatusPublisher(failing_publish)
+    publisher.submit(make_snapshot(100))
+    assert publisher.publish_pending() is True
+
+
+def test_forced_submit_is_published_by_the_thread_without_waiting_for_the_interval():
+    published = threading.Event()
+    publisher = StatusPublisher(lambda snapshot: published.set(), interval_seconds=60)
+    publisher.start()
+    try:
+        # The first publish is never delayed; the interval only applies between publishes.
+        publisher.submit(make_snapshot(100))
+        assert published.wait(timeout=2)
+        published.clear()
+
+        publisher.submit(make_snapshot(101), force=True)
+        assert published.wait(timeout=2)
+    finally:
+        publisher.stop()
+
+
+def test_request_refresh_republishes_the_last_snapshot():
+    published = []
+    publisher = StatusPublisher(published.append)
+    publisher.submit(make_snapshot(100))
+    publisher.publish_pending()
+
+    publisher.request_refresh()
+    publisher.publish_pending()
+
+    assert [s.current_price for s in published] == [Decimal('100'), Decimal('100')]
+
+
+def test_submit_does_not_block_on_a_slow_publish():
+    release = threading.Event()
+    publisher = StatusPublisher(lambda snapshot: release.wait(timeout=2), interval_seconds=0)
+    publisher.start()
+    try:
+        publisher.submit(make_snapshot(100), force=True)
+        time.sleep(0.05)
+        started = time.monotonic()
+        publisher.submit(make_snapshot(101))
+        assert time.monotonic() - started < 0.1
+    finally:
+        release.set()
+        publisher.stop()
@@ -60,7 +60,12 @@ class TestStatusService(unittest.TestCase):
         trade1 = Trade(trade_id="open-trade-1", price=50000, quantity=0.1, sell_target_price=55000, timestamp=now, usd_value=Decimal("5000.0"))
         trade2 = Trade(trade_id="open-trade-2", price=48000, quantity=0.2, sell_target_price=50000, timestamp=now, usd_value=Decimal("9600.0"))
         self.db_manager.get_open_positions.return_value = [trade1, trade2]
-        self.db_manager.get_all_trades_in_range.return_value = [] # Not the focus of this test
+        self.db_manager.get_trade_rows.return_value = [] # Not the focus of this test
+        self.db_manager.get_recent_trades.return_value = []
+        self.db_manager.get_realized_pnl_summary.return_value = {
+            "sell_count": 0, "realized_pnl_usd": Decimal("0"),
+            "realized_pnl_btc": Decimal("0"), "hodl_asset_amount": Decimal("0")
+        }
 
         # Arrange: Mock the new get_bot_status call
         mock_status = MagicMock()
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_candles
+from jules_bot.backtesting.equity import EquityCurve
+
+
+def _values(days=3, seed=5):
+    index = pd.date_range('2024-01-01', periods=days * 1440, freq='1min')
+    values = 1000 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.001, len(index))))
+    series = pd.Series(values, index=index)
+    # A day without candles, as after a gap in the candle store.
+    return series[(series.index < '2024-01-02') | (series.index >= '2024-01-03')]
+
+
+def _record(series, downsample=1):
+    curve = EquityCurve(downsample=downsample, capacity=16)
+    for timestamp, value in series.items():
+        curve.append(timestamp, float(value))
+    return curve
+
+
+def test_equity_curve_matches_the_pandas_metrics():
+    series = _values()
+    curve = _record(series)
+
+    peak = series.expanding(min_periods=1).max()
+    assert curve.max_drawdown == abs(((series - peak) / peak).min())
+    pd.testing.assert_series_equal(curve.daily_values(), series.resample('D').last(), check_names=False, check_freq=False)
+    pd.testing.assert_series_equal(curve.to_series(), series, check_names=False, check_freq=False)
+    assert (curve.first_timestamp, curve.last_timestamp) == (series.index[0], series.index[-1])
+
+
+def test_downsampled_equity_curve_keeps_exact_metrics():
+    series = _values()
+    full, sparse = _record(series), _record(series, downsample=7)
+
+    stored = sparse.to_series()
+    assert len(sparse) == len(series)
+    assert len(stored) == len(series[::7]) + 1
+    assert stored.index[-1] == series.index[-1]
+    assert sparse.nbytes < full.nbytes
+    assert sparse.max_drawdown == full.max_drawdown
+    pd.testing.assert_series_equal(sparse.daily_values(), full.daily_values())
+
+
+def _candle_store(candles):
+    """A db_manager whose get_price_data slices `candles` like the SQL range query."""
+    db_manager = MagicMock()
+    db_manager.get_price_data.side_effect = lambda measurement, start_date, end_date: \
+        candles.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)].copy()
+    db_manager.get_trades_frame.return_value = pd.DataFrame()
+    return db_manager
+
+
+def test_chunked_features_match_the_full_range():
+    pytest.importorskip("pandas_ta")
+    from jules_bot.backtesting.streaming import iter_feature_chunks
+    from jules_bot.bot.situational_awareness import SituationalAwareness
+    from jules_bot.research.feature_dtypes import FeatureDtypePolicy
+    from jules_bot.research.feature_engineering import add_all_features
+
+    candles = generate_candles(4, seed=3)
+    expected = SituationalAwareness().transform(add_all_features(candles, live_mode=False).dropna())
+
+    db_manager = _candle_store(candles)
+    chunks = list(iter_feature_chunks(db_manager, "BTCUSDT", candles.index[0], candles.index[-1],
+                                      chunk=timedelta(days=1), warmup=timedelta(days=1),
+                                      dtype_policy=FeatureDtypePolicy()))
+
+    assert len(chunks) == 4
+    streamed = pd.concat(chunks)
+    pd.testing.assert_index_equal(streamed.index, expected.index)
+    # Past the first warm-up the exponential indicators have converged to the full-range values.
+    settled = expected.index >= candles.index[0] + timedelta(days=1)
+    for column in ('ema_20', 'ema_100', 'bbl_20_2_0', 'atr_14', 'macd_diff_12_26_9', 'cvd'):
+        np.testing.assert_allclose(streamed.loc[settled, column], expected.loc[settled, column], rtol=1e-9, atol=1e-9)
+    assert (streamed['market_regime'][settled] == expected['market_regime'][settled]).all()
+
+
+def test_streaming_backtest_matches_the_in_memory_run():
+    pytest.importorskip("pandas_ta")
+    from jules_bot.backtesting.engine import Backtester
+    from jules_bot.backtesting.streaming import iter_feature_chunks
+
+    candles = generate_candles(4, seed=3)
+    db_manager = _candle_store(candles)
+    # Both runs see the same (streamed) features, so only the chunked simulation differs.
+    data = pd.concat(iter_feature_chunks(db_manager, "BTCUSDT", candles.index[0], candles.index[-1]))
+
+    def run(**kwargs):
+        logged = []
+        backtester = Backtester(db_manager=db_manager, **kwargs)
+        backtester._log_trades_to_db = logged.extend
+        db_manager.get_trades_frame.side_effect = lambda **_: pd.DataFrame([trade.to_dict() for trade in logged])
+        return backtester, backtester.run(return_full_results=True)
+
+    in_memory, expected = run(data=data)
+    streamed, result = run(start_date=str(candles.index[0].date()), end_date=str(candles.index[-1].date()),
+                           stream=True, chunk_days=1, equity_downsample=60)
+
+    assert len(streamed.equity_curve) == len(in_memory.equity_curve) == len(data)
+    assert len(streamed.equity_curve.to_series()) == len(data[::60]) + 1
+    for key in ('buy_trades_count', 'sell_trades_count', 'open_positions_count'):
+        assert result[key] == expected[key]
+    for key in ('final_balance', 'total_realized_pnl', 'max_drawdown', 'sharpe_ratio', 'sortino_ratio'):
+        assert float(result[key]) == pytest.approx(float(expected[key]), rel=1e-9)
@@ -4,7 +4,7 @@ from decimal import Decimal
 import datetime
 import uuid
 
-from jules_bot.bot.synchronization_manager import SynchronizationManager
+from jules_bot.bot.synchronization_manager import SynchronizationManager, FifoLotBook
 from jules_bot.database.models import Trade
 
 # Reusable mock trade data from Binance API
@@ -66,18 +66,19 @@ def test_run_full_sync_adopts_new_buy(sync_manager, mock_db_manager):
     sync_manager.db.get_all_trades_for_sync.return_value = [] # Empty local DB
     sync_manager.client.get_my_trades.return_value = [MOCK_BINANCE_BUY]
     
-    with patch.object(sync_manager.trade_logger, 'log_trade') as mock_log_trade:
-        # Act
-        sync_manager.run_full_sync()
-        
-        # Assert: A new position should be created
-        mock_log_trade.assert_called_once()
-        call_args = mock_log_trade.call_args[0][0]
-        assert call_args['order_type'] == 'buy'
-        assert call_args['status'] == 'OPEN'
-        assert call_args['binance_trade_id'] == MOCK_BINANCE_BUY['id']
-
-@patch('jules_bot.bot.synchronization_manager.SynchronizationManager._reconcile_external_sell')
+    # Act
+    sync_manager.run_full_sync()
+    
+    # Assert: A new position should be created in a single batch write
+    sync_manager.db.bulk_apply_sync_changes.assert_called_once()
+    new_records, updates = sync_manager.db.bulk_apply_sync_changes.call_args[0]
+    assert len(new_records) == 1
+    assert new_records[0]['order_type'] == 'buy'
+    assert new_records[0]['status'] == 'OPEN'
+    assert new_records[0]['binance_trade_id'] == MOCK_BINANCE_BUY['id']
+    assert updates == {}
+
+@patch('jules_bot.bot.synchronization_manager.SynchronizationManager._reconcile_external_sell', return_value=[])
 def test_run_full_sync_triggers_reconciliation_for_external_sell(mock_reconcile_method, sync_manager, mock_db_manager):
     # Arrange: DB has an open buy, Binance has a new sell.
     mock_db_buy = create_mock_db_trade(MOCK_BINANCE_BUY['id'], '1.0', '1.0')
@@ -88,51 +89,79 @@ def test_run_full_sync_triggers_reconciliation_for_external_sell(mock_reconcile_
     sync_manager.run_full_sync()
 
     # Assert: The reconciliation method for external sells should be called.
-    mock_reconcile_method.assert_called_once_with(MOCK_BINANCE_SELL, ANY)
+    mock_reconcile_method.assert_called_once_with(MOCK_BINANCE_SELL, ANY, ANY)
 
 def test_reconcile_external_sell_partial_sell(sync_manager, mock_db_manager):
     # Arrange: One open buy of 1.0 BTC, external sell of 0.5 BTC.
     mock_db_buy = create_mock_db_trade(MOCK_BINANCE_BUY['id'], '1.0', '1.0')
-    sync_manager.db.get_open_positions.return_value = [mock_db_buy]
+    lot_book = FifoLotBook.from_trades([mock_db_buy])
     
     sync_manager.strategy_rules.calculate_realized_pnl.return_value = Decimal('1000')
     
-    with patch.object(sync_manager.trade_logger, 'log_trade') as mock_log_trade:
-        # Act
-        sync_manager._reconcile_external_sell(MOCK_BINANCE_SELL, {'BTCUSDT': '52000'})
-
-        # Assert
-        mock_log_trade.assert_called_once()
-        sell_call_args = mock_log_trade.call_args[0][0]
-        assert sell_call_args['order_type'] == 'sell'
-        assert sell_call_args['linked_trade_id'] == mock_db_buy.trade_id
-        assert sell_call_args['quantity'] == Decimal(MOCK_BINANCE_SELL['qty'])
-        assert sell_call_args['realized_pnl_usd'] == Decimal('1000')
-
-        sync_manager.db.update_trade.assert_called_once()
-        update_call_args = sync_manager.db.update_trade.call_args[0]
-        assert update_call_args[0] == mock_db_buy.trade_id
-        update_payload = update_call_args[1]
-        assert 'status' not in update_payload
-        assert update_payload['remaining_quantity'] == Decimal('0.5')
+    # Act
+    sell_records = sync_manager._reconcile_external_sell(MOCK_BINANCE_SELL, {'BTCUSDT': '52000'}, lot_book)
+    sync_manager._flush_sync_batch(sell_records, lot_book)
+
+    # Assert
+    assert len(sell_records) == 1
+    sell_call_args = sell_records[0]
+    assert sell_call_args['order_type'] == 'sell'
+    assert sell_call_args['linked_trade_id'] == mock_db_buy.trade_id
+    assert sell_call_args['quantity'] == Decimal(MOCK_BINANCE_SELL['qty'])
+    assert sell_call_args['realized_pnl_usd'] == Decimal('1000')
+
+    sync_manager.db.get_open_positions.assert_not_called()
+    sync_manager.db.update_trade.assert_not_called()
+    sync_manager.db.bulk_apply_sync_changes.assert_called_once()
+    _, updates = sync_manager.db.bulk_apply_sync_changes.call_args[0]
+    update_payload = updates[mock_db_buy.trade_id]
+    assert 'status' not in update_payload
+    assert update_payload['remaining_quantity'] == Decimal('0.5')
 
 def test_reconcile_external_sell_full_sell(sync_manager, mock_db_manager):
     # Arrange: One open buy of 0.5 BTC, external sell of 0.5 BTC.
     mock_db_buy = create_mock_db_trade(MOCK_BINANCE_BUY['id'], '0.5', '0.5')
-    sync_manager.db.get_open_positions.return_value = [mock_db_buy]
+    lot_book = FifoLotBook.from_trades([mock_db_buy])
     sync_manager.strategy_rules.calculate_realized_pnl.return_value = Decimal('1000')
     
-    with patch.object(sync_manager.trade_logger, 'log_trade'):
-        # Act
-        sync_manager._reconcile_external_sell(MOCK_BINANCE_SELL, {'BTCUSDT': '52000'})
-
-        # Assert: The original buy trade is updated and marked as CLOSED.
-        sync_manager.db.update_trade.assert_called_once()
-        update_call_args = sync_manager.db.update_trade.call_args[0]
-        assert update_call_args[0] == mock_db_buy.trade_id
-        update_payload = update_call_args[1]
-        assert update_payload['status'] == 'CLOSED'
-        assert update_payload['remaining_quantity'] <= Decimal('1e-8')
+    # Act
+    sell_records = sync_manager._reconcile_external_sell(MOCK_BINANCE_SELL, {'BTCUSDT': '52000'}, lot_book)
+    sync_manager._flush_sync_batch(sell_records, lot_book)
+
+    # Assert: The original buy trade is updated and marked as CLOSED.
+    _, updates = sync_manager.db.bulk_apply_sync_changes.call_args[0]
+    update_payload = updates[mock_db_buy.trade_id]
+    assert update_payload['status'] == 'CLOSED'
+    assert update_payload['remaining_quantity'] <= Decimal('1e-8')
+
+def test_reconcile_external_sell_without_open_lots_is_unlinked(sync_manager, mock_db_manager):
+    sell_records = sync_manager._reconcile_external_sell(MOCK_BINANCE_SELL, {'BTCUSDT': '52000'}, FifoLotBook())
+
+    assert len(sell_records) == 1
+    assert sell_records[0]['linked_trade_id'] is None
+    assert sell_records[0]['decision_context'] == {'reason': 'sync_unlinked_sell'}
+
+def test_fifo_lot_book_consumes_oldest_lots_first():
+    older = create_mock_db_trade(1, '1.0', '0.4')
+    newer = create_mock_db_trade(2, '2.0', '2.0')
+    newer.timestamp = older.timestamp + datetime.timedelta(hours=1)
+    # Insertion order must not matter, only timestamps.
+    book = FifoLotBook.from_trades([newer, older])
+
+    matches = book.consume(Decimal('1.0'))
+
+    assert [(lot.trade_id, qty) for lot, qty in matches] == [
+        (older.trade_id, Decimal('0.4')),
+        (newer.trade_id, Decimal('0.6')),
+    ]
+    assert matches[0][0].is_closed
+    assert matches[1][0].remaining_quantity == Decimal('1.4')
+    assert not book.is_empty()
+
+    # Over-selling leaves the excess unmatched and the book empty.
+    matches = book.consume(Decimal('5'))
+    assert sum(qty for _, qty in matches) == Decimal('1.4')
+    assert book.is_empty()
 
 @patch('jules_bot.bot.synchronization_manager.logger.warning')
 def test_final_balance_sanity_check_logs_warning_on_discrepancy(mock_logger, sync_manager, mock_db_manager):
@@ -201,11 +230,18 @@ def test_run_full_sync_from_scratch_complex_scenario(sync_manager, mock_db_manag
             for key, value in payload.items():
                 setattr(db_storage[trade_id], key, value)
 
+    def mock_bulk_apply_sync_changes(new_trades, trade_updates):
+        for trade_data in new_trades:
+            mock_log_trade(trade_data)
+            if 'remaining_quantity' in trade_data:
+                db_storage[trade_data['trade_id']].remaining_quantity = trade_data['remaining_quantity']
+        for trade_id, payload in trade_updates.items():
+            mock_update_trade(trade_id, payload)
+
     # Patch the methods
-    sync_manager.trade_logger.log_trade = mock_log_trade
     sync_manager.db.get_all_trades_for_sync.return_value = [] # Start with empty DB
     sync_manager.db.get_open_positions.side_effect = mock_get_open_positions
-    sync_manager.db.update_trade.side_effect = mock_update_trade
+    sync_manager.db.bulk_apply_sync_changes.side_effect = mock_bulk_apply_sync_changes
 
     # ACT
     sync_manager.run_full_sync()
@@ -275,5 +311,9 @@ def test_run_full_sync_from_scratch_complex_scenario(sync_manager, mock_db_manag
     # Check PnL was calculated on all of them
     assert all(s.realized_pnl_usd is not None for s in final_sells)
     
+    # Everything was written in a single batch, without per-sell reloads
+    sync_manager.db.bulk_apply_sync_changes.assert_called_once()
+    sync_manager.db.update_trade.assert_not_called()
+
     # Final sanity check should not log a warning
     sync_manager.client.get_account.assert_called_once()
@@ -0,0 +1,107 @@
+import io
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from collectors.agg_trades_collector import parse_agg_trades_csv
+from jules_bot.backtesting.tick_replay import AggTradeStore, price_for_pnl, position_levels, replay_path
+from jules_bot.core_logic.strategy_rules import StrategyRules
+from jules_bot.utils.config_manager import ConfigManager
+
+DAY = pd.Timestamp('2024-01-01')
+
+
+def test_store_round_trip_and_dedupe(tmp_path):
+    store = AggTradeStore(tmp_path, "BTCUSDT")
+    times = DAY.value + np.array([61, 5, 60, 62, 120], dtype=np.int64) * 10 ** 9
+    store.save_day(DAY, times, np.array([101.0, 100.0, 101.0, 101.0, 102.0]))
+
+    # Unsorted input is stored by time; the repeated 101.0 collapses to one trade.
+    np.testing.assert_array_equal(store.prices(DAY + pd.Timedelta(minutes=1), DAY + pd.Timedelta(minutes=2)), [101.0])
+    np.testing.assert_array_equal(store.prices(DAY, DAY + pd.Timedelta(minutes=1)), [100.0])
+    assert store.prices(DAY + pd.Timedelta(days=1), DAY + pd.Timedelta(days=1, minutes=1)) is None
+
+
+def test_csv_with_header_and_microsecond_times():
+    ms = "1,42000.5,0.1,1,1,1704067200000,True,True\n2,42001.0,0.2,2,3,1704067200500,False,True\n"
+    us = ("agg_trade_id,price,quantity,first_trade_id,last_trade_id,transact_time,is_buyer_maker,is_best_match\n"
+          "1,42000.5,0.1,1,1,1704067200000000,True,True\n")
+
+    times, prices = parse_agg_trades_csv(io.StringIO(ms))
+    np.testing.assert_array_equal(times, [1704067200000 * 10 ** 6, 1704067200500 * 10 ** 6])
+    np.testing.assert_array_equal(prices, [42000.5, 42001.0])
+    times, prices = parse_agg_trades_csv(io.StringIO(us))
+    np.testing.assert_array_equal(times, [1704067200000000 * 10 ** 3])
+    np.testing.assert_array_equal(prices, [42000.5])
+
+
+def test_levels_invert_the_strategy_pnl():
+    rules = StrategyRules(ConfigManager())
+    position = {'price': Decimal('100'), 'quantity': Decimal('0.5'), 'commission_usd': Decimal('0.05'),
+                'sell_target_price': Decimal('103'), 'is_smart_trailing_active': True,
+                'smart_trailing_highest_profit': Decimal('1'), 'current_trail_percentage': Decimal('0.2')}
+
+    price = price_for_pnl(position, Decimal('0.8'), rules.commission_rate)
+    pnl = rules.calculate_net_unrealized_pnl(entry_price=position['price'], current_price=price,
+                                             total_quantity=position['quantity'], buy_commission_usd=position['commission_usd'])
+    assert pnl == pytest.approx(Decimal('0.8'), abs=Decimal('1e-12'))
+    assert price in position_levels(position, rules)
+    assert Decimal('103') in position_levels(position, rules)
+
+
+def test_replay_path_buy_points():
+    prices = np.array([100.0, 99.0, 97.5, 98.0, 99.5])
+    path, buy_points, intrabar = replay_path(prices, Decimal('99.5'), Decimal('98'))
+
+    assert path == [Decimal('100.0'), Decimal('99.0'), Decimal('97.5'), Decimal('98.0'), Decimal('99.5')]
+    assert buy_points == [2, 4]
+    assert intrabar == {2: {'close': 97.5, 'high': 100.0, 'low': 97.5}}
+    # Without a touch of the target only the close is evaluated, and the path always ends at the close.
+    path, buy_points, intrabar = replay_path(prices[:2], Decimal('99.5'), Decimal('90'))
+    assert (path[-1], buy_points, intrabar) == (Decimal('99.5'), [2], {})
+
+
+def _dense_trades(store, data, steps=10):
+    """Trades walking each candle's OHLC path in `steps` equal moves per leg."""
+    for day, candles in data.groupby(data.index.normalize()):
+        times, prices = [], []
+        for timestamp, candle in candles.iterrows():
+            # The engine's own path: O, L, H, C for up candles and O, H, L, C for down candles.
+            extremes = ['low', 'high'] if candle['close'] >= candle['open'] else ['high', 'low']
+            points = [candle['open'], *(candle[column] for column in extremes), candle['close']]
+            walk = np.concatenate([np.linspace(a, b, steps, endpoint=False) for a, b in zip(points, points[1:])] + [[points[-1]]])
+            times.append(timestamp.value + np.linspace(0, 59e9, len(walk)).astype(np.int64))
+            prices.append(walk)
+        store.save_day(day, np.concatenate(times), np.concatenate(prices))
+
+
+def test_replayed_sells_fill_inside_the_candle(tmp_path, feature_frame):
+    pytest.importorskip("pandas_ta")
+    from jules_bot.backtesting.engine import Backtester
+
+    data = feature_frame()
+    store = AggTradeStore(tmp_path, "BTCUSDT")
+    _dense_trades(store, data)
+    db_manager = MagicMock()
+
+    backtester = Backtester(db_manager=db_manager, data=data.copy(), tick_replay=False)
+    backtester.tick_store = store
+    logged = []
+    backtester._log_trades_to_db = logged.extend
+    db_manager.get_trades_frame.side_effect = lambda **_: pd.DataFrame([trade.to_dict() for trade in logged])
+    backtester.run(return_full_results=True)
+
+    slippage = float(backtester.mock_trader.slippage_rate)
+    sells = [trade for trade in logged if trade.order_type == 'sell']
+    assert sells
+    inside = 0
+    for trade in sells:
+        candle = data.loc[trade.timestamp]
+        fill = float(trade.price) / (1 - slippage)
+        assert candle['low'] - 1e-6 <= fill <= candle['high'] + 1e-6
+        inside += not any(abs(fill - candle[column]) < 1e-6 for column in ('open', 'high', 'low', 'close'))
+    # Sells that fired mid-leg fill at the first trade past their level, not at a candle extreme.
+    assert inside > 0
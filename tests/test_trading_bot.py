@@ -271,3 +271,62 @@ class TestSmartTrailingStop:
         mock_state_manager.update_trade_smart_trailing_state.assert_called_once_with(
             trade_id='test_trade_4', is_active=True, highest_profit=new_highest_profit
         )
+
+
+def test_force_buy_and_sell_feed_the_difficulty_tracker():
+    """Manual API trades move the buy streak just like the bot's own trades."""
+    from jules_bot.bot.trading_bot import TradingBot
+
+    bot = TradingBot.__new__(TradingBot)
+    bot.run_id, bot.symbol, bot.min_trade_size = 'test_bot', 'BTCUSDT', Decimal('10')
+    bot.trader, bot.state_manager, bot.strategy_rules = MagicMock(), MagicMock(), MagicMock()
+    bot.strategy_rules.calculate_realized_pnl.return_value = Decimal('0.9')
+    bot.capital_manager = MagicMock()
+    bot._update_status_file = MagicMock()
+    bot.trader.execute_buy.return_value = (True, {'price': '50000', 'quantity': '0.001'})
+    bot.trader.execute_sell.return_value = (True, {'price': '51000', 'commission_usd': '0.05'})
+    bot.trader.min_qty, bot.trader.min_notional = None, Decimal('5')
+    bot.trader.get_current_price.return_value = '51000'
+    position = Trade(trade_id='1', symbol='BTCUSDT', quantity=Decimal('0.001'), remaining_quantity=Decimal('0.001'),
+                     price=Decimal('50000'), commission_usd=Decimal('0.05'), status='OPEN')
+    bot.state_manager.get_open_positions.return_value = [position]
+
+    assert bot.process_force_buy('50')['status'] == 'success'
+    assert bot.process_force_sell('1', '100%')['status'] == 'success'
+
+    recorded = [c.args[0] for c in bot.capital_manager.difficulty_tracker.record_trade.call_args_list]
+    assert recorded == ['buy', 'sell']
+
+
+def test_skipped_cycle_waits_outside_the_cycle_timer(tmp_path):
+    """A cycle skipped for missing features records its own work under 'cycle', not the 10 s wait after it."""
+    import datetime
+    import pandas as pd
+    from jules_bot.bot.trading_bot import TradingBot
+    from jules_bot.utils import profiling
+
+    bot = TradingBot.__new__(TradingBot)
+    bot.mode, bot.symbol, bot.bot_name, bot.run_id, bot.api_port = 'test', 'BTCUSDT', 'test_bot', 'run-1', 0
+    for name in ('trader', 'sync_manager', 'state_manager', 'strategy_rules', 'sa_instance', 'dynamic_params',
+                 'status_service', 'status_publisher', 'feature_calculator', 'api_app'):
+        setattr(bot, name, MagicMock())
+    bot._update_sync_status_file = bot._reload_difficulty_tracker = bot._check_and_handle_refresh_signal = MagicMock()
+    bot.is_running, bot.last_sync_time = True, datetime.datetime.now()
+    bot.feature_calculator.get_features_dataframe.return_value = pd.DataFrame()
+
+    clock = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+        bot.is_running = False
+
+    profiler = profiling.Profiler(enabled=True, profiles_dir=str(tmp_path), label="test_bot")
+    with patch.object(profiling, "_profiler", profiler), \
+         patch('jules_bot.bot.trading_bot.uvicorn'), patch('jules_bot.bot.trading_bot.threading'), \
+         patch('time.sleep', fake_sleep), patch('time.perf_counter', lambda: clock[0]):
+        bot.run()
+
+    assert sleeps == [10]
+    assert profiler.summary()["cycle"]["max_ms"] < 1000
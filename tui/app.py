@@ -28,8 +28,20 @@ import pytz
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 SUDO_PREFIX = ["sudo"] if os.name != "nt" else []
 
+HISTORY_PAGE_SIZE = 100
+HISTORY_PREFETCH_ROWS = 20
+HISTORY_MAX_RELOAD_ROWS = 500
+# Maps history table columns to the API's server-side sort keys (None: not sortable).
+HISTORY_SORT_KEY_MAP = {
+    "Timestamp": "timestamp", "Symbol": "symbol", "Type": "order_type", "Status": "status",
+    "Buy Price": "price", "Sell Price": "sell_price", "Quantity": "quantity",
+    "USD Value": "usd_value", "PnL (USD)": "realized_pnl_usd", "PnL (%)": None,
+    "Trade ID": "trade_id"
+}
+
 from jules_bot.utils.config_manager import config_manager
 from jules_bot.utils.logger import logger
+from jules_bot.services.status_channel import StatusChannelReader, status_log_path
 
 class NumberValidator(Validator):
     def validate(self, value: str) -> ValidationResult:
@@ -40,9 +52,11 @@ class NumberValidator(Validator):
             return self.failure("Invalid number format.")
 
 class DashboardData(Message):
-    def __init__(self, data: dict | str, success: bool) -> None:
+    def __init__(self, data: dict | str, success: bool, changed: set | None = None) -> None:
         self.data = data
         self.success = success
+        # Names of the status sections that changed; None means treat everything as changed.
+        self.changed = changed
         super().__init__()
 
 class CommandOutput(Message):
@@ -58,11 +72,14 @@ class ProcessedPositionsData(Message):
         self.summary_text = summary_text
         super().__init__()
 
-class ProcessedHistoryData(Message):
-    """Carries processed trade history data from the worker."""
-    def __init__(self, sorted_history: list, summary_text: str) -> None:
-        self.sorted_history = sorted_history
+class HistoryPageData(Message):
+    """Carries one page of trade history fetched from the bot's API."""
+    def __init__(self, trades: list, next_cursor: str | None, summary_text: str | None, append: bool, request_id: int) -> None:
+        self.trades = trades
+        self.next_cursor = next_cursor
         self.summary_text = summary_text
+        self.append = append
+        self.request_id = request_id
         super().__init__()
 
 class StatusIndicator(Static):
@@ -114,13 +131,18 @@ class TUIApp(App):
         self.log_filter = ""
         self.open_positions_data = []
         self._last_positions_data: str | None = None
-        self.trade_history_data = []
-        self._last_history_data: str | None = None
+        # Trade history is paged from the bot's API; only a change marker comes with the status.
+        self._last_history_marker: tuple | None = None
+        self.history_next_cursor: str | None = None
+        self.history_loading = False
+        self._history_request_id = 0
         self.positions_sort_column = "Unrealized PnL"
         self.positions_sort_reverse = True
         self.history_sort_column = "Timestamp"
         self.history_sort_reverse = True
         self.history_filter = "all"
+        # Assumes the TUI is run from the project root, like the bot writing the log.
+        self.status_reader = StatusChannelReader(status_log_path(self.bot_name))
 
     def compose(self) -> ComposeResult:
         yield CustomHeader()
@@ -314,103 +336,66 @@ class TUIApp(App):
             # Log the error or post an error message back to the main thread
             self.call_from_thread(self.log_display.write, f"[bold red]Error in positions worker: {e}[/]")
 
-    @work(thread=True)
-    def process_history_worker(self, history_data: list, history_filter: str, start_date_str: str, end_date_str: str, sort_column: str, sort_reverse: bool) -> None:
-        """Processes, filters, and sorts trade history data in a background thread."""
+    @work(thread=True, group="history")
+    def fetch_history_page_worker(self, params: dict, append: bool, request_id: int) -> None:
+        """Fetches one page of the filtered, sorted trade history from the bot's API."""
+        url = f"http://localhost:{self.host_port}/api/trade_history"
         try:
-            # --- Filtering ---
-            if history_filter == 'open':
-                status_filtered_trades = [t for t in history_data if t.get('status') == 'OPEN']
-            elif history_filter == 'closed':
-                status_filtered_trades = [t for t in history_data if t.get('status') == 'CLOSED']
-            else:
-                status_filtered_trades = history_data
-            
-            # --- Additional Filtering for Closed Buys ---
-            # Remove closed buy orders as they are represented by the sell record
-            status_filtered_trades = [
-                t for t in status_filtered_trades
-                if not (t.get('order_type') == 'buy' and t.get('status') == 'CLOSED')
-            ]
-
-            final_filtered_history = []
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date() if start_date_str else None
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date() if end_date_str else None
-            for trade in status_filtered_trades:
-                trade_date = datetime.fromisoformat(trade['timestamp']).date()
-                if (start_date and trade_date < start_date) or (end_date and trade_date > end_date):
-                    continue
-                final_filtered_history.append(trade)
-
-            # --- Summary Calculation ---
-            total_trades = len(final_filtered_history)
-            if total_trades > 0:
-                buy_trades = [t for t in final_filtered_history if t.get('order_type') == 'buy']
-                closed_sells = [t for t in final_filtered_history if t.get('order_type') == 'sell' and t.get('status') == 'CLOSED']
-                total_invested = sum(Decimal(t.get('usd_value', 0)) for t in buy_trades if t.get('usd_value') is not None)
-                total_returned = sum(Decimal(t.get('sell_usd_value', 0)) for t in closed_sells if t.get('sell_usd_value') is not None)
-                total_realized_pnl = sum(Decimal(t.get('realized_pnl_usd', 0)) for t in closed_sells if t.get('realized_pnl_usd') is not None)
-                roi_pct = (total_realized_pnl / total_invested * 100) if total_invested > 0 else 0
-                pnl_color = "green" if total_realized_pnl >= 0 else "red"
-                roi_color = "green" if roi_pct >= 0 else "red"
-                summary_text = (
-                    f"Filtered Trades: {total_trades} (Buys: {len(buy_trades)}, Sells: {len(closed_sells)})\n\n"
-                    f"  Total Invested (in view): ${total_invested:,.2f}\n"
-                    f"  Total Returned (in view): ${total_returned:,.2f}\n"
-                    f"  Realized PnL (in view):   [{pnl_color}]${total_realized_pnl:,.2f}[/]\n"
-                    f"  ROI (of closed in view):  [{roi_color}]{roi_pct:.2f}%[/]"
-                )
-            else:
-                summary_text = "No trades match the current filter."
-
-            # --- Sorting ---
-            sort_key_map = {
-                "Timestamp": "timestamp", "Symbol": "symbol", "Type": "order_type", "Status": "status",
-                "Buy Price": "price", "Sell Price": "sell_price", "Quantity": "quantity",
-                "USD Value": "usd_value", "PnL (USD)": "realized_pnl_usd", "PnL (%)": "pnl_percentage",
-                "Trade ID": "trade_id"
-            }
-            sort_key = sort_key_map.get(sort_column, "timestamp")
-            numeric_keys = ["price", "sell_price", "quantity", "usd_value", "realized_pnl_usd", "pnl_percentage"]
-
-            def sort_func(trade):
-                if sort_key == 'pnl_percentage': val = trade.get('decision_context', {}).get('pnl_percentage')
-                else: val = trade.get(sort_key)
-                if val is None: return -float('inf') if sort_reverse else float('inf')
-                if sort_key in numeric_keys:
-                    try: return Decimal(val)
-                    except (InvalidOperation, TypeError): return -float('inf') if sort_reverse else float('inf')
-                else: return str(val)
-            
-            sorted_history = sorted(final_filtered_history, key=sort_func, reverse=sort_reverse)
-
-            self.post_message(ProcessedHistoryData(sorted_history, summary_text))
-        except ValueError:
-            self.call_from_thread(self.log_display.write, "[bold red]Invalid date format. Please use YYYY-MM-DD.[/bold red]")
+            response = requests.get(url, params=params, timeout=15)
+            if response.status_code != 200:
+                try:
+                    error_detail = response.json().get("detail", response.text)
+                except json.JSONDecodeError:
+                    error_detail = response.text
+                self.call_from_thread(self.log_display.write, f"[bold red]History API Error (HTTP {response.status_code}): {error_detail}[/]")
+                self.post_message(HistoryPageData([], None, None, append, request_id))
+                return
+            page = response.json()
+
+            summary_text = None
+            summary = page.get("summary")
+            if summary is not None:
+                total_trades = int(summary.get("total_trades", 0))
+                if total_trades > 0:
+                    total_invested = Decimal(summary.get("total_invested", 0))
+                    total_returned = Decimal(summary.get("total_returned", 0))
+                    total_realized_pnl = Decimal(summary.get("realized_pnl_usd", 0))
+                    roi_pct = (total_realized_pnl / total_invested * 100) if total_invested > 0 else 0
+                    pnl_color = "green" if total_realized_pnl >= 0 else "red"
+                    roi_color = "green" if roi_pct >= 0 else "red"
+                    summary_text = (
+                        f"Filtered Trades: {total_trades} (Buys: {summary.get('buy_count', 0)}, Sells: {summary.get('sell_count', 0)})\n\n"
+                        f"  Total Invested (in view): ${total_invested:,.2f}\n"
+                        f"  Total Returned (in view): ${total_returned:,.2f}\n"
+                        f"  Realized PnL (in view):   [{pnl_color}]${total_realized_pnl:,.2f}[/]\n"
+                        f"  ROI (of closed in view):  [{roi_color}]{roi_pct:.2f}%[/]"
+                    )
+                else:
+                    summary_text = "No trades match the current filter."
+
+            self.post_message(HistoryPageData(page.get("trades", []), page.get("next_cursor"), summary_text, append, request_id))
+        except requests.exceptions.RequestException as e:
+            self.call_from_thread(self.log_display.write, f"[bold red]Failed to fetch trade history from bot API: {e}[/]")
+            self.post_message(HistoryPageData([], None, None, append, request_id))
         except Exception as e:
             self.call_from_thread(self.log_display.write, f"[bold red]Error in history worker: {e}[/]")
+            self.post_message(HistoryPageData([], None, None, append, request_id))
 
 
-    @work(thread=True)
+    @work(thread=True, exclusive=True, group="status_reader")
     def read_status_file_worker(self) -> None:
-        """Worker to read the bot status from the JSON file."""
-        # Use a simple relative path, assuming TUI is run from the project root.
-        status_file_path = os.path.join(".tui_files", f".bot_status_{self.bot_name}.json")
+        """Worker that applies new entries of the bot's status log."""
         try:
-            if os.path.exists(status_file_path):
-                with open(status_file_path, "r") as f:
-                    content = f.read()
-                    if not content:
-                        self.post_message(DashboardData("Bot is starting, waiting for status file...", success=False))
-                        return
-                    data = json.loads(content)
-                self.post_message(DashboardData(data, success=True))
-            else:
-                self.post_message(DashboardData(f"Status file not found for bot '{self.bot_name}'. Is the bot running?", success=False))
+            changed = self.status_reader.poll()
+            if changed is None:
+                return
+            self.post_message(DashboardData(dict(self.status_reader.state), success=True, changed=changed))
+        except FileNotFoundError:
+            self.post_message(DashboardData(f"Status log not found for bot '{self.bot_name}'. Is the bot running?", success=False))
         except json.JSONDecodeError:
-            self.post_message(DashboardData("Error decoding status file. It might be corrupted or being written.", success=False))
+            self.post_message(DashboardData("Error decoding status log. It will be re-read on the next update.", success=False))
         except Exception as e:
-            self.post_message(DashboardData(f"Error reading status file: {e}", success=False))
+            self.post_message(DashboardData(f"Error reading status log: {e}", success=False))
 
     def update_from_status_file(self) -> None:
         """Triggers the worker to read the status file."""
@@ -425,6 +410,7 @@ class TUIApp(App):
             return
 
         data = message.data
+        changed = message.changed
         self.query_one(StatusIndicator).status = data.get("bot_status", "OFF")
         self.query_one("#header_title").update(f"GCS Trading Bot Dashboard - {self.bot_name}")
 
@@ -453,46 +439,123 @@ class TUIApp(App):
         # --- Update All UI Components from the Single Data Source ---
         self.update_strategy_panel(data.get("buy_signal_status", {}), price)
         self.update_capital_panel(data.get("capital_allocation", {}), data.get("buy_signal_status", {}))
-        self.update_wallet_table(data.get("wallet_balances", []))
+        if changed is None or "wallet_balances" in changed:
+            self.update_wallet_table(data.get("wallet_balances", []))
 
         # --- Trigger background workers to process and render table data ---
         new_positions_data = data.get("open_positions_status", [])
-        new_positions_str = json.dumps(new_positions_data)
+        if changed is not None and "open_positions_status" not in changed and self._last_positions_data is not None:
+            new_positions_str = self._last_positions_data
+        else:
+            new_positions_str = json.dumps(new_positions_data)
         if new_positions_str != self._last_positions_data:
             self.log_display.write("Change in positions data detected, updating table...")
             self._last_positions_data = new_positions_str
             self.open_positions_data = new_positions_data
             self.process_positions_worker(self.open_positions_data, self.positions_sort_column, self.positions_sort_reverse)
 
-        new_history_data = data.get("trade_history", [])
-        new_history_str = json.dumps(new_history_data)
-        if new_history_str != self._last_history_data:
-            self.log_display.write("Change in history data detected, updating table...")
-            self._last_history_data = new_history_str
-            self.trade_history_data = new_history_data
-            self.update_history_table() # This will call the worker
+        history_marker = (data.get("latest_trade_id"), total_count, open_count)
+        if history_marker != self._last_history_marker:
+            self.log_display.write("Change in trade history detected, reloading table...")
+            self._last_history_marker = history_marker
+            # Reload as many rows as are already on screen so the scroll position survives.
+            loaded_rows = self.query_one("#history_table", DataTable).row_count
+            self.update_history_table(limit=min(max(HISTORY_PAGE_SIZE, loaded_rows), HISTORY_MAX_RELOAD_ROWS))
 
         # Update portfolio chart
-        self.update_portfolio_chart(data.get("portfolio_history", []))
-
-    def update_history_table(self) -> None:
-        """Triggers the history processing worker with the current filters."""
-        start_date_str = self.query_one("#start_date_input", Input).value
-        end_date_str = self.query_one("#end_date_input", Input).value
-        self.process_history_worker(
-            self.trade_history_data,
-            self.history_filter,
-            start_date_str,
-            end_date_str,
-            self.history_sort_column,
-            self.history_sort_reverse
+        if changed is None or "portfolio_history" in changed:
+            self.update_portfolio_chart(data.get("portfolio_history", []))
+
+    def _history_query_params(self) -> dict | None:
+        """Builds the trade history API filters from the current UI state, or None if they are invalid."""
+        params = {
+            "status": self.history_filter,
+            "sort_by": HISTORY_SORT_KEY_MAP.get(self.history_sort_column, "timestamp"),
+            "descending": "true" if self.history_sort_reverse else "false",
+        }
+        for param, input_id in (("start_date", "#start_date_input"), ("end_date", "#end_date_input")):
+            value = self.query_one(input_id, Input).value.strip()
+            if not value:
+                continue
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except ValueError:
+                self.log_display.write("[bold red]Invalid date format. Please use YYYY-MM-DD.[/bold red]")
+                return None
+            params[param] = value
+        return params
+
+    def update_history_table(self, limit: int | None = None) -> None:
+        """(Re)loads the first page of the trade history with the current filters and sort order."""
+        params = self._history_query_params()
+        if params is None:
+            return
+        params["limit"] = limit or HISTORY_PAGE_SIZE
+        self._history_request_id += 1
+        self.history_loading = True
+        self.fetch_history_page_worker(params, False, self._history_request_id)
+
+    def load_next_history_page(self) -> None:
+        """Fetches the next page of the trade history, if there is one and none is in flight."""
+        if self.history_loading or not self.history_next_cursor:
+            return
+        params = self._history_query_params()
+        if params is None:
+            return
+        params.update(limit=HISTORY_PAGE_SIZE, cursor=self.history_next_cursor)
+        self.history_loading = True
+        self.fetch_history_page_worker(params, True, self._history_request_id)
+
+    def _add_history_row(self, table: DataTable, trade: dict) -> None:
+        trade_id = trade.get("trade_id")
+        if not trade_id: return
+
+        pnl = trade.get('realized_pnl_usd')
+        order_type = trade.get('order_type', 'N/A')
+        pnl_str = f"${Decimal(pnl):,.2f}" if pnl is not None else "N/A"
+        pnl_color = "green" if pnl is not None and Decimal(pnl) >= 0 else "red"
+        pnl_cell = f"[{pnl_color}]{pnl_str}[/]" if order_type == 'sell' else "N/A"
+        type_color = "green" if order_type == 'buy' else "red"
+        type_cell = f"[{type_color}]{order_type.upper()}[/]"
+        local_timestamp = datetime.fromisoformat(trade['timestamp'])
+        timestamp = local_timestamp.strftime('%Y-%m-%d %H:%M')
+        trade_id_short = trade_id.split('-')[0]
+        buy_price = f"${Decimal(trade.get('price', 0)):,.2f}"
+        sell_price = f"${Decimal(trade.get('sell_price', 0)):,.2f}" if trade.get('sell_price') else "N/A"
+        pnl_pct_str = trade.get('decision_context', {}).get('pnl_percentage', 'N/A')
+        pnl_pct_cell = "N/A"
+        if pnl_pct_str != 'N/A':
+            try:
+                pnl_pct_val = Decimal(pnl_pct_str)
+                pct_color = "green" if pnl_pct_val >= 0 else "red"
+                pnl_pct_cell = f"[{pct_color}]{pnl_pct_val:.2f}%[/]"
+            except InvalidOperation: pnl_pct_cell = "err"
+        
+        row_data = (
+            timestamp, trade.get('symbol'), type_cell, trade.get('status'), buy_price, sell_price, 
+            f"{Decimal(trade.get('quantity', 0)):.8f}", f"${Decimal(trade.get('usd_value', 0)):.2f}", 
+            pnl_cell, pnl_pct_cell if order_type == 'sell' else "N/A", trade_id_short
         )
-
-    def on_processed_history_data(self, message: ProcessedHistoryData) -> None:
-        """Renders the processed trade history data received from the worker,
-        preserving scroll position."""
+        # Add row with key to allow scroll restoration
+        table.add_row(*row_data, key=trade_id)
+
+    def on_history_page_data(self, message: HistoryPageData) -> None:
+        """Renders a page of trade history received from the worker. The first page
+        replaces the table (preserving the cursor row); later pages are appended."""
+        if message.request_id != self._history_request_id:
+            return  # A newer filter or sort superseded this request.
+        self.history_loading = False
+        self.history_next_cursor = message.next_cursor
         table = self.query_one("#history_table", DataTable)
-        self.query_one("#history_summary_label").update(message.summary_text)
+
+        if message.append:
+            for trade in message.trades:
+                if trade.get("trade_id") in table.rows: continue
+                self._add_history_row(table, trade)
+            return
+
+        if message.summary_text is not None:
+            self.query_one("#history_summary_label").update(message.summary_text)
         self._update_table_headers(table, self.history_sort_column, self.history_sort_reverse)
 
         # --- Preserve scroll position ---
@@ -505,44 +568,14 @@ class TUIApp(App):
 
         table.clear()
 
-        if not message.sorted_history:
+        if not message.trades:
             table.add_row("No trades match the current filter.", key="placeholder_history")
             return
 
-        # --- Repopulate the table with new data ---
-        for trade in message.sorted_history:
-            trade_id = trade.get("trade_id")
-            if not trade_id: continue
-
-            pnl = trade.get('realized_pnl_usd')
-            order_type = trade.get('order_type', 'N/A')
-            pnl_str = f"${Decimal(pnl):,.2f}" if pnl is not None else "N/A"
-            pnl_color = "green" if pnl is not None and Decimal(pnl) >= 0 else "red"
-            pnl_cell = f"[{pnl_color}]{pnl_str}[/]" if order_type == 'sell' else "N/A"
-            type_color = "green" if order_type == 'buy' else "red"
-            type_cell = f"[{type_color}]{order_type.upper()}[/]"
-            local_timestamp = datetime.fromisoformat(trade['timestamp'])
-            timestamp = local_timestamp.strftime('%Y-%m-%d %H:%M')
-            trade_id_short = trade_id.split('-')[0]
-            buy_price = f"${Decimal(trade.get('price', 0)):,.2f}"
-            sell_price = f"${Decimal(trade.get('sell_price', 0)):,.2f}" if trade.get('sell_price') else "N/A"
-            pnl_pct_str = trade.get('decision_context', {}).get('pnl_percentage', 'N/A')
-            pnl_pct_cell = "N/A"
-            if pnl_pct_str != 'N/A':
-                try:
-                    pnl_pct_val = Decimal(pnl_pct_str)
-                    pct_color = "green" if pnl_pct_val >= 0 else "red"
-                    pnl_pct_cell = f"[{pct_color}]{pnl_pct_val:.2f}%[/]"
-                except InvalidOperation: pnl_pct_cell = "err"
-            
-            row_data = (
-                timestamp, trade.get('symbol'), type_cell, trade.get('status'), buy_price, sell_price, 
-                f"{Decimal(trade.get('quantity', 0)):.8f}", f"${Decimal(trade.get('usd_value', 0)):.2f}", 
-                pnl_cell, pnl_pct_cell if order_type == 'sell' else "N/A", trade_id_short
-            )
-            # Add row with key to allow scroll restoration
-            table.add_row(*row_data, key=trade_id)
-        
+        # --- Repopulate the table with the first page ---
+        for trade in message.trades:
+            self._add_history_row(table, trade)
+
         # --- Restore scroll position ---
         if cursor_row_key:
             try:
@@ -551,6 +584,7 @@ class TUIApp(App):
             except RowDoesNotExist:
                 pass # The previously selected row might no longer be in view
 
+
     def on_command_output(self, message: CommandOutput) -> None:
         if message.success:
             self.log_display.write(f"[green]Command success:[/green] {message.output}")
@@ -793,6 +827,11 @@ class TUIApp(App):
         elif event.button.id == "filter_date_button":
             self.update_history_table()
 
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        # Lazy-load the next history page as the cursor approaches the end of the table.
+        if event.control.id == "history_table" and event.cursor_row >= event.control.row_count - HISTORY_PREFETCH_ROWS:
+            self.load_next_history_page()
+
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         if event.control.id == "positions_table":
             self.selected_trade_id = event.row_key.value
@@ -838,6 +877,9 @@ class TUIApp(App):
             self._update_table_headers(table, self.positions_sort_column, self.positions_sort_reverse)
             self.update_positions_table()
         elif table.id == "history_table":
+            if HISTORY_SORT_KEY_MAP.get(column_label) is None:
+                self.log_display.write(f"[yellow]Trade history cannot be sorted by '{column_label}'.[/]")
+                return
             if self.history_sort_column == column_label:
                 self.history_sort_reverse = not self.history_sort_reverse
             else: